@@ -6,14 +6,18 @@ This is the stable entrypoint; all CARTON lookups live here.
 
 from .carton_query import (
     list_carton_paths,
+    operation_stories,
     ops_with_low_coverage,
     profiles_and_signatures_for_operation,
     profiles_with_operation,
+    profiles_with_operations,
 )
 
 __all__ = [
     "list_carton_paths",
+    "operation_stories",
     "ops_with_low_coverage",
     "profiles_and_signatures_for_operation",
     "profiles_with_operation",
+    "profiles_with_operations",
 ]
@@ -8,19 +8,35 @@ This module enforces a small error contract so helpers get predictable failures
 when CARTON data is missing or out of date. Coverage and index helpers surface
 canonical system-profile status so callers can see when “known” data is sitting
 on top of a degraded bedrock contract.
+
+Verified loads are memoized per (path, mtime, size, manifest hash): a mapping is
+read, parsed, and hashed once, then served from memory until the file or the
+manifest changes. Derived indexes (op name/id maps, op id -> profiles) are
+cached against the same stamp. Cached data is never handed out directly;
+helpers return copies so callers cannot corrupt later answers.
 """
 
 from __future__ import annotations
 
+import copy
 import hashlib
 import json
+import os
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 ROOT = Path(__file__).resolve().parents[3]
 CARTON_MANIFEST = ROOT / "book/api/carton/CARTON.json"
 
 _MANIFEST_CACHE: Optional[dict] = None
+_MANIFEST_STAMP: Optional[Tuple[str, int, int]] = None
+
+# Stamp of a verified mapping: (path, mtime_ns, size, expected sha256).
+FileStamp = Tuple[str, int, int, Optional[str]]
+_FILE_CACHE: Dict[str, Tuple[FileStamp, dict]] = {}
+_INDEX_CACHE: Dict[str, Tuple[FileStamp, Any]] = {}
+SNAPSHOT_ENV = "SANDBOX_LORE_CARTON_SNAPSHOT"
+_SNAPSHOT_SEEDED = False
 
 LOGICAL_PATHS = {
     "vocab.ops": "book/graph/mappings/vocab/ops.json",
@@ -45,9 +61,18 @@ class UnknownOperationError(CartonError):
     """Raised when an operation name is not present in the CARTON vocab."""
 
 
+def _manifest_stamp() -> Optional[Tuple[str, int, int]]:
+    try:
+        st = CARTON_MANIFEST.stat()
+    except OSError:
+        return None
+    return (str(CARTON_MANIFEST), st.st_mtime_ns, st.st_size)
+
+
 def _load_manifest() -> dict:
-    global _MANIFEST_CACHE
-    if _MANIFEST_CACHE is not None:
+    global _MANIFEST_CACHE, _MANIFEST_STAMP
+    stamp = _manifest_stamp()
+    if _MANIFEST_CACHE is not None and (_MANIFEST_STAMP is None or _MANIFEST_STAMP == stamp):
         return _MANIFEST_CACHE
     try:
         manifest = json.loads(CARTON_MANIFEST.read_text())
@@ -58,9 +83,20 @@ def _load_manifest() -> dict:
     if not isinstance(manifest, dict) or "files" not in manifest:
         raise CartonDataError(f"CARTON manifest at {CARTON_MANIFEST} is not well-formed")
     _MANIFEST_CACHE = manifest
+    _MANIFEST_STAMP = stamp
     return manifest
 
 
+def clear_cache() -> None:
+    """Drop the memoized manifest, verified mappings, and derived indexes."""
+    global _MANIFEST_CACHE, _MANIFEST_STAMP, _SNAPSHOT_SEEDED
+    _MANIFEST_CACHE = None
+    _MANIFEST_STAMP = None
+    _SNAPSHOT_SEEDED = False
+    _FILE_CACHE.clear()
+    _INDEX_CACHE.clear()
+
+
 def _manifest_entry(logical_name: str) -> Tuple[Path, Optional[str]]:
     expected_path = LOGICAL_PATHS.get(logical_name)
     if not expected_path:
@@ -77,41 +113,101 @@ def _compute_sha256(path: Path) -> str:
     return hashlib.sha256(path.read_bytes()).hexdigest()
 
 
-def _load_json_from_manifest(logical_name: str, required_keys: Optional[List[str]] = None) -> dict:
-    """
-    Load a CARTON-mapped JSON by logical name, enforcing manifest hashes and
-    presence of expected top-level keys so callers get consistent failures
-    rather than partial data.
-    """
+def _file_stamp(path: Path, expected_hash: Optional[str]) -> FileStamp:
+    try:
+        st = path.stat()
+    except FileNotFoundError as exc:
+        raise CartonDataError(f"Missing CARTON mapping at {path}") from exc
+    return (str(path), st.st_mtime_ns, st.st_size, expected_hash)
+
+
+def _verified(logical_name: str) -> Tuple[FileStamp, dict]:
+    """Return (stamp, data) for a mapping, reading and hashing it only when its stamp changed."""
+    global _SNAPSHOT_SEEDED
     path, expected_hash = _manifest_entry(logical_name)
+    stamp = _file_stamp(path, expected_hash)
+    if not _SNAPSHOT_SEEDED:
+        _SNAPSHOT_SEEDED = True
+        snapshot_path = os.environ.get(SNAPSHOT_ENV)
+        if snapshot_path:
+            from .snapshot import load_snapshot
+
+            load_snapshot(Path(snapshot_path))
+    cached = _FILE_CACHE.get(logical_name)
+    if cached is not None and cached[0] == stamp:
+        return cached
     try:
-        data = json.loads(path.read_text())
+        raw = path.read_bytes()
+        data = json.loads(raw)
     except FileNotFoundError as exc:
         raise CartonDataError(f"Missing CARTON mapping at {path}") from exc
-    except json.JSONDecodeError as exc:
+    except (json.JSONDecodeError, UnicodeDecodeError) as exc:
         raise CartonDataError(f"Malformed JSON in CARTON mapping at {path}") from exc
     if expected_hash:
-        actual_hash = _compute_sha256(path)
+        actual_hash = hashlib.sha256(raw).hexdigest()
         if actual_hash != expected_hash:
             raise CartonDataError(
                 f"CARTON mapping at {path} does not match manifest hash (expected {expected_hash}, got {actual_hash})"
             )
+    _FILE_CACHE[logical_name] = (stamp, data)
+    return stamp, data
+
+
+def _load_json_from_manifest(logical_name: str, required_keys: Optional[List[str]] = None) -> dict:
+    """
+    Load a CARTON-mapped JSON by logical name, enforcing manifest hashes and
+    presence of expected top-level keys so callers get consistent failures
+    rather than partial data. The returned dict is the shared cached object;
+    treat it as read-only.
+    """
+    stamp, data = _verified(logical_name)
     if required_keys:
         for key in required_keys:
             if key not in data:
-                raise CartonDataError(f"CARTON mapping at {path} is missing required key '{key}'")
+                raise CartonDataError(f"CARTON mapping at {stamp[0]} is missing required key '{key}'")
     return data
 
 
-def _load_vocab() -> Tuple[Dict[str, int], Dict[int, str]]:
-    """Return both name->id and id->name maps from the CARTON ops vocab."""
-    vocab = _load_json_from_manifest("vocab.ops", required_keys=["ops"])
+def _derived(index_name: str, logical_name: str, required_keys: Optional[List[str]], build: Callable[[dict], Any]) -> Any:
+    """Build an index from one mapping, cached against that mapping's stamp."""
+    data = _load_json_from_manifest(logical_name, required_keys=required_keys)
+    stamp = _FILE_CACHE[logical_name][0]
+    cached = _INDEX_CACHE.get(index_name)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    value = build(data)
+    _INDEX_CACHE[index_name] = (stamp, value)
+    return value
+
+
+def _build_vocab(vocab: dict) -> Tuple[Dict[str, int], Dict[int, str]]:
     ops = vocab.get("ops") or []
     name_to_id = {entry["name"]: entry["id"] for entry in ops if "name" in entry and "id" in entry}
     id_to_name = {entry["id"]: entry["name"] for entry in ops if "name" in entry and "id" in entry}
     return name_to_id, id_to_name
 
 
+def _load_vocab() -> Tuple[Dict[str, int], Dict[int, str]]:
+    """Return both name->id and id->name maps from the CARTON ops vocab."""
+    return _derived("vocab", "vocab.ops", ["ops"], _build_vocab)
+
+
+def _build_op_profiles(digests: dict) -> Dict[int, List[str]]:
+    profile_map = digests.get("profiles") or digests
+    index: Dict[int, List[str]] = {}
+    for key, val in profile_map.items():
+        if key == "metadata":
+            continue
+        for op_id in dict.fromkeys(val.get("op_table") or []):
+            index.setdefault(op_id, []).append(key)
+    return index
+
+
+def _profiles_for_op_id(op_id: int) -> List[str]:
+    """System profiles whose digest op-table carries `op_id` (digest order)."""
+    return list(_derived("op_profiles", "system.digests", None, _build_op_profiles).get(op_id, []))
+
+
 def _load_coverage() -> dict:
     """Minimal coverage load that keeps a small surface for low-level queries."""
     coverage = _load_json_from_manifest("carton.coverage", required_keys=["coverage"])
@@ -147,28 +243,12 @@ def profiles_with_operation(op_name: str) -> List[str]:
     entry = coverage[op_name] or {}
     profiles = entry.get("system_profiles")
     if profiles is not None:
-        return profiles
+        return copy.deepcopy(profiles)
     # If the coverage entry is missing system profile data, fall back to digests.
-    digests = _load_json_from_manifest("system.digests")
-    profile_map = digests.get("profiles") or digests
-    profiles = []
-    for key, val in profile_map.items():
-        if key == "metadata":
-            continue
-        op_table = val.get("op_table") or []
-        if op_id in op_table:
-            profiles.append(key)
-    return profiles
+    return _profiles_for_op_id(op_id)
 
 
-def profiles_and_signatures_for_operation(op_name: str) -> Dict[str, Any]:
-    """
-    Combine coverage entries for an op into a single record, keeping coverage
-    health visible so callers can distinguish “known but degraded” from fully
-    backed mappings.
-    """
-    op_id = _lookup_op_id(op_name)
-    coverage_full = _load_coverage_full()
+def _operation_record(op_name: str, op_id: int, coverage_full: dict) -> Dict[str, Any]:
     coverage = coverage_full.get("coverage") or {}
     if op_name not in coverage:
         raise CartonDataError(f"CARTON coverage mapping does not include operation '{op_name}'")
@@ -177,19 +257,31 @@ def profiles_and_signatures_for_operation(op_name: str) -> Dict[str, Any]:
     # coverage_status and canonical_profile_status report whether the coverage
     # data is still backed by canonical contracts; callers should treat non-ok
     # states as “known but degraded,” not business-as-usual.
-    return {
-        "op_name": op_name,
-        "op_id": op_id,
-        "system_profiles": entry.get("system_profiles") or [],
-        "system_profile_status": entry.get("system_profile_status") or {},
-        "counts": {
-            "system_profiles": counts.get("system_profiles", 0),
-            "system_profiles_ok": counts.get("system_profiles_ok", 0),
-        },
-        "coverage_status": (coverage_full.get("metadata") or {}).get("status"),
-        "canonical_profile_status": (coverage_full.get("metadata") or {}).get("canonical_profile_status") or {},
-        "known": True,
-    }
+    return copy.deepcopy(
+        {
+            "op_name": op_name,
+            "op_id": op_id,
+            "system_profiles": entry.get("system_profiles") or [],
+            "system_profile_status": entry.get("system_profile_status") or {},
+            "counts": {
+                "system_profiles": counts.get("system_profiles", 0),
+                "system_profiles_ok": counts.get("system_profiles_ok", 0),
+            },
+            "coverage_status": (coverage_full.get("metadata") or {}).get("status"),
+            "canonical_profile_status": (coverage_full.get("metadata") or {}).get("canonical_profile_status") or {},
+            "known": True,
+        }
+    )
+
+
+def profiles_and_signatures_for_operation(op_name: str) -> Dict[str, Any]:
+    """
+    Combine coverage entries for an op into a single record, keeping coverage
+    health visible so callers can distinguish “known but degraded” from fully
+    backed mappings.
+    """
+    op_id = _lookup_op_id(op_name)
+    return _operation_record(op_name, op_id, _load_coverage_full())
 
 
 def ops_with_low_coverage(threshold: int = 0) -> List[Dict[str, object]]:
@@ -248,7 +340,7 @@ def filter_story(filter_name: str) -> Dict[str, Any]:
         "filter_id": entry.get("id"),
         "known": entry.get("known", False),
         "usage_status": entry.get("usage_status"),
-        "system_profiles": entry.get("system_profiles") or [],
+        "system_profiles": list(entry.get("system_profiles") or []),
     }
 
 
@@ -268,27 +360,59 @@ def list_carton_paths() -> Dict[str, str]:
     return paths
 
 
-def operation_story(op_name: str) -> Dict[str, Any]:
-    """Narrative view for an op: ids plus linkage to profiles/signatures and health fields."""
-    op_info = profiles_and_signatures_for_operation(op_name)
-    coverage_full = _load_coverage_full()
-    coverage = coverage_full.get("coverage") or {}
-    entry = coverage.get(op_name, {})
+def _story_from_record(op_info: Dict[str, Any]) -> Dict[str, Any]:
     # Keep canonical/cov status visible so the mini-story reads as “this is what
     # we know, and here is the health of the canonical evidence it rests on.”
     return {
-        "op_name": op_name,
+        "op_name": op_info["op_name"],
         "op_id": op_info["op_id"],
         "known": op_info["known"],
         "system_profiles": op_info["system_profiles"],
-        "system_profile_status": op_info.get("system_profile_status") or entry.get("system_profile_status") or {},
+        "system_profile_status": op_info["system_profile_status"],
         "profile_layers": ["system"] if op_info["system_profiles"] else [],
         "coverage_counts": op_info["counts"],
-        "coverage_status": (coverage_full.get("metadata") or {}).get("status"),
-        "canonical_profile_status": (coverage_full.get("metadata") or {}).get("canonical_profile_status") or {},
+        "coverage_status": op_info["coverage_status"],
+        "canonical_profile_status": op_info["canonical_profile_status"],
     }
 
 
+def operation_story(op_name: str) -> Dict[str, Any]:
+    """Narrative view for an op: ids plus linkage to profiles/signatures and health fields."""
+    return _story_from_record(profiles_and_signatures_for_operation(op_name))
+
+
+def _resolve_op_ids(op_names: List[str]) -> Dict[str, int]:
+    """Resolve many op names at once, reporting every unknown name in one error."""
+    name_to_id, _ = _load_vocab()
+    missing = [name for name in op_names if name not in name_to_id]
+    if missing:
+        raise UnknownOperationError(f"Operations not found in CARTON vocab: {', '.join(repr(n) for n in missing)}")
+    return {name: name_to_id[name] for name in op_names}
+
+
+def operation_stories(op_names: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Batch `operation_story`: one vocab/coverage pass for all names. Raises
+    UnknownOperationError naming every unknown op before any story is built.
+    """
+    op_ids = _resolve_op_ids(list(op_names))
+    coverage_full = _load_coverage_full()
+    return {name: _story_from_record(_operation_record(name, op_id, coverage_full)) for name, op_id in op_ids.items()}
+
+
+def profiles_with_operations(op_names: List[str]) -> Dict[str, List[str]]:
+    """Batch `profiles_with_operation` (same digest fallback per op)."""
+    op_ids = _resolve_op_ids(list(op_names))
+    coverage = _load_coverage()
+    out: Dict[str, List[str]] = {}
+    for name, op_id in op_ids.items():
+        if name not in coverage:
+            raise CartonDataError(f"CARTON coverage mapping does not include operation '{name}'")
+        profiles = (coverage[name] or {}).get("system_profiles")
+        out[name] = copy.deepcopy(profiles) if profiles is not None else _profiles_for_op_id(op_id)
+    return out
+
+
 def profile_story(profile_id: str) -> Dict[str, Any]:
     """Narrative view for a system profile, keeping canonical/coverage status visible."""
     digests = _load_json_from_manifest("system.digests")
@@ -309,14 +433,15 @@ def profile_story(profile_id: str) -> Dict[str, Any]:
     }
     canonical_profiles_meta = meta.get("canonical_profiles") or {}
     canonical_profile_status = {
-        pid: (info.get("status") if isinstance(info, dict) else info) for pid, info in canonical_profiles_meta.items()
+        pid: copy.deepcopy(info.get("status") if isinstance(info, dict) else info)
+        for pid, info in canonical_profiles_meta.items()
     }
     # Coverage status here mirrors the canonical profile health to keep profile
     # stories consistent with the generator guardrails.
     return {
         "profile_id": profile_id,
         "layer": "system",
-        "status": profile_body.get("status") or meta.get("status"),
+        "status": copy.deepcopy(profile_body.get("status") or meta.get("status")),
         "ops": ops,
         "filters": filters_info,
         "canonical_profile_status": canonical_profile_status,
@@ -327,14 +452,17 @@ def profile_story(profile_id: str) -> Dict[str, Any]:
 __all__ = [
     "CartonDataError",
     "UnknownOperationError",
+    "clear_cache",
     "filter_story",
     "list_filters",
     "list_operations",
     "list_profiles",
     "list_carton_paths",
     "ops_with_low_coverage",
+    "operation_stories",
     "operation_story",
     "profile_story",
     "profiles_and_signatures_for_operation",
     "profiles_with_operation",
+    "profiles_with_operations",
 ]
@@ -0,0 +1,134 @@
+"""
+Long-lived CARTON query server (JSON lines over stdio or a Unix socket).
+
+One process keeps `carton_query`'s verified mappings and indexes resident, so
+agents can issue many lookups without paying a fresh load per call. Each query
+still stat-checks `CARTON.json` and the mappings it touches; data is reloaded
+only when those change.
+
+Protocol: one JSON object per line.
+
+    {"id": 1, "method": "operation_stories", "params": {"op_names": ["file-read*"]}}
+    {"id": 2, "method": "filter_story", "args": ["path"]}
+
+Responses echo `id` and carry either `result` or
+`error: {"type": <exception class>, "message": ...}`; CartonError subclasses
+keep their names so callers can apply the same error contract as in-process;
+any other exception is reported as `InternalError` and the server keeps going.
+
+Usage:
+    python -m book.api.carton.server --stdio
+    python -m book.api.carton.server --socket /tmp/carton.sock
+"""
+
+from __future__ import annotations
+
+import argparse
+import inspect
+import json
+import os
+import socketserver
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, IO, Mapping, Optional, Sequence
+
+from . import carton_query as cq
+
+METHODS: Dict[str, Callable[..., Any]] = {
+    name: getattr(cq, name)
+    for name in cq.__all__
+    if callable(getattr(cq, name)) and not isinstance(getattr(cq, name), type) and name != "clear_cache"
+}
+
+
+def handle_request(request: Any) -> Dict[str, Any]:
+    """Answer one decoded request object."""
+    if not isinstance(request, Mapping):
+        return {"id": None, "error": {"type": "BadRequest", "message": "request must be a JSON object"}}
+    req_id = request.get("id")
+    method = request.get("method")
+    func = METHODS.get(method) if isinstance(method, str) else None
+    if func is None:
+        return {"id": req_id, "error": {"type": "BadRequest", "message": f"unknown method {method!r}"}}
+    args = request.get("args") or []
+    params = request.get("params") or {}
+    if not isinstance(args, list) or not isinstance(params, Mapping):
+        return {"id": req_id, "error": {"type": "BadRequest", "message": "args must be a list and params an object"}}
+    try:
+        inspect.signature(func).bind(*args, **params)
+    except TypeError as exc:
+        return {"id": req_id, "error": {"type": "BadRequest", "message": f"{method}: {exc}"}}
+    try:
+        result = func(*args, **params)
+    except cq.CartonError as exc:
+        return {"id": req_id, "error": {"type": type(exc).__name__, "message": str(exc)}}
+    except Exception as exc:  # keep serving: one bad query must not take the server down
+        return {"id": req_id, "error": {"type": "InternalError", "message": f"{method}: {type(exc).__name__}: {exc}"}}
+    return {"id": req_id, "result": result}
+
+
+def handle_line(line: str) -> Optional[str]:
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        request = json.loads(line)
+    except json.JSONDecodeError as exc:
+        response: Dict[str, Any] = {"id": None, "error": {"type": "BadRequest", "message": f"invalid JSON: {exc}"}}
+    else:
+        response = handle_request(request)
+    return json.dumps(response, sort_keys=True)
+
+
+def serve_stream(reader: IO[str], writer: IO[str]) -> None:
+    for line in reader:
+        out = handle_line(line)
+        if out is None:
+            continue
+        writer.write(out + "\n")
+        writer.flush()
+
+
+class _LineHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        for raw in self.rfile:
+            out = handle_line(raw.decode("utf-8", "replace"))
+            if out is None:
+                continue
+            self.wfile.write(out.encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class CartonUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve_unix(path: Path) -> None:
+    if path.exists():
+        path.unlink()
+    with CartonUnixServer(str(path), _LineHandler) as server:
+        try:
+            server.serve_forever()
+        finally:
+            if path.exists():
+                os.unlink(path)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve CARTON queries as JSON lines")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--stdio", action="store_true", help="Read requests from stdin, write responses to stdout")
+    mode.add_argument("--socket", type=Path, help="Listen on this Unix socket path")
+    args = parser.parse_args(argv)
+    if args.stdio:
+        serve_stream(sys.stdin, sys.stdout)
+        return 0
+    try:
+        serve_unix(args.socket)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
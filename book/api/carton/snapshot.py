@@ -0,0 +1,141 @@
+"""
+Persisted CARTON snapshot and query latency probe.
+
+`carton_query` already memoizes verified mappings in-process. This module lets
+a fresh process skip the read/parse/hash step too: `write_snapshot` pickles the
+verified mappings together with their stamps (path, mtime_ns, size, manifest
+sha256), and `load_snapshot` seeds the in-process cache with every entry whose
+stamp still matches the live manifest and filesystem. Stale or unreadable
+snapshots are ignored, so the error contract of `carton_query` is unchanged:
+anything not seeded is loaded and verified as usual.
+
+Setting `SANDBOX_LORE_CARTON_SNAPSHOT=<path>` makes `carton_query` seed from
+that snapshot on first use.
+
+`measure_latency` times each public query function cold (caches cleared) and
+warm (median of repeated calls).
+
+Usage:
+    python -m book.api.carton.snapshot write --out /tmp/carton.snapshot
+    python -m book.api.carton.snapshot latency [--snapshot PATH] [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import pickle
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from . import carton_query as cq
+
+SNAPSHOT_SCHEMA_VERSION = "carton-snapshot.v0.1"
+
+# Representative call for each public query function.
+QUERY_CALLS: Dict[str, Tuple[Callable[..., Any], Tuple[Any, ...]]] = {
+    "profiles_with_operation": (cq.profiles_with_operation, ("file-read*",)),
+    "profiles_and_signatures_for_operation": (cq.profiles_and_signatures_for_operation, ("file-read*",)),
+    "operation_story": (cq.operation_story, ("file-read*",)),
+    "ops_with_low_coverage": (cq.ops_with_low_coverage, (0,)),
+    "profile_story": (cq.profile_story, ("sys:bsd",)),
+    "filter_story": (cq.filter_story, ("path",)),
+    "list_operations": (cq.list_operations, ()),
+    "list_profiles": (cq.list_profiles, ()),
+    "list_filters": (cq.list_filters, ()),
+    "list_carton_paths": (cq.list_carton_paths, ()),
+}
+
+
+def write_snapshot(path: Path, logical_names: Optional[Iterable[str]] = None) -> int:
+    """Verify every logical mapping and pickle (stamp, data) pairs to `path`; returns the entry count."""
+    files: Dict[str, Tuple[cq.FileStamp, dict]] = {}
+    for logical in logical_names or cq.LOGICAL_PATHS:
+        files[logical] = cq._verified(logical)
+    doc = {"schema_version": SNAPSHOT_SCHEMA_VERSION, "manifest": str(cq.CARTON_MANIFEST), "files": files}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(pickle.dumps(doc, protocol=pickle.HIGHEST_PROTOCOL))
+    tmp.replace(path)
+    return len(files)
+
+
+def load_snapshot(path: Path) -> int:
+    """
+    Seed `carton_query`'s verified-load cache from a snapshot. Only entries
+    whose stamp matches the current manifest entry and file stat are used;
+    returns how many were seeded.
+    """
+    try:
+        doc = pickle.loads(path.read_bytes())
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+        return 0
+    except (ImportError, AttributeError, TypeError):
+        # Pickled against code that has since moved or changed: as stale as a
+        # schema mismatch, so seed nothing and let callers load as usual.
+        return 0
+    if not isinstance(doc, dict) or doc.get("schema_version") != SNAPSHOT_SCHEMA_VERSION:
+        return 0
+    seeded = 0
+    for logical, entry in (doc.get("files") or {}).items():
+        try:
+            stamp, data = entry
+            file_path, expected_hash = cq._manifest_entry(logical)
+            current = cq._file_stamp(file_path, expected_hash)
+        except (cq.CartonError, TypeError, ValueError):
+            continue
+        if tuple(stamp) == current:
+            cq._FILE_CACHE[logical] = (current, data)
+            seeded += 1
+    return seeded
+
+
+def measure_latency(
+    calls: Optional[Dict[str, Tuple[Callable[..., Any], Tuple[Any, ...]]]] = None,
+    *,
+    repeat: int = 200,
+    snapshot: Optional[Path] = None,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Per query function: `cold_ms` is one call after `clear_cache()` (seeded from
+    `snapshot` when given), `warm_ms` is the median of `repeat` further calls.
+    """
+    results: Dict[str, Dict[str, float]] = {}
+    for name, (func, args) in (calls or QUERY_CALLS).items():
+        cq.clear_cache()
+        if snapshot is not None:
+            load_snapshot(snapshot)
+        t0 = time.perf_counter()
+        func(*args)
+        cold = time.perf_counter() - t0
+        samples: List[float] = []
+        for _ in range(max(1, repeat)):
+            t0 = time.perf_counter()
+            func(*args)
+            samples.append(time.perf_counter() - t0)
+        results[name] = {"cold_ms": cold * 1000.0, "warm_ms": statistics.median(samples) * 1000.0}
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="CARTON snapshot utilities")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ap_write = sub.add_parser("write", help="Persist verified CARTON mappings to a snapshot file")
+    ap_write.add_argument("--out", type=Path, required=True)
+    ap_lat = sub.add_parser("latency", help="Report cold/warm latency per query function")
+    ap_lat.add_argument("--snapshot", type=Path, default=None, help="Seed cold runs from this snapshot")
+    ap_lat.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    if args.command == "write":
+        count = write_snapshot(args.out)
+        print(f"[+] wrote {args.out} ({count} mappings)")
+        return 0
+    print(json.dumps(measure_latency(repeat=args.repeat, snapshot=args.snapshot), indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -22,7 +22,9 @@ from book.api.entitlementjail.cli import (
     show_profile,
     verify_evidence,
 )
+from book.api.entitlementjail.async_session import AsyncXpcSession, open_async_session
 from book.api.entitlementjail.paths import EJ, EJ_APP, LOG_OBSERVER, REPO_ROOT
+from book.api.entitlementjail.pool import SessionPool
 from book.api.entitlementjail.protocol import WaitSpec
 from book.api.entitlementjail.session import XpcSession, open_session
 
@@ -45,6 +47,9 @@ __all__ = [
     "run_matrix",
     "XpcSession",
     "open_session",
+    "AsyncXpcSession",
+    "open_async_session",
+    "SessionPool",
     "WaitSpec",
     "run_matrix_group",
     "run_xpc",
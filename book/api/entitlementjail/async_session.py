@@ -0,0 +1,664 @@
+"""
+asyncio-native client for EntitlementJail `xpc session` (v2 control plane).
+
+`AsyncXpcSession` runs `entitlement-jail xpc session` with
+`asyncio.create_subprocess_exec` and pumps its JSONL stdout in a reader task.
+Every parsed object lands in `stdout_jsonl`; waiters are woken through an
+`asyncio.Condition`, so `next_event`/`wait_for_event` are event-driven (no
+polling slices).
+
+Probes can be pipelined: `submit_probe` registers a pending future before the
+command is written, and the reader resolves it when the matching
+`probe_response` arrives. Matching uses, in order:
+
+- a per-command `correlation_id` (only sent when the caller supplies one) that
+  the response echoes in `data.correlation_id`;
+- otherwise the oldest pending command with the same `(probe_id, argv)`, which
+  follows the service's in-order handling of commands on one session;
+- otherwise the oldest pending command.
+
+Responses claimed by a pending probe are hidden from `next_event`; unclaimed
+ones (e.g. after a raw `send_command`) stay visible, matching the synchronous
+`XpcSession` behaviour. `book.api.entitlementjail.session.XpcSession` wraps
+this class for blocking callers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
+
+from book.api import path_utils
+from book.api.entitlementjail.logging import (
+    LOG_OBSERVER_LAST,
+    extract_correlation_id,
+    extract_process_name,
+    extract_service_pid,
+    run_sandbox_log_observer,
+    should_run_observer,
+)
+from book.api.entitlementjail.paths import EJ, REPO_ROOT
+from book.api.entitlementjail.protocol import (
+    WaitSpec,
+    normalize_wait_spec,
+    parse_wait_spec,
+    trigger_wait_path,
+)
+
+# Probe responses can carry large observer reports; keep whole lines readable.
+STREAM_LIMIT = 16 * 1024 * 1024
+CLOSE_DRAIN_S = 0.5
+
+
+@dataclass
+class _PendingProbe:
+    probe_id: str
+    argv: Tuple[str, ...]
+    request_id: Optional[str]
+    future: "asyncio.Future[Tuple[Dict[str, object], int]]" = field(repr=False)
+
+
+class XpcSessionState:
+    """Configuration, command line, and parsed-event accessors shared by the async and sync sessions."""
+
+    def __init__(
+        self,
+        *,
+        profile_id: str,
+        plan_id: str,
+        correlation_id: Optional[str] = None,
+        ack_risk: Optional[str] = None,
+        wait_spec: Optional[str | WaitSpec] = None,
+        wait_timeout_ms: Optional[int] = None,
+        wait_interval_ms: Optional[int] = None,
+        xpc_timeout_ms: Optional[int] = None,
+        cwd: Path = REPO_ROOT,
+    ) -> None:
+        if not profile_id:
+            raise ValueError("profile_id is required for xpc session")
+        self.profile_id = profile_id
+        self.plan_id = plan_id
+        self.correlation_id = correlation_id
+        self.ack_risk = ack_risk
+        self.wait_spec = normalize_wait_spec(wait_spec)
+        self.wait_timeout_ms = wait_timeout_ms
+        self.wait_interval_ms = wait_interval_ms
+        self.xpc_timeout_ms = xpc_timeout_ms
+        self.cwd = cwd
+
+        self.stdout_lines: List[str] = []
+        self.stderr_lines: List[str] = []
+        self.stdout_jsonl: List[Dict[str, object]] = []
+        self.session_ready: Optional[Dict[str, object]] = None
+        self.wait_ready: Optional[Dict[str, object]] = None
+
+        self.started_at_unix_s: Optional[float] = None
+        self.closed_at_unix_s: Optional[float] = None
+        self.exit_code: Optional[int] = None
+        self.last_error: Optional[Dict[str, object]] = None
+
+    def _set_last_error(self, code: str, details: Dict[str, object]) -> None:
+        self.last_error = {"code": code, **details}
+
+    def _build_cmd(self) -> List[str]:
+        cmd = [str(EJ), "xpc", "session", "--plan-id", self.plan_id]
+        if self.ack_risk:
+            cmd += ["--ack-risk", self.ack_risk]
+        if self.correlation_id:
+            cmd += ["--correlation-id", self.correlation_id]
+        if self.wait_spec:
+            cmd += ["--wait", self.wait_spec]
+        if self.wait_timeout_ms is not None:
+            cmd += ["--wait-timeout-ms", str(self.wait_timeout_ms)]
+        if self.wait_interval_ms is not None:
+            cmd += ["--wait-interval-ms", str(self.wait_interval_ms)]
+        if self.xpc_timeout_ms is not None:
+            cmd += ["--xpc-timeout-ms", str(self.xpc_timeout_ms)]
+        cmd += ["--profile", self.profile_id]
+        return cmd
+
+    def command(self) -> List[str]:
+        return path_utils.relativize_command(self._build_cmd(), REPO_ROOT)
+
+    def _ingest_json(self, obj: Dict[str, object]) -> None:
+        self.stdout_jsonl.append(obj)
+        if obj.get("kind") != "xpc_session_event":
+            return
+        data = obj.get("data")
+        if not isinstance(data, dict):
+            return
+        event = data.get("event")
+        if event == "session_ready":
+            self.session_ready = obj
+        elif event == "wait_ready":
+            self.wait_ready = obj
+
+    def _ingest_line(self, line: str) -> Optional[Dict[str, object]]:
+        self.stdout_lines.append(line)
+        stripped = line.strip()
+        if not stripped:
+            return None
+        try:
+            obj = json.loads(stripped)
+        except Exception:
+            return None
+        if isinstance(obj, dict):
+            self._ingest_json(obj)
+            return obj
+        return None
+
+    def pid(self) -> Optional[int]:
+        if not self.session_ready or not isinstance(self.session_ready.get("data"), dict):
+            return None
+        value = self.session_ready["data"].get("pid")
+        return value if isinstance(value, int) else None
+
+    def service_name(self) -> Optional[str]:
+        if not self.session_ready or not isinstance(self.session_ready.get("data"), dict):
+            return None
+        data = self.session_ready["data"]
+        for key in ("service_name", "process_name", "service"):
+            value = data.get(key)
+            if isinstance(value, str) and value:
+                return value
+        return None
+
+    def wait_path(self) -> Optional[str]:
+        for source in (self.wait_ready, self.session_ready):
+            if source and isinstance(source.get("data"), dict):
+                value = source["data"].get("wait_path")
+                if isinstance(value, str) and value:
+                    return value
+        _, path = parse_wait_spec(self.wait_spec)
+        return path if path else None
+
+    def wait_mode(self) -> Optional[str]:
+        for source in (self.wait_ready, self.session_ready):
+            if source and isinstance(source.get("data"), dict):
+                value = source["data"].get("wait_mode")
+                if isinstance(value, str) and value:
+                    return value
+        mode, _ = parse_wait_spec(self.wait_spec)
+        return mode
+
+    def _trigger_wait_blocking(self, *, nonblocking: bool, timeout_s: float) -> Optional[str]:
+        wait_path = self.wait_path()
+        wait_mode = self.wait_mode()
+        if wait_path is None or wait_mode is None:
+            return "no_wait_configured"
+        return trigger_wait_path(
+            wait_path=wait_path,
+            wait_mode=wait_mode,
+            nonblocking=nonblocking,
+            timeout_s=timeout_s,
+        )
+
+    def capture_observer(
+        self,
+        *,
+        probe_response: Optional[Dict[str, object]],
+        log_path: Optional[Path],
+        plan_id: Optional[str] = None,
+        row_id: Optional[str] = None,
+        observer_last: str = LOG_OBSERVER_LAST,
+        start_s: Optional[float] = None,
+        end_s: Optional[float] = None,
+    ) -> tuple[Optional[Dict[str, object]], Optional[str]]:
+        if log_path is None or not should_run_observer():
+            return None, None
+        observer_dest = log_path.parent / "observer" / f"{log_path.name}.observer.json"
+        observer_log_path = path_utils.to_repo_relative(observer_dest, REPO_ROOT)
+        observer_correlation_id = extract_correlation_id(probe_response) or self.correlation_id
+        observer = run_sandbox_log_observer(
+            pid=extract_service_pid(probe_response),
+            process_name=extract_process_name(probe_response),
+            dest_path=observer_dest,
+            last=observer_last,
+            start_s=start_s,
+            end_s=end_s,
+            plan_id=plan_id or self.plan_id,
+            row_id=row_id,
+            correlation_id=observer_correlation_id,
+        )
+        return observer, observer_log_path
+
+    def _preview(self) -> Dict[str, str]:
+        return {
+            "stdout": "".join(self.stdout_lines).strip(),
+            "stderr": "".join(self.stderr_lines).strip(),
+        }
+
+
+def _matches(obj: Dict[str, object], kind: Optional[str], event: Optional[str]) -> bool:
+    if kind and obj.get("kind") != kind:
+        return False
+    if event:
+        data = obj.get("data")
+        if not isinstance(data, dict) or data.get("event") != event:
+            return False
+    return True
+
+
+class AsyncXpcSession(XpcSessionState):
+    """
+    asyncio `entitlement-jail xpc session` client.
+
+    - `await start()` (or `async with`) waits for `session_ready` (and
+      `wait_ready` when a wait spec is set).
+    - `await run_probe()` for one probe, or `submit_probe()` / `run_probes()`
+      to keep several in flight.
+    - `await wait_for_event()` / `next_event()` consume the event stream.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.proc: Optional[asyncio.subprocess.Process] = None
+        self._cond: Optional[asyncio.Condition] = None
+        self._cursor = 0
+        self._claimed: set[int] = set()
+        self._pending: List[_PendingProbe] = []
+        # probe_responses that matched no pending probe exactly (see _dispatch_probe_response).
+        self.probe_mismatches: List[Dict[str, object]] = []
+        self._eof = False
+        self._tasks: List[asyncio.Task] = []
+
+    # -- process plumbing -------------------------------------------------
+
+    def _proc_state(self) -> str:
+        if self.proc is None:
+            return "not_started"
+        if self.proc.returncode is None:
+            return "running"
+        return f"exit:{self.proc.returncode}"
+
+    def is_running(self) -> bool:
+        return self.proc is not None and self.proc.returncode is None and not self._eof
+
+    def _ensure_live(self) -> asyncio.subprocess.Process:
+        if self.proc is None:
+            raise RuntimeError("session_not_started")
+        if self.proc.returncode is not None:
+            raise RuntimeError(f"session_exited:{self.proc.returncode}")
+        return self.proc
+
+    async def _notify(self) -> None:
+        assert self._cond is not None
+        async with self._cond:
+            self._cond.notify_all()
+
+    def _dispatch_probe_response(self, obj: Dict[str, object], index: int) -> None:
+        if not self._pending:
+            return
+        data = obj.get("data") if isinstance(obj.get("data"), dict) else {}
+        assert isinstance(data, dict)
+        chosen: Optional[_PendingProbe] = None
+        echoed = data.get("correlation_id")
+        if isinstance(echoed, str):
+            chosen = next((p for p in self._pending if p.request_id == echoed), None)
+        probe_id = data.get("probe_id")
+        if chosen is None and isinstance(probe_id, str):
+            argv = data.get("argv")
+            key_argv = tuple(argv) if isinstance(argv, list) else None
+            same_probe = [p for p in self._pending if p.probe_id == probe_id]
+            chosen = next((p for p in same_probe if key_argv is None or p.argv == key_argv), None)
+            # The service may echo argv normalized (paths, expanded args); like
+            # the one-at-a-time protocol, fall back to arrival order rather than
+            # leaving the probe to time out.
+            if chosen is None:
+                chosen = same_probe[0] if same_probe else self._pending[0]
+                self.probe_mismatches.append(
+                    {
+                        "response_index": index,
+                        "probe_id": probe_id,
+                        "argv": argv,
+                        "matched_probe_id": chosen.probe_id,
+                        "matched_argv": list(chosen.argv),
+                    }
+                )
+        if chosen is None:
+            chosen = self._pending[0]
+        self._pending.remove(chosen)
+        self._claimed.add(index)
+        if not chosen.future.done():
+            chosen.future.set_result((obj, index))
+
+    async def _pump_stdout(self) -> None:
+        assert self.proc is not None and self.proc.stdout is not None
+        stream = self.proc.stdout
+        try:
+            while True:
+                raw = await stream.readline()
+                if not raw:
+                    break
+                obj = self._ingest_line(raw.decode("utf-8", "replace"))
+                if obj is not None and obj.get("kind") == "probe_response":
+                    self._dispatch_probe_response(obj, len(self.stdout_jsonl) - 1)
+                await self._notify()
+        finally:
+            self._eof = True
+            returncode = None
+            try:
+                returncode = await asyncio.wait_for(self.proc.wait(), timeout=1.0)
+            except (asyncio.TimeoutError, ProcessLookupError):
+                pass
+            for pending in self._pending:
+                if not pending.future.done():
+                    pending.future.set_exception(RuntimeError(f"session_exited:{returncode}"))
+            self._pending.clear()
+            await self._notify()
+
+    async def _pump_stderr(self) -> None:
+        assert self.proc is not None and self.proc.stderr is not None
+        while True:
+            raw = await self.proc.stderr.readline()
+            if not raw:
+                return
+            self.stderr_lines.append(raw.decode("utf-8", "replace"))
+
+    async def start(self, *, ready_timeout_s: float = 15.0) -> None:
+        if self.proc is not None:
+            return
+        cmd = self._build_cmd()
+        self.started_at_unix_s = time.time()
+        self._cond = asyncio.Condition()
+        self._eof = False
+        self.proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            cwd=str(self.cwd),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=STREAM_LIMIT,
+        )
+        self._tasks = [asyncio.create_task(self._pump_stdout()), asyncio.create_task(self._pump_stderr())]
+
+        want_wait_ready = self.wait_spec is not None
+
+        def ready() -> bool:
+            return self.session_ready is not None and (not want_wait_ready or self.wait_ready is not None)
+
+        async with self._cond:
+            try:
+                await asyncio.wait_for(self._cond.wait_for(lambda: ready() or self._eof), max(ready_timeout_s, 0.0))
+            except asyncio.TimeoutError:
+                pass
+        if ready():
+            return
+
+        if self._eof:
+            # Let both readers finish so the error carries the full stderr.
+            await asyncio.wait(self._tasks, timeout=1.0)
+        state = "timeout" if self.proc.returncode is None else f"exit:{self.proc.returncode}"
+        error = {
+            "state": state,
+            "command": self.command(),
+            "ready_timeout_s": ready_timeout_s,
+            "wait_spec": self.wait_spec,
+            "wait_timeout_ms": self.wait_timeout_ms,
+            "wait_interval_ms": self.wait_interval_ms,
+            "xpc_timeout_ms": self.xpc_timeout_ms,
+            **self._preview(),
+        }
+        self._set_last_error("xpc_session_not_ready", error)
+        raise RuntimeError("xpc_session_not_ready", error)
+
+    # -- event stream -----------------------------------------------------
+
+    async def next_event(
+        self,
+        *,
+        kind: Optional[str] = None,
+        event: Optional[str] = None,
+        timeout_s: float = 5.0,
+    ) -> Optional[Dict[str, object]]:
+        """
+        Return the next unconsumed object matching kind/event, consuming
+        everything before it. None on timeout; raises `session_exited:<rc>`
+        once the stream has ended with no match.
+        """
+        self._ensure_live()
+        assert self._cond is not None
+        deadline = time.monotonic() + max(timeout_s, 0.0)
+        async with self._cond:
+            while True:
+                while self._cursor < len(self.stdout_jsonl):
+                    index = self._cursor
+                    self._cursor += 1
+                    if index in self._claimed:
+                        continue
+                    obj = self.stdout_jsonl[index]
+                    if _matches(obj, kind, event):
+                        return obj
+                if self._eof:
+                    raise RuntimeError(f"session_exited:{self.proc.returncode if self.proc else None}")
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                try:
+                    await asyncio.wait_for(self._cond.wait(), remaining)
+                except asyncio.TimeoutError:
+                    return None
+
+    async def read_jsonl(self, *, timeout_s: float = 0.2) -> Optional[Dict[str, object]]:
+        """Next unconsumed object of any kind, or None (timeout or ended stream)."""
+        if self.proc is None:
+            raise RuntimeError("session_not_started")
+        if self._cursor >= len(self.stdout_jsonl) and (self._eof or self.proc.returncode is not None):
+            return None
+        try:
+            return await self.next_event(timeout_s=timeout_s)
+        except RuntimeError:
+            return None
+
+    async def iter_events(self, *, timeout_s: float = 5.0) -> AsyncIterator[Dict[str, object]]:
+        self._ensure_live()
+        deadline = time.monotonic() + max(timeout_s, 0.0)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining < 0:
+                return
+            try:
+                obj = await self.next_event(timeout_s=remaining)
+            except RuntimeError:
+                return
+            if obj is None:
+                return
+            yield obj
+
+    async def watch_events(
+        self,
+        *,
+        timeout_s: float = 5.0,
+        on_event: Callable[[Dict[str, object]], None],
+    ) -> List[Dict[str, object]]:
+        events: List[Dict[str, object]] = []
+        async for obj in self.iter_events(timeout_s=timeout_s):
+            events.append(obj)
+            on_event(obj)
+        return events
+
+    async def wait_for_event(self, *, event: str, timeout_s: float = 5.0) -> Optional[Dict[str, object]]:
+        return await self.next_event(kind="xpc_session_event", event=event, timeout_s=timeout_s)
+
+    async def wait_for_trigger_received(self, *, timeout_s: float = 5.0) -> Optional[Dict[str, object]]:
+        return await self.wait_for_event(event="trigger_received", timeout_s=timeout_s)
+
+    async def trigger_wait(self, *, nonblocking: bool = False, timeout_s: float = 2.0) -> Optional[str]:
+        return await asyncio.to_thread(self._trigger_wait_blocking, nonblocking=nonblocking, timeout_s=timeout_s)
+
+    # -- commands and probes ----------------------------------------------
+
+    async def send_command(self, payload: Dict[str, object]) -> None:
+        proc = self._ensure_live()
+        assert proc.stdin is not None
+        proc.stdin.write((json.dumps(payload) + "\n").encode("utf-8"))
+        await proc.stdin.drain()
+
+    async def submit_probe(
+        self,
+        *,
+        probe_id: str,
+        argv: Sequence[str] = (),
+        request_id: Optional[str] = None,
+    ) -> "asyncio.Future[Tuple[Dict[str, object], int]]":
+        """
+        Send `run_probe` without waiting. The returned future resolves to
+        (probe_response, stream index). `request_id` is sent as the command's
+        `correlation_id` and preferred for matching when the response echoes it.
+        """
+        self._ensure_live()
+        future: "asyncio.Future[Tuple[Dict[str, object], int]]" = asyncio.get_running_loop().create_future()
+        pending = _PendingProbe(probe_id=probe_id, argv=tuple(argv), request_id=request_id, future=future)
+        self._pending.append(pending)
+        payload: Dict[str, object] = {"command": "run_probe", "probe_id": probe_id, "argv": list(argv)}
+        if request_id is not None:
+            payload["correlation_id"] = request_id
+        try:
+            await self.send_command(payload)
+        except Exception:
+            if pending in self._pending:
+                self._pending.remove(pending)
+            raise
+        return future
+
+    def _probe_error(self, code: str, *, probe_id: str, argv: Sequence[str], timeout_s: float, exc: Optional[BaseException] = None) -> RuntimeError:
+        state = self._proc_state()
+        if code == "probe_response_missing" and state == "running":
+            state = "timeout"
+        error: Dict[str, object] = {
+            "state": state,
+            "command": self.command(),
+            "probe_id": probe_id,
+            "argv": list(argv),
+            "probe_timeout_s": timeout_s,
+            **self._preview(),
+        }
+        if exc is not None:
+            error["error"] = f"{type(exc).__name__}: {exc}"
+        if self.probe_mismatches:
+            error["probe_mismatches"] = self.probe_mismatches[-5:]
+        self._set_last_error(code, error)
+        return RuntimeError(code, error)
+
+    async def _await_probe(
+        self,
+        future: "asyncio.Future[Tuple[Dict[str, object], int]]",
+        *,
+        probe_id: str,
+        argv: Sequence[str],
+        timeout_s: float,
+    ) -> Dict[str, object]:
+        try:
+            response, index = await asyncio.wait_for(asyncio.shield(future), max(timeout_s, 0.0))
+        except asyncio.TimeoutError:
+            self._pending = [p for p in self._pending if p.future is not future]
+            raise self._probe_error("probe_response_missing", probe_id=probe_id, argv=argv, timeout_s=timeout_s)
+        except Exception as exc:
+            raise self._probe_error(
+                "probe_response_error", probe_id=probe_id, argv=argv, timeout_s=timeout_s, exc=exc
+            ) from exc
+        # Sequential callers see the same stream position as a blocking read
+        # that stopped at this response.
+        self._cursor = max(self._cursor, index + 1)
+        return response
+
+    async def run_probe(
+        self,
+        *,
+        probe_id: str,
+        argv: Sequence[str] = (),
+        timeout_s: float = 25.0,
+        request_id: Optional[str] = None,
+    ) -> Dict[str, object]:
+        try:
+            future = await self.submit_probe(probe_id=probe_id, argv=argv, request_id=request_id)
+        except Exception as exc:
+            raise self._probe_error(
+                "probe_response_error", probe_id=probe_id, argv=argv, timeout_s=timeout_s, exc=exc
+            ) from exc
+        return await self._await_probe(future, probe_id=probe_id, argv=argv, timeout_s=timeout_s)
+
+    async def run_probes(
+        self,
+        probes: Sequence[Tuple[str, Sequence[str]]],
+        *,
+        timeout_s: float = 25.0,
+    ) -> List[Dict[str, object]]:
+        """Pipeline several probes on this session; responses come back in input order."""
+        futures = []
+        for probe_id, argv in probes:
+            futures.append(await self.submit_probe(probe_id=probe_id, argv=argv))
+        return list(
+            await asyncio.gather(
+                *(
+                    self._await_probe(future, probe_id=probe_id, argv=argv, timeout_s=timeout_s)
+                    for future, (probe_id, argv) in zip(futures, probes)
+                )
+            )
+        )
+
+    # -- shutdown ---------------------------------------------------------
+
+    async def close(self, *, timeout_s: float = 2.0) -> None:
+        if self.proc is None:
+            return
+        proc = self.proc
+        if proc.returncode is None and not self._eof:
+            try:
+                await self.send_command({"command": "close_session"})
+            except Exception:
+                pass
+        stdout_task = self._tasks[0] if self._tasks else None
+        if stdout_task is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(stdout_task), CLOSE_DRAIN_S)
+            except (asyncio.TimeoutError, Exception):
+                pass
+
+        try:
+            await asyncio.wait_for(proc.wait(), timeout_s)
+        except asyncio.TimeoutError:
+            try:
+                proc.terminate()
+            except ProcessLookupError:
+                pass
+            try:
+                await asyncio.wait_for(proc.wait(), timeout_s)
+            except asyncio.TimeoutError:
+                try:
+                    proc.kill()
+                except ProcessLookupError:
+                    pass
+                try:
+                    await asyncio.wait_for(proc.wait(), timeout_s)
+                except asyncio.TimeoutError:
+                    pass
+
+        self.exit_code = proc.returncode
+        self.closed_at_unix_s = time.time()
+        for task in self._tasks:
+            try:
+                await asyncio.wait_for(task, 1.0)
+            except (asyncio.TimeoutError, Exception):
+                task.cancel()
+        self._tasks = []
+        if proc.stdin is not None and not proc.stdin.is_closing():
+            proc.stdin.close()
+        self.proc = None
+
+    async def __aenter__(self) -> "AsyncXpcSession":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+
+async def open_async_session(*, ready_timeout_s: float = 15.0, **kwargs: Any) -> AsyncXpcSession:
+    session = AsyncXpcSession(**kwargs)
+    await session.start(ready_timeout_s=ready_timeout_s)
+    return session
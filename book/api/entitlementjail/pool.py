@@ -0,0 +1,317 @@
+"""
+Warm `xpc session` pool for multi-probe runs.
+
+`open_session` pays service launch plus readiness (up to `ready_timeout_s`)
+per call. `SessionPool` keeps ready `XpcSession`s keyed by
+(profile_id, wait_spec, ack_risk) and hands them out for `run_probe` /
+`run_probe_with_observer`:
+
+- `warm(profile_id, count=N)` starts N sessions for a key concurrently;
+- `session(...)` (context manager) returns an idle session that still passes
+  `is_running()`, starting one on a miss;
+- a session is recycled (closed, not returned to the pool) after
+  `max_probes_per_session` probes, on any probe error, or when it has a wait
+  spec (the wait barrier is one-shot per service start, so those sessions are
+  pre-warmed but used once);
+- `stats()` reports per-key hits/misses, recycles, and startup latency.
+
+All sessions share the pool's `plan_id` and `correlation_id`.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from book.api.entitlementjail.paths import REPO_ROOT
+from book.api.entitlementjail.protocol import WaitSpec, normalize_wait_spec
+from book.api.entitlementjail.session import XpcSession
+
+PoolKey = Tuple[str, Optional[str], Optional[str]]
+
+
+@dataclass
+class _KeyStats:
+    hits: int = 0
+    misses: int = 0
+    probes: int = 0
+    recycled: int = 0
+    unhealthy: int = 0
+    start_failures: int = 0
+    start_latencies_s: List[float] = field(default_factory=list)
+
+    def to_json(self) -> Dict[str, object]:
+        lat = self.start_latencies_s
+        requests = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / requests) if requests else None,
+            "probes": self.probes,
+            "recycled": self.recycled,
+            "unhealthy": self.unhealthy,
+            "start_failures": self.start_failures,
+            "starts": len(lat),
+            "start_latency_s": {
+                "mean": sum(lat) / len(lat),
+                "min": min(lat),
+                "max": max(lat),
+            }
+            if lat
+            else None,
+        }
+
+
+@dataclass
+class _Pooled:
+    session: XpcSession
+    probes: int = 0
+
+
+class SessionPool:
+    """Pre-warmed `XpcSession`s keyed by (profile_id, wait_spec, ack_risk)."""
+
+    def __init__(
+        self,
+        *,
+        plan_id: str,
+        correlation_id: Optional[str] = None,
+        max_probes_per_session: int = 50,
+        ready_timeout_s: float = 15.0,
+        xpc_timeout_ms: Optional[int] = None,
+        cwd: Path = REPO_ROOT,
+        session_factory: Callable[..., XpcSession] = XpcSession,
+    ) -> None:
+        if max_probes_per_session < 1:
+            raise ValueError("max_probes_per_session must be >= 1")
+        self.plan_id = plan_id
+        self.correlation_id = correlation_id
+        self.max_probes_per_session = max_probes_per_session
+        self.ready_timeout_s = ready_timeout_s
+        self.xpc_timeout_ms = xpc_timeout_ms
+        self.cwd = cwd
+        self.session_factory = session_factory
+        self._idle: Dict[PoolKey, List[_Pooled]] = {}
+        self._stats: Dict[PoolKey, _KeyStats] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @staticmethod
+    def key(
+        profile_id: str,
+        wait_spec: Optional[str | WaitSpec] = None,
+        ack_risk: Optional[str] = None,
+    ) -> PoolKey:
+        return (profile_id, normalize_wait_spec(wait_spec), ack_risk)
+
+    def _key_stats(self, key: PoolKey) -> _KeyStats:
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = _KeyStats()
+        return stats
+
+    def _start(self, key: PoolKey) -> _Pooled:
+        profile_id, wait_spec, ack_risk = key
+        session = self.session_factory(
+            profile_id=profile_id,
+            plan_id=self.plan_id,
+            correlation_id=self.correlation_id,
+            ack_risk=ack_risk,
+            wait_spec=wait_spec,
+            xpc_timeout_ms=self.xpc_timeout_ms,
+            cwd=self.cwd,
+        )
+        t0 = time.monotonic()
+        try:
+            session.start(ready_timeout_s=self.ready_timeout_s)
+        except Exception:
+            with self._lock:
+                self._key_stats(key).start_failures += 1
+            session.close()
+            raise
+        with self._lock:
+            self._key_stats(key).start_latencies_s.append(time.monotonic() - t0)
+        return _Pooled(session=session)
+
+    def warm(
+        self,
+        profile_id: str,
+        *,
+        wait_spec: Optional[str | WaitSpec] = None,
+        ack_risk: Optional[str] = None,
+        count: int = 1,
+    ) -> int:
+        """Start `count` sessions for the key concurrently; returns how many became ready."""
+        key = self.key(profile_id, wait_spec, ack_risk)
+        if count < 1:
+            return 0
+        started: List[_Pooled] = []
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            futures = [executor.submit(self._start, key) for _ in range(count)]
+            for future in futures:
+                try:
+                    started.append(future.result())
+                except Exception:
+                    continue
+        with self._lock:
+            if self._closed:
+                closing, started = started, []
+            else:
+                self._idle.setdefault(key, []).extend(started)
+                closing = []
+        for pooled in closing:
+            pooled.session.close()
+        return len(started)
+
+    def _checkout(self, key: PoolKey) -> _Pooled:
+        stale: List[_Pooled] = []
+        chosen: Optional[_Pooled] = None
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("session_pool_closed")
+            idle = self._idle.get(key, [])
+            stats = self._key_stats(key)
+            while idle:
+                pooled = idle.pop()
+                if pooled.session.is_running():
+                    chosen = pooled
+                    stats.hits += 1
+                    break
+                stats.unhealthy += 1
+                stale.append(pooled)
+            if chosen is None:
+                stats.misses += 1
+        for pooled in stale:
+            pooled.session.close()
+        return chosen if chosen is not None else self._start(key)
+
+    def _checkin(self, key: PoolKey, pooled: _Pooled, *, failed: bool) -> None:
+        _, wait_spec, _ = key
+        recycle = (
+            failed
+            or wait_spec is not None
+            or pooled.probes >= self.max_probes_per_session
+            or not pooled.session.is_running()
+        )
+        with self._lock:
+            stats = self._key_stats(key)
+            if not recycle and not self._closed:
+                self._idle.setdefault(key, []).append(pooled)
+                return
+            stats.recycled += 1
+        pooled.session.close()
+
+    @contextmanager
+    def session(
+        self,
+        profile_id: str,
+        *,
+        wait_spec: Optional[str | WaitSpec] = None,
+        ack_risk: Optional[str] = None,
+    ) -> Iterator[XpcSession]:
+        """
+        Borrow a ready session. It returns to the pool on clean exit and is
+        recycled when the block raises. Probes issued directly on the borrowed
+        session are not counted toward `max_probes_per_session`; use the
+        pool's `run_probe*` helpers for that.
+        """
+        key = self.key(profile_id, wait_spec, ack_risk)
+        pooled = self._checkout(key)
+        failed = False
+        try:
+            yield pooled.session
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self._checkin(key, pooled, failed=failed)
+
+    def run_probe(
+        self,
+        profile_id: str,
+        *,
+        probe_id: str,
+        argv: Sequence[str] = (),
+        timeout_s: float = 25.0,
+        wait_spec: Optional[str | WaitSpec] = None,
+        ack_risk: Optional[str] = None,
+    ) -> Dict[str, object]:
+        key = self.key(profile_id, wait_spec, ack_risk)
+        pooled = self._checkout(key)
+        failed = True
+        try:
+            response = pooled.session.run_probe(probe_id=probe_id, argv=argv, timeout_s=timeout_s)
+            failed = False
+            return response
+        finally:
+            pooled.probes += 1
+            with self._lock:
+                self._key_stats(key).probes += 1
+            self._checkin(key, pooled, failed=failed)
+
+    def run_probe_with_observer(
+        self,
+        profile_id: str,
+        *,
+        probe_id: str,
+        argv: Sequence[str] = (),
+        wait_spec: Optional[str | WaitSpec] = None,
+        ack_risk: Optional[str] = None,
+        **kwargs,
+    ) -> Dict[str, object]:
+        """`XpcSession.run_probe_with_observer` on a pooled session; a record with `probe_error` recycles it."""
+        key = self.key(profile_id, wait_spec, ack_risk)
+        pooled = self._checkout(key)
+        failed = True
+        try:
+            record = pooled.session.run_probe_with_observer(probe_id=probe_id, argv=argv, **kwargs)
+            failed = record.get("probe_error") is not None
+            return record
+        finally:
+            pooled.probes += 1
+            with self._lock:
+                self._key_stats(key).probes += 1
+            self._checkin(key, pooled, failed=failed)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            per_key = []
+            total = _KeyStats()
+            for key, stats in self._stats.items():
+                profile_id, wait_spec, ack_risk = key
+                per_key.append(
+                    {
+                        "profile_id": profile_id,
+                        "wait_spec": wait_spec,
+                        "ack_risk": ack_risk,
+                        "idle": len(self._idle.get(key, [])),
+                        **stats.to_json(),
+                    }
+                )
+                total.hits += stats.hits
+                total.misses += stats.misses
+                total.probes += stats.probes
+                total.recycled += stats.recycled
+                total.unhealthy += stats.unhealthy
+                total.start_failures += stats.start_failures
+                total.start_latencies_s.extend(stats.start_latencies_s)
+        return {"plan_id": self.plan_id, "total": total.to_json(), "keys": per_key}
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle = [pooled for entries in self._idle.values() for pooled in entries]
+            self._idle.clear()
+        for pooled in idle:
+            pooled.session.close()
+
+    def __enter__(self) -> "SessionPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
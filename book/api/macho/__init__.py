@@ -0,0 +1,42 @@
+"""
+Pure-Python Mach-O reader (segments, symbols, fileset entries, chained fixups).
+
+Replaces `otool -l` / `nm` text scraping for dyld-extracted slices; works on
+any host because it only reads the file.
+"""
+
+from __future__ import annotations
+
+from .reader import (  # noqa: F401
+    ChainedFixup,
+    ChainedImport,
+    Dysymtab,
+    FilesetEntry,
+    IndirectSymbol,
+    MachO,
+    MachOError,
+    Section,
+    Segment,
+    Symbol,
+    Symtab,
+    load_macho,
+    open_macho,
+    symbol_addresses,
+)
+
+__all__ = [
+    "ChainedFixup",
+    "ChainedImport",
+    "Dysymtab",
+    "FilesetEntry",
+    "IndirectSymbol",
+    "MachO",
+    "MachOError",
+    "Section",
+    "Segment",
+    "Symbol",
+    "Symtab",
+    "load_macho",
+    "open_macho",
+    "symbol_addresses",
+]
@@ -0,0 +1,697 @@
+"""
+mmap-backed Mach-O reader.
+
+Parses a 64-bit little-endian Mach-O image (thin, the arm64/arm64e slice of a
+fat file, or an entry inside an MH_FILESET collection) without `otool`/`nm`,
+so dyld-extracted slices can be inspected on any host. Covered load commands:
+
+- LC_SEGMENT_64 (segments + sections), indexed by name;
+- LC_SYMTAB / LC_DYSYMTAB (nlist_64 entries, indirect symbol table);
+- LC_FILESET_ENTRY (sub-images of a kernel/boot collection);
+- LC_DYLD_CHAINED_FIXUPS (imports and per-page pointer chains).
+
+The symbol name index is a dict built once per image on first lookup;
+`open_macho` caches images by (path, mtime, size) so repeated lookups across
+a run share one mapping and one index.
+
+Offsets follow the on-disk layout: segment `fileoff` and symtab offsets are
+relative to the start of the containing file (fileset entries share the
+collection's offsets), while the header itself is read at `header_offset`.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+from bisect import bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+MH_MAGIC_64 = 0xFEEDFACF
+FAT_MAGIC = 0xCAFEBABE
+FAT_MAGIC_64 = 0xCAFEBABF
+
+MH_FILESET = 0xC
+
+CPU_TYPE_ARM64 = 0x0100000C
+CPU_TYPE_X86_64 = 0x01000007
+
+LC_REQ_DYLD = 0x80000000
+LC_SYMTAB = 0x2
+LC_DYSYMTAB = 0xB
+LC_SEGMENT_64 = 0x19
+LC_UUID = 0x1B
+LC_DYLD_EXPORTS_TRIE = 0x33 | LC_REQ_DYLD
+LC_DYLD_CHAINED_FIXUPS = 0x34 | LC_REQ_DYLD
+LC_FILESET_ENTRY = 0x35 | LC_REQ_DYLD
+
+N_STAB = 0xE0
+N_TYPE = 0x0E
+N_EXT = 0x01
+N_UNDF = 0x0
+N_ABS = 0x2
+N_SECT = 0xE
+N_INDR = 0xA
+
+INDIRECT_SYMBOL_LOCAL = 0x80000000
+INDIRECT_SYMBOL_ABS = 0x40000000
+
+# Section types whose reserved1 indexes the indirect symbol table.
+S_NON_LAZY_SYMBOL_POINTERS = 0x6
+S_LAZY_SYMBOL_POINTERS = 0x7
+S_SYMBOL_STUBS = 0x8
+S_LAZY_DYLIB_SYMBOL_POINTERS = 0x10
+SECTION_TYPE = 0xFF
+
+DYLD_CHAINED_PTR_ARM64E = 1
+DYLD_CHAINED_PTR_64 = 2
+DYLD_CHAINED_PTR_64_OFFSET = 6
+DYLD_CHAINED_PTR_64_KERNEL_CACHE = 8
+DYLD_CHAINED_PTR_ARM64E_USERLAND = 9
+DYLD_CHAINED_PTR_ARM64E_USERLAND24 = 12
+DYLD_CHAINED_PTR_START_NONE = 0xFFFF
+DYLD_CHAINED_PTR_START_MULTI = 0x8000
+DYLD_CHAINED_PTR_START_LAST = 0x8000
+
+DYLD_CHAINED_IMPORT = 1
+DYLD_CHAINED_IMPORT_ADDEND = 2
+DYLD_CHAINED_IMPORT_ADDEND64 = 3
+
+_ARM64E_FORMATS = {
+    DYLD_CHAINED_PTR_ARM64E,
+    DYLD_CHAINED_PTR_ARM64E_USERLAND,
+    DYLD_CHAINED_PTR_ARM64E_USERLAND24,
+}
+_PTR64_FORMATS = {DYLD_CHAINED_PTR_64, DYLD_CHAINED_PTR_64_OFFSET, DYLD_CHAINED_PTR_64_KERNEL_CACHE}
+# Formats whose rebase target is an offset from the image's preferred base.
+_VMOFFSET_FORMATS = {
+    DYLD_CHAINED_PTR_64_OFFSET,
+    DYLD_CHAINED_PTR_ARM64E_USERLAND,
+    DYLD_CHAINED_PTR_ARM64E_USERLAND24,
+}
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+class MachOError(ValueError):
+    """Raised for truncated, foreign, or unsupported Mach-O input."""
+
+
+@dataclass(frozen=True)
+class Section:
+    segname: str
+    sectname: str
+    addr: int
+    size: int
+    offset: int
+    align: int
+    flags: int
+    reserved1: int
+    reserved2: int
+
+    @property
+    def section_type(self) -> int:
+        return self.flags & SECTION_TYPE
+
+
+@dataclass(frozen=True)
+class Segment:
+    name: str
+    vmaddr: int
+    vmsize: int
+    fileoff: int
+    filesize: int
+    maxprot: int
+    initprot: int
+    flags: int
+    sections: Tuple[Section, ...] = ()
+
+    def contains_vm(self, vmaddr: int) -> bool:
+        return self.vmaddr <= vmaddr < self.vmaddr + self.vmsize
+
+
+@dataclass(frozen=True)
+class Symbol:
+    name: str
+    value: int
+    n_type: int
+    n_sect: int
+    n_desc: int
+    index: int
+
+    @property
+    def is_stab(self) -> bool:
+        return bool(self.n_type & N_STAB)
+
+    @property
+    def is_external(self) -> bool:
+        return bool(self.n_type & N_EXT)
+
+    @property
+    def is_undefined(self) -> bool:
+        return not self.is_stab and (self.n_type & N_TYPE) == N_UNDF
+
+    @property
+    def is_defined(self) -> bool:
+        return not self.is_stab and (self.n_type & N_TYPE) in (N_ABS, N_SECT, N_INDR)
+
+
+@dataclass(frozen=True)
+class Symtab:
+    symoff: int
+    nsyms: int
+    stroff: int
+    strsize: int
+
+
+@dataclass(frozen=True)
+class Dysymtab:
+    ilocalsym: int
+    nlocalsym: int
+    iextdefsym: int
+    nextdefsym: int
+    iundefsym: int
+    nundefsym: int
+    indirectsymoff: int
+    nindirectsyms: int
+
+
+@dataclass(frozen=True)
+class FilesetEntry:
+    entry_id: str
+    vmaddr: int
+    fileoff: int
+
+
+@dataclass(frozen=True)
+class ChainedImport:
+    lib_ordinal: int
+    weak: bool
+    name: str
+    addend: int
+
+
+@dataclass(frozen=True)
+class ChainedFixup:
+    """
+    One pointer in a chain; `target` is a vmaddr for rebases, `None` for binds.
+
+    Kernel-cache pointers into another collection (`cache_level` > 0) keep the
+    raw offset into that collection as `target`. `diversity`/`addr_div`/`key`
+    are the pointer-auth bits of authenticated pointers.
+    """
+
+    fileoff: int
+    vmaddr: int
+    pointer_format: int
+    is_bind: bool
+    is_auth: bool
+    target: Optional[int] = None
+    ordinal: Optional[int] = None
+    addend: int = 0
+    cache_level: int = 0
+    diversity: int = 0
+    addr_div: bool = False
+    key: int = 0
+
+
+@dataclass(frozen=True)
+class IndirectSymbol:
+    section: str
+    vmaddr: int
+    symbol_index: int
+    name: Optional[str]
+
+
+class MachO:
+    """One Mach-O image over a shared buffer (typically an `mmap`)."""
+
+    def __init__(
+        self,
+        data: Buffer,
+        *,
+        header_offset: int = 0,
+        path: Optional[Path] = None,
+        collection_base: Optional[int] = None,
+    ) -> None:
+        self.data = data
+        self.header_offset = header_offset
+        self.path = path
+        # Kernel-cache fixup targets are offsets from the collection, not the entry.
+        self.collection_base = collection_base
+        self.segments: List[Segment] = []
+        self.symtab: Optional[Symtab] = None
+        self.dysymtab: Optional[Dysymtab] = None
+        self.uuid: Optional[str] = None
+        self.fileset_entries: List[FilesetEntry] = []
+        self.chained_fixups_range: Optional[Tuple[int, int]] = None
+        self.exports_trie_range: Optional[Tuple[int, int]] = None
+        self.load_commands: List[Tuple[int, int, int]] = []
+        self._segments_by_name: Dict[str, Segment] = {}
+        self._sections_by_name: Dict[Tuple[str, str], Section] = {}
+        self._vm_starts: List[int] = []
+        self._vm_sorted: List[Segment] = []
+        self._symbols: Optional[List[Symbol]] = None
+        self._by_name: Optional[Dict[str, Symbol]] = None
+        self._parse_header()
+
+    # -- header / load commands -------------------------------------------
+
+    def _unpack(self, fmt: str, offset: int) -> Tuple[int, ...]:
+        try:
+            return struct.unpack_from(fmt, self.data, offset)
+        except struct.error as exc:
+            raise MachOError(f"truncated Mach-O at offset {offset:#x}") from exc
+
+    def _cstring(self, offset: int, limit: Optional[int] = None) -> str:
+        stop = min(limit, len(self.data)) if limit is not None else len(self.data)
+        out = bytearray()
+        while offset < stop:
+            chunk = bytes(self.data[offset : min(offset + 256, stop)])
+            nul = chunk.find(b"\x00")
+            if nul != -1:
+                out += chunk[:nul]
+                break
+            out += chunk
+            offset += len(chunk)
+        return out.decode("utf-8", errors="replace")
+
+    def _parse_header(self) -> None:
+        base = self.header_offset
+        magic, cputype, cpusubtype, filetype, ncmds, sizeofcmds, flags, _ = self._unpack("<8I", base)
+        if magic != MH_MAGIC_64:
+            raise MachOError(f"not a 64-bit little-endian Mach-O (magic {magic:#x})")
+        self.cputype = cputype
+        self.cpusubtype = cpusubtype
+        self.filetype = filetype
+        self.flags = flags
+        off = base + 32
+        end = off + sizeofcmds
+        for _ in range(ncmds):
+            cmd, cmdsize = self._unpack("<2I", off)
+            if cmdsize < 8 or off + cmdsize > end:
+                raise MachOError(f"bad load command size {cmdsize} at {off:#x}")
+            self.load_commands.append((cmd, off, cmdsize))
+            if cmd == LC_SEGMENT_64:
+                self._parse_segment(off)
+            elif cmd == LC_SYMTAB:
+                self.symtab = Symtab(*self._unpack("<4I", off + 8))
+            elif cmd == LC_DYSYMTAB:
+                fields = self._unpack("<18I", off + 8)
+                self.dysymtab = Dysymtab(
+                    ilocalsym=fields[0],
+                    nlocalsym=fields[1],
+                    iextdefsym=fields[2],
+                    nextdefsym=fields[3],
+                    iundefsym=fields[4],
+                    nundefsym=fields[5],
+                    indirectsymoff=fields[12],
+                    nindirectsyms=fields[13],
+                )
+            elif cmd == LC_UUID:
+                raw = bytes(self.data[off + 8 : off + 24])
+                self.uuid = "-".join((raw[:4].hex(), raw[4:6].hex(), raw[6:8].hex(), raw[8:10].hex(), raw[10:].hex())).upper()
+            elif cmd == LC_FILESET_ENTRY:
+                vmaddr, fileoff, name_off = self._unpack("<QQI", off + 8)
+                self.fileset_entries.append(
+                    FilesetEntry(entry_id=self._cstring(off + name_off, off + cmdsize), vmaddr=vmaddr, fileoff=fileoff)
+                )
+            elif cmd == LC_DYLD_CHAINED_FIXUPS:
+                self.chained_fixups_range = self._unpack("<2I", off + 8)
+            elif cmd == LC_DYLD_EXPORTS_TRIE:
+                self.exports_trie_range = self._unpack("<2I", off + 8)
+            off += cmdsize
+        self._vm_sorted = sorted((s for s in self.segments if s.vmsize), key=lambda s: s.vmaddr)
+        self._vm_starts = [s.vmaddr for s in self._vm_sorted]
+
+    def _parse_segment(self, off: int) -> None:
+        segname = bytes(self.data[off + 8 : off + 24]).rstrip(b"\x00").decode("ascii", errors="replace")
+        vmaddr, vmsize, fileoff, filesize, maxprot, initprot, nsects, flags = self._unpack("<4Q4I", off + 24)
+        sections: List[Section] = []
+        sect_off = off + 72
+        for _ in range(nsects):
+            sectname = bytes(self.data[sect_off : sect_off + 16]).rstrip(b"\x00").decode("ascii", errors="replace")
+            sect_seg = bytes(self.data[sect_off + 16 : sect_off + 32]).rstrip(b"\x00").decode("ascii", errors="replace")
+            addr, size, offset, align, _reloff, _nreloc, sflags, r1, r2, _r3 = self._unpack("<2Q8I", sect_off + 32)
+            section = Section(sect_seg, sectname, addr, size, offset, align, sflags, r1, r2)
+            sections.append(section)
+            self._sections_by_name.setdefault((sect_seg, sectname), section)
+            sect_off += 80
+        segment = Segment(segname, vmaddr, vmsize, fileoff, filesize, maxprot, initprot, flags, tuple(sections))
+        self.segments.append(segment)
+        self._segments_by_name.setdefault(segname, segment)
+
+    # -- segments / address translation ------------------------------------
+
+    def segment(self, name: str) -> Optional[Segment]:
+        return self._segments_by_name.get(name)
+
+    def section(self, segname: str, sectname: str) -> Optional[Section]:
+        return self._sections_by_name.get((segname, sectname))
+
+    def sections(self) -> Iterator[Section]:
+        for seg in self.segments:
+            yield from seg.sections
+
+    def segment_for_vm(self, vmaddr: int) -> Optional[Segment]:
+        idx = bisect_right(self._vm_starts, vmaddr) - 1
+        if idx >= 0 and self._vm_sorted[idx].contains_vm(vmaddr):
+            return self._vm_sorted[idx]
+        return None
+
+    def vm_to_file(self, vmaddr: int) -> int:
+        seg = self.segment_for_vm(vmaddr)
+        if seg is None:
+            raise MachOError(f"vmaddr {vmaddr:#x} not mapped to any segment")
+        delta = vmaddr - seg.vmaddr
+        if delta >= seg.filesize:
+            raise MachOError(f"vmaddr {vmaddr:#x} lies in zero-fill part of {seg.name}")
+        return seg.fileoff + delta
+
+    def file_to_vm(self, fileoff: int) -> int:
+        for seg in self.segments:
+            if seg.filesize and seg.fileoff <= fileoff < seg.fileoff + seg.filesize:
+                return seg.vmaddr + (fileoff - seg.fileoff)
+        raise MachOError(f"file offset {fileoff:#x} not covered by any segment")
+
+    def read(self, vmaddr: int, size: int) -> bytes:
+        off = self.vm_to_file(vmaddr)
+        return bytes(self.data[off : off + size])
+
+    def read_u64(self, vmaddr: int) -> int:
+        return self._unpack("<Q", self.vm_to_file(vmaddr))[0]
+
+    def read_cstring(self, vmaddr: int) -> str:
+        return self._cstring(self.vm_to_file(vmaddr))
+
+    @property
+    def preferred_base(self) -> int:
+        text = self.segment("__TEXT")
+        return text.vmaddr if text is not None else 0
+
+    # -- symbols ------------------------------------------------------------
+
+    @property
+    def symbols(self) -> List[Symbol]:
+        if self._symbols is None:
+            self._symbols = list(self._iter_nlist())
+        return self._symbols
+
+    def _iter_nlist(self) -> Iterator[Symbol]:
+        st = self.symtab
+        if st is None or st.nsyms == 0:
+            return
+        str_end = st.stroff + st.strsize
+        if st.symoff + st.nsyms * 16 > len(self.data) or str_end > len(self.data):
+            raise MachOError("symbol table extends past end of file")
+        strtab = bytes(self.data[st.stroff : str_end])
+        for idx, (strx, n_type, n_sect, n_desc, value) in enumerate(
+            struct.iter_unpack("<IBBHQ", self.data[st.symoff : st.symoff + st.nsyms * 16])
+        ):
+            name = ""
+            if 0 < strx < len(strtab):
+                end = strtab.find(b"\x00", strx)
+                name = strtab[strx : end if end != -1 else len(strtab)].decode("utf-8", errors="replace")
+            yield Symbol(name, value, n_type, n_sect, n_desc, idx)
+
+    @property
+    def symbol_index(self) -> Dict[str, Symbol]:
+        """Name → symbol; a defined non-stab entry wins over stabs and undefined references."""
+        if self._by_name is None:
+            index: Dict[str, Symbol] = {}
+            for sym in self.symbols:
+                if not sym.name or sym.is_stab:
+                    continue
+                current = index.get(sym.name)
+                if current is None or (sym.is_defined and not current.is_defined):
+                    index[sym.name] = sym
+            self._by_name = index
+        return self._by_name
+
+    def symbol(self, name: str) -> Optional[Symbol]:
+        return self.symbol_index.get(name)
+
+    def symbol_address(self, name: str) -> Optional[int]:
+        sym = self.symbol_index.get(name)
+        return sym.value if sym is not None and sym.is_defined else None
+
+    def defined_symbols(self) -> Dict[str, int]:
+        return {name: sym.value for name, sym in self.symbol_index.items() if sym.is_defined}
+
+    def indirect_symbols(self) -> List[IndirectSymbol]:
+        """Indirect symbol table entries attributed to their stub/pointer sections."""
+        dy = self.dysymtab
+        if dy is None or dy.nindirectsyms == 0:
+            return []
+        table = [v for (v,) in struct.iter_unpack("<I", self.data[dy.indirectsymoff : dy.indirectsymoff + dy.nindirectsyms * 4])]
+        symbols = self.symbols
+        out: List[IndirectSymbol] = []
+        for sect in self.sections():
+            kind = sect.section_type
+            if kind == S_SYMBOL_STUBS:
+                stride = sect.reserved2
+            elif kind in (S_NON_LAZY_SYMBOL_POINTERS, S_LAZY_SYMBOL_POINTERS, S_LAZY_DYLIB_SYMBOL_POINTERS):
+                stride = 8
+            else:
+                continue
+            if not stride:
+                continue
+            label = f"{sect.segname},{sect.sectname}"
+            for i in range(sect.size // stride):
+                slot = sect.reserved1 + i
+                if slot >= len(table):
+                    break
+                sym_idx = table[slot]
+                name = None
+                if not sym_idx & (INDIRECT_SYMBOL_LOCAL | INDIRECT_SYMBOL_ABS) and sym_idx < len(symbols):
+                    name = symbols[sym_idx].name
+                out.append(IndirectSymbol(label, sect.addr + i * stride, sym_idx, name))
+        return out
+
+    # -- fileset entries ----------------------------------------------------
+
+    def fileset_entry(self, entry_id: str) -> "MachO":
+        for entry in self.fileset_entries:
+            if entry.entry_id == entry_id:
+                return MachO(self.data, header_offset=entry.fileoff, path=self.path, collection_base=self.preferred_base)
+        raise KeyError(entry_id)
+
+    # -- chained fixups -----------------------------------------------------
+
+    def _fixups_header(self) -> Optional[Tuple[int, int, int, int, int, int, int]]:
+        if self.chained_fixups_range is None:
+            return None
+        dataoff, datasize = self.chained_fixups_range
+        if datasize < 28:
+            return None
+        return (dataoff,) + self._unpack("<6I", dataoff + 4)[:6]
+
+    def chained_imports(self) -> List[ChainedImport]:
+        header = self._fixups_header()
+        if header is None:
+            return []
+        base, starts_offset, imports_offset, symbols_offset, imports_count, imports_format, _ = header
+        imports: List[ChainedImport] = []
+        off = base + imports_offset
+        sym_base = base + symbols_offset
+        for _ in range(imports_count):
+            if imports_format == DYLD_CHAINED_IMPORT:
+                (raw,) = self._unpack("<I", off)
+                ordinal, weak, name_off, addend = raw & 0xFF, (raw >> 8) & 1, raw >> 9, 0
+                off += 4
+            elif imports_format == DYLD_CHAINED_IMPORT_ADDEND:
+                raw, addend = self._unpack("<Ii", off)
+                ordinal, weak, name_off = raw & 0xFF, (raw >> 8) & 1, raw >> 9
+                off += 8
+            elif imports_format == DYLD_CHAINED_IMPORT_ADDEND64:
+                raw, addend = self._unpack("<QQ", off)
+                ordinal, weak, name_off = raw & 0xFFFF, (raw >> 16) & 1, raw >> 32
+                off += 16
+            else:
+                raise MachOError(f"unsupported chained imports format {imports_format}")
+            # Special ordinals (self/main/flat/weak lookup) are small negatives.
+            width = 16 if imports_format == DYLD_CHAINED_IMPORT_ADDEND64 else 8
+            if ordinal > (1 << width) - 16:
+                ordinal -= 1 << width
+            imports.append(ChainedImport(ordinal, bool(weak), self._cstring(sym_base + name_off), addend))
+        return imports
+
+    def iter_chained_fixups(self) -> Iterator[ChainedFixup]:
+        """
+        Walk every pointer chain in LC_DYLD_CHAINED_FIXUPS (64-bit formats).
+        A DYLD_CHAINED_PTR_START_MULTI page starts several chains, listed in the
+        overflow entries after page_start[page_count].
+        """
+        header = self._fixups_header()
+        if header is None:
+            return
+        base, starts_offset = header[0], header[1]
+        starts = base + starts_offset
+        (seg_count,) = self._unpack("<I", starts)
+        seg_info_offsets = self._unpack(f"<{seg_count}I", starts + 4)
+        for seg_index, info_off in enumerate(seg_info_offsets):
+            if info_off == 0 or seg_index >= len(self.segments):
+                continue
+            info = starts + info_off
+            size, page_size, pointer_format, segment_offset, _max_valid, page_count = self._unpack("<IHHQIH", info)
+            # `size` covers page_start[page_count] and the overflow list after it.
+            page_starts = self._unpack(f"<{max(page_count, (size - 22) // 2)}H", info + 22)
+            segment = self.segments[seg_index]
+            for page_index, page_start in enumerate(page_starts[:page_count]):
+                if page_start == DYLD_CHAINED_PTR_START_NONE:
+                    continue
+                # segment_offset is relative to the image base, not the segment.
+                page_vmaddr = self.preferred_base + segment_offset + page_index * page_size
+                for chain_start in self._chain_starts(page_starts, page_start):
+                    yield from self._walk_chain(segment, page_vmaddr + chain_start - segment.vmaddr, pointer_format)
+
+    @staticmethod
+    def _chain_starts(page_starts: Sequence[int], page_start: int) -> List[int]:
+        if not page_start & DYLD_CHAINED_PTR_START_MULTI:
+            return [page_start]
+        starts: List[int] = []
+        for value in page_starts[page_start & ~DYLD_CHAINED_PTR_START_MULTI :]:
+            starts.append(value & ~DYLD_CHAINED_PTR_START_LAST)
+            if value & DYLD_CHAINED_PTR_START_LAST:
+                return starts
+        raise MachOError("multi-start chain list runs past its segment info")
+
+    def _walk_chain(self, segment: Segment, seg_rel: int, pointer_format: int) -> Iterator[ChainedFixup]:
+        if pointer_format in _ARM64E_FORMATS:
+            stride = 8
+        elif pointer_format in _PTR64_FORMATS:
+            stride = 4
+        else:
+            raise MachOError(f"unsupported chained pointer format {pointer_format}")
+        image_base = self.preferred_base
+        collection_base = image_base if self.collection_base is None else self.collection_base
+        while True:
+            fileoff = segment.fileoff + seg_rel
+            (raw,) = self._unpack("<Q", fileoff)
+            vmaddr = segment.vmaddr + seg_rel
+            if pointer_format in _ARM64E_FORMATS:
+                fixup, nxt = self._decode_arm64e(raw, fileoff, vmaddr, pointer_format, image_base)
+            elif pointer_format == DYLD_CHAINED_PTR_64_KERNEL_CACHE:
+                fixup, nxt = self._decode_kernel_cache(raw, fileoff, vmaddr, collection_base)
+            else:
+                fixup, nxt = self._decode_ptr64(raw, fileoff, vmaddr, pointer_format, image_base)
+            yield fixup
+            if nxt == 0:
+                return
+            seg_rel += nxt * stride
+
+    @staticmethod
+    def _decode_arm64e(raw: int, fileoff: int, vmaddr: int, fmt: int, image_base: int) -> Tuple[ChainedFixup, int]:
+        is_auth = bool(raw >> 63)
+        is_bind = bool((raw >> 62) & 1)
+        nxt = (raw >> 51) & 0x7FF
+        ordinal_bits = 24 if fmt == DYLD_CHAINED_PTR_ARM64E_USERLAND24 else 16
+        if is_bind:
+            ordinal = raw & ((1 << ordinal_bits) - 1)
+            addend = 0
+            if not is_auth:
+                addend = (raw >> 32) & 0x7FFFF
+                if addend & 0x40000:
+                    addend -= 0x80000
+            return ChainedFixup(fileoff, vmaddr, fmt, True, is_auth, ordinal=ordinal, addend=addend), nxt
+        if is_auth:
+            target = (raw & 0xFFFFFFFF) + image_base
+            diversity, addr_div, key = (raw >> 32) & 0xFFFF, bool((raw >> 48) & 1), (raw >> 49) & 0x3
+            return (
+                ChainedFixup(
+                    fileoff, vmaddr, fmt, False, True, target=target, diversity=diversity, addr_div=addr_div, key=key
+                ),
+                nxt,
+            )
+        target = (raw & 0x7FFFFFFFFFF) | (((raw >> 43) & 0xFF) << 56)
+        if fmt in _VMOFFSET_FORMATS:
+            target += image_base
+        return ChainedFixup(fileoff, vmaddr, fmt, False, False, target=target), nxt
+
+    @staticmethod
+    def _decode_kernel_cache(raw: int, fileoff: int, vmaddr: int, collection_base: int) -> Tuple[ChainedFixup, int]:
+        # Rebases only: 30-bit offset into the collection at `cache_level`.
+        cache_level = (raw >> 30) & 0x3
+        target = raw & 0x3FFFFFFF
+        if cache_level == 0:
+            target += collection_base
+        return (
+            ChainedFixup(
+                fileoff,
+                vmaddr,
+                DYLD_CHAINED_PTR_64_KERNEL_CACHE,
+                False,
+                bool(raw >> 63),
+                target=target,
+                cache_level=cache_level,
+                diversity=(raw >> 32) & 0xFFFF,
+                addr_div=bool((raw >> 48) & 1),
+                key=(raw >> 49) & 0x3,
+            ),
+            (raw >> 51) & 0xFFF,
+        )
+
+    @staticmethod
+    def _decode_ptr64(raw: int, fileoff: int, vmaddr: int, fmt: int, image_base: int) -> Tuple[ChainedFixup, int]:
+        is_bind = bool(raw >> 63)
+        nxt = (raw >> 51) & 0xFFF
+        if is_bind:
+            ordinal = raw & 0xFFFFFF
+            addend = (raw >> 24) & 0xFF
+            return ChainedFixup(fileoff, vmaddr, fmt, True, False, ordinal=ordinal, addend=addend), nxt
+        target = (raw & 0xFFFFFFFFF) | (((raw >> 36) & 0xFF) << 56)
+        if fmt in _VMOFFSET_FORMATS:
+            target += image_base
+        return ChainedFixup(fileoff, vmaddr, fmt, False, False, target=target), nxt
+
+
+def _thin_offset(data: Buffer, arch: Optional[int]) -> Tuple[int, int]:
+    """(offset, size) of the Mach-O to read; selects a slice from fat files."""
+    if len(data) < 4:
+        raise MachOError("file too small for a Mach-O header")
+    (magic,) = struct.unpack_from(">I", data, 0)
+    if magic not in (FAT_MAGIC, FAT_MAGIC_64):
+        return 0, len(data)
+    (nfat,) = struct.unpack_from(">I", data, 4)
+    slices: List[Tuple[int, int, int]] = []
+    for i in range(nfat):
+        if magic == FAT_MAGIC:
+            cputype, _sub, offset, size, _align = struct.unpack_from(">5I", data, 8 + i * 20)
+        else:
+            cputype, _sub, offset, size, _align, _res = struct.unpack_from(">2I2Q2I", data, 8 + i * 32)
+        slices.append((cputype, offset, size))
+    wanted = arch if arch is not None else CPU_TYPE_ARM64
+    for cputype, offset, size in slices:
+        if cputype == wanted:
+            return offset, size
+    raise MachOError(f"no slice for cputype {wanted:#x} in fat file")
+
+
+def load_macho(path: Path, *, arch: Optional[int] = None) -> MachO:
+    """Map `path` read-only and parse it (uncached; see `open_macho`)."""
+    with path.open("rb") as fh:
+        data = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    offset, size = _thin_offset(data, arch)
+    if offset:
+        # Offsets inside a fat slice are relative to the slice start.
+        return MachO(memoryview(data)[offset : offset + size], path=path)
+    return MachO(data, path=path)
+
+
+@lru_cache(maxsize=32)
+def _cached(path: str, mtime_ns: int, size: int, arch: Optional[int]) -> MachO:
+    return load_macho(Path(path), arch=arch)
+
+
+def open_macho(path: Path | str, *, arch: Optional[int] = None) -> MachO:
+    """Cached `load_macho`, keyed by resolved path, mtime, and size."""
+    resolved = Path(path).resolve()
+    st = resolved.stat()
+    return _cached(str(resolved), st.st_mtime_ns, st.st_size, arch)
+
+
+def symbol_addresses(path: Path | str, names: Sequence[str]) -> Dict[str, Optional[int]]:
+    image = open_macho(path)
+    return {name: image.symbol_address(name) for name in names}
@@ -15,14 +15,17 @@ Preferred imports:
 from __future__ import annotations
 
 # Submodules are the preferred import surface.
+from . import bench as bench  # noqa: F401
 from . import cli as cli  # noqa: F401
 from . import compile as compile  # noqa: F401
+from . import decode_cache as decode_cache  # noqa: F401
 from . import decoder as decoder  # noqa: F401
 from . import digests as digests  # noqa: F401
 from . import ingestion as ingestion  # noqa: F401
 from . import identity as identity  # noqa: F401
 from . import inspect as inspect  # noqa: F401
 from . import libsandbox as libsandbox  # noqa: F401
+from . import mapping_context as mapping_context  # noqa: F401
 from . import op_table as op_table  # noqa: F401
 from . import oracles as oracles  # noqa: F401
 from . import sbpl_scan as sbpl_scan  # noqa: F401
@@ -34,6 +37,7 @@ from .digests import canonical_system_profile_blobs, digest_compiled_blob_path,
 from .ingestion import (  # noqa: F401
     Header,
     ProfileBlob,
+    ProfileView,
     SectionOffsets,
     Sections,
     parse_header,
@@ -45,12 +49,14 @@ __all__ = [
     # modules
     "cli",
     "compile",
+    "decode_cache",
     "decoder",
     "digests",
     "ingestion",
     "identity",
     "inspect",
     "libsandbox",
+    "mapping_context",
     "op_table",
     "oracles",
     "sbpl_scan",
@@ -65,6 +71,7 @@ __all__ = [
     "decode_profile_dict",
     # ingestion
     "ProfileBlob",
+    "ProfileView",
     "Header",
     "SectionOffsets",
     "Sections",
@@ -0,0 +1,396 @@
+"""
+Microbenchmarks for the profile_tools decode/digest pipeline (Sonoma baseline).
+
+Covers the hot paths that validation runs lean on:
+- `decoder.decode_profile`,
+- `ingestion.slice_sections_with_offsets`,
+- `op_table.entry_signature` (every op-table entry of a pre-decoded blob),
+- `digests.digest_named_blobs` (with the decode cache disabled).
+
+Each function is measured over four corpora: the canonical system blobs
+(`airlock`, `bsd`, `sample`), the golden corpus, and synthetic scaled-up blobs
+(the largest canonical blob with its node region repeated `scale` times). One
+"op" is one pass over a corpus. Everything works on bytes only, so the suite
+runs offline on Linux without libsandbox.
+
+Per case the suite records:
+- `ops_per_sec` / `mean_s` / `min_s` from a perf_counter timing loop,
+- `alloc_peak_bytes`: tracemalloc peak during one extra traced op,
+- `alloc_blocks`: tracemalloc blocks still live after that op (retained by the
+  result or by caches),
+- `peak_rss_bytes`: `ru_maxrss` of the process that ran the case; cases run in
+  a forked child by default so one case's high-water mark never leaks into the
+  next.
+
+`compare_results` diffs two result documents and flags any metric that moved
+the wrong way by more than a relative threshold. pytest-benchmark is not a
+dependency; `Benchmark` mirrors its `benchmark(func, *args)` calling shape so
+cases read the same way in tests.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence
+
+from book.api.path_utils import find_repo_root, to_repo_relative
+
+from . import decode_cache
+from . import decoder
+from . import digests
+from . import ingestion
+from . import op_table
+from .mapping_context import MappingContext, default_mapping_context
+
+SCHEMA_VERSION = "profile-tools.bench.v0.1"
+DEFAULT_SCALES = (8, 64)
+DEFAULT_THRESHOLD = 0.25
+GOLDEN_MANIFEST = "book/graph/concepts/validation/golden_corpus/corpus_manifest.json"
+
+# metric -> True when larger is better.
+METRICS: Dict[str, bool] = {
+    "ops_per_sec": True,
+    "alloc_peak_bytes": False,
+    "alloc_blocks": False,
+    "peak_rss_bytes": False,
+}
+
+
+@dataclass
+class Benchmark:
+    """
+    Callable timer with the pytest-benchmark calling shape.
+
+    `bench(func, *args, **kwargs)` runs `warmup` untimed calls, then timed calls
+    until both `min_rounds` and `min_time` are reached (or `max_rounds`), then
+    one traced call for allocation figures. It returns the last result and
+    leaves the measurements in `stats`.
+    """
+
+    min_time: float = 0.5
+    min_rounds: int = 3
+    max_rounds: int = 100_000
+    warmup: int = 1
+    trace_allocations: bool = True
+    stats: Dict[str, Any] = field(default_factory=dict)
+
+    def __call__(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        result = None
+        for _ in range(self.warmup):
+            result = func(*args, **kwargs)
+        times: List[float] = []
+        total = 0.0
+        while len(times) < self.max_rounds and (len(times) < self.min_rounds or total < self.min_time):
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+            times.append(elapsed)
+            total += elapsed
+        stats: Dict[str, Any] = {
+            "rounds": len(times),
+            "mean_s": total / len(times) if times else None,
+            "min_s": min(times) if times else None,
+            "ops_per_sec": (len(times) / total) if total else None,
+        }
+        if self.trace_allocations:
+            result = None  # let the previous result go before tracing
+            tracemalloc.start()
+            try:
+                result = func(*args, **kwargs)
+                _current, peak = tracemalloc.get_traced_memory()
+                blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+            finally:
+                tracemalloc.stop()
+            stats["alloc_peak_bytes"] = peak
+            stats["alloc_blocks"] = blocks
+        stats["peak_rss_bytes"] = peak_rss_bytes()
+        self.stats = stats
+        return result
+
+
+def peak_rss_bytes() -> int:
+    """Process high-water RSS in bytes (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return int(maxrss if sys.platform == "darwin" else maxrss * 1024)
+
+
+@dataclass(frozen=True)
+class BenchCase:
+    """One function over one corpus; `func()` performs a single op."""
+
+    name: str
+    target: str
+    corpus: str
+    blobs: int
+    bytes: int
+    func: Callable[[], Any]
+
+
+@contextlib.contextmanager
+def decode_cache_disabled() -> Iterator[None]:
+    """Bypass the on-disk decode cache so digests measure the decoder itself."""
+    previous = os.environ.get(decode_cache.CACHE_ENV)
+    os.environ[decode_cache.CACHE_ENV] = "off"
+    try:
+        yield
+    finally:
+        if previous is None:
+            os.environ.pop(decode_cache.CACHE_ENV, None)
+        else:
+            os.environ[decode_cache.CACHE_ENV] = previous
+
+
+def scale_blob(data: bytes, scale: int) -> bytes:
+    """
+    Return `data` with its node region repeated `scale` times.
+
+    The preamble, op table, and literal pool are kept as-is, so op-table
+    entries still land in the first copy of the node stream and the decoder
+    sees a realistic (just longer) tag mix.
+    """
+    if scale <= 1:
+        return data
+    view = ingestion.ProfileView(data)
+    if view.is_legacy:
+        raise ValueError("scale_blob expects a modern graph-based blob")
+    nodes = bytes(view.nodes)
+    return data[: view.nodes_start] + nodes * scale + data[view.nodes_end :]
+
+
+def golden_blobs(root: Path) -> Dict[str, Path]:
+    manifest = root / GOLDEN_MANIFEST
+    if not manifest.exists():
+        return {}
+    out: Dict[str, Path] = {}
+    for entry in json.loads(manifest.read_text()).get("entries", []):
+        path = root / entry["compiled_path"]
+        if path.exists():
+            out[str(entry["id"])] = path
+    return out
+
+
+def bench_corpora(
+    root: Path, workdir: Path, *, golden: bool = True, scales: Sequence[int] = DEFAULT_SCALES
+) -> Dict[str, Dict[str, Path]]:
+    """
+    Map corpus name -> {blob name: path}.
+
+    Synthetic blobs are derived from the largest canonical blob and written to
+    `workdir` so every target (including path-based digests) can read them.
+    """
+    canonical = {name: path for name, path in digests.canonical_system_profile_blobs(root).items() if path.exists()}
+    corpora: Dict[str, Dict[str, Path]] = {"canonical": canonical}
+    if golden:
+        corpora["golden"] = golden_blobs(root)
+    if canonical and scales:
+        base_name, base_path = max(canonical.items(), key=lambda item: item[1].stat().st_size)
+        base = base_path.read_bytes()
+        for scale in scales:
+            path = workdir / f"{base_name}.x{scale}.sb.bin"
+            path.write_bytes(scale_blob(base, scale))
+            corpora[f"synthetic-x{scale}"] = {f"{base_name}.x{scale}": path}
+    return {name: blobs for name, blobs in corpora.items() if blobs}
+
+
+def _decode_target(blobs: List[bytes], mappings: MappingContext) -> Callable[[], Any]:
+    def run() -> Any:
+        return [decoder.decode_profile(data, mappings=mappings) for data in blobs]
+
+    return run
+
+
+def _slice_target(blobs: List[bytes]) -> Callable[[], Any]:
+    profiles = [ingestion.ProfileBlob(bytes=data, source="") for data in blobs]
+
+    def run() -> Any:
+        return [ingestion.slice_sections_with_offsets(blob, ingestion.parse_header(blob)) for blob in profiles]
+
+    return run
+
+
+def _entry_signature_target(blobs: List[bytes], mappings: MappingContext) -> Callable[[], Any]:
+    decoded = [decoder.decode_profile_dict(data, mappings=mappings) for data in blobs]
+    work = [(d, sorted(set(d.get("op_table") or []))) for d in decoded]
+
+    def run() -> Any:
+        return [[op_table.entry_signature(d, entry) for entry in entries] for d, entries in work]
+
+    return run
+
+
+def _digest_target(paths: Mapping[str, Path], root: Path, mappings: MappingContext) -> Callable[[], Any]:
+    def run() -> Any:
+        with decode_cache_disabled():
+            return digests.digest_named_blobs(paths, repo_root=root, mappings=mappings)
+
+    return run
+
+
+TARGETS = ("decode_profile", "slice_sections_with_offsets", "entry_signature", "digest_named_blobs")
+
+
+def build_cases(
+    corpora: Mapping[str, Mapping[str, Path]],
+    *,
+    root: Optional[Path] = None,
+    mappings: Optional[MappingContext] = None,
+    targets: Sequence[str] = TARGETS,
+) -> List[BenchCase]:
+    root = root or find_repo_root()
+    mappings = mappings or default_mapping_context()
+    cases: List[BenchCase] = []
+    for corpus, paths in corpora.items():
+        data = [path.read_bytes() for path in paths.values()]
+        size = sum(len(d) for d in data)
+        factories: Dict[str, Callable[[], Callable[[], Any]]] = {
+            "decode_profile": lambda: _decode_target(data, mappings),
+            "slice_sections_with_offsets": lambda: _slice_target(data),
+            "entry_signature": lambda: _entry_signature_target(data, mappings),
+            "digest_named_blobs": lambda: _digest_target(paths, root, mappings),
+        }
+        for target in targets:
+            cases.append(
+                BenchCase(
+                    name=f"{target}[{corpus}]",
+                    target=target,
+                    corpus=corpus,
+                    blobs=len(data),
+                    bytes=size,
+                    func=factories[target](),
+                )
+            )
+    return cases
+
+
+def measure_case(case: BenchCase, bench: Benchmark) -> Dict[str, Any]:
+    bench(case.func)
+    return {"target": case.target, "corpus": case.corpus, "blobs": case.blobs, "bytes": case.bytes, **bench.stats}
+
+
+def _measure_in_child(case: BenchCase, bench: Benchmark, conn: Any) -> None:
+    try:
+        conn.send(("ok", measure_case(case, bench)))
+    except BaseException as exc:  # pragma: no cover - reported by the parent
+        conn.send(("error", f"{type(exc).__name__}: {exc}"))
+    finally:
+        conn.close()
+
+
+def _fork_context() -> Optional[Any]:
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return None
+    return multiprocessing.get_context("fork")
+
+
+def measure_isolated(case: BenchCase, bench: Benchmark) -> Dict[str, Any]:
+    """Run `case` in a forked child so its peak RSS is its own (in-process without fork)."""
+    ctx = _fork_context()
+    if ctx is None:
+        return measure_case(case, bench)
+    recv, send = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_measure_in_child, args=(case, bench, send))
+    proc.start()
+    send.close()
+    try:
+        status, payload = recv.recv()
+    except EOFError:
+        status, payload = "error", f"benchmark child exited with {proc.exitcode}"
+    proc.join()
+    if status != "ok":
+        raise RuntimeError(f"{case.name}: {payload}")
+    return payload
+
+
+def run_suite(
+    *,
+    root: Optional[Path] = None,
+    golden: bool = True,
+    scales: Sequence[int] = DEFAULT_SCALES,
+    targets: Sequence[str] = TARGETS,
+    select: Optional[Callable[[str], bool]] = None,
+    bench: Optional[Benchmark] = None,
+    isolate: bool = True,
+) -> Dict[str, Any]:
+    """Build the corpora, run every selected case, and return a results document."""
+    root = root or find_repo_root()
+    bench = bench or Benchmark()
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(prefix="profile-tools-bench-") as tmp:
+        corpora = bench_corpora(root, Path(tmp), golden=golden, scales=scales)
+        for case in build_cases(corpora, root=root, targets=targets):
+            if select is not None and not select(case.name):
+                continue
+            results[case.name] = measure_isolated(case, bench) if isolate else measure_case(case, bench)
+        inputs = {
+            corpus: sorted(to_repo_relative(p, root) for p in paths.values())
+            for corpus, paths in corpora.items()
+            if not corpus.startswith("synthetic-")
+        }
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "host": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "config": {
+            "min_time": bench.min_time,
+            "min_rounds": bench.min_rounds,
+            "isolated": bool(isolate and _fork_context() is not None),
+            "scales": list(scales),
+        },
+        "inputs": inputs,
+        "cases": results,
+    }
+
+
+def compare_results(
+    baseline: Mapping[str, Any],
+    current: Mapping[str, Any],
+    *,
+    threshold: float = DEFAULT_THRESHOLD,
+    metrics: Sequence[str] = tuple(METRICS),
+) -> Dict[str, Any]:
+    """
+    Diff two results documents case by case.
+
+    A metric regresses when it moves the wrong way by more than `threshold`
+    (relative to the baseline): ops/sec dropping, or allocations/RSS growing.
+    Moves of the same size in the good direction are listed as improvements.
+    """
+    base_cases = baseline.get("cases") or {}
+    cur_cases = current.get("cases") or {}
+    regressions: List[Dict[str, Any]] = []
+    improvements: List[Dict[str, Any]] = []
+    for name in sorted(set(base_cases) & set(cur_cases)):
+        for metric in metrics:
+            before = base_cases[name].get(metric)
+            after = cur_cases[name].get(metric)
+            if not before or after is None:
+                continue
+            change = after / before - 1.0
+            worse = -change if METRICS[metric] else change
+            row = {"case": name, "metric": metric, "baseline": before, "current": after, "change": round(change, 4)}
+            if worse > threshold:
+                regressions.append(row)
+            elif -worse > threshold:
+                improvements.append(row)
+    return {
+        "threshold": threshold,
+        "regressions": regressions,
+        "improvements": improvements,
+        "missing": sorted(set(base_cases) - set(cur_cases)),
+        "new": sorted(set(cur_cases) - set(base_cases)),
+    }
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-Unified CLI for profile tooling (compile, decode, inspect, op-table, digest, oracles).
+Unified CLI for profile tooling (compile, decode, inspect, op-table, digest, cache, bench, oracles).
 """
 
 from __future__ import annotations
@@ -14,7 +14,9 @@ from typing import Iterable
 
 from book.api.path_utils import find_repo_root, to_repo_relative
 
+from . import bench as bench_mod
 from . import compile as compile_mod
+from . import decode_cache as decode_cache_mod
 from . import decoder as decoder_mod
 from . import digests as digests_mod
 from . import inspect as inspect_mod
@@ -225,9 +227,86 @@ def digest_system_profiles_command(args: argparse.Namespace) -> int:
     return 0
 
 
+def _cache_or_exit() -> decode_cache_mod.DecodeCache:
+    cache = decode_cache_mod.default_decode_cache()
+    if cache is None:
+        raise SystemExit(f"decode cache disabled via {decode_cache_mod.CACHE_ENV}")
+    return cache
+
+
+def cache_stats_command(args: argparse.Namespace) -> int:
+    print(json.dumps(_cache_or_exit().stats(), indent=2, sort_keys=True))
+    return 0
+
+
+def cache_clear_command(args: argparse.Namespace) -> int:
+    removed = _cache_or_exit().clear()
+    print(f"[+] removed {removed} cached decodes")
+    return 0
+
+
+def _bench_blobs(root: Path) -> list[Path]:
+    blobs = list(digests_mod.canonical_system_profile_blobs(root).values())
+    manifest = root / "book/graph/concepts/validation/golden_corpus/corpus_manifest.json"
+    if manifest.exists():
+        for entry in json.loads(manifest.read_text()).get("entries", []):
+            path = root / entry["compiled_path"]
+            if path.exists() and path not in blobs:
+                blobs.append(path)
+    return blobs
+
+
+def cache_bench_command(args: argparse.Namespace) -> int:
+    root = find_repo_root()
+    blobs = [Path(p) for p in args.blobs] if args.blobs else _bench_blobs(root)
+    payload = decode_cache_mod.benchmark(blobs, repeat=args.repeat)
+    payload["inputs"] = [to_repo_relative(p, root) for p in blobs]
+    _write_json(args.out, payload)
+    return 0
+
+
+def _bench_suite(args: argparse.Namespace, names: set[str] | None = None) -> dict:
+    bench = bench_mod.Benchmark(min_time=args.min_time, min_rounds=1 if args.quick else 3)
+    filters = args.filter or []
+
+    def select(name: str) -> bool:
+        if names is not None and name not in names:
+            return False
+        return not filters or any(f in name for f in filters)
+
+    return bench_mod.run_suite(
+        golden=not args.no_golden,
+        scales=args.scale if args.scale else bench_mod.DEFAULT_SCALES,
+        select=select,
+        bench=bench,
+        isolate=not args.no_isolate,
+    )
+
+
+def bench_run_command(args: argparse.Namespace) -> int:
+    _write_json(args.out, _bench_suite(args))
+    return 0
+
+
+def bench_compare_command(args: argparse.Namespace) -> int:
+    baseline = json.loads(args.baseline.read_text())
+    if args.current:
+        current = json.loads(args.current.read_text())
+    else:
+        current = _bench_suite(args, names=set(baseline.get("cases") or {}))
+    report = bench_mod.compare_results(baseline, current, threshold=args.threshold)
+    _write_json(args.out, report)
+    for row in report["regressions"]:
+        print(
+            f"[!] {row['case']} {row['metric']}: {row['baseline']} -> {row['current']} ({row['change']:+.1%})",
+            file=sys.stderr,
+        )
+    return 1 if report["regressions"] else 0
+
+
 def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser(
-        description="Unified profile tooling (compile, decode, inspect, op-table, digest, oracles) for Sonoma Seatbelt."
+        description="Unified profile tooling (compile, decode, inspect, op-table, digest, cache, bench, oracles) for Sonoma Seatbelt."
     )
     sub = ap.add_subparsers(dest="command", required=True)
 
@@ -280,6 +359,55 @@ def main(argv: list[str] | None = None) -> int:
     p_sys.add_argument("--out", type=Path, help="Write JSON to this path (default stdout).")
     p_sys.set_defaults(func=digest_system_profiles_command)
 
+    ap_cache = sub.add_parser("cache", help="Inspect or clear the on-disk decode cache.")
+    cache_sub = ap_cache.add_subparsers(dest="cache_cmd", required=True)
+
+    p_stats = cache_sub.add_parser("stats", help="Show cache location, size, and key versions.")
+    p_stats.set_defaults(func=cache_stats_command)
+
+    p_clear = cache_sub.add_parser("clear", help="Remove every cached decode.")
+    p_clear.set_defaults(func=cache_clear_command)
+
+    p_bench = cache_sub.add_parser(
+        "bench", help="Time uncached vs cold vs warm decodes (fixture blobs + golden corpus by default)."
+    )
+    p_bench.add_argument("blobs", nargs="*", help="Blobs to decode (default: canonical fixtures + golden corpus).")
+    p_bench.add_argument("--repeat", type=int, default=3, help="Repetitions; the best time is reported.")
+    p_bench.add_argument("--out", type=Path, help="Write JSON to this path (default stdout).")
+    p_bench.set_defaults(func=cache_bench_command)
+
+    ap_bench = sub.add_parser("bench", help="Microbenchmark decode/slice/entry-signature/digest (offline, bytes only).")
+    bench_sub = ap_bench.add_subparsers(dest="bench_cmd", required=True)
+
+    def add_suite_args(p: argparse.ArgumentParser) -> None:
+        p.add_argument("--filter", action="append", help="Only run cases whose name contains this (repeatable).")
+        p.add_argument("--no-golden", action="store_true", help="Skip the golden corpus.")
+        p.add_argument(
+            "--scale", type=int, action="append", help="Synthetic node-region scale factor (repeatable; default 8 and 64)."
+        )
+        p.add_argument("--min-time", type=float, default=0.5, help="Minimum timed seconds per case (default 0.5).")
+        p.add_argument("--quick", action="store_true", help="Allow a single timed round per case.")
+        p.add_argument("--no-isolate", action="store_true", help="Run cases in-process instead of a forked child each.")
+        p.add_argument("--out", type=Path, help="Write JSON to this path (default stdout).")
+
+    p_run = bench_sub.add_parser("run", help="Run the suite and emit a JSON results document (usable as a baseline).")
+    add_suite_args(p_run)
+    p_run.set_defaults(func=bench_run_command)
+
+    p_cmp = bench_sub.add_parser(
+        "compare", help="Compare against a baseline; exit 1 when any metric regresses beyond --threshold."
+    )
+    p_cmp.add_argument("baseline", type=Path, help="Baseline results JSON from `bench run`.")
+    p_cmp.add_argument("--current", type=Path, help="Results JSON to compare (default: run the baseline's cases now).")
+    p_cmp.add_argument(
+        "--threshold",
+        type=float,
+        default=bench_mod.DEFAULT_THRESHOLD,
+        help=f"Relative change that counts as a regression (default {bench_mod.DEFAULT_THRESHOLD}).",
+    )
+    add_suite_args(p_cmp)
+    p_cmp.set_defaults(func=bench_compare_command)
+
     ap_oracle = sub.add_parser("oracle", help="Run structural oracles over compiled blobs.")
     oracle_sub = ap_oracle.add_subparsers(dest="oracle_cmd", required=True)
 
@@ -0,0 +1,279 @@
+"""
+Content-addressed on-disk cache for decoded profiles (Sonoma baseline).
+
+Digests, op-table summaries, validation jobs, and the mapping generators decode
+the same small set of blobs in many separate processes. This cache stores the
+`decoder.decode_profile_dict` result under a key built from:
+- the blob's sha256,
+- the decode options (node stride, whether node dicts are included),
+- a hash of the decoder code (decoder/ingestion/mapping_context sources),
+- `MappingContext.fingerprint()` (tag layouts, u16 roles, filter vocab).
+
+Any edit to the decoder or to a mapping therefore misses cleanly instead of
+serving a stale decode. Entries are pickled dicts (tuples in the decoder output
+round-trip exactly), written atomically, and evicted least-recently-used once
+the directory exceeds `max_bytes`.
+
+The cache lives under `book/out/decode-cache/` by default. Set
+`SANDBOX_LORE_DECODE_CACHE` to another directory, or to `off`, to disable it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from book.api.path_utils import find_repo_root, to_repo_relative
+
+from . import decoder
+from . import ingestion
+from . import mapping_context
+from .mapping_context import MappingContext, default_mapping_context
+
+CACHE_ENV = "SANDBOX_LORE_DECODE_CACHE"
+CACHE_FORMAT = 1
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+_DISABLED_VALUES = {"0", "off", "false", "no"}
+
+
+@lru_cache()
+def decoder_code_sha256() -> str:
+    """Hash of the modules whose code determines decode output."""
+    h = hashlib.sha256(f"format={CACHE_FORMAT}".encode("utf-8"))
+    for mod in (decoder, ingestion, mapping_context):
+        h.update(Path(mod.__file__).read_bytes())
+    return h.hexdigest()
+
+
+@dataclass
+class DecodeCache:
+    root: Path
+    max_bytes: int = DEFAULT_MAX_BYTES
+    hits: int = 0
+    misses: int = 0
+    # Running size of the directory, seeded by one scan on the first write.
+    # Writes from other processes are only seen at the next scan, which runs
+    # whenever this total crosses max_bytes.
+    _bytes: Optional[int] = field(default=None, init=False, repr=False)
+
+    def key(
+        self,
+        blob: bytes,
+        *,
+        node_stride_bytes: Optional[int] = None,
+        include_nodes: bool = True,
+        mappings: Optional[MappingContext] = None,
+    ) -> str:
+        mappings = mappings or default_mapping_context()
+        parts = [
+            hashlib.sha256(blob).hexdigest(),
+            f"stride={node_stride_bytes}",
+            f"nodes={int(include_nodes)}",
+            decoder_code_sha256(),
+            mappings.fingerprint(),
+        ]
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.pkl"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            value = pickle.loads(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Truncated or foreign entry: drop it and treat as a miss.
+            path.unlink(missing_ok=True)
+            return None
+        try:
+            os.utime(path)  # mtime doubles as last-use time for LRU eviction
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        try:
+            replaced = path.stat().st_size
+        except OSError:
+            replaced = 0
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(payload)
+            os.replace(tmp, path)
+        except Exception:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        if self._bytes is None:
+            self._bytes = sum(size for _, size, _ in self._entries())
+        else:
+            self._bytes += len(payload) - replaced
+        if self._bytes > self.max_bytes:
+            self.evict()
+
+    def decode_profile_dict(
+        self,
+        blob: bytes,
+        node_stride_bytes: Optional[int] = None,
+        *,
+        include_nodes: bool = True,
+        mappings: Optional[MappingContext] = None,
+    ) -> Dict[str, Any]:
+        """Cached equivalent of `decoder.decode_profile_dict`."""
+        mappings = mappings or default_mapping_context()
+        key = self.key(blob, node_stride_bytes=node_stride_bytes, include_nodes=include_nodes, mappings=mappings)
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        decoded = decoder.decode_profile_dict(
+            blob, node_stride_bytes=node_stride_bytes, include_nodes=include_nodes, mappings=mappings
+        )
+        self.put(key, decoded)
+        return decoded
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        out: List[Tuple[float, int, Path]] = []
+        if not self.root.exists():
+            return out
+        for path in self.root.glob("*/*.pkl"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            out.append((st.st_mtime, st.st_size, path))
+        return out
+
+    def evict(self) -> int:
+        """Remove least-recently-used entries until the cache fits max_bytes."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _mtime, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        self._bytes = total
+        return removed
+
+    def clear(self) -> int:
+        removed = 0
+        for _mtime, _size, path in self._entries():
+            path.unlink(missing_ok=True)
+            removed += 1
+        self._bytes = 0
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self._entries()
+        try:
+            root = to_repo_relative(self.root)
+        except Exception:
+            root = str(self.root)
+        return {
+            "root": root,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "decoder_code_sha256": decoder_code_sha256(),
+            "mapping_fingerprint": default_mapping_context().fingerprint(),
+        }
+
+
+def default_cache_dir() -> Optional[Path]:
+    """Resolve the cache directory, or None when disabled via SANDBOX_LORE_DECODE_CACHE."""
+    override = os.environ.get(CACHE_ENV)
+    if override is not None:
+        if override.strip().lower() in _DISABLED_VALUES:
+            return None
+        return Path(override)
+    return find_repo_root(Path(__file__)) / "book" / "out" / "decode-cache"
+
+
+_DEFAULT: Dict[Path, DecodeCache] = {}
+
+
+def default_decode_cache() -> Optional[DecodeCache]:
+    """Process-wide DecodeCache for the configured directory (None when disabled)."""
+    root = default_cache_dir()
+    if root is None:
+        return None
+    cache = _DEFAULT.get(root)
+    if cache is None:
+        cache = _DEFAULT[root] = DecodeCache(root=root)
+    return cache
+
+
+def decode_profile_dict(
+    blob: bytes,
+    node_stride_bytes: Optional[int] = None,
+    *,
+    include_nodes: bool = True,
+    mappings: Optional[MappingContext] = None,
+) -> Dict[str, Any]:
+    """
+    `decoder.decode_profile_dict` through the default on-disk cache.
+
+    Falls back to a direct decode when the cache is disabled. Each call returns
+    a fresh dict, so callers may mutate the result.
+    """
+    cache = default_decode_cache()
+    if cache is None:
+        return decoder.decode_profile_dict(
+            blob, node_stride_bytes=node_stride_bytes, include_nodes=include_nodes, mappings=mappings
+        )
+    return cache.decode_profile_dict(
+        blob, node_stride_bytes=node_stride_bytes, include_nodes=include_nodes, mappings=mappings
+    )
+
+
+def benchmark(blobs: List[Path], *, repeat: int = 3) -> Dict[str, Any]:
+    """
+    Time cold (empty cache) vs warm (populated cache) decodes over `blobs`.
+
+    Uses a throwaway cache directory so the configured cache is untouched.
+    """
+    blobs_data = [(p, p.read_bytes()) for p in blobs]
+    mappings = default_mapping_context()
+    results: Dict[str, Any] = {"blobs": len(blobs_data), "repeat": repeat}
+
+    def run(cache: Optional[DecodeCache]) -> float:
+        start = time.perf_counter()
+        for _path, data in blobs_data:
+            if cache is None:
+                decoder.decode_profile_dict(data, mappings=mappings)
+            else:
+                cache.decode_profile_dict(data, mappings=mappings)
+        return time.perf_counter() - start
+
+    uncached: List[float] = []
+    cold: List[float] = []
+    warm: List[float] = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory(prefix="decode-cache-bench-") as tmp:
+            cache = DecodeCache(root=Path(tmp))
+            uncached.append(run(None))
+            cold.append(run(cache))
+            warm.append(run(cache))
+    results["uncached_s"] = min(uncached)
+    results["cold_s"] = min(cold)
+    results["warm_s"] = min(warm)
+    results["warm_speedup"] = (min(uncached) / min(warm)) if min(warm) else None
+    return results
@@ -10,15 +10,17 @@ and intended to be version-tolerant.
 
 from __future__ import annotations
 
-import json
 import string
+import sys
+from array import array
+from bisect import bisect_left
+from collections import Counter
 from dataclasses import dataclass
-from pathlib import Path
+from itertools import chain, compress
 from typing import List, Dict, Any, Optional, Tuple, Sequence
 
-from book.api.path_utils import find_repo_root
-
 from . import ingestion as pi
+from .mapping_context import MappingContext, default_mapping_context
 
 PRINTABLE = set(bytes(string.printable, "ascii"))
 # Heuristic: op_table and branch offsets are stored as u16 word offsets
@@ -98,51 +100,6 @@ def _score_scaled_targets_as_headers(
     }
 
 
-def _load_filter_vocab() -> Dict[int, str]:
-    """Load filter vocabulary id->name from the published mapping if present."""
-    try:
-        root = find_repo_root(Path(__file__))
-    except Exception:
-        return {}
-    path = root / "book" / "graph" / "mappings" / "vocab" / "filters.json"
-    if not path.exists():
-        return {}
-    try:
-        data = json.loads(path.read_text())
-    except Exception:
-        return {}
-    out: Dict[int, str] = {}
-    entries = data.get("filters", []) if isinstance(data, dict) else data
-    for entry in entries or []:
-        try:
-            out[int(entry["id"])] = str(entry["name"])
-        except Exception:
-            continue
-    return out
-
-
-def _load_tag_u16_roles() -> Dict[int, str]:
-    """Load per-tag u16 role mapping if available."""
-    try:
-        root = find_repo_root(Path(__file__))
-    except Exception:
-        return {}
-    path = root / "book" / "graph" / "mappings" / "tag_layouts" / "tag_u16_roles.json"
-    if not path.exists():
-        return {}
-    try:
-        data = json.loads(path.read_text())
-    except Exception:
-        return {}
-    out: Dict[int, str] = {}
-    for entry in data.get("roles", []):
-        try:
-            out[int(entry["tag"])] = str(entry["u16_role"])
-        except Exception:
-            continue
-    return out
-
-
 @dataclass
 class DecodedProfile:
     format_variant: str
@@ -161,6 +118,7 @@ class DecodedProfile:
     sections: Dict[str, int]
     validation: Dict[str, Any]
     header_fields: Dict[str, Any]
+    node_columns: Optional[NodeColumns] = None
 
 
 def _read_words(data: bytes, byte_len: int) -> List[int]:
@@ -224,54 +182,21 @@ def _parse_op_table(data: bytes) -> List[int]:
     return [int.from_bytes(data[i : i + 2], "little") for i in range(0, len(data), 2)]
 
 
-def _load_external_tag_layouts() -> Dict[int, Tuple[int, Tuple[int, ...], Tuple[int, ...]]]:
-    """
-    Optionally merge in tag layout hints from stable mappings or experiments.
+def _merged_tag_layouts(mappings: MappingContext) -> Dict[int, Tuple[int, Tuple[int, ...], Tuple[int, ...]]]:
+    return {**DEFAULT_TAG_LAYOUTS, **mappings.tag_layouts}
 
-    Priority: published mapping under book/graph/mappings/tag_layouts/tag_layouts.json,
-    then experimental assumptions under probe-op-structure. If none found, fall
-    back to the built-in defaults. Keys are tag ints; values mirror DEFAULT_TAG_LAYOUTS.
-    """
-    try:
-        root = find_repo_root(Path(__file__))
-    except Exception:
-        return {}
-    candidates = [
-        root / "book" / "graph" / "mappings" / "tag_layouts" / "tag_layouts.json",
-        root / "book" / "experiments" / "probe-op-structure" / "out" / "tag_layout_assumptions.json",
-    ]
-    data = None
-    for path in candidates:
-        if not path.exists():
-            continue
-        try:
-            data = json.loads(path.read_text())
-            break
-        except Exception:
-            continue
-    if not data:
-        return {}
-    out: Dict[int, Tuple[int, Tuple[int, ...], Tuple[int, ...]]] = {}
-    for entry in data.get("tags", []):
-        try:
-            tag = int(entry["tag"])
-        except Exception:
-            continue
-        rec_size = int(entry.get("record_size_bytes", 12))
-        edges = tuple(entry.get("edge_fields", []))
-        payloads = tuple(entry.get("payload_fields", []))
-        out[tag] = (rec_size, edges, payloads)
-    return out
 
-
-def _parse_nodes_tagged(data: bytes) -> Tuple[List[Dict[str, Any]], Dict[int, int], int]:
+def _parse_nodes_tagged(
+    data: bytes, mappings: Optional[MappingContext] = None
+) -> Tuple[List[Dict[str, Any]], Dict[int, int], int]:
     """
     Parse nodes using per-tag record sizes when available, defaulting to 12-byte
     records. Returns (nodes, tag_counts, remainder_bytes).
     """
-    tag_layouts = {**DEFAULT_TAG_LAYOUTS, **_load_external_tag_layouts()}
-    tag_roles = _load_tag_u16_roles()
-    filter_vocab = _load_filter_vocab()
+    mappings = mappings or default_mapping_context()
+    tag_layouts = _merged_tag_layouts(mappings)
+    tag_roles = mappings.tag_u16_roles
+    filter_vocab = mappings.filter_vocab
     nodes: List[Dict[str, Any]] = []
     tag_counts: Dict[int, int] = {}
 
@@ -322,58 +247,137 @@ def _parse_nodes_tagged(data: bytes) -> Tuple[List[Dict[str, Any]], Dict[int, in
     return nodes, tag_counts, remainder
 
 
-def _parse_nodes_fixed_stride(
-    data: bytes, stride_bytes: int
-) -> Tuple[List[Dict[str, Any]], Dict[int, int], int]:
+@dataclass
+class NodeColumns:
     """
-    Parse nodes as fixed-size records (e.g., 8-byte records: tag,u8 + 3*u16).
+    Column-oriented view of a fixed-stride node stream.
 
-    This mode ignores per-tag record_size_bytes from mappings; it still consumes
-    edge/payload indices from the tag-layout mapping when available so that
-    payload/u16-role annotations remain consistent.
+    Each record is `tag:u8, kind:u8` followed by `(stride_bytes - 2) // 2` u16
+    slots. `tags`/`kinds` hold one byte per record and `fields[i]` holds slot i
+    of every record, so counts and bounds checks run as whole-column operations
+    instead of per-record dict construction.
     """
+
+    stride_bytes: int
+    tags: bytes
+    kinds: bytes
+    fields: Tuple[array, ...]
+    remainder: int
+
+    @property
+    def count(self) -> int:
+        return len(self.tags)
+
+    def tag_counts(self) -> Dict[int, int]:
+        # Counter keeps first-occurrence order, matching the record-at-a-time parse.
+        return dict(Counter(self.tags))
+
+    def tag_mask(self, tag: int) -> bytes:
+        """Per-record selector (1/0 bytes) for use with itertools.compress."""
+        table = bytearray(256)
+        table[tag] = 1
+        return self.tags.translate(bytes(table))
+
+
+def _node_columns_fixed_stride(data: bytes, stride_bytes: int) -> NodeColumns:
+    """Slice `data` into NodeColumns using fixed `stride_bytes` records."""
     if stride_bytes < 4 or stride_bytes % 2 != 0:
         raise ValueError(f"invalid node stride {stride_bytes} (expected even >=4)")
+    count = len(data) // stride_bytes
+    body = data[: count * stride_bytes]
+    words = array("H", body)
+    if sys.byteorder != "little":
+        words.byteswap()
+    slots = stride_bytes // 2
+    return NodeColumns(
+        stride_bytes=stride_bytes,
+        tags=body[0::stride_bytes],
+        kinds=body[1::stride_bytes],
+        fields=tuple(words[i::slots] for i in range(1, slots)),
+        remainder=len(data) - len(body),
+    )
 
-    tag_layouts = {**DEFAULT_TAG_LAYOUTS, **_load_external_tag_layouts()}
-    tag_roles = _load_tag_u16_roles()
-    filter_vocab = _load_filter_vocab()
-    nodes: List[Dict[str, Any]] = []
-    tag_counts: Dict[int, int] = {}
 
-    offset = 0
-    while offset + stride_bytes <= len(data):
-        tag = data[offset]
+def _edge_bounds_from_columns(columns: NodeColumns) -> Tuple[int, int]:
+    """Return (edge_in_bounds, edge_total) treating the first two slots as edges."""
+    edge_total = 0
+    edge_in_bounds = 0
+    for col in columns.fields[:2]:
+        edge_total += len(col)
+        edge_in_bounds += bisect_left(sorted(col), columns.count)
+    return edge_in_bounds, edge_total
+
+
+def _tag_validation_from_columns(
+    columns: NodeColumns, merged_layouts: Dict[int, Tuple[int, Tuple[int, ...], Tuple[int, ...]]]
+) -> Dict[str, Any]:
+    """Columnar equivalent of the per-node tag-aware validation in decode_profile."""
+    tag_validation: Dict[str, Any] = {}
+    n_slots = len(columns.fields)
+    for tag in columns.tag_counts():
+        if tag not in merged_layouts:
+            continue
+        rec_size, edge_idx, payload_idx = merged_layouts[tag]
+        if rec_size != columns.stride_bytes:
+            continue
+        mask = columns.tag_mask(tag)
+        tv = {"edge_in_bounds": 0, "edge_total": 0, "payloads": {}, "record_size": rec_size}
+        for i in edge_idx:
+            if i < n_slots:
+                edges = sorted(compress(columns.fields[i], mask))
+                tv["edge_total"] += len(edges)
+                tv["edge_in_bounds"] += bisect_left(edges, columns.count)
+        payload_cols = [compress(columns.fields[i], mask) for i in payload_idx if i < n_slots]
+        if payload_cols:
+            # Interleave per record so payload keys keep first-seen order.
+            counts = Counter(chain.from_iterable(zip(*payload_cols)))
+            tv["payloads"] = {str(p): c for p, c in counts.items()}
+        tag_validation[str(tag)] = tv
+    return tag_validation
+
+
+def _node_dicts_from_columns(
+    columns: NodeColumns,
+    data: bytes,
+    tag_layouts: Dict[int, Tuple[int, Tuple[int, ...], Tuple[int, ...]]],
+    tag_roles: Dict[int, str],
+    filter_vocab: Dict[int, str],
+) -> List[Dict[str, Any]]:
+    """Materialize the legacy per-node dict shape from NodeColumns."""
+    stride = columns.stride_bytes
+    n_slots = len(columns.fields)
+    per_tag: Dict[int, Tuple[str, Tuple[int, ...], Tuple[int, ...], str]] = {}
+    for tag in columns.tag_counts():
         layout_source = "mapping" if tag in tag_layouts else "default"
-        _mapped_size, edge_idx, payload_idx = tag_layouts.get(tag, (stride_bytes, (0, 1), (2,)))
-        chunk = data[offset : offset + stride_bytes]
-        fields = [
-            int.from_bytes(chunk[i : i + 2], "little") for i in range(2, stride_bytes, 2)
-        ]
-        tag_counts[tag] = tag_counts.get(tag, 0) + 1
+        _mapped_size, _edge_idx, payload_idx = tag_layouts.get(tag, (stride, (0, 1), (2,)))
+        present = tuple(i for i in payload_idx if i < n_slots) if payload_idx else ()
+        per_tag[tag] = (layout_source, payload_idx, present, tag_roles.get(tag, ROLE_UNKNOWN))
 
-        payload_values = [fields[i] for i in payload_idx if i < len(fields)] if payload_idx else []
+    hex_all = data[: columns.count * stride].hex()
+    hex_width = stride * 2
+    nodes: List[Dict[str, Any]] = []
+    for idx, (tag, *fields) in enumerate(zip(columns.tags, *columns.fields)):
+        layout_source, payload_idx, present, u16_role = per_tag[tag]
         filter_arg_raw: Optional[int | List[int]] = None
-        if payload_values:
-            filter_arg_raw = payload_values[0] if len(payload_values) == 1 else payload_values
-
-        u16_role = tag_roles.get(tag, ROLE_UNKNOWN)
         filter_vocab_ref: Optional[str] = None
         out_of_vocab = False
-        if u16_role == "filter_vocab_id" and payload_values:
-            val = payload_values[0]
-            if val in filter_vocab:
-                filter_vocab_ref = filter_vocab[val]
-            else:
-                out_of_vocab = True
-
+        if present:
+            payload_values = [fields[i] for i in present]
+            filter_arg_raw = payload_values[0] if len(payload_values) == 1 else payload_values
+            if u16_role == "filter_vocab_id":
+                val = payload_values[0]
+                if val in filter_vocab:
+                    filter_vocab_ref = filter_vocab[val]
+                else:
+                    out_of_vocab = True
+        offset = idx * stride
         nodes.append(
             {
                 "offset": offset,
                 "tag": tag,
                 "fields": fields,
-                "record_size": stride_bytes,
-                "hex": chunk.hex(),
+                "record_size": stride,
+                "hex": hex_all[idx * hex_width : (idx + 1) * hex_width],
                 "layout_provenance": layout_source,
                 "payload_indices": payload_idx,
                 "filter_arg_raw": filter_arg_raw,
@@ -382,10 +386,25 @@ def _parse_nodes_fixed_stride(
                 "filter_out_of_vocab": out_of_vocab,
             }
         )
-        offset += stride_bytes
+    return nodes
 
-    remainder = len(data) - offset
-    return nodes, tag_counts, remainder
+
+def _parse_nodes_fixed_stride(
+    data: bytes, stride_bytes: int, mappings: Optional[MappingContext] = None
+) -> Tuple[List[Dict[str, Any]], Dict[int, int], int]:
+    """
+    Parse nodes as fixed-size records (e.g., 8-byte records: tag,u8 + 3*u16).
+
+    This mode ignores per-tag record_size_bytes from mappings; it still consumes
+    edge/payload indices from the tag-layout mapping when available so that
+    payload/u16-role annotations remain consistent.
+    """
+    columns = _node_columns_fixed_stride(data, stride_bytes)
+    mappings = mappings or default_mapping_context()
+    nodes = _node_dicts_from_columns(
+        columns, data, _merged_tag_layouts(mappings), mappings.tag_u16_roles, mappings.filter_vocab
+    )
+    return nodes, columns.tag_counts(), columns.remainder
 
 
 def _extract_strings_with_offsets(buf: bytes, min_len: int = 4) -> List[Tuple[int, str]]:
@@ -408,8 +427,82 @@ def _extract_strings_with_offsets(buf: bytes, min_len: int = 4) -> List[Tuple[in
     return out
 
 
+@dataclass
+class _LiteralRefIndex:
+    """
+    Value -> literal-string lookups for the literal_refs heuristic.
+
+    `fields` matches whole u16 node fields against literal offsets (relative or
+    absolute). `u16`/`u32` match little-endian windows anywhere inside a node
+    record against offsets and string indices, mirroring a substring search
+    for each encoded pattern.
+    """
+
+    fields: Dict[int, List[str]]
+    u16: Dict[int, List[str]]
+    u32: Dict[int, List[str]]
+
+
+def _build_literal_ref_index(
+    literal_strings_with_offsets: Sequence[Tuple[int, str]], literal_start: int
+) -> _LiteralRefIndex:
+    fields: Dict[int, List[str]] = {}
+    u16: Dict[int, List[str]] = {}
+    u32: Dict[int, List[str]] = {}
+    for idx, (off, val) in enumerate(literal_strings_with_offsets):
+        abs_off = literal_start + off
+        for v in (off, abs_off):
+            fields.setdefault(v, []).append(val)
+        for v in (off, abs_off, idx):
+            if v < 0x10000:
+                u16.setdefault(v, []).append(val)
+            if v < 0x100000000:
+                u32.setdefault(v, []).append(val)
+    return _LiteralRefIndex(fields=fields, u16=u16, u32=u32)
+
+
+def _unaligned_words(data: bytes, width: int, typecode: str) -> List[int]:
+    """Little-endian value of the `width`-byte window starting at every byte offset."""
+    out: List[int] = [0] * max(0, len(data) - width + 1)
+    for phase in range(min(width, len(out))):
+        count = (len(data) - phase) // width
+        words = array(typecode, data[phase : phase + count * width])
+        if sys.byteorder != "little":
+            words.byteswap()
+        out[phase::width] = words
+    return out
+
+
+def _literal_refs_for_nodes(
+    nodes: Sequence[Dict[str, Any]], nodes_bytes: bytes, index: _LiteralRefIndex
+) -> List[List[str]]:
+    """Resolve literal_refs for every node with a handful of dict probes per record."""
+    u16_at = _unaligned_words(nodes_bytes, 2, "H")
+    u32_at = _unaligned_words(nodes_bytes, 4, "I")
+    out: List[List[str]] = []
+    for node in nodes:
+        matches: set[str] = set()
+        for f in node.get("fields", []):
+            matches.update(index.fields.get(f, ()))
+        offset = node.get("offset", 0)
+        rec_size = node.get("record_size", 0) or 0
+        if rec_size >= 2:
+            for v in u16_at[offset : offset + rec_size - 1]:
+                matches.update(index.u16.get(v, ()))
+        if rec_size >= 4:
+            for v in u32_at[offset : offset + rec_size - 3]:
+                matches.update(index.u32.get(v, ()))
+        out.append(sorted(matches))
+    return out
+
+
 def decode_profile(
-    data: bytes, header_window: int = 128, node_stride_bytes: Optional[int] = None
+    data: bytes,
+    header_window: int = 128,
+    node_stride_bytes: Optional[int] = None,
+    *,
+    materialize_nodes: bool = True,
+    mappings: Optional[MappingContext] = None,
 ) -> DecodedProfile:
     """
     Heuristic decoder for modern compiled sandbox blobs: slices the preamble,
@@ -419,7 +512,16 @@ def decode_profile(
     Returns a DecodedProfile that mirrors the substrate story (preamble fields,
     op_table entries, node tags/edges/payloads, literal pool slices) without
     asserting correctness beyond the light validation included here.
+
+    Fixed-stride blobs are decoded through NodeColumns. With
+    `materialize_nodes=False` the per-node dicts (and their literal_refs) are
+    skipped and `nodes` is empty; counts, tag_counts, and validation are
+    unchanged and `node_columns` carries the columnar view.
+
+    `mappings` supplies the tag-layout/u16-role/filter-vocab side-tables; it
+    defaults to the process-wide `default_mapping_context()`.
     """
+    mappings = mappings or default_mapping_context()
     preamble = _read_words(data, 16)
     preamble_full = _read_words(data, header_window)
     header_bytes = data[:header_window]
@@ -446,7 +548,7 @@ def decode_profile(
     nodes_bytes = sections.nodes
     literal_pool = sections.regex_literals
 
-    merged_layouts = {**DEFAULT_TAG_LAYOUTS, **_load_external_tag_layouts()}
+    merged_layouts = _merged_tag_layouts(mappings)
     known_tags = set(merged_layouts.keys())
     op_table_scaling_witness = {
         "scale8": _score_scaled_targets_as_headers(
@@ -458,80 +560,59 @@ def decode_profile(
         "notes": "Scores op_table entries as offsets into the node stream under different scale factors; ASCII-heavy scale12 is a strong sign of mis-scaling.",
     }
 
+    columns: Optional[NodeColumns] = None
     if selected_stride is None:
-        nodes, tag_counts, node_remainder = _parse_nodes_tagged(nodes_bytes)
+        nodes, tag_counts, node_remainder = _parse_nodes_tagged(nodes_bytes, mappings)
+        node_count = len(nodes)
     else:
-        nodes, tag_counts, node_remainder = _parse_nodes_fixed_stride(nodes_bytes, selected_stride)
-
-    # Sanity: treat first two fields as edges and count in-bounds hits.
-    edge_total = 0
-    edge_in_bounds = 0
-    for node in nodes:
-        edges = node.get("fields", [])[:2]
-        edge_total += len(edges)
-        edge_in_bounds += sum(1 for e in edges if 0 <= e < len(nodes))
+        columns = _node_columns_fixed_stride(nodes_bytes, selected_stride)
+        tag_counts, node_remainder = columns.tag_counts(), columns.remainder
+        node_count = columns.count
+        nodes = []
+        if materialize_nodes:
+            nodes = _node_dicts_from_columns(
+                columns, nodes_bytes, merged_layouts, mappings.tag_u16_roles, mappings.filter_vocab
+            )
 
-    # Tag-aware validation: check candidate layouts for selected tags.
     literal_strings_with_offsets = _extract_strings_with_offsets(literal_pool)
-    literal_count = len(literal_strings_with_offsets)
-    tag_validation: Dict[str, Any] = {}
-    # Tag-aware validation based on merged layouts
-    for node in nodes:
-        tag = node.get("tag")
-        if tag not in merged_layouts:
-            continue
-        rec_size, edge_idx, payload_idx = merged_layouts[tag]
-        if node.get("record_size") != rec_size:
-            continue
-        fields = node.get("fields", [])
-        edges = [fields[i] for i in edge_idx if i < len(fields)]
-        payloads = [fields[i] for i in payload_idx if i < len(fields)]
-        tv = tag_validation.setdefault(
-            str(tag), {"edge_in_bounds": 0, "edge_total": 0, "payloads": {}, "record_size": rec_size}
-        )
-        tv["edge_total"] += len(edges)
-        tv["edge_in_bounds"] += sum(1 for e in edges if 0 <= e < len(nodes))
-        for p in payloads:
-            tv["payloads"][str(p)] = tv["payloads"].get(str(p), 0) + 1
+    if columns is not None:
+        edge_in_bounds, edge_total = _edge_bounds_from_columns(columns)
+        tag_validation = _tag_validation_from_columns(columns, merged_layouts)
+    else:
+        # Sanity: treat first two fields as edges and count in-bounds hits.
+        edge_total = 0
+        edge_in_bounds = 0
+        for node in nodes:
+            edges = node.get("fields", [])[:2]
+            edge_total += len(edges)
+            edge_in_bounds += sum(1 for e in edges if 0 <= e < len(nodes))
+
+        # Tag-aware validation based on merged layouts
+        tag_validation: Dict[str, Any] = {}
+        for node in nodes:
+            tag = node.get("tag")
+            if tag not in merged_layouts:
+                continue
+            rec_size, edge_idx, payload_idx = merged_layouts[tag]
+            if node.get("record_size") != rec_size:
+                continue
+            fields = node.get("fields", [])
+            edges = [fields[i] for i in edge_idx if i < len(fields)]
+            payloads = [fields[i] for i in payload_idx if i < len(fields)]
+            tv = tag_validation.setdefault(
+                str(tag), {"edge_in_bounds": 0, "edge_total": 0, "payloads": {}, "record_size": rec_size}
+            )
+            tv["edge_total"] += len(edges)
+            tv["edge_in_bounds"] += sum(1 for e in edges if 0 <= e < len(nodes))
+            for p in payloads:
+                tv["payloads"][str(p)] = tv["payloads"].get(str(p), 0) + 1
 
     # Heuristic literal references: match node fields to literal offsets, absolute offsets, or string indices.
-    literal_refs_per_node: List[List[str]] = []
-    literal_candidates: List[Tuple[str, List[bytes]]] = []
-    for idx, (off, val) in enumerate(literal_strings_with_offsets):
-        abs_off = literal_start + off
-        patterns = [
-            off.to_bytes(2, "little"),
-            abs_off.to_bytes(2, "little"),
-            off.to_bytes(4, "little"),
-            abs_off.to_bytes(4, "little"),
-            idx.to_bytes(2, "little"),
-            idx.to_bytes(4, "little"),
-        ]
-        literal_candidates.append((val, patterns))
-    for node in nodes:
-        matches: List[str] = []
-        fields = node.get("fields", [])
-        # field-based matching (u16 payloads)
-        for off, val in literal_strings_with_offsets:
-            abs_off = literal_start + off
-            if any((f == off or f == abs_off) for f in fields):
-                matches.append(val)
-        # byte-scan matching inside the record
-        try:
-            rec_size = node.get("record_size", 0) or 0
-            chunk = nodes_bytes[node["offset"] : node["offset"] + rec_size]
-        except Exception:
-            chunk = b""
-        if chunk:
-            for val, pats in literal_candidates:
-                for pat in pats:
-                    if pat in chunk:
-                        matches.append(val)
-                        break
-        literal_refs_per_node.append(sorted(set(matches)))
-    for node, refs in zip(nodes, literal_refs_per_node):
-        node["literal_refs"] = refs
-        node["literal_refs_provenance"] = "heuristic" if refs else "none"
+    if nodes:
+        ref_index = _build_literal_ref_index(literal_strings_with_offsets, literal_start)
+        for node, refs in zip(nodes, _literal_refs_for_nodes(nodes, nodes_bytes, ref_index)):
+            node["literal_refs"] = refs
+            node["literal_refs_provenance"] = "heuristic" if refs else "none"
 
     header_fields: Dict[str, Any] = {}
     try:
@@ -567,7 +648,7 @@ def decode_profile(
         op_table_offset=offsets.op_table_start,
         op_table=op_table,
         nodes=nodes,
-        node_count=len(nodes),
+        node_count=node_count,
         tag_counts={str(k): v for k, v in tag_counts.items()},
         literal_pool=literal_pool,
         literal_strings=[s for _, s in literal_strings_with_offsets],
@@ -591,16 +672,28 @@ def decode_profile(
             "op_table_scaling_witness": op_table_scaling_witness,
         },
         header_fields=header_fields,
+        node_columns=columns,
     )
     return decoded
 
 
-def decode_profile_dict(data: bytes, node_stride_bytes: Optional[int] = None) -> Dict[str, Any]:
+def decode_profile_dict(
+    data: bytes,
+    node_stride_bytes: Optional[int] = None,
+    *,
+    include_nodes: bool = True,
+    mappings: Optional[MappingContext] = None,
+) -> Dict[str, Any]:
     """
     Dict wrapper for JSON serialization and downstream tooling that expects a
     JSON-safe structure instead of DecodedProfile objects.
+
+    `include_nodes=False` skips building per-node dicts for callers that only
+    need counts, sections, and validation (e.g. digests); `nodes` is then empty.
     """
-    d = decode_profile(data, node_stride_bytes=node_stride_bytes)
+    d = decode_profile(
+        data, node_stride_bytes=node_stride_bytes, materialize_nodes=include_nodes, mappings=mappings
+    )
     return {
         "format_variant": d.format_variant,
         "preamble_words": d.preamble_words,
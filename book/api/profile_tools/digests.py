@@ -14,7 +14,8 @@ from typing import Any, Mapping
 
 from book.api.path_utils import find_repo_root, to_repo_relative
 
-from . import decoder
+from . import decode_cache
+from .mapping_context import MappingContext, default_mapping_context
 
 _DEFAULT_DIGEST_KEYS = {
     "format_variant",
@@ -45,32 +46,42 @@ def canonical_system_profile_blobs(repo_root: Path | None = None) -> dict[str, P
     }
 
 
-def digest_compiled_blob_bytes(blob: bytes, *, source: str | None = None) -> dict[str, Any]:
+def digest_compiled_blob_bytes(
+    blob: bytes, *, source: str | None = None, mappings: MappingContext | None = None
+) -> dict[str, Any]:
     """
     Return a stable, JSON-serializable digest for a compiled profile blob.
 
     Digest content is derived from `book.api.profile_tools.decoder` and is meant
     to be stable across callers (experiments, validation, ad-hoc tooling).
     """
-    decoded = decoder.decode_profile_dict(blob)
+    # Digests never carry per-node dicts; skip materializing them.
+    decoded = decode_cache.decode_profile_dict(blob, include_nodes=False, mappings=mappings)
     body = {k: decoded[k] for k in sorted(_DEFAULT_DIGEST_KEYS) if k in decoded}
     if source is not None:
         body["source"] = source
     return body
 
 
-def digest_compiled_blob_path(path: Path, *, repo_root: Path | None = None) -> dict[str, Any]:
+def digest_compiled_blob_path(
+    path: Path, *, repo_root: Path | None = None, mappings: MappingContext | None = None
+) -> dict[str, Any]:
     root = repo_root or find_repo_root()
     if not path.exists():
         raise FileNotFoundError(f"missing compiled blob: {path}")
-    return digest_compiled_blob_bytes(path.read_bytes(), source=to_repo_relative(path, root))
+    return digest_compiled_blob_bytes(
+        path.read_bytes(), source=to_repo_relative(path, root), mappings=mappings
+    )
 
 
-def digest_named_blobs(blobs: Mapping[str, Path], *, repo_root: Path | None = None) -> dict[str, Any]:
+def digest_named_blobs(
+    blobs: Mapping[str, Path], *, repo_root: Path | None = None, mappings: MappingContext | None = None
+) -> dict[str, Any]:
     root = repo_root or find_repo_root()
+    mappings = mappings or default_mapping_context()
     payload: dict[str, Any] = {}
     for name, path in blobs.items():
-        payload[str(name)] = digest_compiled_blob_path(path, repo_root=root)
+        payload[str(name)] = digest_compiled_blob_path(path, repo_root=root, mappings=mappings)
     return payload
 
 
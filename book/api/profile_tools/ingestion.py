@@ -6,13 +6,15 @@ This module is a copy of the canonical ingestion helpers under:
 
 It exists so that callers outside the validation layer (examples, experiments,
 API tooling) have a stable import path under `book.api.profile_tools` without
-reaching into `book/graph/concepts/validation/`.
+reaching into `book/graph/concepts/validation/`. `find_literal_start` lives
+only here; the validation module imports it.
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass
 from typing import Optional, List, Dict, Any
+import re
 import struct
 import string
 
@@ -93,8 +95,7 @@ def _is_legacy_decision_tree(blob: bytes) -> bool:
     return (re_offset_bytes - 4) % 2 == 0
 
 
-def parse_header(blob: ProfileBlob) -> Header:
-    data = blob.bytes
+def _parse_header_data(data: bytes | memoryview) -> Header:
     if _is_legacy_decision_tree(data):
         re_offset_words = int.from_bytes(data[0:2], "little")
         re_offset_bytes = re_offset_words * 8
@@ -128,98 +129,188 @@ def parse_header(blob: ProfileBlob) -> Header:
     )
 
 
+def parse_header(blob: ProfileBlob) -> Header:
+    return _parse_header_data(blob.bytes)
+
+
+# Literal-start scan tables: a translate() table mapping printable-or-NUL bytes
+# to 1 (everything else to 0), and a regex for 4 printable non-NUL bytes.
+_LOOSE_PRINTABLE_FLAGS = bytes(1 if b == 0x00 or b in PRINTABLE else 0 for b in range(256))
+_PRINTABLE_RUN = re.compile(b"[" + b"".join(re.escape(bytes([b])) for b in sorted(PRINTABLE)) + b"]{4}")
+
+
+def find_literal_start(buf: bytes | memoryview, start: int) -> int:
+    """
+    Locate the start of the literal/regex pool at or after `start`.
+
+    Order of preference: the end of a Mach-O `__TEXT` segment (wrapped blobs),
+    then the first run of at least 4 printable non-NUL bytes, then the first
+    offset whose 64-byte window is at least 70% printable-or-NUL. Both scans
+    are linear in the buffer length.
+    """
+    buf = bytes(buf) if isinstance(buf, memoryview) else buf
+    for seg in _parse_macho_segments(buf):
+        if seg["name"] == "__TEXT":
+            cstring = seg["fileoff"] + seg["filesize"]  # crude upper bound
+            if cstring >= start:
+                return cstring
+    # Prefer a short run of non-NUL printable characters starting at the lower bound.
+    min_run = 4
+    match = _PRINTABLE_RUN.search(buf, start)
+    if match and match.start() < len(buf) - min_run:
+        return match.start()
+    # Fallback: ratio-based scan over a sliding window (the window shrinks at
+    # the tail, as the ratio is taken over the bytes actually present).
+    window = 64
+    threshold = 0.7
+    n = len(buf)
+    if start >= n:
+        return n
+    loose = buf.translate(_LOOSE_PRINTABLE_FLAGS)
+    count = loose.count(1, start, start + window)
+    for i in range(start, n):
+        if count / min(window, n - i) >= threshold:
+            return i
+        count -= loose[i]
+        if i + window < n:
+            count += loose[i + window]
+    return n
+
+
+class ProfileView:
+    """
+    Lazily sliced view of a compiled profile.
+
+    Wraps the blob in a `memoryview` and computes each section boundary on first
+    access, so callers that need only the header or op table never run the
+    node/literal split (`find_literal_start`). Section properties return
+    zero-copy memoryviews; `sections()` materializes `Sections` (bytes) for
+    callers that need the historical shape.
+
+    `operation_count` overrides the header's op count for modern blobs (the
+    decoder and op-table summaries supply their own estimate).
+    """
+
+    def __init__(
+        self,
+        data: bytes | bytearray | memoryview,
+        source: str = "",
+        *,
+        header: Optional[Header] = None,
+        operation_count: Optional[int] = None,
+    ) -> None:
+        self.data = memoryview(data)
+        self._raw = data if isinstance(data, bytes) else None
+        self.source = source
+        self._header = header
+        self._operation_count = operation_count
+        self._op_table_end: Optional[int] = None
+        self._nodes_start: Optional[int] = None
+        self._literal_start: Optional[int] = None
+
+    @property
+    def header(self) -> Header:
+        if self._header is None:
+            header = _parse_header_data(self.data)
+            if self._operation_count is not None and header.format_variant != "legacy-decision-tree":
+                header.operation_count = self._operation_count
+            self._header = header
+        return self._header
+
+    @property
+    def is_legacy(self) -> bool:
+        return self.header.format_variant == "legacy-decision-tree"
+
+    @property
+    def op_table_start(self) -> int:
+        return 4 if self.is_legacy else 16
+
+    @property
+    def op_table_end(self) -> int:
+        if self._op_table_end is None:
+            if self.is_legacy:
+                self._op_table_end = int.from_bytes(self.data[0:2], "little") * 8
+            else:
+                # Modern heuristic: treat bytes 0x10..(0x10 + op_count*2) as op-table.
+                op_table_len = (self.header.operation_count or 0) * 2
+                self._op_table_end = min(len(self.data), self.op_table_start + op_table_len)
+        return self._op_table_end
+
+    @property
+    def op_table(self) -> memoryview:
+        return self.data[self.op_table_start : self.op_table_end]
+
+    def op_entries(self) -> List[int]:
+        table = self.op_table
+        return [int.from_bytes(table[i : i + 2], "little") for i in range(0, len(table), 2)]
+
+    @property
+    def nodes_start(self) -> int:
+        return self.op_table_end
+
+    @property
+    def literal_lower_bound(self) -> int:
+        """
+        For this Sonoma baseline, op_table entries behave like u16 word offsets
+        (8-byte units) into the node stream. The maximum op_table target is a
+        hard lower bound for where the literal pool may begin, to avoid the
+        common failure mode where printable-run heuristics "find" ASCII-looking
+        bytes inside the node stream and truncate the node region.
+        """
+        nodes_start = self.nodes_start
+        entries = self.op_entries()
+        if not entries:
+            return nodes_start
+        return min(max(nodes_start + (max(entries) + 1) * 8, nodes_start), len(self.data))
+
+    @property
+    def literal_start(self) -> int:
+        if self._literal_start is None:
+            if self.is_legacy:
+                self._literal_start = self.op_table_end
+            else:
+                if self._raw is None:
+                    self._raw = self.data.tobytes()
+                self._literal_start = find_literal_start(self._raw, self.literal_lower_bound)
+        return self._literal_start
+
+    @property
+    def nodes_end(self) -> int:
+        # Legacy handlers are embedded in the regex/literal area.
+        return self.literal_start
+
+    @property
+    def nodes(self) -> memoryview:
+        return self.data[self.nodes_start : self.nodes_end]
+
+    @property
+    def regex_literals(self) -> memoryview:
+        return self.data[self.literal_start :]
+
+    @property
+    def offsets(self) -> SectionOffsets:
+        return SectionOffsets(
+            op_table_start=self.op_table_start,
+            op_table_end=self.op_table_end,
+            nodes_start=self.nodes_start,
+            nodes_end=self.nodes_end,
+            literal_start=self.literal_start,
+            literal_end=len(self.data),
+        )
+
+    def sections(self) -> Sections:
+        return Sections(
+            op_table=self.op_table.tobytes(),
+            nodes=self.nodes.tobytes(),
+            regex_literals=self.regex_literals.tobytes(),
+        )
+
+
 def slice_sections(blob: ProfileBlob, header: Header) -> Sections:
     sections, _offsets = slice_sections_with_offsets(blob, header)
     return sections
 
 
 def slice_sections_with_offsets(blob: ProfileBlob, header: Header) -> tuple[Sections, SectionOffsets]:
-    data = blob.bytes
-    if header.format_variant == "legacy-decision-tree":
-        re_offset_bytes = int.from_bytes(data[0:2], "little") * 8
-        op_table_start = 4
-        op_table_end = re_offset_bytes
-        literal_start = re_offset_bytes
-        literal_end = len(data)
-        op_table = data[op_table_start:op_table_end]
-        nodes = b""  # legacy handlers are embedded; keep them in regex_literals below
-        regex_literals = data[literal_start:]
-        return (
-            Sections(op_table=op_table, nodes=nodes, regex_literals=regex_literals),
-            SectionOffsets(
-                op_table_start=op_table_start,
-                op_table_end=op_table_end,
-                nodes_start=literal_start,
-                nodes_end=literal_start,
-                literal_start=literal_start,
-                literal_end=literal_end,
-            ),
-        )
-    # Modern heuristic: treat bytes 0x10..(0x10 + op_count*2) as op-table.
-    op_table_len = 0
-    if header.operation_count:
-        op_table_len = header.operation_count * 2
-    op_table_start = 16
-    op_table_end = min(len(data), op_table_start + op_table_len)
-    op_table = data[op_table_start:op_table_end]
-
-    # Attempt to split node area vs literal/regex pool.
-    #
-    # For this Sonoma baseline, op_table entries behave like u16 word offsets
-    # (8-byte units) into the node stream. Use the maximum op_table target as a
-    # hard lower bound for where the literal pool may begin, to avoid the common
-    # failure mode where printable-run heuristics "find" ASCII-looking bytes
-    # inside the node stream and truncate the node region.
-    nodes_start = op_table_end
-    op_entries = [int.from_bytes(op_table[i : i + 2], "little") for i in range(0, len(op_table), 2)]
-    lower_bound = nodes_start
-    if op_entries:
-        lower_bound = nodes_start + (max(op_entries) + 1) * 8
-        if lower_bound < nodes_start:
-            lower_bound = nodes_start
-        if lower_bound > len(data):
-            lower_bound = len(data)
-
-    def find_literal_start(buf: bytes, start: int) -> int:
-        segments = _parse_macho_segments(buf)
-        for seg in segments:
-            if seg["name"] == "__TEXT":
-                cstring = seg["fileoff"] + seg["filesize"]  # crude upper bound
-                if cstring >= start:
-                    return cstring
-        # Prefer a short run of non-NUL printable characters starting at the lower bound.
-        min_run = 4
-        for i in range(start, len(buf) - min_run):
-            j = i
-            while j < len(buf) and buf[j] != 0x00 and buf[j] in PRINTABLE:
-                j += 1
-            if j - i >= min_run:
-                return i
-        # Fallback: ratio-based scan, still starting at the lower bound.
-        window = 64
-        threshold = 0.7
-        for i in range(start, len(buf)):
-            chunk = buf[i : min(len(buf), i + window)]
-            if not chunk:
-                continue
-            printable = sum(1 for b in chunk if b == 0x00 or b in PRINTABLE)
-            if printable / len(chunk) >= threshold:
-                return i
-        return len(buf)
-
-    literal_start = find_literal_start(data, lower_bound)
-    literal_end = len(data)
-    nodes_end = literal_start
-    nodes = data[nodes_start:nodes_end]
-    regex_literals = data[literal_start:literal_end]
-    return (
-        Sections(op_table=op_table, nodes=nodes, regex_literals=regex_literals),
-        SectionOffsets(
-            op_table_start=op_table_start,
-            op_table_end=op_table_end,
-            nodes_start=nodes_start,
-            nodes_end=nodes_end,
-            literal_start=literal_start,
-            literal_end=literal_end,
-        ),
-    )
+    view = ProfileView(blob.bytes, blob.source, header=header)
+    return view.sections(), view.offsets
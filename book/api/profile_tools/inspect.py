@@ -13,6 +13,7 @@ from typing import Any, Dict, List, Sequence
 from . import bytes_util as bu
 from . import decoder as decoder
 from . import ingestion as pi
+from .mapping_context import MappingContext
 
 
 @dataclass
@@ -68,13 +69,15 @@ def _tag_counts(nodes: bytes, stride: int = 12) -> Dict[int, int]:
     return bu.tag_counts(nodes, stride=stride)
 
 
-def summarize_blob(blob: bytes, strides: Sequence[int] = (8, 12, 16)) -> Summary:
+def summarize_blob(
+    blob: bytes, strides: Sequence[int] = (8, 12, 16), mappings: MappingContext | None = None
+) -> Summary:
     header_words = [int.from_bytes(blob[i : i + 2], "little") for i in range(0, min(len(blob), 16), 2)]
     header = pi.parse_header(pi.ProfileBlob(bytes=blob, source="inspect_profile"))
     sections = pi.slice_sections(pi.ProfileBlob(bytes=blob, source="inspect_profile"), header)
     op_count = header.operation_count or 0
     op_entries = bu.op_entries(blob, op_count) if op_count else []
-    decoded = decoder.decode_profile_dict(blob)
+    decoded = decoder.decode_profile_dict(blob, mappings=mappings)
     nodes_raw: List[Dict[str, Any]] | None = None
     if sections.nodes:
         stride = 12  # default modern stride for Sonoma baseline
@@ -0,0 +1,192 @@
+"""
+Decoder mapping side-tables (Sonoma baseline).
+
+The decoder annotates nodes with three published mappings:
+- `book/graph/mappings/tag_layouts/tag_layouts.json` (falling back to the
+  probe-op-structure experiment's tag_layout_assumptions.json),
+- `book/graph/mappings/tag_layouts/tag_u16_roles.json`,
+- `book/graph/mappings/vocab/filters.json`.
+
+`MappingContext` holds the parsed tables so a batch of decodes reads and parses
+them once. `default_mapping_context()` returns a process-wide instance that is
+keyed by each file's (mtime_ns, size) and reloads when a mapping is edited.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from book.api.path_utils import find_repo_root, to_repo_relative
+
+TagLayouts = Dict[int, Tuple[int, Tuple[int, ...], Tuple[int, ...]]]
+
+TAG_LAYOUT_CANDIDATES = (
+    "book/graph/mappings/tag_layouts/tag_layouts.json",
+    "book/experiments/probe-op-structure/out/tag_layout_assumptions.json",
+)
+TAG_U16_ROLES_PATH = "book/graph/mappings/tag_layouts/tag_u16_roles.json"
+FILTER_VOCAB_PATH = "book/graph/mappings/vocab/filters.json"
+
+
+@dataclass(frozen=True)
+class MappingContext:
+    """
+    Parsed decoder side-tables plus the provenance of each.
+
+    `tag_layouts` holds only the externally mapped layouts (the decoder merges
+    its own defaults underneath). `sources` maps each table name to the
+    repo-relative path it came from, and `sha256` maps the same names to the
+    content hash of that file (None when the table was absent).
+    """
+
+    tag_layouts: TagLayouts = field(default_factory=dict)
+    tag_u16_roles: Dict[int, str] = field(default_factory=dict)
+    filter_vocab: Dict[int, str] = field(default_factory=dict)
+    sources: Dict[str, Optional[str]] = field(default_factory=dict)
+    sha256: Dict[str, Optional[str]] = field(default_factory=dict)
+
+    def fingerprint(self) -> str:
+        """Stable hash over the table hashes; changes whenever any mapping does."""
+        payload = json.dumps(self.sha256, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+
+
+def _read_json(path: Path) -> Tuple[Optional[Any], Optional[str]]:
+    try:
+        raw = path.read_bytes()
+        return json.loads(raw), hashlib.sha256(raw).hexdigest()
+    except Exception:
+        return None, None
+
+
+def _parse_tag_layouts(data: Any) -> TagLayouts:
+    out: TagLayouts = {}
+    for entry in data.get("tags", []):
+        try:
+            tag = int(entry["tag"])
+        except Exception:
+            continue
+        rec_size = int(entry.get("record_size_bytes", 12))
+        edges = tuple(entry.get("edge_fields", []))
+        payloads = tuple(entry.get("payload_fields", []))
+        out[tag] = (rec_size, edges, payloads)
+    return out
+
+
+def _parse_tag_u16_roles(data: Any) -> Dict[int, str]:
+    out: Dict[int, str] = {}
+    for entry in data.get("roles", []):
+        try:
+            out[int(entry["tag"])] = str(entry["u16_role"])
+        except Exception:
+            continue
+    return out
+
+
+def _parse_filter_vocab(data: Any) -> Dict[int, str]:
+    out: Dict[int, str] = {}
+    entries = data.get("filters", []) if isinstance(data, dict) else data
+    for entry in entries or []:
+        try:
+            out[int(entry["id"])] = str(entry["name"])
+        except Exception:
+            continue
+    return out
+
+
+def _mapping_paths(root: Path) -> List[Path]:
+    return [root / rel for rel in (*TAG_LAYOUT_CANDIDATES, TAG_U16_ROLES_PATH, FILTER_VOCAB_PATH)]
+
+
+def load_mapping_context(repo_root: Path | None = None) -> MappingContext:
+    """
+    Read and parse the decoder side-tables from disk.
+
+    Missing or unreadable tables yield empty mappings, matching the decoder's
+    historical best-effort behavior. Tag layouts use the first candidate that
+    exists and parses.
+    """
+    try:
+        root = repo_root or find_repo_root(Path(__file__))
+    except Exception:
+        return MappingContext()
+
+    sources: Dict[str, Optional[str]] = {"tag_layouts": None, "tag_u16_roles": None, "filter_vocab": None}
+    sha: Dict[str, Optional[str]] = dict(sources)
+
+    tag_layouts: TagLayouts = {}
+    for rel in TAG_LAYOUT_CANDIDATES:
+        path = root / rel
+        if not path.exists():
+            continue
+        data, digest = _read_json(path)
+        if data is None:
+            continue
+        if data:
+            tag_layouts = _parse_tag_layouts(data)
+        sources["tag_layouts"], sha["tag_layouts"] = to_repo_relative(path, root), digest
+        break
+
+    def load_table(name: str, rel: str, parse) -> Dict[int, str]:
+        path = root / rel
+        if not path.exists():
+            return {}
+        data, digest = _read_json(path)
+        if data is None:
+            return {}
+        sources[name], sha[name] = to_repo_relative(path, root), digest
+        return parse(data)
+
+    tag_u16_roles = load_table("tag_u16_roles", TAG_U16_ROLES_PATH, _parse_tag_u16_roles)
+    filter_vocab = load_table("filter_vocab", FILTER_VOCAB_PATH, _parse_filter_vocab)
+    return MappingContext(
+        tag_layouts=tag_layouts,
+        tag_u16_roles=tag_u16_roles,
+        filter_vocab=filter_vocab,
+        sources=sources,
+        sha256=sha,
+    )
+
+
+def _stat_key(root: Path) -> Tuple[Any, ...]:
+    key: List[Any] = [str(root)]
+    for path in _mapping_paths(root):
+        try:
+            st = path.stat()
+        except OSError:
+            key.append(None)
+            continue
+        key.append((st.st_mtime_ns, st.st_size))
+    return tuple(key)
+
+
+_DEFAULT: Optional[Tuple[Tuple[Any, ...], MappingContext]] = None
+
+
+def default_mapping_context() -> MappingContext:
+    """
+    Return the process-wide MappingContext, reloading it if any mapping file's
+    mtime or size changed since it was loaded.
+    """
+    global _DEFAULT
+    try:
+        root = find_repo_root(Path(__file__))
+    except Exception:
+        return MappingContext()
+    key = _stat_key(root)
+    cached = _DEFAULT
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    ctx = load_mapping_context(root)
+    _DEFAULT = (key, ctx)
+    return ctx
+
+
+def clear_default_mapping_context() -> None:
+    """Drop the process-wide context so the next call reloads from disk."""
+    global _DEFAULT
+    _DEFAULT = None
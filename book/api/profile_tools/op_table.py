@@ -14,8 +14,9 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Sequence
 
 from . import bytes_util as bu
-from . import decoder as decoder
+from . import decode_cache
 from . import ingestion as pi
+from .mapping_context import MappingContext
 
 
 ALLOW_RE = re.compile(r"^\(allow\s+([^\s)]+)")
@@ -113,14 +114,17 @@ def summarize_profile(
     filters: List[str],
     op_count_override: Optional[int] = None,
     filter_map: Optional[Dict[str, int]] = None,
+    mappings: Optional[MappingContext] = None,
 ) -> Summary:
     header = pi.parse_header(pi.ProfileBlob(bytes=blob, source=name))
     if op_count_override:
         header.operation_count = op_count_override
-    sections = pi.slice_sections(pi.ProfileBlob(bytes=blob, source=name), header)
+    view = pi.ProfileView(blob, name, header=header)
+    nodes = view.nodes
+    literals = view.regex_literals
     op_count = header.operation_count or 0
     entries = bu.op_entries(blob, op_count) if op_count else []
-    decoded = decoder.decode_profile_dict(blob)
+    decoded = decode_cache.decode_profile_dict(blob, mappings=mappings)
     header_words = [int.from_bytes(blob[i : i + 2], "little") for i in range(0, min(len(blob), 16), 2)]
     entry_sigs = {str(e): entry_signature(decoded, e) for e in sorted(set(entries))}
     return Summary(
@@ -135,13 +139,13 @@ def summarize_profile(
         header_words=header_words if header_words else None,
         op_entries=entries,
         section_lengths={
-            "op_table": len(sections.op_table),
-            "nodes": len(sections.nodes),
-            "literals": len(sections.regex_literals),
+            "op_table": view.op_table_end - view.op_table_start,
+            "nodes": len(nodes),
+            "literals": len(literals),
         },
-        tag_counts_stride12={str(k): v for k, v in bu.tag_counts(sections.nodes).items()},
-        remainder_stride12_hex=sections.nodes[(len(sections.nodes) // 12) * 12 :].hex(),
-        literal_strings=bu.ascii_strings(sections.regex_literals),
+        tag_counts_stride12={str(k): v for k, v in bu.tag_counts(nodes).items()},
+        remainder_stride12_hex=nodes[(len(nodes) // 12) * 12 :].hex(),
+        literal_strings=bu.ascii_strings(literals),
         decoder={
             "format_variant": decoded.get("format_variant"),
             "op_count": decoded.get("op_count"),
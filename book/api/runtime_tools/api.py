@@ -459,6 +459,7 @@ def run_plan(
     only_profiles: Optional[Iterable[str]] = None,
     only_scenarios: Optional[Iterable[str]] = None,
     dry_run: bool = False,
+    parallel: int = 1,
 ) -> RunBundle:
     channel_spec = channel if isinstance(channel, ChannelSpec) else ChannelSpec(channel=channel)
     plan_doc = plan_loader.load_plan(plan_path)
@@ -497,6 +498,7 @@ def run_plan(
                 only_profiles=only_profiles,
                 only_scenarios=only_scenarios,
                 run_id=run_id,
+                parallel=parallel,
             )
             run_dir = out_root / run_id
             run_manifest = run_dir / "run_manifest.json"
@@ -580,7 +582,10 @@ def run_plan(
             )
 
             if effective_lanes.get("scenario", True):
-                _ = workflow.run_profiles(profiles, run_dir, world_id=world_id)
+                # Plans whose probes share fixtures can force serial execution.
+                controls = plan_doc.get("controls") or {}
+                probe_parallel = 1 if controls.get("serialize_probes") else parallel
+                _ = workflow.run_profiles(profiles, run_dir, world_id=world_id, parallel=probe_parallel)
                 expected_matrix_path = run_dir / "expected_matrix.json"
                 expected_matrix_path.write_text((run_dir / "expected_matrix.generated.json").read_text())
 
@@ -10,6 +10,10 @@ The orchestration logic and bundle lifecycle live in `book.api.runtime_tools.api
 
 from __future__ import annotations
 
+from .digests import (  # noqa: F401
+    DigestSidecar,
+    sha256_paths,
+)
 from .reader import (  # noqa: F401
     BundleState,
     resolve_bundle_dir,
@@ -23,6 +27,8 @@ from .writer import (  # noqa: F401
 )
 
 __all__ = [
+    "DigestSidecar",
+    "sha256_paths",
     "BundleState",
     "resolve_bundle_dir",
     "load_bundle_index_strict",
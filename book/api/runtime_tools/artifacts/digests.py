@@ -0,0 +1,156 @@
+"""
+runtime_tools artifact digests (service contract).
+
+Strict bundle loads, unverified opens, and index commits all hash every
+indexed artifact. This module keeps that work cheap without changing what is
+verified:
+
+- `sha256_path` hashes through a read-only mmap (falling back to buffered
+  reads for files that cannot be mapped).
+- `sha256_paths` fans a batch out across a thread pool; hashlib releases the
+  GIL while digesting, so large artifacts hash concurrently.
+- `DigestSidecar` is an optional JSON cache of previously computed digests
+  keyed by (path, size, mtime_ns, inode). It only short-cuts hashing; the
+  cached digest is still compared against the index, so a tampered index is
+  rejected exactly as before. It is off unless `SANDBOX_LORE_DIGEST_SIDECAR`
+  names a sidecar file, because an in-place rewrite that preserves size,
+  mtime, and inode would go unnoticed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SIDECAR_ENV = "SANDBOX_LORE_DIGEST_SIDECAR"
+SIDECAR_SCHEMA_VERSION = "runtime-tools.digest_sidecar.v0.1"
+
+StatKey = Tuple[int, int, int]
+
+
+def sha256_path(path: Path) -> str:
+    with path.open("rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        if size == 0:
+            return hashlib.sha256(b"").hexdigest()
+        try:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return hashlib.sha256(mm).hexdigest()
+        except (OSError, ValueError):
+            fh.seek(0)
+            return hashlib.file_digest(fh, "sha256").hexdigest()
+
+
+def _stat_key(path: Path) -> Optional[StatKey]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns, st.st_ino)
+
+
+class DigestSidecar:
+    """
+    Digest cache persisted as JSON at `path`.
+
+    Entries are recorded only when a file's stat key is identical before and
+    after hashing, so a file rewritten mid-hash is never cached.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, object]] = {}
+        self._dirty = False
+        try:
+            doc = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            doc = None
+        if isinstance(doc, dict) and doc.get("schema_version") == SIDECAR_SCHEMA_VERSION:
+            entries = doc.get("entries")
+            if isinstance(entries, dict):
+                self._entries = entries
+
+    def lookup(self, path: Path, key: Optional[StatKey]) -> Optional[str]:
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(str(path))
+        if not entry or tuple(entry.get("stat") or ()) != key:
+            return None
+        digest = entry.get("sha256")
+        return digest if isinstance(digest, str) else None
+
+    def record(self, path: Path, key: StatKey, digest: str) -> None:
+        with self._lock:
+            self._entries[str(path)] = {"stat": list(key), "sha256": digest}
+            self._dirty = True
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            doc = {"schema_version": SIDECAR_SCHEMA_VERSION, "entries": self._entries}
+            payload = json.dumps(doc, indent=2, sort_keys=True)
+            self._dirty = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                fh.write(payload)
+            os.replace(tmp, self.path)
+        except Exception:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+
+def default_sidecar() -> Optional[DigestSidecar]:
+    """Sidecar named by SANDBOX_LORE_DIGEST_SIDECAR, or None when unset."""
+    value = os.environ.get(SIDECAR_ENV, "").strip()
+    if not value:
+        return None
+    return DigestSidecar(Path(value).expanduser())
+
+
+def _digest_with_sidecar(path: Path, sidecar: Optional[DigestSidecar]) -> str:
+    if sidecar is None:
+        return sha256_path(path)
+    before = _stat_key(path)
+    cached = sidecar.lookup(path, before)
+    if cached is not None:
+        return cached
+    digest = sha256_path(path)
+    if before is not None and _stat_key(path) == before:
+        sidecar.record(path, before, digest)
+    return digest
+
+
+def sha256_paths(
+    paths: Iterable[Path],
+    *,
+    sidecar: Optional[DigestSidecar] = None,
+    max_workers: Optional[int] = None,
+) -> Dict[Path, str]:
+    """
+    Hash `paths` concurrently and return path -> sha256 hex digest.
+
+    Errors (e.g. a file removed mid-run) propagate from the first failing path
+    in input order. When `sidecar` is given, cached digests are reused and new
+    ones are recorded and saved.
+    """
+    unique: List[Path] = list(dict.fromkeys(paths))
+    if len(unique) <= 1 or max_workers == 1:
+        digests = [_digest_with_sidecar(p, sidecar) for p in unique]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            digests = list(pool.map(lambda p: _digest_with_sidecar(p, sidecar), unique))
+    if sidecar is not None:
+        sidecar.save()
+    return dict(zip(unique, digests))
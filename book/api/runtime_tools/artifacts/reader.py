@@ -18,7 +18,6 @@ the bundle is complete or promotable.
 
 from __future__ import annotations
 
-import hashlib
 import json
 from enum import StrEnum
 from pathlib import Path
@@ -26,6 +25,8 @@ from typing import Any, Dict, Optional, Tuple
 
 from book.api import path_utils
 
+from .digests import default_sidecar, sha256_paths
+
 
 class BundleState(StrEnum):
     """
@@ -43,17 +44,6 @@ class BundleState(StrEnum):
     FAILED = "failed"
 
 
-def _sha256_path(path: Path) -> str:
-    h = hashlib.sha256()
-    with path.open("rb") as fh:
-        while True:
-            chunk = fh.read(1024 * 1024)
-            if not chunk:
-                break
-            h.update(chunk)
-    return h.hexdigest()
-
-
 def _latest_run_id(bundle_root: Path) -> Optional[str]:
     latest = bundle_root / "LATEST"
     if not latest.exists():
@@ -88,6 +78,9 @@ def load_bundle_index_strict(bundle_dir: Path, *, repo_root: Path) -> Dict[str,
     - The bundle is not `in_progress`.
     - `artifact_index.json` exists and every indexed artifact exists and matches
       its recorded digest.
+
+    Digests are computed concurrently (see `digests.sha256_paths`); errors are
+    still raised for the first failing entry in index order.
     """
 
     bundle_dir, _ = resolve_bundle_dir(bundle_dir, repo_root=repo_root)
@@ -102,12 +95,16 @@ def load_bundle_index_strict(bundle_dir: Path, *, repo_root: Path) -> Dict[str,
         raise FileNotFoundError(f"missing artifact_index.json in {bundle_dir}")
     index = json.loads(index_path.read_text(encoding="utf-8", errors="ignore"))
     artifacts = index.get("artifacts") or []
-    for entry in artifacts:
-        path = path_utils.ensure_absolute(Path(entry["path"]), repo_root)
+    paths = [path_utils.ensure_absolute(Path(entry["path"]), repo_root) for entry in artifacts]
+    digests = sha256_paths(
+        [path for entry, path in zip(artifacts, paths) if entry.get("sha256") and path.exists()],
+        sidecar=default_sidecar(),
+    )
+    for entry, path in zip(artifacts, paths):
         if not path.exists():
             raise FileNotFoundError(f"missing artifact: {entry['path']}")
         expected = entry.get("sha256")
-        if expected and _sha256_path(path) != expected:
+        if expected and digests[path] != expected:
             raise ValueError(f"digest mismatch for {entry['path']}")
     return index
 
@@ -138,6 +135,7 @@ def open_bundle_unverified(bundle_dir: Path, *, repo_root: Path) -> Dict[str, An
         return payload
     index = json.loads(index_path.read_text(encoding="utf-8", errors="ignore"))
     payload["artifact_index"] = index
+    present = []
     for entry in index.get("artifacts") or []:
         rel = entry.get("path")
         if not rel:
@@ -146,7 +144,8 @@ def open_bundle_unverified(bundle_dir: Path, *, repo_root: Path) -> Dict[str, An
         if not path.exists():
             payload["missing"].append(rel)
             continue
-        expected = entry.get("sha256")
-        if expected and _sha256_path(path) != expected:
-            payload["digest_mismatches"].append(rel)
+        if entry.get("sha256"):
+            present.append((rel, path, entry["sha256"]))
+    digests = sha256_paths([path for _rel, path, _expected in present], sidecar=default_sidecar())
+    payload["digest_mismatches"] = [rel for rel, path, expected in present if digests[path] != expected]
     return payload
@@ -17,7 +17,6 @@ not run probes, interpret evidence tiers, or decide promotability.
 
 from __future__ import annotations
 
-import hashlib
 import json
 import os
 from enum import StrEnum
@@ -26,6 +25,8 @@ from typing import Any, Dict, Iterable, Optional
 
 from book.api import path_utils
 
+from .digests import default_sidecar, sha256_path, sha256_paths  # noqa: F401
+
 
 class ArtifactIndexStatus(StrEnum):
     """
@@ -56,17 +57,6 @@ def write_text_atomic(path: Path, text: str) -> None:
     os.replace(tmp, path)
 
 
-def sha256_path(path: Path) -> str:
-    h = hashlib.sha256()
-    with path.open("rb") as fh:
-        while True:
-            chunk = fh.read(1024 * 1024)
-            if not chunk:
-                break
-            h.update(chunk)
-    return h.hexdigest()
-
-
 def extract_schema_version(path: Path) -> Optional[str]:
     if path.suffix == ".jsonl":
         for line in path.read_text(encoding="utf-8", errors="ignore").splitlines():
@@ -100,16 +90,22 @@ def write_artifact_index(
 ) -> Path:
     artifacts = []
     missing = []
+    present = []
     for name in expected_artifacts:
         path = out_dir / name
         if not path.exists():
             missing.append(path_utils.to_repo_relative(path, repo_root=repo_root))
             continue
+        present.append(path)
+    # Hash concurrently; recording into the sidecar (when enabled) lets the
+    # strict load that usually follows a commit skip rehashing.
+    digests = sha256_paths(present, sidecar=default_sidecar())
+    for path in present:
         artifacts.append(
             {
                 "path": path_utils.to_repo_relative(path, repo_root=repo_root),
                 "file_size": path.stat().st_size,
-                "sha256": sha256_path(path),
+                "sha256": digests[path],
                 "schema_version": extract_schema_version(path),
             }
         )
@@ -64,6 +64,7 @@ def _build_plist(
     out_dir: Path,
     only_profiles: Optional[Iterable[str]],
     only_scenarios: Optional[Iterable[str]],
+    parallel: int = 1,
 ) -> dict:
     program = str(PYTHON if PYTHON.exists() else sys.executable)
     args = [program, "-m", "book.api.runtime_tools", "run", "--plan", str(plan_path), "--out", str(out_dir)]
@@ -74,6 +75,8 @@ def _build_plist(
     if only_scenarios:
         for sid in only_scenarios:
             args += ["--only-scenario", sid]
+    if parallel > 1:
+        args += ["--parallel", str(parallel)]
     env = {
         "PYTHONPATH": str(repo_root),
         "SANDBOX_LORE_RUN_ID": run_id,
@@ -113,6 +116,7 @@ def run_via_launchctl(
     only_profiles: Optional[Iterable[str]] = None,
     only_scenarios: Optional[Iterable[str]] = None,
     run_id: Optional[str] = None,
+    parallel: int = 1,
 ) -> None:
     if not LAUNCHCTL.exists():
         raise RuntimeError("launchctl missing")
@@ -149,6 +153,7 @@ def run_via_launchctl(
         out_dir=staged_out,
         only_profiles=only_profiles,
         only_scenarios=only_scenarios,
+        parallel=parallel,
     )
     plist_path.write_bytes(plistlib.dumps(plist))
 
@@ -69,6 +69,7 @@ def run_command(args: argparse.Namespace) -> int:
             only_profiles=args.only_profile,
             only_scenarios=args.only_scenario,
             dry_run=args.dry,
+            parallel=args.parallel,
         )
         print(f"[+] wrote {bundle.out_dir}")
         print(f"[+] updated {out_dir / 'LATEST'}")
@@ -76,7 +77,7 @@ def run_command(args: argparse.Namespace) -> int:
     if args.dry:
         raise SystemExit("--dry requires --plan")
     out_dir = args.out or (BOOK_ROOT / "profiles" / "golden-triple")
-    out_path = harness_runner.run_matrix(args.matrix, out_dir=out_dir)
+    out_path = harness_runner.run_matrix(args.matrix, out_dir=out_dir, parallel=args.parallel)
     print(f"[+] wrote {out_path}")
     return 0
 
@@ -281,6 +282,12 @@ def main(argv: list[str] | None = None) -> int:
     ap_run.add_argument("--only-profile", action="append", default=[], help="Limit to a profile_id (plan mode)")
     ap_run.add_argument("--only-scenario", action="append", default=[], help="Limit to an expectation_id (plan mode)")
     ap_run.add_argument("--dry", action="store_true", help="Validate/emit plan artifacts without running probes")
+    ap_run.add_argument(
+        "--parallel",
+        type=int,
+        default=1,
+        help="Run up to N probes concurrently (results keep plan order; probes with a shared serial_group stay ordered)",
+    )
     ap_run.set_defaults(func=run_command)
 
     ap_norm = sub.add_parser("normalize", help="Normalize expected_matrix + runtime_results into observations.")
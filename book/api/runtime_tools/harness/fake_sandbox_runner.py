@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for `sandbox_runner` (test-only; applies no policy).
+
+Mirrors the runner CLI, `fake_sandbox_runner.py <profile> -- <cmd...>`, so the
+harness can be exercised on hosts without Seatbelt (e.g. Linux CI) by pointing
+`harness.runner.RUNNER` at this file. It never claims anything about sandbox
+semantics; results produced through it are fixtures, not evidence.
+
+Environment knobs:
+- SANDBOX_LORE_FAKE_RUNNER_DELAY: seconds to sleep before running the command.
+- SANDBOX_LORE_FAKE_RUNNER_DENY: comma-separated substrings; if any command
+  argument contains one, exit 1 ("deny") without running the command.
+- SANDBOX_LORE_FAKE_RUNNER_LOG: append one JSON line per start/end event
+  (pid, monotonic time, argv) for concurrency assertions.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+
+def _log(event: str, argv: list[str]) -> None:
+    path = os.environ.get("SANDBOX_LORE_FAKE_RUNNER_LOG")
+    if not path:
+        return
+    line = json.dumps({"event": event, "pid": os.getpid(), "t": time.monotonic(), "argv": argv})
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write(line + "\n")
+
+
+def main(argv: list[str]) -> int:
+    if len(argv) < 3 or argv[1] != "--":
+        print("usage: fake_sandbox_runner.py <profile> -- <cmd...>", file=sys.stderr)
+        return 64
+    cmd = argv[2:]
+    _log("start", cmd)
+    try:
+        delay = float(os.environ.get("SANDBOX_LORE_FAKE_RUNNER_DELAY") or 0)
+        if delay > 0:
+            time.sleep(delay)
+        deny = [s for s in (os.environ.get("SANDBOX_LORE_FAKE_RUNNER_DENY") or "").split(",") if s]
+        if any(token in arg for token in deny for arg in cmd):
+            print("fake_sandbox_runner: denied", file=sys.stderr)
+            return 1
+        return subprocess.run(cmd).returncode
+    finally:
+        _log("end", cmd)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
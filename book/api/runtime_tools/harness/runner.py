@@ -11,6 +11,8 @@ import hashlib
 import json
 import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -124,8 +126,12 @@ def _observe_path_unsandboxed(path: Optional[str]) -> Optional[Dict[str, Any]]:
             "observed_path_errno": exc.errno,
         }
     try:
-        buf = fcntl.fcntl(fd, fcntl.F_GETPATH, b"\0" * 1024)
-        observed = buf.split(b"\0", 1)[0].decode("utf-8", errors="replace")
+        if hasattr(fcntl, "F_GETPATH"):
+            buf = fcntl.fcntl(fd, fcntl.F_GETPATH, b"\0" * 1024)
+            observed = buf.split(b"\0", 1)[0].decode("utf-8", errors="replace")
+        else:
+            # Non-Darwin hosts (fake-runner tests): resolve via procfs.
+            observed = os.readlink(f"/proc/self/fd/{fd}")
         return {"observed_path": observed, "observed_path_source": "unsandboxed_fd_path"}
     except OSError as exc:
         return {
@@ -558,13 +564,220 @@ def run_probe(profile: Path, probe: Dict[str, Any], profile_mode: str | None, wr
         return {"error": str(e)}
 
 
+def _probe_record(
+    probe: Dict[str, Any],
+    raw: Dict[str, Any],
+    actual: Optional[str],
+    path_observation: Optional[Dict[str, Any]],
+    preflight_blocked: bool,
+) -> Dict[str, Any]:
+    expected = probe.get("expected")
+
+    stderr = raw.get("stderr") or ""
+    apply_markers = rt_contract.extract_sbpl_apply_markers(stderr)
+    apply_marker = _first_marker(apply_markers, "apply")
+    applied_marker = _first_marker(apply_markers, "applied")
+    exec_marker = _first_marker(apply_markers, "exec")
+    seatbelt_callouts = rt_contract.extract_seatbelt_callout_markers(stderr) or None
+
+    failure_stage: Optional[str] = None
+    failure_kind: Optional[str] = None
+    observed_errno: Optional[int] = None
+    apply_report: Optional[Dict[str, Any]] = None
+
+    if preflight_blocked:
+        failure_stage = "preflight"
+        failure_kind = "preflight_apply_gate_signature"
+    apply_rc = apply_marker.get("rc") if apply_marker else None
+    if isinstance(apply_rc, int) and apply_rc != 0:
+        failure_stage = "apply"
+        if apply_marker:
+            api = apply_marker.get("api")
+            errbuf = apply_marker.get("errbuf")
+            err_class = apply_marker.get("err_class")
+            apply_report = {
+                "api": api,
+                "rc": apply_marker.get("rc"),
+                "errno": apply_marker.get("errno"),
+                "errbuf": errbuf,
+                "err_class": err_class,
+                "err_class_source": apply_marker.get("err_class_source"),
+            }
+            if err_class == "already_sandboxed":
+                failure_kind = "apply_already_sandboxed"
+            else:
+                failure_kind = f"{api}_failed" if api else "apply_failed"
+        else:
+            failure_kind = "apply_failed"
+        observed_errno = apply_marker.get("errno") if apply_marker else None
+    else:
+        if apply_marker:
+            apply_report = {
+                "api": apply_marker.get("api"),
+                "rc": apply_marker.get("rc"),
+                "errno": apply_marker.get("errno"),
+                "errbuf": apply_marker.get("errbuf"),
+                "err_class": apply_marker.get("err_class"),
+                "err_class_source": apply_marker.get("err_class_source"),
+            }
+        exec_rc = exec_marker.get("rc") if exec_marker else None
+        if isinstance(exec_rc, int) and exec_rc != 0:
+            failure_stage = "bootstrap"
+            observed_errno = exec_marker.get("errno") if exec_marker else None
+            if applied_marker is not None and observed_errno == 1:
+                failure_kind = "bootstrap_deny_process_exec"
+            else:
+                failure_kind = "bootstrap_exec_failed"
+        elif raw.get("exit_code") not in (None, 0):
+            failure_stage = "probe"
+            failure_kind = "probe_nonzero_exit"
+            observed_errno = observed_errno or raw.get("exit_code")
+
+    entrypoint = (raw.get("command") or [None])[0]
+    entrypoint_path = Path(entrypoint) if isinstance(entrypoint, str) else None
+    runner_info: Optional[Dict[str, Any]]
+    if entrypoint == str(WRAPPER):
+        runner_info = {"entrypoint": "SBPL-wrapper", "apply_model": "exec_wrapper", "apply_timing": "pre_exec"}
+    elif entrypoint == str(RUNNER):
+        runner_info = {"entrypoint": "sandbox_runner", "apply_model": "exec_wrapper", "apply_timing": "pre_exec"}
+    elif entrypoint == str(READER):
+        runner_info = {"entrypoint": "sandbox_reader", "apply_model": "self_apply", "apply_timing": "pre_syscall"}
+    elif entrypoint == str(WRITER):
+        runner_info = {"entrypoint": "sandbox_writer", "apply_model": "self_apply", "apply_timing": "pre_syscall"}
+    else:
+        runner_info = None
+
+    if runner_info is not None:
+        preexisting = failure_kind == "apply_already_sandboxed"
+        if failure_stage == "apply" and isinstance(apply_report, dict):
+            if apply_report.get("err_class") == "errno_eperm":
+                preexisting = True
+        runner_info["preexisting_sandbox_suspected"] = preexisting
+
+    if runner_info is not None and entrypoint_path and entrypoint_path.exists():
+        runner_info["entrypoint_path"] = to_repo_relative(entrypoint_path, REPO_ROOT)
+        runner_info["entrypoint_sha256"] = _sha256_path(entrypoint_path)
+        runner_info["tool_build_id"] = runner_info["entrypoint_sha256"]
+
+    runtime_result = {
+        "status": "blocked" if preflight_blocked else ("success" if raw.get("exit_code") == 0 else "errno"),
+        "errno": None if preflight_blocked or raw.get("exit_code") == 0 else observed_errno,
+        "runtime_result_schema_version": rt_contract.CURRENT_RUNTIME_RESULT_SCHEMA_VERSION,
+        "tool_marker_schema_version": rt_contract.CURRENT_TOOL_MARKER_SCHEMA_VERSION,
+        "failure_stage": failure_stage,
+        "failure_kind": failure_kind,
+        "apply_report": apply_report,
+        "runner_info": runner_info,
+        "seatbelt_callouts": seatbelt_callouts,
+    }
+
+    violation_summary = None
+    if failure_stage in {"apply", "bootstrap"} and observed_errno == 1:
+        violation_summary = "EPERM"
+    elif (
+        failure_stage == "apply"
+        and isinstance(apply_report, dict)
+        and apply_report.get("err_class") == "errno_eperm"
+    ):
+        violation_summary = "EPERM"
+
+    return {
+        "name": probe.get("name"),
+        "expectation_id": probe.get("expectation_id"),
+        "operation": probe.get("operation"),
+        "path": probe.get("target"),
+        "expected": expected,
+        "actual": actual,
+        "match": (expected == actual) if actual is not None else None,
+        "runtime_result": runtime_result,
+        "violation_summary": violation_summary,
+        **({"path_observation": path_observation} if path_observation else {}),
+        **{**raw, "command": relativize_command(raw.get("command") or [], REPO_ROOT)},
+        **(
+            {"notes": "preflight blocked: known apply-gate signature"}
+            if preflight_blocked
+            else {}
+        ),
+    }
+
+
+@dataclass(frozen=True)
+class ProbeTask:
+    probe: Dict[str, Any]
+    runtime_profile: Path
+    profile_mode: Optional[str]
+    wrapper_preflight: Optional[str]
+    preflight_blocked: bool
+
+
+ProbeOutcome = tuple[Dict[str, Any], Optional[str], Optional[Dict[str, Any]]]
+
+
+def execute_probe_task(task: ProbeTask) -> ProbeOutcome:
+    """Observe the target (path ops) and run one probe; returns (raw, actual, path_observation)."""
+    path_observation = None
+    if _is_path_operation(task.probe.get("operation")):
+        path_observation = _observe_path_unsandboxed(task.probe.get("target"))
+    if task.preflight_blocked:
+        return {"command": [], "exit_code": None, "stdout": "", "stderr": ""}, None, path_observation
+    raw = run_probe(task.runtime_profile, task.probe, task.profile_mode, task.wrapper_preflight)
+    actual = "allow" if raw.get("exit_code") == 0 else "deny"
+    return raw, actual, path_observation
+
+
+def run_probe_tasks(tasks: List[ProbeTask], parallel: int = 1) -> List[ProbeOutcome]:
+    """
+    Execute probe tasks and return outcomes in task order.
+
+    With `parallel > 1`, independent probes run concurrently in a thread pool
+    (each probe is its own child process, so threads only wait on it). Probes
+    that share a fixture opt into ordering with a `serial_group` string: every
+    task in a group runs on one worker, in task order.
+    """
+    if parallel <= 1 or len(tasks) <= 1:
+        return [execute_probe_task(task) for task in tasks]
+
+    units: List[List[int]] = []
+    groups: Dict[str, List[int]] = {}
+    for idx, task in enumerate(tasks):
+        group = task.probe.get("serial_group")
+        if not isinstance(group, str) or not group:
+            units.append([idx])
+        elif group in groups:
+            groups[group].append(idx)
+        else:
+            groups[group] = [idx]
+            units.append(groups[group])
+
+    outcomes: List[Optional[ProbeOutcome]] = [None] * len(tasks)
+
+    def run_unit(unit: List[int]) -> None:
+        for idx in unit:
+            outcomes[idx] = execute_probe_task(tasks[idx])
+
+    with ThreadPoolExecutor(max_workers=parallel) as pool:
+        for future in [pool.submit(run_unit, unit) for unit in units]:
+            future.result()
+    return [outcome for outcome in outcomes if outcome is not None]
+
+
 def run_matrix(
     matrix_path: Path | str,
     out_dir: Path | None = None,
     runtime_profile_dir: Path | None = None,
     profile_paths: Dict[str, Path] | None = None,
     key_specific_rules: Dict[str, List[str]] | None = None,
+    parallel: int = 1,
 ) -> Path:
+    """
+    Run every probe of every profile in the expected matrix and write
+    `runtime_results.json`.
+
+    Profiles are prepared (and preflighted) in matrix order; probes then run
+    serially, or with `parallel > 1` in a bounded thread pool (see
+    `run_probe_tasks`). Results are always emitted in matrix order. A matrix
+    with `"serialize_probes": true` always runs serially.
+    """
     matrix_path = ensure_absolute(matrix_path, REPO_ROOT)
     out_dir = ensure_absolute(out_dir, REPO_ROOT) if out_dir else DEFAULT_OUT
     runtime_profile_dir = ensure_absolute(runtime_profile_dir, REPO_ROOT) if runtime_profile_dir else out_dir / "runtime_profiles"
@@ -576,6 +789,8 @@ def run_matrix(
     key_specific_rules = key_specific_rules or {}
 
     results: Dict[str, Any] = {}
+    tasks: List[ProbeTask] = []
+    pending: List[tuple[str, Path, Path, Optional[Dict[str, Any]], int, int]] = []
     preflight_enabled = os.environ.get("SANDBOX_LORE_PREFLIGHT") != "0"
     preflight_force = os.environ.get("SANDBOX_LORE_PREFLIGHT_FORCE") == "1"
     for key, rec in profiles.items():
@@ -635,155 +850,30 @@ def run_matrix(
             except Exception:
                 preflight_record = None
                 preflight_blocked = False
+        wrapper_preflight = None
+        if not profile_preflight_enabled:
+            wrapper_preflight = "off"
+        elif profile_preflight_force:
+            wrapper_preflight = "force"
+        else:
+            wrapper_preflight = "enforce"
         probes = rec.get("probes") or []
-        probe_results = []
+        # Placeholder keeps profile order in the emitted results; filled below.
+        results[key] = None
+        pending.append((key, runtime_profile, profile_path, preflight_record, len(tasks), len(probes)))
         for probe in probes:
-            path_observation = None
-            if _is_path_operation(probe.get("operation")):
-                path_observation = _observe_path_unsandboxed(probe.get("target"))
-            if preflight_blocked:
-                actual = None
-                raw = {"command": [], "exit_code": None, "stdout": "", "stderr": ""}
-            else:
-                wrapper_preflight = None
-                if not profile_preflight_enabled:
-                    wrapper_preflight = "off"
-                elif profile_preflight_force:
-                    wrapper_preflight = "force"
-                else:
-                    wrapper_preflight = "enforce"
-                raw = run_probe(runtime_profile, probe, profile_mode, wrapper_preflight)
-                actual = "allow" if raw.get("exit_code") == 0 else "deny"
-            expected = probe.get("expected")
-
-            stderr = raw.get("stderr") or ""
-            apply_markers = rt_contract.extract_sbpl_apply_markers(stderr)
-            apply_marker = _first_marker(apply_markers, "apply")
-            applied_marker = _first_marker(apply_markers, "applied")
-            exec_marker = _first_marker(apply_markers, "exec")
-            seatbelt_callouts = rt_contract.extract_seatbelt_callout_markers(stderr) or None
-
-            failure_stage: Optional[str] = None
-            failure_kind: Optional[str] = None
-            observed_errno: Optional[int] = None
-            apply_report: Optional[Dict[str, Any]] = None
-
-            if preflight_blocked:
-                failure_stage = "preflight"
-                failure_kind = "preflight_apply_gate_signature"
-            apply_rc = apply_marker.get("rc") if apply_marker else None
-            if isinstance(apply_rc, int) and apply_rc != 0:
-                failure_stage = "apply"
-                if apply_marker:
-                    api = apply_marker.get("api")
-                    errbuf = apply_marker.get("errbuf")
-                    err_class = apply_marker.get("err_class")
-                    apply_report = {
-                        "api": api,
-                        "rc": apply_marker.get("rc"),
-                        "errno": apply_marker.get("errno"),
-                        "errbuf": errbuf,
-                        "err_class": err_class,
-                        "err_class_source": apply_marker.get("err_class_source"),
-                    }
-                    if err_class == "already_sandboxed":
-                        failure_kind = "apply_already_sandboxed"
-                    else:
-                        failure_kind = f"{api}_failed" if api else "apply_failed"
-                else:
-                    failure_kind = "apply_failed"
-                observed_errno = apply_marker.get("errno") if apply_marker else None
-            else:
-                if apply_marker:
-                    apply_report = {
-                        "api": apply_marker.get("api"),
-                        "rc": apply_marker.get("rc"),
-                        "errno": apply_marker.get("errno"),
-                        "errbuf": apply_marker.get("errbuf"),
-                        "err_class": apply_marker.get("err_class"),
-                        "err_class_source": apply_marker.get("err_class_source"),
-                    }
-                exec_rc = exec_marker.get("rc") if exec_marker else None
-                if isinstance(exec_rc, int) and exec_rc != 0:
-                    failure_stage = "bootstrap"
-                    observed_errno = exec_marker.get("errno") if exec_marker else None
-                    if applied_marker is not None and observed_errno == 1:
-                        failure_kind = "bootstrap_deny_process_exec"
-                    else:
-                        failure_kind = "bootstrap_exec_failed"
-                elif raw.get("exit_code") not in (None, 0):
-                    failure_stage = "probe"
-                    failure_kind = "probe_nonzero_exit"
-                    observed_errno = observed_errno or raw.get("exit_code")
-
-            entrypoint = (raw.get("command") or [None])[0]
-            entrypoint_path = Path(entrypoint) if isinstance(entrypoint, str) else None
-            runner_info: Optional[Dict[str, Any]]
-            if entrypoint == str(WRAPPER):
-                runner_info = {"entrypoint": "SBPL-wrapper", "apply_model": "exec_wrapper", "apply_timing": "pre_exec"}
-            elif entrypoint == str(RUNNER):
-                runner_info = {"entrypoint": "sandbox_runner", "apply_model": "exec_wrapper", "apply_timing": "pre_exec"}
-            elif entrypoint == str(READER):
-                runner_info = {"entrypoint": "sandbox_reader", "apply_model": "self_apply", "apply_timing": "pre_syscall"}
-            elif entrypoint == str(WRITER):
-                runner_info = {"entrypoint": "sandbox_writer", "apply_model": "self_apply", "apply_timing": "pre_syscall"}
-            else:
-                runner_info = None
-
-            if runner_info is not None:
-                preexisting = failure_kind == "apply_already_sandboxed"
-                if failure_stage == "apply" and isinstance(apply_report, dict):
-                    if apply_report.get("err_class") == "errno_eperm":
-                        preexisting = True
-                runner_info["preexisting_sandbox_suspected"] = preexisting
-
-            if runner_info is not None and entrypoint_path and entrypoint_path.exists():
-                runner_info["entrypoint_path"] = to_repo_relative(entrypoint_path, REPO_ROOT)
-                runner_info["entrypoint_sha256"] = _sha256_path(entrypoint_path)
-                runner_info["tool_build_id"] = runner_info["entrypoint_sha256"]
-
-            runtime_result = {
-                "status": "blocked" if preflight_blocked else ("success" if raw.get("exit_code") == 0 else "errno"),
-                "errno": None if preflight_blocked or raw.get("exit_code") == 0 else observed_errno,
-                "runtime_result_schema_version": rt_contract.CURRENT_RUNTIME_RESULT_SCHEMA_VERSION,
-                "tool_marker_schema_version": rt_contract.CURRENT_TOOL_MARKER_SCHEMA_VERSION,
-                "failure_stage": failure_stage,
-                "failure_kind": failure_kind,
-                "apply_report": apply_report,
-                "runner_info": runner_info,
-                "seatbelt_callouts": seatbelt_callouts,
-            }
-
-            violation_summary = None
-            if failure_stage in {"apply", "bootstrap"} and observed_errno == 1:
-                violation_summary = "EPERM"
-            elif (
-                failure_stage == "apply"
-                and isinstance(apply_report, dict)
-                and apply_report.get("err_class") == "errno_eperm"
-            ):
-                violation_summary = "EPERM"
-
-            probe_results.append(
-                {
-                    "name": probe.get("name"),
-                    "expectation_id": probe.get("expectation_id"),
-                    "operation": probe.get("operation"),
-                    "path": probe.get("target"),
-                    "expected": expected,
-                    "actual": actual,
-                    "match": (expected == actual) if actual is not None else None,
-                    "runtime_result": runtime_result,
-                    "violation_summary": violation_summary,
-                    **({"path_observation": path_observation} if path_observation else {}),
-                    **{**raw, "command": relativize_command(raw.get("command") or [], REPO_ROOT)},
-                    **(
-                        {"notes": "preflight blocked: known apply-gate signature"}
-                        if preflight_blocked
-                        else {}
-                    ),
-                }
+            tasks.append(ProbeTask(probe, runtime_profile, profile_mode, wrapper_preflight, preflight_blocked))
+
+    if matrix.get("serialize_probes"):
+        parallel = 1
+    outcomes = run_probe_tasks(tasks, parallel=parallel)
+    for key, runtime_profile, profile_path, preflight_record, first, count in pending:
+        probe_results = [
+            _probe_record(task.probe, raw, actual, path_observation, task.preflight_blocked)
+            for task, (raw, actual, path_observation) in zip(
+                tasks[first : first + count], outcomes[first : first + count]
             )
+        ]
         status, note = classify_profile_status(probe_results)
         entry = {
             "status": status,
@@ -105,6 +105,8 @@ def _probe_to_row(probe: Dict[str, Any], profile_id: str) -> Dict[str, Any]:
         row["mode"] = probe.get("mode")
     if probe.get("driver"):
         row["driver"] = probe.get("driver")
+    if probe.get("serial_group"):
+        row["serial_group"] = probe.get("serial_group")
     return row
 
 
@@ -40,7 +40,8 @@ class ProfileSpec:
     - profile_id: identifier for this profile run (used in expected matrix)
     - profile_path: path to SBPL or blob to run
     - probes: list of probes with expected decisions
-      Each probe: {name, operation, target, expected, expectation_id?, mode?}
+      Each probe: {name, operation, target, expected, expectation_id?, mode?, serial_group?}
+      (probes sharing a serial_group never run concurrently; see harness.runner)
     - mode/profile_mode: optional mode hints (e.g., "sbpl", "blob")
     - family/semantic_group: optional tags for grouping/reporting
     - key_specific_rules: optional SBPL snippets to patch in for this key
@@ -333,10 +334,12 @@ def run_profiles(
     world_id: Optional[str] = None,
     key_specific_rules: Optional[Dict[str, List[str]]] = None,
     classification_strategy: Optional[Callable[[str, str, Dict[str, Any]], str]] = None,
+    parallel: int = 1,
 ) -> models.RuntimeRun:
     """
     Run the harness for the given profiles and emit a staged runtime cut.
     Returns a RuntimeRun bundle (expected_matrix, runtime_results, runtime cut paths, mismatch summary).
+    `parallel` bounds how many probes run concurrently (1 = serial).
     """
 
     out_dir = path_utils.ensure_absolute(out_dir, REPO_ROOT)
@@ -366,6 +369,7 @@ def run_profiles(
         runtime_profile_dir=out_dir / "runtime_profiles",
         profile_paths=profile_paths,
         key_specific_rules=key_rules,
+        parallel=parallel,
     )
 
     run_id = _run_id_from_env()
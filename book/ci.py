@@ -2,13 +2,15 @@
 """
 Unified CI/validation driver for SANDBOX_LORE.
 
-Runs the Python test harness and the Swift graph build once, with
-coarse-grained stamps to avoid rerunning expensive steps when inputs
-haven’t changed.
+Runs the Python test harness and the Swift graph build once. The Swift
+build uses coarse-grained stamps to avoid rerunning when its inputs haven’t
+changed; the Python harness runs only the test modules whose traced
+dependencies changed by content (see `book/tests/impact.py`).
 """
 
 from __future__ import annotations
 
+import argparse
 import json
 import os
 import subprocess
@@ -67,24 +69,18 @@ def _run_step(
     stamp.write_text(json.dumps({"fingerprint": fingerprint}, indent=2))
 
 
-def run_python_harness() -> None:
-    inputs = [
-        ROOT / "tests",
-        ROOT / "api",
-        ROOT / "graph" / "concepts" / "validation",
-        ROOT / "examples",
-        ROOT / "experiments",
-    ]
+def run_python_harness(run_all: bool = False, jobs: int | None = None, explain: bool = False) -> None:
     env = os.environ.copy()
     env["PYTHONPATH"] = str(REPO_ROOT)
-    _run_step(
-        "python-harness",
-        inputs,
-        [sys.executable, "-m", "book.tests.run_all"],
-        cwd=ROOT,
-        env=env,
-        always_run=True,
-    )
+    cmd = [sys.executable, "-m", "book.tests.impact"]
+    if run_all:
+        cmd.append("--all")
+    if jobs is not None:
+        cmd.extend(["--jobs", str(jobs)])
+    if explain:
+        cmd.append("--explain")
+    print(f"[ci] python-harness: running {' '.join(cmd)}", flush=True)
+    subprocess.check_call(cmd, cwd=ROOT, env=env)
 
 
 def run_swift_build() -> None:
@@ -103,8 +99,13 @@ def run_swift_build() -> None:
     )
 
 
-def main() -> None:
-    run_python_harness()
+def main(argv: List[str] | None = None) -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--all-tests", action="store_true", help="run every Python test module, not just impacted ones")
+    ap.add_argument("--jobs", type=int, help="parallel test worker processes (default: CPU count)")
+    ap.add_argument("--explain", action="store_true", help="print why each test module is selected or skipped")
+    args = ap.parse_args(argv)
+    run_python_harness(run_all=args.all_tests, jobs=args.jobs, explain=args.explain)
     run_swift_build()
 
 
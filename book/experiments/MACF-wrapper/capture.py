@@ -158,7 +158,7 @@ def normalize_log(
     summary_path: pathlib.Path | None,
 ) -> None:
     with raw_path.open() as f:
-        events = normalize.parse_raw_log(f.readlines())
+        events = normalize.parse_raw_log(f)
 
     static_refs = normalize.resolve_default_static_refs(repo_root)
     output = normalize.build_output(
@@ -5,13 +5,20 @@ from __future__ import annotations
 
 import argparse
 import hashlib
+import heapq
 import json
 import pathlib
-from typing import Dict, Iterable, List, Optional
+from collections import deque
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from book.api import path_utils
 
 CORRELATION_WINDOW_NS = 10_000_000  # 10 ms
+# DTrace drains per-CPU buffers at `switchrate` (1 Hz by default), so raw lines
+# can be out of timestamp order by up to about a second.
+REORDER_WINDOW_NS = 1_000_000_000
+QUANTILE_EXACT_LIMIT = 4096
+_SWEEP_EVERY = 4096
 DERIVED_OPERATION = {
     "mac_vnode_check_open": "vnode_open",
     "mac_vnop_setxattr": "vnode_setxattr",
@@ -57,8 +64,7 @@ def parse_event_line(line: str) -> Optional[Dict[str, str]]:
         fields[key] = value
     return fields
 
-def parse_raw_log(lines: Iterable[str]) -> List[Dict]:
-    events: List[Dict] = []
+def iter_raw_log(lines: Iterable[str]) -> Iterator[Dict]:
     for line in lines:
         fields = parse_event_line(line)
         if fields is None:
@@ -74,7 +80,7 @@ def parse_raw_log(lines: Iterable[str]) -> List[Dict]:
                 args = {"ctx": fields.get("ctx"), "vp": fields.get("vp"), "acc_mode": fields.get("acc_mode")}
             elif hook == "mac_vnop_setxattr":
                 args = {"vp": fields.get("vp"), "name_ptr": fields.get("name_ptr"), "buf_ptr": fields.get("buf_ptr"), "len": fields.get("len")}
-            events.append({
+            yield {
                 "kind": "hook",
                 "hook": hook,
                 "pid": pid,
@@ -84,7 +90,7 @@ def parse_raw_log(lines: Iterable[str]) -> List[Dict]:
                 "args": args,
                 "world": fields.get("world"),
                 "run_id": fields.get("run_id"),
-            })
+            }
         elif kind == "syscall":
             sys_name = fields.get("sys")
             sys_fields: Dict[str, str] = {}
@@ -94,7 +100,7 @@ def parse_raw_log(lines: Iterable[str]) -> List[Dict]:
                 sys_fields = {"path": fields.get("path"), "xattr_name": fields.get("name"), "size": fields.get("size")}
             elif sys_name == "fsetxattr":
                 sys_fields = {"fd": fields.get("fd"), "xattr_name": fields.get("name"), "size": fields.get("size")}
-            events.append({
+            yield {
                 "kind": "syscall",
                 "sys": sys_name,
                 "pid": pid,
@@ -102,14 +108,16 @@ def parse_raw_log(lines: Iterable[str]) -> List[Dict]:
                 "exec": fields.get("exec"),
                 "timestamp_ns": ts,
                 "fields": sys_fields,
-            })
-    return events
+            }
+
+def parse_raw_log(lines: Iterable[str]) -> List[Dict]:
+    return list(iter_raw_log(lines))
 
-def _match_syscall(hook_event: Dict, sys_events: List[Dict]) -> Optional[Dict]:
+def _match_syscall(hook_event: Dict, sys_events: Iterable[Dict]) -> Optional[Dict]:
     hook_name = hook_event.get("hook")
     allowed = HOOK_TO_SYSCALL.get(hook_name, set())
     hook_ts = hook_event.get("timestamp_ns")
-    for sys_ev in reversed(sys_events):
+    for sys_ev in reversed(sys_events):  # type: ignore[call-overload]
         if sys_ev.get("sys") not in allowed:
             continue
         sys_ts = sys_ev.get("timestamp_ns")
@@ -121,44 +129,114 @@ def _match_syscall(hook_event: Dict, sys_events: List[Dict]) -> Optional[Dict]:
         return sys_ev
     return None
 
-def correlate_events(raw_events: List[Dict], runtime_world_id: str, run_id: str) -> List[Dict]:
-    sorted_events = sorted(raw_events, key=lambda ev: ev.get("timestamp_ns") or 0)
-    sys_by_thread: Dict[tuple, List[Dict]] = {}
-    hook_outputs: List[Dict] = []
-    for ev in sorted_events:
+def _hook_record(ev: Dict, matched_sys: Optional[Dict], runtime_world_id: str, run_id: str) -> Dict:
+    hook_name = ev.get("hook")
+    derived_op = DERIVED_OPERATION.get(hook_name)
+    op_flags: List[str] = []
+    args = ev.get("args") or {}
+    if hook_name == "mac_vnode_check_open":
+        op_flags = decode_acc_mode(args.get("acc_mode"))
+    syscall_obj = None
+    if matched_sys:
+        syscall_obj = {"sys": matched_sys.get("sys")}
+        syscall_fields = matched_sys.get("fields") or {}
+        syscall_obj.update(syscall_fields)
+        syscall_obj["timestamp_ns"] = matched_sys.get("timestamp_ns")
+    return {
+        "hook": hook_name,
+        "pid": ev.get("pid"),
+        "tid": ev.get("tid"),
+        "execname": ev.get("exec"),
+        "timestamp_ns": ev.get("timestamp_ns"),
+        "args": args,
+        "derived_operation": derived_op,
+        "operation_flags": op_flags,
+        "syscall": syscall_obj,
+        "world_id": runtime_world_id,
+        "run_id": run_id,
+    }
+
+def iter_time_ordered(events: Iterable[Dict], *, reorder_window_ns: int = REORDER_WINDOW_NS, stats: Optional[Dict[str, int]] = None) -> Iterator[Dict]:
+    """
+    Re-sort a nearly ordered event stream with a bounded heap: an event is
+    released once the newest timestamp seen is `reorder_window_ns` past it.
+    Ties keep input order, so a stream whose disorder fits in the window comes
+    out exactly as `sorted()` would produce it. Events arriving later than the
+    window are passed through as-is and counted in `stats["late_events"]`.
+    """
+    heap: List[Tuple[int, int, Dict]] = []
+    watermark: Optional[int] = None
+    released: Optional[int] = None
+    for seq, ev in enumerate(events):
+        key = ev.get("timestamp_ns") or 0
+        if released is not None and key < released:
+            if stats is not None:
+                stats["late_events"] = stats.get("late_events", 0) + 1
+            yield ev
+            continue
+        heapq.heappush(heap, (key, seq, ev))
+        if watermark is None or key > watermark:
+            watermark = key
+        while heap and heap[0][0] <= watermark - reorder_window_ns:
+            released, _, out = heapq.heappop(heap)
+            yield out
+    while heap:
+        _, _, out = heapq.heappop(heap)
+        yield out
+
+def iter_correlated(ordered_events: Iterable[Dict], runtime_world_id: str, run_id: str) -> Iterator[Dict]:
+    """
+    Correlate a time-ordered event stream, yielding one record per hook.
+
+    Each (pid, tid) keeps a deque of candidate syscalls pruned to
+    CORRELATION_WINDOW_NS behind the current timestamp (anything older can no
+    longer match a later hook), and idle threads are swept periodically, so
+    memory tracks the window rather than the capture.
+
+    Syscalls without a timestamp have no age, so they are held aside per
+    thread and never pruned. As in the batch matcher, a hook falls back to them
+    only when no dated syscall it accepts was seen on that thread, in or out of
+    the window.
+    """
+    candidate_sys = set().union(*HOOK_TO_SYSCALL.values())
+    sys_by_thread: Dict[tuple, Deque[Dict]] = {}
+    undated_by_thread: Dict[tuple, List[Dict]] = {}
+    expired_by_thread: Dict[tuple, set] = {}
+
+    def expire(key: tuple, events: Iterable[Dict]) -> None:
+        if key in undated_by_thread:
+            expired_by_thread.setdefault(key, set()).update(e.get("sys") for e in events)
+
+    for count, ev in enumerate(ordered_events, 1):
+        now = ev.get("timestamp_ns")
+        if now is not None and count % _SWEEP_EVERY == 0:
+            for key in [k for k, q in sys_by_thread.items() if not q or now - q[-1]["timestamp_ns"] > CORRELATION_WINDOW_NS]:
+                expire(key, sys_by_thread.pop(key))
         key = (ev.get("pid"), ev.get("tid"))
+        queue = sys_by_thread.get(key)
+        if queue is not None and now is not None:
+            while queue and now - queue[0]["timestamp_ns"] > CORRELATION_WINDOW_NS:
+                expire(key, (queue.popleft(),))
         if ev.get("kind") == "syscall":
-            sys_by_thread.setdefault(key, []).append(ev)
+            if ev.get("sys") in candidate_sys:
+                if now is None:
+                    undated_by_thread.setdefault(key, []).append(ev)
+                    continue
+                if queue is None:
+                    queue = sys_by_thread[key] = deque()
+                queue.append(ev)
             continue
         if ev.get("kind") != "hook":
             continue
-        matched_sys = _match_syscall(ev, sys_by_thread.get(key, []))
-        hook_name = ev.get("hook")
-        derived_op = DERIVED_OPERATION.get(hook_name)
-        op_flags: List[str] = []
-        args = ev.get("args") or {}
-        if hook_name == "mac_vnode_check_open":
-            op_flags = decode_acc_mode(args.get("acc_mode"))
-        syscall_obj = None
-        if matched_sys:
-            syscall_obj = {"sys": matched_sys.get("sys")}
-            syscall_fields = matched_sys.get("fields") or {}
-            syscall_obj.update(syscall_fields)
-            syscall_obj["timestamp_ns"] = matched_sys.get("timestamp_ns")
-        hook_outputs.append({
-            "hook": hook_name,
-            "pid": ev.get("pid"),
-            "tid": ev.get("tid"),
-            "execname": ev.get("exec"),
-            "timestamp_ns": ev.get("timestamp_ns"),
-            "args": args,
-            "derived_operation": derived_op,
-            "operation_flags": op_flags,
-            "syscall": syscall_obj,
-            "world_id": runtime_world_id,
-            "run_id": run_id,
-        })
-    return hook_outputs
+        matched = _match_syscall(ev, queue or ())
+        undated = undated_by_thread.get(key)
+        if matched is None and undated and not HOOK_TO_SYSCALL.get(ev.get("hook"), set()) & expired_by_thread.get(key, set()):
+            matched = _match_syscall(ev, undated)
+        yield _hook_record(ev, matched, runtime_world_id, run_id)
+
+def correlate_events(raw_events: Iterable[Dict], runtime_world_id: str, run_id: str) -> List[Dict]:
+    sorted_events = sorted(raw_events, key=lambda ev: ev.get("timestamp_ns") or 0)
+    return list(iter_correlated(sorted_events, runtime_world_id, run_id))
 
 def _percentile(values: List[float], pct: float) -> Optional[float]:
     if not values:
@@ -174,50 +252,157 @@ def _percentile(values: List[float], pct: float) -> Optional[float]:
     return d0 + d1
 
 
-def summarize_events(hook_events: List[Dict], *, runtime_world_id: str, run_id: str, scenario: Optional[str], scenario_description: Optional[str]) -> Dict:
-    hook_counts: Dict[str, int] = {}
-    syscall_counts: Dict[str, int] = {}
-    correlation: Dict[str, Dict[str, Optional[float]]] = {}
-    for ev in hook_events:
+class StreamingQuantile:
+    """
+    Constant-memory estimate of one quantile.
+
+    Values are kept exactly (and `value()` matches `_percentile`) until
+    `exact_limit` is reached; after that the buffer seeds the five markers of
+    the P-square estimator (Jain & Chlamtac), which is updated in O(1) per value.
+    """
+
+    def __init__(self, pct: float, exact_limit: int = QUANTILE_EXACT_LIMIT) -> None:
+        if exact_limit < 5:
+            raise ValueError(f"exact_limit must be at least 5 (one value per marker), got {exact_limit}")
+        self.pct = pct
+        self.exact_limit = exact_limit
+        self.count = 0
+        self._exact: Optional[List[float]] = []
+        self._heights: List[float] = []
+        self._positions: List[float] = []
+        self._desired: List[float] = []
+        self._increments = [0.0, pct / 2, pct, (1 + pct) / 2, 1.0]
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        if self._exact is not None:
+            self._exact.append(value)
+            if len(self._exact) > self.exact_limit:
+                self._seed_markers()
+            return
+        h, n = self._heights, self._positions
+        if value < h[0]:
+            h[0] = value
+            k = 0
+        elif value >= h[4]:
+            h[4] = max(h[4], value)
+            k = 3
+        else:
+            k = next(i for i in range(4) if h[i] <= value < h[i + 1])
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+        for i in (1, 2, 3):
+            d = self._desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                step = 1 if d > 0 else -1
+                candidate = self._parabolic(i, step)
+                if not h[i - 1] < candidate < h[i + 1]:
+                    candidate = h[i] + step * (h[i + step] - h[i]) / (n[i + step] - n[i])
+                h[i] = candidate
+                n[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        h, n = self._heights, self._positions
+        return h[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def _seed_markers(self) -> None:
+        values = sorted(self._exact or [])
+        last = len(values) - 1
+        ranks = [0, round(last * self.pct / 2), round(last * self.pct), round(last * (1 + self.pct) / 2), last]
+        # Marker positions must be distinct, increasing, and leave room for
+        # the markers above them within [0, last].
+        for i in range(1, 4):
+            ranks[i] = min(max(ranks[i], ranks[i - 1] + 1), last - (4 - i))
+        self._heights = [values[r] for r in ranks]
+        self._positions = [float(r + 1) for r in ranks]
+        self._desired = [1 + last * inc for inc in self._increments]
+        self._exact = None
+
+    def value(self) -> Optional[float]:
+        if self._exact is not None:
+            return _percentile(self._exact, self.pct)
+        return self._heights[2]
+
+
+class EventSummary:
+    """Incremental form of `summarize_events`: feed hook records with `add`."""
+
+    def __init__(self) -> None:
+        self.hook_counts: Dict[str, int] = {}
+        self.syscall_counts: Dict[str, int] = {}
+        self._correlation: Dict[str, Dict[str, object]] = {}
+
+    def add(self, ev: Dict) -> None:
         hook = ev.get("hook")
         if hook:
-            hook_counts[hook] = hook_counts.get(hook, 0) + 1
+            self.hook_counts[hook] = self.hook_counts.get(hook, 0) + 1
         syscall = ev.get("syscall") or {}
         sys_name = syscall.get("sys")
         if sys_name:
-            syscall_counts[sys_name] = syscall_counts.get(sys_name, 0) + 1
+            self.syscall_counts[sys_name] = self.syscall_counts.get(sys_name, 0) + 1
         hook_ts = ev.get("timestamp_ns")
         sys_ts = syscall.get("timestamp_ns")
         if hook_ts is None or sys_ts is None:
-            continue
+            return
         delta_us = (hook_ts - sys_ts) / 1000.0
         key = f"{hook}/{sys_name}"
-        entry = correlation.setdefault(key, {"deltas_us": []})
-        entry["deltas_us"].append(delta_us)
-
-    correlation_stats: Dict[str, Dict[str, Optional[float]]] = {}
-    for key, data in correlation.items():
-        deltas = data.get("deltas_us", [])
-        correlation_stats[key] = {
-            "count": len(deltas),
-            "min_delta_us": min(deltas) if deltas else None,
-            "max_delta_us": max(deltas) if deltas else None,
-            "p50_delta_us": _percentile(deltas, 0.5),
-            "p95_delta_us": _percentile(deltas, 0.95),
+        entry = self._correlation.get(key)
+        if entry is None:
+            entry = self._correlation[key] = {
+                "count": 0,
+                "min": delta_us,
+                "max": delta_us,
+                "p50": StreamingQuantile(0.5),
+                "p95": StreamingQuantile(0.95),
+            }
+        entry["count"] += 1  # type: ignore[operator]
+        entry["min"] = min(entry["min"], delta_us)  # type: ignore[type-var]
+        entry["max"] = max(entry["max"], delta_us)  # type: ignore[type-var]
+        entry["p50"].add(delta_us)  # type: ignore[union-attr]
+        entry["p95"].add(delta_us)  # type: ignore[union-attr]
+
+    def correlation_stats(self) -> Dict[str, Dict[str, Optional[float]]]:
+        return {
+            key: {
+                "count": data["count"],
+                "min_delta_us": data["min"],
+                "max_delta_us": data["max"],
+                "p50_delta_us": data["p50"].value(),  # type: ignore[union-attr]
+                "p95_delta_us": data["p95"].value(),  # type: ignore[union-attr]
+            }
+            for key, data in self._correlation.items()
         }
 
-    return {
-        "runtime_world_id": runtime_world_id,
-        "run_id": run_id,
-        "scenario": scenario,
-        "scenario_description": scenario_description,
-        "hook_counts": hook_counts,
-        "syscall_counts": syscall_counts,
-        "correlation": correlation_stats,
-    }
+    def to_json(self, *, runtime_world_id: str, run_id: str, scenario: Optional[str], scenario_description: Optional[str]) -> Dict:
+        return {
+            "runtime_world_id": runtime_world_id,
+            "run_id": run_id,
+            "scenario": scenario,
+            "scenario_description": scenario_description,
+            "hook_counts": self.hook_counts,
+            "syscall_counts": self.syscall_counts,
+            "correlation": self.correlation_stats(),
+        }
+
+
+def summarize_events(hook_events: Iterable[Dict], *, runtime_world_id: str, run_id: str, scenario: Optional[str], scenario_description: Optional[str]) -> Dict:
+    summary = EventSummary()
+    for ev in hook_events:
+        summary.add(ev)
+    return summary.to_json(
+        runtime_world_id=runtime_world_id,
+        run_id=run_id,
+        scenario=scenario,
+        scenario_description=scenario_description,
+    )
 
 
-def build_output(*, events: List[Dict], runtime_world_id: str, run_id: str, os_build: Optional[str], kernel_version: Optional[str], provider: str, module: str, hooks: List[str], run_command: Optional[str], target_pid: Optional[int], static_refs: Dict[str, Optional[str]], scenario: Optional[str], scenario_description: Optional[str]) -> Dict:
+def build_output(*, events: Iterable[Dict], runtime_world_id: str, run_id: str, os_build: Optional[str], kernel_version: Optional[str], provider: str, module: str, hooks: List[str], run_command: Optional[str], target_pid: Optional[int], static_refs: Dict[str, Optional[str]], scenario: Optional[str], scenario_description: Optional[str]) -> Dict:
     hook_events = correlate_events(events, runtime_world_id=runtime_world_id, run_id=run_id)
     summary = summarize_events(
         hook_events,
@@ -243,6 +428,48 @@ def build_output(*, events: List[Dict], runtime_world_id: str, run_id: str, os_b
         "summary": summary,
     }
 
+def build_streaming_output(*, lines: Iterable[str], events_path: pathlib.Path, runtime_world_id: str, run_id: str, os_build: Optional[str], kernel_version: Optional[str], provider: str, module: str, hooks: List[str], run_command: Optional[str], target_pid: Optional[int], static_refs: Dict[str, Optional[str]], scenario: Optional[str], scenario_description: Optional[str], reorder_window_ns: int = REORDER_WINDOW_NS) -> Dict:
+    """
+    Constant-memory variant of `build_output`: raw lines are parsed, reordered
+    within `reorder_window_ns`, correlated, and written to `events_path` as
+    JSONL one hook record at a time. The returned document references the
+    JSONL file instead of embedding `events`.
+    """
+    stream_stats: Dict[str, int] = {"late_events": 0}
+    summary = EventSummary()
+    ordered = iter_time_ordered(iter_raw_log(lines), reorder_window_ns=reorder_window_ns, stats=stream_stats)
+    event_count = 0
+    events_path.parent.mkdir(parents=True, exist_ok=True)
+    with events_path.open("w") as f:
+        for record in iter_correlated(ordered, runtime_world_id, run_id):
+            summary.add(record)
+            f.write(json.dumps(record, sort_keys=True))
+            f.write("\n")
+            event_count += 1
+    return {
+        "runtime_world_id": runtime_world_id,
+        "run_id": run_id,
+        "scenario": scenario,
+        "scenario_description": scenario_description,
+        "os_build": os_build,
+        "kernel_version": kernel_version,
+        "provider": provider,
+        "module": module,
+        "hooks": hooks,
+        "run_command": run_command,
+        "target_pid": target_pid,
+        "static_reference": static_refs,
+        "events_path": path_utils.to_repo_relative(events_path),
+        "event_count": event_count,
+        "late_events": stream_stats["late_events"],
+        "summary": summary.to_json(
+            runtime_world_id=runtime_world_id,
+            run_id=run_id,
+            scenario=scenario,
+            scenario_description=scenario_description,
+        ),
+    }
+
 def resolve_default_static_refs(repo_root: pathlib.Path) -> Dict[str, Optional[str]]:
     op_table = repo_root / "book/graph/mappings/op_table/op_table_signatures.json"
     vocab_ops = repo_root / "book/graph/mappings/vocab/ops.json"
@@ -270,21 +497,22 @@ def main() -> int:
     parser.add_argument("--target-pid", type=int, default=None, help="Target pid if attaching with -p.")
     parser.add_argument("--no-static-ref", action="store_true", help="Skip computing static reference hashes.")
     parser.add_argument("--summary-out", default=None, help="Optional summary JSON output path.")
+    parser.add_argument(
+        "--events-jsonl",
+        default=None,
+        help="Stream correlated hook records to this JSONL path in constant memory (the --out JSON then references it).",
+    )
     args = parser.parse_args()
 
     repo_root = path_utils.find_repo_root()
     raw_path = path_utils.ensure_absolute(repo_root / args.raw)
     out_path = path_utils.ensure_absolute(repo_root / args.out)
 
-    with raw_path.open() as f:
-        events = parse_raw_log(f.readlines())
-
     static_refs = {"op_table_hash": None, "vocab_ops_hash": None, "vocab_filters_hash": None}
     if not args.no_static_ref:
         static_refs = resolve_default_static_refs(repo_root)
 
-    output = build_output(
-        events=events,
+    common = dict(
         runtime_world_id=args.runtime_world_id,
         run_id=args.run_id,
         os_build=args.os_build,
@@ -298,6 +526,12 @@ def main() -> int:
         scenario=args.scenario,
         scenario_description=args.scenario_description,
     )
+    with raw_path.open() as f:
+        if args.events_jsonl:
+            events_path = path_utils.ensure_absolute(repo_root / args.events_jsonl)
+            output = build_streaming_output(lines=f, events_path=events_path, **common)
+        else:
+            output = build_output(events=iter_raw_log(f), **common)
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
     with out_path.open("w") as f:
@@ -1,7 +1,10 @@
 import importlib.util
+import json
 import pathlib
 import sys
 
+import pytest
+
 # Ensure repo root is on path for normalize import
 REPO_ROOT = pathlib.Path(__file__).resolve().parents[2]
 sys.path.append(str(REPO_ROOT))
@@ -78,3 +81,92 @@ def test_correlate_setxattr():
     assert evt["syscall"]["sys"] == "setxattr"
     assert evt["syscall"]["path"] == "/tmp/foo"
     assert evt["syscall"]["xattr_name"] == "com.test"
+
+
+def test_streaming_output_matches_build_output(tmp_path):
+    raw = [
+        "EVENT kind=hook hook=mac_vnode_check_open world=w run_id=test pid=1 tid=2 exec=ls ts=2000015 ctx=0x1 vp=0x2 acc_mode=3",
+        "EVENT kind=syscall sys=open world=w run_id=test pid=1 tid=2 exec=ls ts=10 path=/a flags=0x0",
+        "EVENT kind=syscall sys=read world=w run_id=test pid=1 tid=2 exec=ls ts=2000012 path=/b flags=0x0",
+        "EVENT kind=hook hook=mac_vnode_check_open world=w run_id=test pid=1 tid=2 exec=ls ts=15 ctx=0x1 vp=0x2 acc_mode=1",
+        "EVENT kind=syscall sys=openat world=w run_id=test pid=1 tid=2 exec=ls ts=2000010 path=/c flags=0x0",
+        "EVENT kind=hook hook=mac_vnode_check_open world=w run_id=test pid=1 tid=2 exec=ls ts=30000000 ctx=0x1 vp=0x2 acc_mode=1",
+    ]
+    kwargs = dict(
+        runtime_world_id="w",
+        run_id="test",
+        os_build=None,
+        kernel_version=None,
+        provider="fbt",
+        module="mach_kernel",
+        hooks=["mac_vnode_check_open"],
+        run_command="/bin/ls",
+        target_pid=None,
+        static_refs={},
+        scenario=None,
+        scenario_description=None,
+    )
+    expected = normalize.build_output(events=normalize.parse_raw_log(raw), **kwargs)
+    events_path = tmp_path / "events.jsonl"
+    streamed = normalize.build_streaming_output(lines=raw, events_path=events_path, **kwargs)
+    records = [json.loads(line) for line in events_path.read_text().splitlines()]
+    assert records == expected["events"]
+    assert [(r["syscall"] or {}).get("path") for r in records] == ["/a", "/c", None]
+    assert streamed["event_count"] == 3
+    assert streamed["late_events"] == 0
+    assert streamed["summary"] == expected["summary"]
+
+
+def test_time_ordering_counts_events_beyond_reorder_window():
+    events = [{"timestamp_ns": ts} for ts in (5, 1, 100, 3, 200)]
+    stats = {}
+    ordered = list(normalize.iter_time_ordered(events, reorder_window_ns=10, stats=stats))
+    assert [ev["timestamp_ns"] for ev in ordered] == [1, 5, 3, 100, 200]
+    assert stats["late_events"] == 1
+
+
+def test_streaming_quantile_is_exact_then_approximate():
+    values = [float((i * 7919) % 1000) for i in range(5000)]
+    small = normalize.StreamingQuantile(0.95, exact_limit=100)
+    for value in values[:50]:
+        small.add(value)
+    assert small.value() == normalize._percentile(values[:50], 0.95)
+    sketch = normalize.StreamingQuantile(0.5, exact_limit=100)
+    for value in values:
+        sketch.add(value)
+    assert abs(sketch.value() - normalize._percentile(values, 0.5)) < 25
+
+
+def test_undated_syscalls_are_not_pruned_by_age():
+    def sys(tid, ts, path):
+        return {"kind": "syscall", "sys": "open", "pid": 1, "tid": tid, "timestamp_ns": ts, "fields": {"path": path}}
+
+    def hook(tid, ts):
+        return {"kind": "hook", "hook": "mac_vnode_check_open", "pid": 1, "tid": tid, "timestamp_ns": ts, "args": {}}
+
+    window = normalize.CORRELATION_WINDOW_NS
+    events = [
+        sys(1, None, "/undated"),
+        hook(1, 5 * window),
+        sys(1, 6 * window, "/dated"),
+        hook(1, 6 * window + 1),
+        sys(2, None, "/undated"),
+        sys(2, window, "/expired"),
+        hook(2, 5 * window),
+    ]
+    records = normalize.correlate_events(events, "w", "test")
+    assert [(r["syscall"] or {}).get("path") for r in records] == ["/undated", None, "/dated"]
+
+
+def test_streaming_quantile_seeds_distinct_markers_for_small_limits():
+    values = [float((i * 7919) % 1000) for i in range(200)]
+    for pct in (0.5, 0.95, 0.99):
+        for limit in range(5, 40):
+            sketch = normalize.StreamingQuantile(pct, exact_limit=limit)
+            for value in values:
+                sketch.add(value)
+            positions = sketch._positions
+            assert all(a < b for a, b in zip(positions, positions[1:]))
+            assert min(values) <= sketch.value() <= max(values)
+    with pytest.raises(ValueError):
+        normalize.StreamingQuantile(0.5, exact_limit=4)
@@ -91,34 +91,85 @@ def _find_all(haystack: bytes, needle: bytes) -> Iterable[int]:
     return out
 
 
+class BlobIndex:
+    """
+    k-gram position index over a compiled blob.
+
+    `find_all(needle)` returns the same ascending positions as `_find_all`, but
+    looks up the needle's first min(len, k) bytes in a per-k table (built
+    lazily for k = 1..4) and only verifies the tail at those positions.
+    Results are memoized per needle, since encoder traces repeat payloads.
+    """
+
+    MAX_K = 4
+
+    def __init__(self, blob: bytes) -> None:
+        self.blob = bytes(blob)
+        self._grams: Dict[int, Dict[bytes, List[int]]] = {}
+        self._memo: Dict[bytes, List[int]] = {}
+
+    def _table(self, k: int) -> Dict[bytes, List[int]]:
+        table = self._grams.get(k)
+        if table is None:
+            table = {}
+            blob = self.blob
+            for pos in range(len(blob) - k + 1):
+                table.setdefault(blob[pos : pos + k], []).append(pos)
+            self._grams[k] = table
+        return table
+
+    def find_all(self, needle: bytes) -> List[int]:
+        if not needle:
+            return []
+        hit = self._memo.get(needle)
+        if hit is not None:
+            return hit
+        k = min(len(needle), self.MAX_K)
+        starts = self._table(k).get(needle[:k], [])
+        if len(needle) > k:
+            blob = self.blob
+            size = len(needle)
+            starts = [pos for pos in starts if blob[pos : pos + size] == needle]
+        self._memo[needle] = starts
+        return starts
+
+
 def _align_gapped(
     writes: Iterable[Tuple[int, bytes]],
     *,
     cursor_mode: str,
     blob: bytes,
     window_len: int,
+    blob_index: Optional[BlobIndex] = None,
 ) -> Optional[Dict[str, Any]]:
     if not blob or window_len <= 0:
         return None
     _, normalized = _normalize_writes(writes, cursor_mode=cursor_mode)
     if not normalized:
         return None
+    if blob_index is None or blob_index.blob != blob:
+        blob_index = BlobIndex(blob)
 
+    # Each write's candidate bases do not depend on min_len; locate it once.
+    located: List[Optional[set]] = [None] * len(normalized)
     candidates: Dict[int, Dict[str, int]] = {}
     min_len_used: Optional[int] = None
     for min_len in (4, 3, 2, 1):
         candidates.clear()
-        for cursor, data in normalized:
+        for idx, (cursor, data) in enumerate(normalized):
             if len(data) < min_len:
                 continue
-            bases_for_write = set()
-            for pos in _find_all(blob, data):
-                base = pos - cursor
-                if base < 0:
-                    continue
-                if base + window_len > len(blob):
-                    continue
-                bases_for_write.add(base)
+            bases_for_write = located[idx]
+            if bases_for_write is None:
+                bases_for_write = set()
+                for pos in blob_index.find_all(data):
+                    base = pos - cursor
+                    if base < 0:
+                        continue
+                    if base + window_len > len(blob):
+                        continue
+                    bases_for_write.add(base)
+                located[idx] = bases_for_write
             for base in bases_for_write:
                 stats = candidates.setdefault(base, {"support_writes": 0, "support_bytes": 0})
                 stats["support_writes"] += 1
@@ -186,6 +237,76 @@ def _align_gapped(
     }
 
 
+_MASK_TO_FF = bytes([0x00, 0xFF]) + bytes(254)
+
+
+def _reconstruct_dense(
+    writes: Iterable[Tuple[int, bytes]],
+    *,
+    base: int,
+    max_end: int,
+) -> Tuple[int, int, int, bytearray]:
+    """
+    Replay writes into a bytearray with a parallel written-mask (0/1 per byte).
+    Overlaps are mask counts; conflicts are counted with a masked XOR over the
+    overlapping slice, so no per-byte Python loop runs.
+    """
+    reconstructed = bytearray(max_end)
+    written = bytearray(max_end)
+    overlaps = 0
+    conflicts = 0
+    for cursor, data in writes:
+        size = len(data)
+        if not size:
+            continue
+        start = cursor - base
+        end = start + size
+        hit = written.count(1, start, end)
+        if hit:
+            overlaps += hit
+            prior = reconstructed[start:end]
+            if prior != data:
+                # XOR the old and new bytes, keep only previously written lanes,
+                # and count the nonzero bytes that remain.
+                diff = int.from_bytes(prior, "big") ^ int.from_bytes(data, "big")
+                if hit != size:
+                    diff &= int.from_bytes(written[start:end].translate(_MASK_TO_FF), "big")
+                conflicts += size - diff.to_bytes(size, "big").count(0)
+            if hit != size:
+                written[start:end] = b"\x01" * size
+        else:
+            written[start:end] = b"\x01" * size
+        reconstructed[start:end] = data
+    return written.count(1), overlaps, conflicts, reconstructed
+
+
+def _reconstruct_sparse(
+    writes: Iterable[Tuple[int, bytes]],
+    *,
+    base: int,
+    max_end: int,
+) -> Tuple[int, int, int, bytearray]:
+    """Per-byte replay for traces with writes before the base (negative positions)."""
+    seen: Dict[int, int] = {}
+    overlaps = 0
+    conflicts = 0
+    for cursor, data in writes:
+        start = cursor - base
+        for offset, b in enumerate(data):
+            pos = start + offset
+            if pos in seen:
+                overlaps += 1
+                if seen[pos] != b:
+                    conflicts += 1
+            seen[pos] = b
+
+    reconstructed = bytearray(max_end)
+    for pos, b in seen.items():
+        if 0 <= pos < max_end:
+            reconstructed[pos] = b
+    return len(seen), overlaps, conflicts, reconstructed
+
+
 def _reconstruct(
     writes: Iterable[Tuple[int, bytes]],
     *,
@@ -212,24 +333,10 @@ def _reconstruct(
         if end > max_end:
             max_end = end
 
-    seen: Dict[int, int] = {}
-    overlaps = 0
-    conflicts = 0
-    for cursor, data in writes:
-        start = cursor - base
-        for offset, b in enumerate(data):
-            pos = start + offset
-            if pos in seen:
-                overlaps += 1
-                if seen[pos] != b:
-                    conflicts += 1
-            seen[pos] = b
-
-    coverage = len(seen)
-    reconstructed = bytearray(max_end)
-    for pos, b in seen.items():
-        if 0 <= pos < max_end:
-            reconstructed[pos] = b
+    if any(cursor - base < 0 for cursor in cursors):
+        coverage, overlaps, conflicts, reconstructed = _reconstruct_sparse(writes, base=base, max_end=max_end)
+    else:
+        coverage, overlaps, conflicts, reconstructed = _reconstruct_dense(writes, base=base, max_end=max_end)
 
     result = {
         "cursor_mode": cursor_mode,
@@ -365,6 +472,7 @@ def main(argv: Optional[List[str]] = None) -> int:
         trace_path = ensure_absolute(trace_rel, repo_root)
         blob_path = ensure_absolute(blob_rel, repo_root)
         blob_bytes = blob_path.read_bytes() if blob_path.exists() else b""
+        blob_index = BlobIndex(blob_bytes)
 
         immutable_buffer = None
         if isinstance(stats_rel, str):
@@ -412,6 +520,7 @@ def main(argv: Optional[List[str]] = None) -> int:
                         cursor_mode=mode,
                         blob=blob_bytes,
                         window_len=int(rec.get("reconstructed_len", 0)),
+                        blob_index=blob_index,
                     )
                     if alignment:
                         rec["alignment"] = alignment
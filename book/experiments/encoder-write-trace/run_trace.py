@@ -16,6 +16,7 @@ REPO_ROOT = Path(__file__).resolve().parents[3]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
+from book.api.macho import MachO, MachOError, open_macho  # type: ignore
 from book.api.path_utils import ensure_absolute, find_repo_root, relativize_command, to_repo_relative  # type: ignore
 from book.api.profile_tools.identity import baseline_world_id  # type: ignore
 
@@ -72,39 +73,24 @@ def _normalize_params(raw: Any) -> Optional[Dict[str, str]]:
     raise ValueError("compile params must be a JSON object mapping string keys to string values")
 
 
-def _parse_nm_scope(output: str, symbol: str) -> Dict[str, Any]:
-    scope = None
-    line_match = None
-    address = None
-    for line in output.splitlines():
-        stripped = line.strip()
-        if not stripped:
-            continue
-        if not stripped.endswith(f" {symbol}"):
-            continue
-        line_match = stripped
-        parts = stripped.split()
-        if parts:
-            addr_text = parts[0]
-            if re.fullmatch(r"0x[0-9a-fA-F]+", addr_text) or re.fullmatch(r"[0-9a-fA-F]+", addr_text):
-                try:
-                    addr_val = int(addr_text, 16)
-                    address = f"0x{addr_val:016x}"
-                except Exception:
-                    address = None
-        if " non-external " in stripped:
-            scope = "non-external"
-        elif " external " in stripped:
-            scope = "external"
-        elif " undefined " in stripped:
-            scope = "undefined"
-        else:
-            scope = "unknown"
-        break
+def _symbol_scope(image: MachO, symbol: str) -> Dict[str, Any]:
+    """`nm -m`-style scope for `symbol`, read from the image's LC_SYMTAB."""
+    sym = image.symbol(symbol)
+    if sym is None:
+        return {"scope": "missing", "line": None, "address": None}
+    if sym.is_undefined:
+        return {"scope": "undefined", "line": f"(undefined) external {symbol}", "address": None}
+    scope = "external" if sym.is_external else "non-external"
+    sections = list(image.sections())
+    if 0 < sym.n_sect <= len(sections):
+        sect = sections[sym.n_sect - 1]
+        where = f"({sect.segname},{sect.sectname})"
+    else:
+        where = "(absolute)"
     return {
-        "scope": scope or "missing",
-        "line": line_match,
-        "address": address,
+        "scope": scope,
+        "line": f"{sym.value:016x} {where} {scope} {symbol}",
+        "address": f"0x{sym.value:016x}",
     }
 
 
@@ -157,30 +143,11 @@ def _select_uuid(entries: List[Dict[str, str]], arch: str) -> Dict[str, Optional
     return {"uuid": None, "arch": None}
 
 
-def _parse_otool_indirect_sections(output: str, symbol: str) -> Dict[str, Any]:
-    current_section: Optional[str] = None
-    sections: List[str] = []
-    header_re = re.compile(r"^Indirect symbols for \\(([^,]+),([^\\)]+)\\)")
-    for line in output.splitlines():
-        stripped = line.strip()
-        if not stripped:
-            continue
-        header = header_re.match(stripped)
-        if header:
-            seg = header.group(1).strip()
-            sect = header.group(2).strip()
-            current_section = f"{seg},{sect}"
-            continue
-        parts = stripped.split()
-        if len(parts) < 3:
-            continue
-        if not parts[0].startswith("0x"):
-            continue
-        name = parts[2]
-        if name == symbol and current_section:
-            sections.append(current_section)
+def _indirect_sections(image: MachO, symbol: str) -> Dict[str, Any]:
+    """Stub/pointer sections whose indirect-symbol entries name `symbol` (as `otool -Iv`)."""
+    sections = {entry.section for entry in image.indirect_symbols() if entry.name == symbol}
     return {
-        "sections": sorted(set(sections)),
+        "sections": sorted(sections),
     }
 
 
@@ -279,30 +246,30 @@ def _analyze_bind_tables(
         analysis["callsite_reachability"] = "unknown"
         return analysis
 
-    nm_result = _run_tool(["nm", "-m", str(image_path)])
-    if nm_result.returncode == 0:
-        analysis["nm"] = _parse_nm_scope(nm_result.stdout, symbol)
-        analysis["nm_secondary"] = _parse_nm_scope(nm_result.stdout, SECONDARY_SYMBOL)
-    else:
-        analysis["nm"] = {"scope": "unavailable", "error": nm_result.stderr.strip() or "nm failed"}
-        analysis["nm_secondary"] = {"scope": "unavailable", "error": nm_result.stderr.strip() or "nm failed"}
-
-    otool_result = _run_tool(["otool", "-Iv", str(image_path)])
-    if otool_result.returncode == 0:
-        indirect = _parse_otool_indirect_sections(otool_result.stdout, symbol)
+    try:
+        image = open_macho(image_path)
+    except (OSError, MachOError) as exc:
+        image = None
+        error = str(exc) or type(exc).__name__
+    if image is not None:
+        analysis["nm"] = _symbol_scope(image, symbol)
+        analysis["nm_secondary"] = _symbol_scope(image, SECONDARY_SYMBOL)
+        indirect = _indirect_sections(image, symbol)
         analysis["indirect"] = indirect
         sections = indirect.get("sections", [])
         analysis["caller_has_bind_record"] = bool(sections)
         analysis["bind_kinds"] = _bind_kinds_from_sections(sections)
         analysis["callsite_reachability"] = _callsite_reachability(sections)
-        analysis["bind_kinds_source"] = "otool_indirect"
+        analysis["bind_kinds_source"] = "macho_indirect"
     else:
+        analysis["nm"] = {"scope": "unavailable", "error": error}
+        analysis["nm_secondary"] = {"scope": "unavailable", "error": error}
         analysis["indirect"] = {"sections": []}
         analysis["caller_has_bind_record"] = None
         analysis["bind_kinds"] = []
         analysis["callsite_reachability"] = "unknown"
         analysis["bind_kinds_source"] = "unavailable"
-        analysis["bind_error"] = otool_result.stderr.strip() or "otool failed"
+        analysis["bind_error"] = error
 
     dyld_bundle = _dyld_info_bundle(image_path, symbol, fallback_path=dyld_fallback)
     dyld_bundle["requested_path"] = to_repo_relative(Path(dyld_bundle["requested_path"]), repo_root)
@@ -842,13 +809,13 @@ def main(argv: Optional[List[str]] = None) -> int:
         manifest["trace_harness"]["env"]["SBPL_WRITE_ADDR"] = args.write_addr
     if write_unslid:
         manifest["trace_harness"]["env"]["SBPL_WRITE_UNSLID"] = write_unslid
-        manifest["trace_harness"]["write_unslid_source"] = "nm" if auto_unslid else "cli"
+        manifest["trace_harness"]["write_unslid_source"] = "symtab" if auto_unslid else "cli"
     elif args.mode in ("patch", "hw_breakpoint") and not args.write_addr and not args.write_offset and not args.write_unslid:
         if not extracted_uuid:
             manifest["trace_harness"]["write_unslid_source"] = "skipped_uuid_missing"
     if immutable_unslid:
         manifest["trace_harness"]["env"]["SBPL_WRITE_IMMUTABLE_UNSLID"] = immutable_unslid
-        manifest["trace_harness"]["immutable_unslid_source"] = "nm" if auto_immutable_unslid else "cli"
+        manifest["trace_harness"]["immutable_unslid_source"] = "symtab" if auto_immutable_unslid else "cli"
     if write_uuid:
         manifest["trace_harness"]["env"]["SBPL_WRITE_UUID_EXPECTED"] = write_uuid
     if args.dyld_shared_region:
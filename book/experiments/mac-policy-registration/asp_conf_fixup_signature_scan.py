@@ -9,6 +9,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 from book.api import path_utils
+from kc_address_index import load_address_index
 
 
 def _load_world_id(repo_root: Path) -> Optional[str]:
@@ -46,42 +47,6 @@ def _u64(value: int) -> int:
     return value & ((1 << 64) - 1)
 
 
-def _find_interval(intervals: List[Dict[str, object]], vmaddr: int) -> Optional[Dict[str, object]]:
-    lo = 0
-    hi = len(intervals) - 1
-    while lo <= hi:
-        mid = (lo + hi) // 2
-        start = intervals[mid]["start"]
-        end = intervals[mid]["end"]
-        if vmaddr < start:
-            hi = mid - 1
-        elif vmaddr >= end:
-            lo = mid + 1
-        else:
-            return intervals[mid]
-    return None
-
-
-def _load_intervals(fileset_index: Path) -> List[Dict[str, object]]:
-    data = json.loads(fileset_index.read_text())
-    intervals = []
-    for item in data.get("segment_intervals", []):
-        start = item.get("start")
-        end = item.get("end")
-        if start is None or end is None:
-            continue
-        intervals.append(
-            {
-                "start": int(start),
-                "end": int(end),
-                "entry_id": item.get("entry_id"),
-                "segment_name": item.get("segment_name"),
-                "is_exec": item.get("is_exec"),
-            }
-        )
-    return sorted(intervals, key=lambda rec: rec["start"])
-
-
 def _extract_asp_strings(instances: Path) -> Dict[str, object]:
     data = json.loads(instances.read_text())
     for inst in data.get("instances", []):
@@ -169,7 +134,7 @@ def main() -> int:
     out_path = Path(args.out)
 
     asp_strings = _extract_asp_strings(instances_path)
-    intervals = _load_intervals(fileset_index_path)
+    address_index = load_address_index(fileset_index_path)
     by_target, by_location, by_decoded_target = _build_fixup_index(fixups_path)
 
     name_ptr = asp_strings.get("name_ptr")
@@ -200,7 +165,7 @@ def main() -> int:
             base = int(rec["vmaddr"])
             if (base + 8) not in full_locations:
                 continue
-            base_interval = _find_interval(intervals, base)
+            base_interval, _ = address_index.lookup(base)
             ops_field_addr = base + int(mpc_ops_offset)
             ops_fixup = by_location.get(ops_field_addr)
             ops_fixup_resolved = ops_fixup.get("resolved_unsigned") if ops_fixup else None
@@ -251,7 +216,7 @@ def main() -> int:
                 base = int(rec["vmaddr"])
                 if (base + 8) not in full_decoded_locations:
                     continue
-                base_interval = _find_interval(intervals, base)
+                base_interval, _ = address_index.lookup(base)
                 ops_field_addr = base + int(mpc_ops_offset)
                 ops_fixup = by_location.get(ops_field_addr)
                 ops_fixup_resolved = ops_fixup.get("resolved_unsigned") if ops_fixup else None
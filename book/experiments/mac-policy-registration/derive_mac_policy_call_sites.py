@@ -15,9 +15,10 @@ from __future__ import annotations
 import argparse
 import json
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Optional
 
 from book.api import path_utils
+from kc_address_index import load_address_index
 
 
 def _parse_hex(text: str) -> Optional[int]:
@@ -39,51 +40,6 @@ def _parse_hex(text: str) -> Optional[int]:
     return value
 
 
-def _s64(value: int) -> int:
-    value &= (1 << 64) - 1
-    if value & (1 << 63):
-        return value - (1 << 64)
-    return value
-
-
-def _load_entries(index_path: Path) -> List[Tuple[int, int, str]]:
-    data = json.loads(index_path.read_text())
-    entries = []
-    intervals = data.get("segment_intervals")
-    if intervals:
-        for interval in intervals:
-            start = interval.get("start")
-            end = interval.get("end")
-            entry_id = interval.get("entry_id")
-            if start is None or end is None:
-                continue
-            entries.append((_s64(int(start)), _s64(int(end)), entry_id))
-        return sorted(entries, key=lambda item: item[0])
-    for entry in data.get("entries", []):
-        span = entry.get("vmaddr_span") or {}
-        start = span.get("start")
-        end = span.get("end")
-        if start is None or end is None:
-            continue
-        entries.append((_s64(int(start)), _s64(int(end)), entry.get("entry_id")))
-    return sorted(entries, key=lambda item: item[0])
-
-
-def _find_entry(entries: List[Tuple[int, int, str]], vmaddr: int) -> Optional[str]:
-    lo = 0
-    hi = len(entries) - 1
-    while lo <= hi:
-        mid = (lo + hi) // 2
-        start, end, entry_id = entries[mid]
-        if vmaddr < start:
-            hi = mid - 1
-        elif vmaddr >= end:
-            lo = mid + 1
-        else:
-            return entry_id
-    return None
-
-
 def main() -> int:
     parser = argparse.ArgumentParser(description="Derive mac_policy_register call sites from string scan.")
     parser.add_argument(
@@ -114,28 +70,32 @@ def main() -> int:
     out_path = path_utils.ensure_absolute(args.out, repo_root)
 
     data = json.loads(calls_path.read_text())
-    entries = _load_entries(index_path)
+    address_index = load_address_index(index_path)
     target_entries = []
     for func in data.get("functions", []):
         if any(args.string_filter in s for s in func.get("strings", [])):
             target_entries.append(func.get("entry"))
     target_entries = [e for e in target_entries if e]
 
-    call_sites = []
+    selected = []
     for call in data.get("call_sites", []):
         if call.get("target_entry") not in target_entries:
             continue
         call_addr = _parse_hex(call.get("call_address"))
         if call_addr is None:
             continue
-        owner = _find_entry(entries, call_addr)
+        selected.append((call, call_addr))
+
+    owners, _counts = address_index.lookup_many(addr for _call, addr in selected)
+    call_sites = []
+    for (call, _addr), owner in zip(selected, owners):
         call_sites.append(
             {
                 "call_address": call.get("call_address"),
                 "call_mnemonic": call.get("call_mnemonic"),
                 "target_entry": call.get("target_entry"),
                 "target_name": call.get("target_name"),
-                "owner_entry": owner,
+                "owner_entry": address_index.entry_ids[owner] if owner >= 0 else None,
             }
         )
 
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Shared vmaddr -> (fileset entry, segment) index for KC address attribution.
+
+Built once from `kc_fileset_index.json` (its `segment_intervals`, falling back
+to per-entry `vmaddr_span` when no interval map is present) and persisted next
+to it as `kc_address_index.json`. kc_truth_layer, asp_conf_fixup_signature_scan,
+and derive_mac_policy_call_sites all resolve addresses through it.
+
+Layout: intervals sorted by (start, -end) in parallel `array` columns, plus a
+`parent` column linking each interval to the nearest earlier interval that
+still covers its start. A lookup bisects `starts` and follows `parent` links,
+so overlapping/nested segments are resolved without scanning neighbours. When
+several intervals contain an address the smallest one wins (ties go to the
+later start), and the match count is reported for ambiguity accounting.
+
+Addresses are compared in unsigned 64-bit space; signed inputs (e.g. Ghidra's
+`0x-1fff...` spelling) are normalized first.
+
+Usage:
+    python3 book/experiments/mac-policy-registration/kc_address_index.py \
+        --fileset-index book/experiments/mac-policy-registration/out/kc_fileset_index.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from book.api import path_utils
+
+INDEX_SCHEMA_VERSION = "kc-address-index.v0.1"
+INDEX_NAME = "kc_address_index.json"
+U64_MASK = (1 << 64) - 1
+
+
+def _u64(value: int) -> int:
+    return int(value) & U64_MASK
+
+
+class KcAddressIndex:
+    """Sorted interval columns with parent links; see the module docstring."""
+
+    def __init__(self, intervals: Iterable[Mapping[str, object]]) -> None:
+        rows = []
+        for item in intervals:
+            start = item.get("start")
+            end = item.get("end")
+            if start is None or end is None:
+                continue
+            start, end = _u64(start), _u64(end)
+            if end <= start:
+                continue
+            rows.append((start, end, item.get("entry_id"), item.get("segment_name"), item.get("is_exec")))
+        rows.sort(key=lambda row: (row[0], -row[1]))
+
+        self.starts = array("Q", (row[0] for row in rows))
+        self.ends = array("Q", (row[1] for row in rows))
+        self.entry_ids: List[Optional[str]] = [row[2] for row in rows]
+        self.segment_names: List[Optional[str]] = [row[3] for row in rows]
+        self.is_exec: List[Optional[bool]] = [None if row[4] is None else bool(row[4]) for row in rows]
+        self.parent = array("i", [-1] * len(rows))
+        for idx in range(1, len(rows)):
+            # Nearest earlier interval whose end is past our start; intervals
+            # skipped by following parent links all end before it.
+            cand = idx - 1
+            while cand >= 0 and self.ends[cand] <= self.starts[idx]:
+                cand = self.parent[cand]
+            self.parent[idx] = cand
+
+    @classmethod
+    def from_fileset_index(cls, data: Mapping[str, object]) -> "KcAddressIndex":
+        intervals = data.get("segment_intervals") or []
+        if intervals:
+            return cls(intervals)  # type: ignore[arg-type]
+        spans = []
+        for entry in data.get("entries") or []:  # type: ignore[union-attr]
+            span = entry.get("vmaddr_span") or {}
+            spans.append(
+                {
+                    "start": span.get("start"),
+                    "end": span.get("end"),
+                    "entry_id": entry.get("entry_id"),
+                    "segment_name": None,
+                    "is_exec": None,
+                }
+            )
+        return cls(spans)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def interval(self, idx: int) -> Dict[str, object]:
+        return {
+            "start": self.starts[idx],
+            "end": self.ends[idx],
+            "entry_id": self.entry_ids[idx],
+            "segment_name": self.segment_names[idx],
+            "is_exec": self.is_exec[idx],
+        }
+
+    def _locate(self, vmaddr: int) -> Tuple[int, int]:
+        """Return (best interval index or -1, number of intervals containing vmaddr)."""
+        addr = _u64(vmaddr)
+        idx = bisect_right(self.starts, addr) - 1
+        best = -1
+        count = 0
+        starts, ends, parent = self.starts, self.ends, self.parent
+        while idx >= 0:
+            if addr < ends[idx]:
+                count += 1
+                if best < 0 or ends[idx] - starts[idx] < ends[best] - starts[best]:
+                    best = idx
+            idx = parent[idx]
+        return best, count
+
+    def lookup(self, vmaddr: int) -> Tuple[Optional[Dict[str, object]], int]:
+        """Return (smallest containing interval or None, containing-interval count)."""
+        idx, count = self._locate(vmaddr)
+        return (self.interval(idx) if idx >= 0 else None), count
+
+    def lookup_many(self, addrs: Iterable[int]) -> Tuple[array, array]:
+        """
+        Batch lookup: (interval indices, match counts) as `array("i")` columns,
+        with -1 / 0 for addresses outside every interval. Accepts any iterable
+        of ints (lists, `array("Q")` columns).
+        """
+        indices = array("i")
+        counts = array("i")
+        memo: Dict[int, Tuple[int, int]] = {}
+        for addr in addrs:
+            hit = memo.get(addr)
+            if hit is None:
+                hit = memo[addr] = self._locate(addr)
+            indices.append(hit[0])
+            counts.append(hit[1])
+        return indices, counts
+
+    def to_json(self, source: Optional[Mapping[str, object]] = None) -> Dict[str, object]:
+        return {
+            "schema_version": INDEX_SCHEMA_VERSION,
+            "source": dict(source or {}),
+            "vmaddr_space": "kc_vmaddr_pre_adjust",
+            "interval_count": len(self),
+            "starts": list(self.starts),
+            "ends": list(self.ends),
+            "parent": list(self.parent),
+            "entry_ids": self.entry_ids,
+            "segment_names": self.segment_names,
+            "is_exec": self.is_exec,
+        }
+
+    @classmethod
+    def from_json(cls, doc: Mapping[str, object]) -> "KcAddressIndex":
+        if doc.get("schema_version") != INDEX_SCHEMA_VERSION:
+            raise ValueError(f"unexpected address index schema: {doc.get('schema_version')}")
+        index = cls([])
+        index.starts = array("Q", doc["starts"])  # type: ignore[arg-type]
+        index.ends = array("Q", doc["ends"])  # type: ignore[arg-type]
+        index.parent = array("i", doc["parent"])  # type: ignore[arg-type]
+        index.entry_ids = list(doc["entry_ids"])  # type: ignore[arg-type]
+        index.segment_names = list(doc["segment_names"])  # type: ignore[arg-type]
+        index.is_exec = list(doc["is_exec"])  # type: ignore[arg-type]
+        return index
+
+
+def _sha256_bytes(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()
+
+
+def index_path_for(fileset_index_path: Path) -> Path:
+    return fileset_index_path.with_name(INDEX_NAME)
+
+
+def write_address_index(index: KcAddressIndex, fileset_index_path: Path) -> Path:
+    """Persist `index` next to `fileset_index_path`, stamped with its sha256."""
+    out_path = index_path_for(fileset_index_path)
+    source = {"fileset_index": fileset_index_path.name, "sha256": _sha256_bytes(fileset_index_path.read_bytes())}
+    out_path.write_text(json.dumps(index.to_json(source), sort_keys=True))
+    return out_path
+
+
+def load_address_index(fileset_index_path: Path, *, persist: bool = True) -> KcAddressIndex:
+    """
+    Load the persisted index for `fileset_index_path`, rebuilding it when it is
+    missing or was built from a different fileset index.
+    """
+    raw = fileset_index_path.read_bytes()
+    digest = _sha256_bytes(raw)
+    persisted = index_path_for(fileset_index_path)
+    if persisted.exists():
+        try:
+            doc = json.loads(persisted.read_text())
+            if (doc.get("source") or {}).get("sha256") == digest:
+                return KcAddressIndex.from_json(doc)
+        except (ValueError, KeyError, TypeError):
+            pass
+    index = KcAddressIndex.from_fileset_index(json.loads(raw))
+    if persist:
+        try:
+            write_address_index(index, fileset_index_path)
+        except OSError:
+            pass
+    return index
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build the persisted KC vmaddr -> entry/segment index.")
+    parser.add_argument(
+        "--fileset-index",
+        default="book/experiments/mac-policy-registration/out/kc_fileset_index.json",
+        help="Path to kc_fileset_index.json",
+    )
+    args = parser.parse_args(argv)
+
+    repo_root = path_utils.find_repo_root()
+    fileset_index_path = path_utils.ensure_absolute(args.fileset_index, repo_root)
+    index = KcAddressIndex.from_fileset_index(json.loads(fileset_index_path.read_text()))
+    out_path = write_address_index(index, fileset_index_path)
+    print("Wrote", path_utils.to_repo_relative(out_path, repo_root), f"({len(index)} intervals)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,6 +4,7 @@ Build a KC "truth layer" by enumerating fileset entries and decoding chained fix
 
 Outputs (default under book/experiments/mac-policy-registration/out):
 - kc_fileset_index.json (fileset entries + segment interval map)
+- kc_address_index.json (persisted vmaddr -> entry/segment index; see kc_address_index.py)
 - kc_fixups_summary.json
 - kc_fixups.jsonl (compact by default; use --fixups-mode lite/full for larger records)
 
@@ -12,18 +13,25 @@ Notes:
   stepping (next*4). Any base-pointer inference beyond cache level 0 remains
   under exploration until validated against additional witnesses.
 - Address mapping is done in KC on-disk vmaddr space (pre-adjust / slide=0).
+- Chains are walked through a read-only mmap of the KC and kept as columnar
+  arrays (`FixupColumns`); kc_fixups.jsonl is written from the columns, so no
+  per-fixup dicts are held. DYLD_CHAINED_PTR_START_MULTI pages are decoded via
+  their overflow chain-start list.
 """
 
 from __future__ import annotations
 
 import argparse
 import json
+import mmap
 import struct
+from array import array
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from book.api import path_utils
+from kc_address_index import KcAddressIndex, write_address_index
 
 MH_MAGIC_64 = 0xFEEDFACF
 MH_FILESET = 0xC
@@ -36,6 +44,9 @@ LC_DYLD_CHAINED_FIXUPS = 0x80000034
 LINKEDIT_DATA_CMDS = {0x1D, 0x1E, 0x2F, 0x31, 0x34}
 DYLD_CHAINED_PTR_START_NONE = 0xFFFF
 DYLD_CHAINED_PTR_START_MULTI = 0x8000
+DYLD_CHAINED_PTR_START_LAST = 0x8000
+
+_U64 = struct.Struct("<Q")
 
 
 @dataclass
@@ -258,52 +269,83 @@ def _build_segment_intervals(
     return intervals, overlaps, overlap_total, skipped_counts
 
 
-def _find_interval(intervals: List[Dict[str, object]], vmaddr: int) -> Tuple[Optional[Dict[str, object]], int]:
-    if not intervals:
-        return None, 0
-    lo = 0
-    hi = len(intervals) - 1
-    match_idx = None
-    while lo <= hi:
-        mid = (lo + hi) // 2
-        start = intervals[mid]["start"]
-        end = intervals[mid]["end"]
-        if vmaddr < start:
-            hi = mid - 1
-        elif vmaddr >= end:
-            lo = mid + 1
-        else:
-            match_idx = mid
+class FixupColumns:
+    """
+    Column-oriented chained-fixup records.
+
+    One `array` per field instead of an 11-key dict per fixup; `decoded` and
+    `next_offset` are derived from `raw` on demand, and `record(i)` rebuilds the
+    historical full record for a single fixup.
+    """
+
+    def __init__(self) -> None:
+        self.segment_names: Dict[int, str] = {}
+        self.segment_index = array("I")
+        self.pointer_format = array("H")
+        self.page_index = array("I")
+        self.page_start = array("H")
+        self.page_chain_start = array("H")
+        self.fileoff = array("Q")
+        self.vmaddr = array("Q")
+        self.raw = array("Q")
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def decoded(self, idx: int) -> Dict[str, int | bool]:
+        if self.pointer_format[idx] != 8:
+            return {}
+        return _decode_kernel_cache_ptr(self.raw[idx])
+
+    def record(self, idx: int) -> Dict[str, object]:
+        decoded = self.decoded(idx)
+        seg_index = self.segment_index[idx]
+        return {
+            "segment_index": seg_index,
+            "segment_name": self.segment_names[seg_index],
+            "pointer_format": self.pointer_format[idx],
+            "page_index": self.page_index[idx],
+            "page_start": self.page_start[idx],
+            "page_chain_start": self.page_chain_start[idx],
+            "fileoff": self.fileoff[idx],
+            "vmaddr": self.vmaddr[idx],
+            "raw": self.raw[idx],
+            "decoded": decoded,
+            "next_offset": int(decoded["next_delta"]) * 4 if decoded else 0,
+        }
+
+    def __iter__(self) -> Iterator[Dict[str, object]]:
+        for idx in range(len(self)):
+            yield self.record(idx)
+
+
+def _page_chain_starts(page_starts: List[int], page_start: int) -> List[int]:
+    """
+    Chain offsets for a DYLD_CHAINED_PTR_START_MULTI page: the low bits index
+    the overflow list that follows page_start[page_count], which runs until an
+    entry flagged DYLD_CHAINED_PTR_START_LAST.
+    """
+    starts: List[int] = []
+    idx = page_start & ~DYLD_CHAINED_PTR_START_MULTI
+    while idx < len(page_starts):
+        value = page_starts[idx]
+        starts.append(value & ~DYLD_CHAINED_PTR_START_LAST)
+        if value & DYLD_CHAINED_PTR_START_LAST:
             break
-    if match_idx is None:
-        return None, 0
-    matches = [intervals[match_idx]]
-    idx = match_idx - 1
-    while idx >= 0 and intervals[idx]["end"] > vmaddr:
-        if intervals[idx]["start"] <= vmaddr < intervals[idx]["end"]:
-            matches.append(intervals[idx])
-        idx -= 1
-    idx = match_idx + 1
-    while idx < len(intervals) and intervals[idx]["start"] <= vmaddr:
-        if intervals[idx]["start"] <= vmaddr < intervals[idx]["end"]:
-            matches.append(intervals[idx])
         idx += 1
-    matches = sorted(matches, key=lambda item: item["end"] - item["start"])
-    return matches[0], len(matches)
+    return starts
 
 
 def _collect_fixups(
     kc_path: Path,
     segments: List[Segment],
     fixups_data: bytes,
-) -> Tuple[List[Dict[str, object]], Dict[str, object]]:
+) -> Dict[str, object]:
     fixups_version, starts_offset, imports_offset, symbols_offset, imports_count, imports_format, symbols_format = struct.unpack_from(
         "<IIIIIII", fixups_data, 0
     )
     seg_count = struct.unpack_from("<I", fixups_data, starts_offset)[0]
-    seg_info_offsets = [
-        struct.unpack_from("<I", fixups_data, starts_offset + 4 + i * 4)[0] for i in range(seg_count)
-    ]
+    seg_info_offsets = struct.unpack_from(f"<{seg_count}I", fixups_data, starts_offset + 4)
 
     pointer_counts: Dict[str, int] = {}
     per_segment_counts: Dict[str, int] = {}
@@ -312,15 +354,12 @@ def _collect_fixups(
     max_chain_len = 0
     cache_level_counts: Dict[str, int] = {}
     page_start_mode_counts = {"single": 0, "multi": 0}
-    multi_start_pages: List[Dict[str, int]] = []
-    fixups: List[Dict[str, object]] = []
+    multi_start_pages: List[Dict[str, object]] = []
+    fixups = FixupColumns()
+    cols = fixups
 
-    def _read_u16(offset: int) -> Optional[int]:
-        if offset < 0 or offset + 2 > len(fixups_data):
-            return None
-        return struct.unpack_from("<H", fixups_data, offset)[0]
-
-    with kc_path.open("rb") as f:
+    with kc_path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        file_size = len(mm)
         for seg_index, info_off in enumerate(seg_info_offsets):
             if info_off == 0:
                 continue
@@ -330,9 +369,11 @@ def _collect_fixups(
             max_valid_pointer = struct.unpack_from("<I", fixups_data, seg_off + 16)[0]
             page_count = struct.unpack_from("<H", fixups_data, seg_off + 20)[0]
             page_starts_off = seg_off + 22
-            page_starts = [
-                struct.unpack_from("<H", fixups_data, page_starts_off + i * 2)[0] for i in range(page_count)
-            ]
+            # page_start[page_count] is followed by the MULTI overflow list; `size`
+            # covers both.
+            start_slots = max(page_count, (size - 22) // 2)
+            start_slots = min(start_slots, (len(fixups_data) - page_starts_off) // 2)
+            page_starts = list(struct.unpack_from(f"<{start_slots}H", fixups_data, page_starts_off))
 
             if seg_index >= len(segments):
                 seg_name = f"segment_{seg_index}"
@@ -340,11 +381,12 @@ def _collect_fixups(
             else:
                 seg_name = segments[seg_index].name
                 seg_vmaddr = segments[seg_index].vmaddr
+            cols.segment_names[seg_index] = seg_name
 
             fmt_key = f"{pointer_format}"
             pointer_counts[fmt_key] = pointer_counts.get(fmt_key, 0)
             per_segment_counts[seg_name] = per_segment_counts.get(seg_name, 0)
-            page_coverage[seg_name] = page_coverage.get(
+            coverage = page_coverage.setdefault(
                 seg_name,
                 {
                     "page_size": page_size,
@@ -353,76 +395,69 @@ def _collect_fixups(
                     "fixups": 0,
                 },
             )
+            seg_fixups = 0
+            level_counts = [0, 0, 0, 0]
 
-            for page_index, page_start in enumerate(page_starts):
+            for page_index, page_start in enumerate(page_starts[:page_count]):
                 if page_start == DYLD_CHAINED_PTR_START_NONE:
                     continue
-                chain_offsets: List[int] = []
                 if page_start & DYLD_CHAINED_PTR_START_MULTI:
                     page_start_mode_counts["multi"] += 1
+                    chain_offsets = _page_chain_starts(page_starts, page_start)
                     if len(multi_start_pages) < 20:
                         multi_start_pages.append(
                             {
                                 "segment_index": seg_index,
                                 "page_index": page_index,
                                 "page_start": page_start,
+                                "chain_starts": chain_offsets,
                             }
                         )
-                    continue
                 else:
                     page_start_mode_counts["single"] += 1
-                    chain_offsets.append(page_start)
+                    chain_offsets = [page_start]
                 if not chain_offsets:
                     continue
-                page_coverage[seg_name]["pages_with_fixups"] += 1
+                coverage["pages_with_fixups"] += 1
+                page_fileoff = segment_offset + page_index * page_size
+                page_vmaddr = seg_vmaddr + page_index * page_size
                 for chain_start in chain_offsets:
-                    chain_fileoff = segment_offset + page_index * page_size + chain_start
-                    chain_vmaddr = seg_vmaddr + page_index * page_size + chain_start
-                    chain_steps = 0
-                    while True:
-                        f.seek(chain_fileoff)
-                        raw_bytes = f.read(8)
-                        if len(raw_bytes) != 8:
-                            break
-                        raw = struct.unpack_from("<Q", raw_bytes, 0)[0]
-                        decoded: Dict[str, int | bool] = {}
+                    offset = chain_start
+                    raws: List[int] = []
+                    offsets: List[int] = []
+                    while page_fileoff + offset + 8 <= file_size:
+                        raw = _U64.unpack_from(mm, page_fileoff + offset)[0]
+                        raws.append(raw)
+                        offsets.append(offset)
                         if pointer_format == 8:
-                            decoded = _decode_kernel_cache_ptr(raw)
-                            next_delta = int(decoded["next_delta"])
-                            next_off = next_delta * 4
-                            cache_level_counts[str(decoded["cache_level"])] = cache_level_counts.get(
-                                str(decoded["cache_level"]), 0
-                            ) + 1
+                            level_counts[(raw >> 30) & 0x3] += 1
+                            next_off = ((raw >> 51) & 0xFFF) * 4
                         else:
-                            next_delta = 0
                             next_off = 0
-
-                        record = {
-                            "segment_index": seg_index,
-                            "segment_name": seg_name,
-                            "pointer_format": pointer_format,
-                            "page_index": page_index,
-                            "page_start": page_start,
-                            "page_chain_start": chain_start,
-                            "fileoff": chain_fileoff,
-                            "vmaddr": chain_vmaddr,
-                            "raw": raw,
-                            "decoded": decoded,
-                            "next_offset": next_off,
-                        }
-                        fixups.append(record)
-                        total += 1
-                        pointer_counts[fmt_key] = pointer_counts.get(fmt_key, 0) + 1
-                        per_segment_counts[seg_name] = per_segment_counts.get(seg_name, 0) + 1
-                        page_coverage[seg_name]["fixups"] += 1
-
-                        chain_steps += 1
-                        if chain_steps > max_chain_len:
-                            max_chain_len = chain_steps
-                        if next_off == 0 or chain_steps > 10000:
+                        if next_off == 0 or len(raws) > 10000:
                             break
-                        chain_fileoff += next_off
-                        chain_vmaddr += next_off
+                        offset += next_off
+                    steps = len(raws)
+                    if not steps:
+                        continue
+                    cols.raw.extend(raws)
+                    cols.fileoff.extend(page_fileoff + off for off in offsets)
+                    cols.vmaddr.extend(page_vmaddr + off for off in offsets)
+                    cols.segment_index.extend([seg_index] * steps)
+                    cols.pointer_format.extend([pointer_format] * steps)
+                    cols.page_index.extend([page_index] * steps)
+                    cols.page_start.extend([page_start] * steps)
+                    cols.page_chain_start.extend([chain_start] * steps)
+                    seg_fixups += steps
+                    max_chain_len = max(max_chain_len, steps)
+
+            total += seg_fixups
+            pointer_counts[fmt_key] += seg_fixups
+            per_segment_counts[seg_name] += seg_fixups
+            coverage["fixups"] += seg_fixups
+            for level, count in enumerate(level_counts):
+                if count:
+                    cache_level_counts[str(level)] = cache_level_counts.get(str(level), 0) + count
 
     return {
         "fixups": fixups,
@@ -438,35 +473,26 @@ def _collect_fixups(
 
 
 def _coverage_for_base(
-    fixups: List[Dict[str, object]],
-    segment_intervals: List[Dict[str, object]],
+    fixups: FixupColumns,
+    address_index: KcAddressIndex,
     base_ptr: Optional[int],
     cache_level: int,
 ) -> Tuple[int, int]:
     if base_ptr is None:
         return 0, 0
-    hits = 0
-    total = 0
-    for rec in fixups:
-        if rec.get("pointer_format") != 8:
-            continue
-        decoded = rec.get("decoded") or {}
-        lvl = decoded.get("cache_level")
-        target = decoded.get("target")
-        if lvl is None or target is None:
-            continue
-        if int(lvl) != cache_level:
-            continue
-        total += 1
-        resolved = base_ptr + int(target)
-        if _find_interval(segment_intervals, resolved)[0] is not None:
-            hits += 1
-    return hits, total
+    resolved = [
+        base_ptr + (raw & 0x3FFFFFFF)
+        for pointer_format, raw in zip(fixups.pointer_format, fixups.raw)
+        if pointer_format == 8 and (raw >> 30) & 0x3 == cache_level
+    ]
+    indices, _counts = address_index.lookup_many(resolved)
+    hits = len(indices) - indices.count(-1)
+    return hits, len(resolved)
 
 
 def _infer_base_pointers(
-    fixups: List[Dict[str, object]],
-    segment_intervals: List[Dict[str, object]],
+    fixups: FixupColumns,
+    address_index: KcAddressIndex,
     base_pointers: Dict[int, int | None],
     threshold: float = 0.95,
 ) -> Tuple[Dict[int, int | None], Dict[str, object]]:
@@ -475,7 +501,7 @@ def _infer_base_pointers(
     levels = sorted(inferred.keys())
     inference = {"threshold": threshold, "base0": base0, "coverage_metric": "resolved_in_entry/total", "levels": {}}
     for level in levels:
-        hits, total = _coverage_for_base(fixups, segment_intervals, base0, level)
+        hits, total = _coverage_for_base(fixups, address_index, base0, level)
         coverage = (float(hits) / float(total)) if total else 0.0
         entry = {
             "coverage_hits": hits,
@@ -494,8 +520,8 @@ def _infer_base_pointers(
 
 
 def _write_fixups(
-    fixups: List[Dict[str, object]],
-    segment_intervals: List[Dict[str, object]],
+    fixups: FixupColumns,
+    address_index: KcAddressIndex,
     entries_by_id: Dict[str, Dict[str, object]],
     base_pointers: Dict[int, int | None],
     out_path: Path,
@@ -510,17 +536,6 @@ def _write_fixups(
     }
     resolved_counts_by_cache_level: Dict[str, Dict[str, int]] = {}
 
-    def find_entry_segment(vmaddr: int) -> Tuple[Optional[str], Optional[str], Optional[bool], int]:
-        match, count = _find_interval(segment_intervals, vmaddr)
-        if not match:
-            return None, None, None, 0
-        return (
-            match.get("entry_id"),
-            match.get("segment_name"),
-            bool(match.get("is_exec")) if match.get("is_exec") is not None else None,
-            count,
-        )
-
     def bump(level: Optional[int], key: str) -> None:
         if level is None:
             return
@@ -536,77 +551,87 @@ def _write_fixups(
         )
         bucket[key] = bucket.get(key, 0) + 1
 
+    # Resolve every target first so interval attribution runs as one batch.
+    resolved_all: List[Optional[int]] = []
+    for pointer_format, raw in zip(fixups.pointer_format, fixups.raw):
+        base_ptr = base_pointers.get((raw >> 30) & 0x3) if pointer_format == 8 else None
+        resolved_all.append(base_ptr + (raw & 0x3FFFFFFF) if base_ptr is not None else None)
+    target_idx, target_count = address_index.lookup_many(r for r in resolved_all if r is not None)
+    if mode == "full":
+        owner_idx, owner_count = address_index.lookup_many(fixups.vmaddr)
+    entry_ids, segment_names, is_exec = address_index.entry_ids, address_index.segment_names, address_index.is_exec
+
+    hit = 0
     with out_path.open("w") as out:
-        for rec in fixups:
-            decoded = rec.get("decoded") or {}
-            pointer_format = rec.get("pointer_format")
-            resolved_guess = None
-            resolved_unsigned = None
+        for idx, (pointer_format, raw, vmaddr) in enumerate(zip(fixups.pointer_format, fixups.raw, fixups.vmaddr)):
+            resolved_unsigned = resolved_all[idx]
+            resolved_guess = resolved_unsigned
             base_ptr = None
             cache_level = None
             if pointer_format == 8:
-                cache_level = decoded.get("cache_level")
-                target = decoded.get("target")
-                if cache_level is not None:
-                    base_ptr = base_pointers.get(int(cache_level))
-                if base_ptr is not None and target is not None:
-                    resolved_unsigned = base_ptr + int(target)
-                    resolved_guess = resolved_unsigned
-                else:
+                cache_level = (raw >> 30) & 0x3
+                base_ptr = base_pointers.get(cache_level)
+                if base_ptr is None:
                     resolved_counts["unresolved_unknown_base"] += 1
-                    bump(int(cache_level) if cache_level is not None else None, "unresolved_unknown_base")
+                    bump(cache_level, "unresolved_unknown_base")
 
-            owner_match, owner_count = _find_interval(segment_intervals, int(rec["vmaddr"]))
-            owner_entry = owner_match.get("entry_id") if owner_match else None
             if mode == "compact":
                 record = {
-                    "v": rec["vmaddr"],
+                    "v": vmaddr,
                     "r": resolved_unsigned,
                 }
             elif mode == "lite":
                 decoded_lite = {}
                 if pointer_format == 8:
                     decoded_lite = {
-                        "target": decoded.get("target"),
-                        "cache_level": decoded.get("cache_level"),
-                        "is_auth": decoded.get("is_auth"),
+                        "target": raw & 0x3FFFFFFF,
+                        "cache_level": cache_level,
+                        "is_auth": bool(raw >> 63),
                     }
                 record = {
-                    "vmaddr": rec["vmaddr"],
+                    "vmaddr": vmaddr,
                     "pointer_format": pointer_format,
                     "decoded": decoded_lite,
                     "resolved_guess": resolved_guess,
                     "resolved_unsigned": resolved_unsigned,
                 }
             else:
-                record = dict(rec)
+                owner = owner_idx[idx]
+                count = owner_count[idx]
+                record = fixups.record(idx)
                 record.update(
                     {
                         "resolved_guess": resolved_guess,
                         "resolved_unsigned": resolved_unsigned,
                         "resolved_base": base_ptr,
-                        "owner_entry": owner_entry,
-                        "owner_segment": owner_match.get("segment_name") if owner_match else None,
-                        "owner_ambiguous": owner_count if owner_count > 1 else 0,
+                        "owner_entry": entry_ids[owner] if owner >= 0 else None,
+                        "owner_segment": segment_names[owner] if owner >= 0 else None,
+                        "owner_ambiguous": count if count > 1 else 0,
                     }
                 )
             out.write(json.dumps(record) + "\n")
 
             if resolved_unsigned is None:
                 continue
-            entry_id, segment_name, is_exec, amb_count = find_entry_segment(resolved_unsigned)
+            match = target_idx[hit]
+            amb_count = target_count[hit]
+            hit += 1
+            if match < 0:
+                resolved_counts["resolved_outside"] += 1
+                bump(cache_level, "resolved_outside")
+                continue
             if amb_count > 1:
                 resolved_counts["resolved_ambiguous"] += 1
-                bump(int(cache_level) if cache_level is not None else None, "resolved_ambiguous")
-            if entry_id:
+                bump(cache_level, "resolved_ambiguous")
+            if entry_ids[match]:
                 resolved_counts["resolved_in_entry"] += 1
-                bump(int(cache_level) if cache_level is not None else None, "resolved_in_entry")
-                if is_exec:
+                bump(cache_level, "resolved_in_entry")
+                if is_exec[match]:
                     resolved_counts["resolved_in_exec"] += 1
-                    bump(int(cache_level) if cache_level is not None else None, "resolved_in_exec")
+                    bump(cache_level, "resolved_in_exec")
             else:
                 resolved_counts["resolved_outside"] += 1
-                bump(int(cache_level) if cache_level is not None else None, "resolved_outside")
+                bump(cache_level, "resolved_outside")
 
     return {
         "resolved_counts": resolved_counts,
@@ -614,9 +639,10 @@ def _write_fixups(
     }
 
 
-def main() -> int:
+def main(argv: Optional[List[str]] = None) -> int:
     parser = argparse.ArgumentParser(description="Build KC fileset + chained-fixups truth layer.")
     parser.add_argument("--build-id", default="14.4.1-23E224", help="Sandbox-private build ID.")
+    parser.add_argument("--kc", help="KC path (default: dumps/Sandbox-private/<build-id>/kernel/BootKernelCollection.kc).")
     parser.add_argument("--out-dir", default="book/experiments/mac-policy-registration/out", help="Output dir.")
     parser.add_argument(
         "--fixups-mode",
@@ -624,11 +650,12 @@ def main() -> int:
         default="compact",
         help="Write compact, lite, or full per-fixup records (default: compact).",
     )
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     repo_root = path_utils.find_repo_root()
     kc_path = path_utils.ensure_absolute(
-        repo_root / f"dumps/Sandbox-private/{args.build_id}/kernel/BootKernelCollection.kc"
+        args.kc or repo_root / f"dumps/Sandbox-private/{args.build_id}/kernel/BootKernelCollection.kc",
+        repo_root,
     )
     out_dir = path_utils.ensure_absolute(args.out_dir, repo_root)
     out_dir.mkdir(parents=True, exist_ok=True)
@@ -702,21 +729,23 @@ def main() -> int:
 
     fileset_index_path = out_dir / "kc_fileset_index.json"
     fileset_index_path.write_text(json.dumps(fileset_index, indent=2, sort_keys=True))
+    address_index = KcAddressIndex(segment_intervals)
+    address_index_path = write_address_index(address_index, fileset_index_path)
 
     # Fixups
-    fixups = None
+    fixups_loc = None
     for cmd, cmdsize, off in _iter_load_commands(cmds, header.ncmds):
         if cmd == LC_DYLD_CHAINED_FIXUPS:
             dataoff, datasize = struct.unpack_from("<II", cmds, off + 8)
-            fixups = (dataoff, datasize)
+            fixups_loc = (dataoff, datasize)
             break
-    if not fixups:
+    if not fixups_loc:
         print("No LC_DYLD_CHAINED_FIXUPS found")
         return 1
 
     with kc_path.open("rb") as f:
-        f.seek(fixups[0])
-        fixups_data = f.read(fixups[1])
+        f.seek(fixups_loc[0])
+        fixups_data = f.read(fixups_loc[1])
 
     base_pointers: Dict[int, int | None] = {0: None, 1: None, 2: None, 3: None}
     if segments:
@@ -748,7 +777,7 @@ def main() -> int:
     else:
         base_pointers, base_inference = _infer_base_pointers(
             fixups,
-            segment_intervals,
+            address_index,
             base_pointers,
             threshold=0.95,
         )
@@ -756,7 +785,7 @@ def main() -> int:
     fixups_out_path = out_dir / "kc_fixups.jsonl"
     resolved_summary = _write_fixups(
         fixups=fixups,
-        segment_intervals=segment_intervals,
+        address_index=address_index,
         entries_by_id=entries_by_id,
         base_pointers=base_pointers,
         out_path=fixups_out_path,
@@ -792,8 +821,8 @@ def main() -> int:
             "world_id": world_id,
             "build_id": args.build_id,
             "kc_path": path_utils.to_repo_relative(kc_path, repo_root),
-            "fixups_dataoff": fixups[0],
-            "fixups_datasize": fixups[1],
+            "fixups_dataoff": fixups_loc[0],
+            "fixups_datasize": fixups_loc[1],
             "fixups_version": fixups_version,
             "starts_offset": starts_offset,
             "imports_offset": imports_offset,
@@ -823,7 +852,7 @@ def main() -> int:
             },
             "page_start_modes": {
                 "single": "page_start is direct chain offset",
-                "multi": "page_start flagged as DYLD_CHAINED_PTR_START_MULTI (unexpected for BootKC)",
+                "multi": "page_start flagged as DYLD_CHAINED_PTR_START_MULTI; low bits index the overflow chain-start list (ends at DYLD_CHAINED_PTR_START_LAST); unexpected for BootKC",
                 "status": "partial",
             },
         },
@@ -835,6 +864,7 @@ def main() -> int:
     fixups_summary_path.write_text(json.dumps(fixups_summary_out, indent=2, sort_keys=True))
 
     print("Wrote", path_utils.to_repo_relative(fileset_index_path, repo_root))
+    print("Wrote", path_utils.to_repo_relative(address_index_path, repo_root))
     print("Wrote", path_utils.to_repo_relative(fixups_summary_path, repo_root))
     print("Wrote", path_utils.to_repo_relative(fixups_out_path, repo_root))
     return 0
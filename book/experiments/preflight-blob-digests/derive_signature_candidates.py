@@ -11,11 +11,10 @@ This script is intentionally conservative about meaning:
 from __future__ import annotations
 
 import argparse
-import itertools
 import json
 import sys
 from pathlib import Path
-from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 REPO_ROOT = Path(__file__).resolve().parents[3]
 if str(REPO_ROOT) not in sys.path:
@@ -24,6 +23,8 @@ if str(REPO_ROOT) not in sys.path:
 from book.api.path_utils import to_repo_relative  # type: ignore
 from book.api.profile_tools import identity as identity_mod  # type: ignore
 
+from feature_bitsets import FeatureMatrix, int_field, iter_tag_combinations, tag_set
+
 SCHEMA_VERSION = 2
 
 DEFAULT_FEATURES = REPO_ROOT / "book/experiments/preflight-blob-digests/out/blob_structural_features.json"
@@ -37,44 +38,9 @@ def _load_json(path: Path) -> Dict[str, Any]:
     return json.loads(path.read_text())
 
 
-def _tags(features: Dict[str, Any]) -> Set[int]:
-    raw = features.get("tags_present") or []
-    out: Set[int] = set()
-    if isinstance(raw, list):
-        for v in raw:
-            try:
-                out.add(int(v))
-            except Exception:
-                continue
-    return out
-
-
-def _int_field(features: Dict[str, Any], field: str) -> Optional[int]:
-    v = features.get(field)
-    if isinstance(v, int):
-        return v
-    return None
-
-
-def _derived_float(features: Dict[str, Any], key: str) -> Optional[float]:
-    derived = features.get("derived")
-    if not isinstance(derived, dict):
-        return None
-    v = derived.get(key)
-    if isinstance(v, (int, float)):
-        return float(v)
-    return None
-
-
-def _metrics(
-    positives: Sequence[Dict[str, Any]],
-    negatives: Sequence[Dict[str, Any]],
-    predicate: Callable[[Dict[str, Any]], bool],
-) -> Dict[str, Any]:
-    tp = sum(1 for r in positives if predicate(r))
-    fp = sum(1 for r in negatives if predicate(r))
-    fn = len(positives) - tp
-    tn = len(negatives) - fp
+def _metrics(tp: int, fp: int, pos_total: int, neg_total: int) -> Dict[str, Any]:
+    fn = pos_total - tp
+    tn = neg_total - fp
 
     precision: Optional[float]
     recall: Optional[float]
@@ -82,7 +48,7 @@ def _metrics(
         precision = None
     else:
         precision = tp / (tp + fp)
-    recall = (tp / len(positives)) if positives else None
+    recall = (tp / pos_total) if pos_total else None
 
     f1: Optional[float]
     if precision is None or recall is None or (precision + recall) == 0:
@@ -95,97 +61,19 @@ def _metrics(
         "fp": fp,
         "tn": tn,
         "fn": fn,
-        "pos_total": len(positives),
-        "neg_total": len(negatives),
+        "pos_total": pos_total,
+        "neg_total": neg_total,
         "precision": precision,
         "recall": recall,
         "f1": f1,
     }
 
 
-def _candidate_tag_present(tag: int) -> Tuple[Dict[str, Any], Callable[[Dict[str, Any]], bool]]:
-    cand = {"kind": "tag_present", "tag": tag}
-
-    def pred(row: Dict[str, Any]) -> bool:
-        feats = row.get("features") or {}
-        return tag in _tags(feats if isinstance(feats, dict) else {})
-
-    return cand, pred
-
-
-def _candidate_tag_or(tags: Sequence[int]) -> Tuple[Dict[str, Any], Callable[[Dict[str, Any]], bool]]:
-    tag_list = sorted({int(t) for t in tags})
-    cand = {"kind": "tag_or", "tags": tag_list}
-
-    def pred(row: Dict[str, Any]) -> bool:
-        feats = row.get("features") or {}
-        present = _tags(feats if isinstance(feats, dict) else {})
-        return any(t in present for t in tag_list)
-
-    return cand, pred
-
-
-def _candidate_tag_and(tags: Sequence[int]) -> Tuple[Dict[str, Any], Callable[[Dict[str, Any]], bool]]:
-    tag_list = sorted({int(t) for t in tags})
-    cand = {"kind": "tag_and", "tags": tag_list}
-
-    def pred(row: Dict[str, Any]) -> bool:
-        feats = row.get("features") or {}
-        present = _tags(feats if isinstance(feats, dict) else {})
-        return all(t in present for t in tag_list)
-
-    return cand, pred
-
-
-def _candidate_tags_present_count_eq(n: int) -> Tuple[Dict[str, Any], Callable[[Dict[str, Any]], bool]]:
-    cand = {"kind": "tags_present_count_eq", "n": n}
-
-    def pred(row: Dict[str, Any]) -> bool:
-        feats = row.get("features") or {}
-        v = _int_field(feats if isinstance(feats, dict) else {}, "tags_present_count")
-        return v == n
-
-    return cand, pred
-
-
-def _candidate_node_count_eq_op_count() -> Tuple[Dict[str, Any], Callable[[Dict[str, Any]], bool]]:
-    cand = {"kind": "node_count_eq_op_count"}
-
-    def pred(row: Dict[str, Any]) -> bool:
-        feats = row.get("features") or {}
-        if not isinstance(feats, dict):
-            return False
-        node_count = _int_field(feats, "node_count")
-        op_count = _int_field(feats, "op_count")
-        return node_count is not None and op_count is not None and node_count == op_count
-
-    return cand, pred
-
-
-def _candidate_literal_pool_ratio_ge(threshold: float) -> Tuple[Dict[str, Any], Callable[[Dict[str, Any]], bool]]:
-    cand = {"kind": "literal_pool_bytes_ratio_ge", "threshold": float(threshold)}
-
-    def pred(row: Dict[str, Any]) -> bool:
-        feats = row.get("features") or {}
-        if not isinstance(feats, dict):
-            return False
-        ratio = _derived_float(feats, "literal_pool_bytes_ratio")
-        return ratio is not None and ratio >= float(threshold)
-
-    return cand, pred
-
-
-def _candidate_op_table_unique_ratio_le(threshold: float) -> Tuple[Dict[str, Any], Callable[[Dict[str, Any]], bool]]:
-    cand = {"kind": "op_table_unique_ratio_le", "threshold": float(threshold)}
-
-    def pred(row: Dict[str, Any]) -> bool:
-        feats = row.get("features") or {}
-        if not isinstance(feats, dict):
-            return False
-        ratio = _derived_float(feats, "op_table_unique_ratio")
-        return ratio is not None and ratio <= float(threshold)
-
-    return cand, pred
+def _sizes(value: str) -> List[int]:
+    out = sorted({int(v) for v in value.split(",") if v.strip()})
+    if any(k < 1 for k in out):
+        raise argparse.ArgumentTypeError("combination sizes must be >= 1")
+    return out
 
 
 def _candidate_id(cand: Dict[str, Any]) -> str:
@@ -225,6 +113,14 @@ def main(argv: List[str] | None = None) -> int:
     ap = argparse.ArgumentParser(prog="derive_signature_candidates")
     ap.add_argument("--features", type=Path, default=DEFAULT_FEATURES)
     ap.add_argument("--out", type=Path, required=True)
+    ap.add_argument("--or-sizes", type=_sizes, default=[2, 3], help="comma-separated tag_or combination sizes (default: 2,3)")
+    ap.add_argument("--and-sizes", type=_sizes, default=[2], help="comma-separated tag_and combination sizes (default: 2)")
+    ap.add_argument(
+        "--max-candidates",
+        type=int,
+        default=None,
+        help="emit only the best N candidates after sorting (all are still evaluated)",
+    )
     args = ap.parse_args(argv)
 
     world_id = identity_mod.baseline_world_id()
@@ -248,55 +144,72 @@ def main(argv: List[str] | None = None) -> int:
     small_pos_tags: Set[int] = set()
     for r in positives:
         feats = r["features"]
-        tags = _tags(feats)
+        tags = tag_set(feats)
         for t in tags:
             pos_tag_support[t] = pos_tag_support.get(t, 0) + 1
-        tpc = _int_field(feats, "tags_present_count")
+        tpc = int_field(feats, "tags_present_count")
         if tpc is not None and tpc <= 2:
             small_pos_tags |= tags
 
     core_tags = sorted({t for t, c in pos_tag_support.items() if c >= 2} | small_pos_tags)
 
+    # Positives occupy bits [0, len(positives)); negatives the bits above them.
+    matrix = FeatureMatrix(positives + negatives)
+    pos_mask = (1 << len(positives)) - 1
+    neg_mask = matrix.valid & ~pos_mask
+    pos_total = len(positives)
+    neg_total = len(negatives)
+
     candidates: List[Dict[str, Any]] = []
 
+    def add(cand: Dict[str, Any], mask: int) -> None:
+        metrics = _metrics((mask & pos_mask).bit_count(), (mask & neg_mask).bit_count(), pos_total, neg_total)
+        candidates.append({"id": _candidate_id(cand), **cand, "labeled_metrics": metrics})
+
+    def add_expr(cand: Dict[str, Any]) -> None:
+        add(cand, matrix.mask_for(cand))
+
     # Scalar candidates (very small set).
-    cand, pred = _candidate_node_count_eq_op_count()
-    candidates.append({"id": _candidate_id(cand), **cand, "labeled_metrics": _metrics(positives, negatives, pred)})
+    add_expr({"kind": "node_count_eq_op_count"})
 
     observed_counts: Set[int] = set()
     for r in positives + negatives:
-        tpc = _int_field(r["features"], "tags_present_count")
+        tpc = int_field(r["features"], "tags_present_count")
         if tpc is not None:
             observed_counts.add(tpc)
     for n in sorted(observed_counts):
-        cand, pred = _candidate_tags_present_count_eq(n)
-        candidates.append({"id": _candidate_id(cand), **cand, "labeled_metrics": _metrics(positives, negatives, pred)})
+        add_expr({"kind": "tags_present_count_eq", "n": n})
 
     # Derived "density/ratio" candidates (new; still structural-only).
     literal_pool_ratio_thresholds = [0.05, 0.1, 0.25, 0.5, 0.75]
     for t in literal_pool_ratio_thresholds:
-        cand, pred = _candidate_literal_pool_ratio_ge(t)
-        candidates.append({"id": _candidate_id(cand), **cand, "labeled_metrics": _metrics(positives, negatives, pred)})
+        add_expr({"kind": "literal_pool_bytes_ratio_ge", "threshold": float(t)})
 
     op_table_unique_ratio_thresholds = [0.1, 0.2, 0.25, 0.5]
     for t in op_table_unique_ratio_thresholds:
-        cand, pred = _candidate_op_table_unique_ratio_le(t)
-        candidates.append({"id": _candidate_id(cand), **cand, "labeled_metrics": _metrics(positives, negatives, pred)})
+        add_expr({"kind": "op_table_unique_ratio_le", "threshold": float(t)})
 
     # Single-tag predicates on core_tags.
     for t in core_tags:
-        cand, pred = _candidate_tag_present(t)
-        candidates.append({"id": _candidate_id(cand), **cand, "labeled_metrics": _metrics(positives, negatives, pred)})
-
-    # Small OR/AND combinations on core_tags.
-    for k in (2, 3):
-        for tags in itertools.combinations(core_tags, k):
-            cand, pred = _candidate_tag_or(tags)
-            candidates.append({"id": _candidate_id(cand), **cand, "labeled_metrics": _metrics(positives, negatives, pred)})
-    for k in (2,):
-        for tags in itertools.combinations(core_tags, k):
-            cand, pred = _candidate_tag_and(tags)
-            candidates.append({"id": _candidate_id(cand), **cand, "labeled_metrics": _metrics(positives, negatives, pred)})
+        add({"kind": "tag_present", "tag": t}, matrix.tag(t))
+
+    # Small OR/AND combinations on core_tags (core_tags is sorted, so each combination is too).
+    or_sizes = [k for k in args.or_sizes if k >= 2]
+    and_sizes = [k for k in args.and_sizes if k >= 2]
+    for tags, mask in iter_tag_combinations(matrix, core_tags, or_sizes, conjunctive=False):
+        add({"kind": "tag_or", "tags": list(tags)}, mask)
+    for tags, mask in iter_tag_combinations(matrix, core_tags, and_sizes, conjunctive=True):
+        add({"kind": "tag_and", "tags": list(tags)}, mask)
+
+    ranked = _sorted_candidate_rows(candidates)
+    metrics_doc: Dict[str, Any] = {
+        "positives": len(positives),
+        "negatives": len(negatives),
+        "candidates": len(candidates),
+    }
+    if args.max_candidates is not None:
+        ranked = ranked[: max(args.max_candidates, 0)]
+        metrics_doc["candidates_emitted"] = len(ranked)
 
     payload = {
         "tool": "book/experiments/preflight-blob-digests",
@@ -305,12 +218,8 @@ def main(argv: List[str] | None = None) -> int:
         "inputs": {"features": _rel(args.features)},
         "labels": {"positive": "apply_gated", "negative": "control"},
         "core_tags": core_tags,
-        "metrics": {
-            "positives": len(positives),
-            "negatives": len(negatives),
-            "candidates": len(candidates),
-        },
-        "candidates": _sorted_candidate_rows(candidates),
+        "metrics": metrics_doc,
+        "candidates": ranked,
         "notes": [
             "These are *candidate* structural signatures derived from a very small labeled set.",
             "Treat any correlation as partial/brittle until expanded and regression-checked.",
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Packed-bitset feature matrix for structural signature candidates.
+
+Each feature column (tag present, `tags_present_count == n`,
+`node_count == op_count`, ratio thresholds) is one Python int whose bit `i` is
+set when row `i` has that feature. A candidate's match set is then an AND/OR
+of columns, and TP/FP counts are popcounts of that mask against the label
+masks (`int.bit_count`), so enumerating tag combinations costs a few integer
+ops per candidate instead of a predicate call per row.
+
+`FeatureMatrix.mask_for` evaluates every candidate `kind` emitted by
+`derive_signature_candidates.py`; rows without a `features` dict never match.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+
+def tag_set(features: Dict[str, Any]) -> Set[int]:
+    raw = features.get("tags_present") or []
+    out: Set[int] = set()
+    if isinstance(raw, list):
+        for v in raw:
+            try:
+                out.add(int(v))
+            except Exception:
+                continue
+    return out
+
+
+def int_field(features: Dict[str, Any], field: str) -> Optional[int]:
+    v = features.get(field)
+    if isinstance(v, int):
+        return v
+    return None
+
+
+def derived_float(features: Dict[str, Any], key: str) -> Optional[float]:
+    derived = features.get("derived")
+    if not isinstance(derived, dict):
+        return None
+    v = derived.get(key)
+    if isinstance(v, (int, float)):
+        return float(v)
+    return None
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """Row indices set in `mask`, ascending."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class FeatureMatrix:
+    """Row × feature presence for a fixed row order."""
+
+    def __init__(self, rows: Sequence[Dict[str, Any]]) -> None:
+        self.rows = list(rows)
+        self.valid = 0
+        self.tag_bits: Dict[int, int] = {}
+        self.tags_count_bits: Dict[int, int] = {}
+        self.node_eq_op = 0
+        self._label_bits: Dict[str, int] = {}
+        self._ratios: Dict[str, List[Tuple[int, float]]] = {
+            "literal_pool_bytes_ratio": [],
+            "op_table_unique_ratio": [],
+        }
+        for i, row in enumerate(self.rows):
+            bit = 1 << i
+            label = row.get("label") if isinstance(row, dict) else None
+            if isinstance(label, str):
+                self._label_bits[label] = self._label_bits.get(label, 0) | bit
+            feats = row.get("features") if isinstance(row, dict) else None
+            if not isinstance(feats, dict):
+                continue
+            self.valid |= bit
+            for tag in tag_set(feats):
+                self.tag_bits[tag] = self.tag_bits.get(tag, 0) | bit
+            tpc = int_field(feats, "tags_present_count")
+            if tpc is not None:
+                self.tags_count_bits[tpc] = self.tags_count_bits.get(tpc, 0) | bit
+            node_count = int_field(feats, "node_count")
+            op_count = int_field(feats, "op_count")
+            if node_count is not None and op_count is not None and node_count == op_count:
+                self.node_eq_op |= bit
+            for key, values in self._ratios.items():
+                ratio = derived_float(feats, key)
+                if ratio is not None:
+                    values.append((i, ratio))
+
+    def label_mask(self, label: str) -> int:
+        return self._label_bits.get(label, 0)
+
+    def _ratio_mask(self, key: str, keep) -> int:
+        mask = 0
+        for i, ratio in self._ratios[key]:
+            if keep(ratio):
+                mask |= 1 << i
+        return mask
+
+    def tag(self, tag: int) -> int:
+        return self.tag_bits.get(tag, 0)
+
+    def tag_or(self, tags: Iterable[int]) -> int:
+        mask = 0
+        for t in tags:
+            mask |= self.tag_bits.get(int(t), 0)
+        return mask
+
+    def tag_and(self, tags: Iterable[int]) -> int:
+        mask = self.valid
+        for t in tags:
+            mask &= self.tag_bits.get(int(t), 0)
+        return mask
+
+    def mask_for(self, cand: Dict[str, Any]) -> int:
+        """Rows matching a candidate expression (0 for unknown or malformed candidates)."""
+        kind = cand.get("kind")
+        if kind == "tag_present":
+            tag = cand.get("tag")
+            return self.tag(tag) if isinstance(tag, int) else 0
+        if kind in {"tag_or", "tag_and"}:
+            tags = cand.get("tags")
+            if not isinstance(tags, list):
+                return 0
+            return self.tag_or(tags) if kind == "tag_or" else self.tag_and(tags)
+        if kind == "tags_present_count_eq":
+            n = cand.get("n")
+            return self.tags_count_bits.get(n, 0) if isinstance(n, int) else 0
+        if kind == "node_count_eq_op_count":
+            return self.node_eq_op
+        if kind == "literal_pool_bytes_ratio_ge":
+            threshold = cand.get("threshold")
+            if not isinstance(threshold, (int, float)):
+                return 0
+            return self._ratio_mask("literal_pool_bytes_ratio", lambda r: r >= float(threshold))
+        if kind == "op_table_unique_ratio_le":
+            threshold = cand.get("threshold")
+            if not isinstance(threshold, (int, float)):
+                return 0
+            return self._ratio_mask("op_table_unique_ratio", lambda r: r <= float(threshold))
+        return 0
+
+
+def iter_tag_combinations(
+    matrix: FeatureMatrix,
+    tags: Sequence[int],
+    sizes: Iterable[int],
+    *,
+    conjunctive: bool,
+) -> Iterator[Tuple[Tuple[int, ...], int]]:
+    """
+    Yield (tags, mask) for every combination of `tags` whose size is in
+    `sizes`, reusing each prefix's OR/AND mask instead of recomputing it.
+    """
+    wanted = {k for k in sizes if k >= 1}
+    if not wanted:
+        return
+    depth_limit = max(wanted)
+    columns = [matrix.tag(t) for t in tags]
+    n = len(tags)
+    start_mask = matrix.valid if conjunctive else 0
+
+    def walk(start: int, prefix: Tuple[int, ...], mask: int) -> Iterator[Tuple[Tuple[int, ...], int]]:
+        for j in range(start, n):
+            combined = (mask & columns[j]) if conjunctive else (mask | columns[j])
+            chosen = prefix + (tags[j],)
+            if len(chosen) in wanted:
+                yield chosen, combined
+            if len(chosen) < depth_limit:
+                yield from walk(j + 1, chosen, combined)
+
+    yield from walk(0, (), start_mask)
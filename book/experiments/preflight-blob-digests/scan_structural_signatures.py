@@ -15,7 +15,7 @@ import argparse
 import json
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, List
 
 REPO_ROOT = Path(__file__).resolve().parents[3]
 if str(REPO_ROOT) not in sys.path:
@@ -24,6 +24,8 @@ if str(REPO_ROOT) not in sys.path:
 from book.api.path_utils import to_repo_relative  # type: ignore
 from book.api.profile_tools import identity as identity_mod  # type: ignore
 
+from feature_bitsets import FeatureMatrix, iter_bits
+
 SCHEMA_VERSION = 2
 
 DEFAULT_FEATURES = REPO_ROOT / "book/experiments/preflight-blob-digests/out/blob_structural_features.json"
@@ -37,83 +39,6 @@ def _load_json(path: Path) -> Dict[str, Any]:
     return json.loads(path.read_text())
 
 
-def _tags(features: Dict[str, Any]) -> Set[int]:
-    raw = features.get("tags_present") or []
-    out: Set[int] = set()
-    if isinstance(raw, list):
-        for v in raw:
-            try:
-                out.add(int(v))
-            except Exception:
-                continue
-    return out
-
-
-def _int_field(features: Dict[str, Any], field: str) -> Optional[int]:
-    v = features.get(field)
-    if isinstance(v, int):
-        return v
-    return None
-
-
-def _derived_float(features: Dict[str, Any], key: str) -> Optional[float]:
-    derived = features.get("derived")
-    if not isinstance(derived, dict):
-        return None
-    v = derived.get(key)
-    if isinstance(v, (int, float)):
-        return float(v)
-    return None
-
-
-def _eval_candidate(cand: Dict[str, Any], row: Dict[str, Any]) -> bool:
-    feats = row.get("features")
-    if not isinstance(feats, dict):
-        return False
-
-    kind = cand.get("kind")
-    if kind == "tag_present":
-        tag = cand.get("tag")
-        if not isinstance(tag, int):
-            return False
-        return tag in _tags(feats)
-    if kind == "tag_or":
-        tags = cand.get("tags")
-        if not isinstance(tags, list):
-            return False
-        present = _tags(feats)
-        return any(int(t) in present for t in tags)
-    if kind == "tag_and":
-        tags = cand.get("tags")
-        if not isinstance(tags, list):
-            return False
-        present = _tags(feats)
-        return all(int(t) in present for t in tags)
-    if kind == "tags_present_count_eq":
-        n = cand.get("n")
-        if not isinstance(n, int):
-            return False
-        return _int_field(feats, "tags_present_count") == n
-    if kind == "node_count_eq_op_count":
-        node_count = _int_field(feats, "node_count")
-        op_count = _int_field(feats, "op_count")
-        return node_count is not None and op_count is not None and node_count == op_count
-    if kind == "literal_pool_bytes_ratio_ge":
-        threshold = cand.get("threshold")
-        if not isinstance(threshold, (int, float)):
-            return False
-        ratio = _derived_float(feats, "literal_pool_bytes_ratio")
-        return ratio is not None and ratio >= float(threshold)
-    if kind == "op_table_unique_ratio_le":
-        threshold = cand.get("threshold")
-        if not isinstance(threshold, (int, float)):
-            return False
-        ratio = _derived_float(feats, "op_table_unique_ratio")
-        return ratio is not None and ratio <= float(threshold)
-
-    return False
-
-
 def main(argv: List[str] | None = None) -> int:
     ap = argparse.ArgumentParser(prog="scan_structural_signatures")
     ap.add_argument("--features", type=Path, default=DEFAULT_FEATURES)
@@ -153,6 +78,10 @@ def main(argv: List[str] | None = None) -> int:
         if label in label_counts:
             label_counts[label] += 1
 
+    shas = list(digest_to_row)
+    matrix = FeatureMatrix([digest_to_row[sha] for sha in shas])
+    label_masks = {label: matrix.label_mask(label) for label in ("apply_gated", "control", "unknown")}
+
     scan_rows: List[Dict[str, Any]] = []
     unknown_hits: Dict[str, List[str]] = {}
     unknown_hit_best_precision: Dict[str, float] = {}
@@ -164,14 +93,10 @@ def main(argv: List[str] | None = None) -> int:
         if not isinstance(cid, str):
             continue
 
-        matched: Dict[str, List[str]] = {"apply_gated": [], "control": [], "unknown": []}
-        for sha, row in digest_to_row.items():
-            if not _eval_candidate(cand, row):
-                continue
-            label = row.get("label")
-            if label not in matched:
-                continue
-            matched[label].append(sha)
+        mask = matrix.mask_for(cand)
+        matched: Dict[str, List[str]] = {
+            label: [shas[i] for i in iter_bits(mask & label_mask)] for label, label_mask in label_masks.items()
+        }
 
         labeled_metrics = cand.get("labeled_metrics") if isinstance(cand.get("labeled_metrics"), dict) else {}
         precision = labeled_metrics.get("precision")
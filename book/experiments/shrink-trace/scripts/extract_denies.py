@@ -1,31 +1,34 @@
 #!/usr/bin/env python3
-import re
+import argparse
 import sys
+from pathlib import Path
+
+from log_json import Checkpoint, iter_sandbox_events
 
 def main() -> int:
-    if len(sys.argv) not in (2, 3):
-        print("Usage: extract_denies.py <log_path> [pid|all]", file=sys.stderr)
-        return 2
-    log_path = sys.argv[1]
-    pid_re = None
-    if len(sys.argv) == 3:
-        pid = sys.argv[2]
-        if pid and pid not in {"all", "*"}:
-            pid_re = re.compile(r"\(" + re.escape(pid) + r"\)")
-    event_re = re.compile(r'"eventMessage"\s*:\s*"([^"]*)"')
+    parser = argparse.ArgumentParser(usage="extract_denies.py <log_path> [pid|all] [--checkpoint PATH]")
+    parser.add_argument("log_path")
+    parser.add_argument("pid", nargs="?", default="all")
+    parser.add_argument("--since", help="Only events strictly after this log timestamp")
+    parser.add_argument("--until", help="Only events at or before this log timestamp")
+    parser.add_argument("--checkpoint", help="Resume from / advance this checkpoint JSON")
+    args = parser.parse_args()
+
+    pid = None
+    if args.pid and args.pid not in {"all", "*"}:
+        try:
+            pid = int(args.pid)
+        except ValueError:
+            print(f"extract_denies.py: pid must be an integer or 'all': {args.pid}", file=sys.stderr)
+            return 2
+    checkpoint = Checkpoint(Path(args.checkpoint)) if args.checkpoint else None
 
-    with open(log_path, "r", errors="ignore") as fh:
-        for raw in fh:
-            m = event_re.search(raw)
-            if not m:
-                continue
-            msg = m.group(1)
-            msg = msg.replace("\\/", "/").replace("\\\"", '"')
-            if "deny" not in msg:
-                continue
-            if pid_re and not pid_re.search(msg):
-                continue
-            print(msg)
+    log_path = Path(args.log_path)
+    for event in iter_sandbox_events(log_path, pid=pid, since=args.since, until=args.until, checkpoint=checkpoint):
+        if event.is_deny:
+            print(" ".join(event.message.split("\n")))
+    if checkpoint is not None:
+        checkpoint.save()
     return 0
 
 if __name__ == "__main__":
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
-import re
 import sys
+from pathlib import Path
+
+from log_json import iter_sandbox_events
 
 NEEDLES = [
     "Sandbox:",
@@ -13,18 +15,9 @@ def main() -> int:
     if len(sys.argv) != 2:
         print("Usage: extract_sandbox_messages.py <log_path>", file=sys.stderr)
         return 2
-    log_path = sys.argv[1]
-    event_re = re.compile(r'"eventMessage"\s*:\s*"([^"]*)"')
-
-    with open(log_path, "r", errors="ignore") as fh:
-        for raw in fh:
-            m = event_re.search(raw)
-            if not m:
-                continue
-            msg = m.group(1)
-            msg = msg.replace("\\/", "/").replace("\\\"", '"')
-            if any(n in msg for n in NEEDLES):
-                print(msg)
+    for event in iter_sandbox_events(Path(sys.argv[1])):
+        if any(n in event.message for n in NEEDLES):
+            print(" ".join(event.message.split("\n")))
     return 0
 
 if __name__ == "__main__":
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Streaming reader for `log show|stream --style json` captures.
+
+The unified log emits one top-level JSON array whose elements are pretty-printed
+over many lines, so line-oriented regex scans miss messages that contain
+quotes or span lines. This module decodes the array incrementally with
+`json.JSONDecoder.raw_decode` over a rolling buffer (no third-party parser):
+
+- `iter_events` yields each complete top-level object plus the byte offset just
+  past it; a truncated tail (a `log stream` killed mid-write) simply ends the
+  iteration, a malformed element earlier in the file raises ValueError, and a
+  leading banner line before `[` is skipped.
+- `iter_sandbox_events` turns events into `SandboxEvent` records
+  (pid, process, operation, target, timestamp) and applies the pid and time
+  window filters before a record is built.
+- `Checkpoint` remembers the path, byte offset, and newest timestamp already
+  consumed. Re-reading the same (grown) file resumes at the offset; a fresh
+  capture (each `log show --last` rewrites its file) skips events at or before
+  the recorded timestamp.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import os
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Tuple
+
+CHECKPOINT_SCHEMA_VERSION = "shrink-trace.log_checkpoint.v0.1"
+CHUNK_SIZE = 1 << 20
+
+_DECODER = json.JSONDecoder()
+_SKIP = " \t\r\n,[]"
+# "Sandbox: cat(123) deny(1) file-read-data /etc/hosts" (also "System Policy: ...").
+_SANDBOX_RE = re.compile(
+    r"^(?:[^:(]*:\s+)?(?P<process>[^()]+?)\((?P<pid>\d+)\)\s+(?P<action>deny|allow)\(\d+\)\s+"
+    r"(?P<operation>\S+)(?:\s+(?P<target>.*?))?\s*$",
+    re.S,
+)
+
+
+@dataclass(frozen=True)
+class SandboxEvent:
+    timestamp: Optional[str]
+    pid: Optional[int]
+    process: Optional[str]
+    action: Optional[str]
+    operation: Optional[str]
+    target: Optional[str]
+    message: str
+
+    @property
+    def is_deny(self) -> bool:
+        return self.action == "deny" or "deny" in self.message
+
+
+def _consumed_bytes(text: str) -> int:
+    return len(text.encode("utf-8", "surrogateescape"))
+
+
+def _needs_more_data(buf: str, err: json.JSONDecodeError) -> bool:
+    # A decode that ran off the end of the buffer (possibly inside a string or
+    # a `\uXXXX` escape) may succeed once the next chunk arrives; anything
+    # failing earlier is malformed regardless of what follows.
+    return err.pos >= len(buf) - 6 or err.msg.startswith("Unterminated string")
+
+
+def iter_events(fh: BinaryIO, start: int = 0, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[Dict[str, Any], int]]:
+    """
+    Yield (event, end_offset) for each complete top-level object from byte
+    `start`. Stops quietly at a truncated tail; raises ValueError (with the
+    byte offset) on an element that is malformed before the end of the data.
+    """
+    fh.seek(start)
+    decoder = codecs.getincrementaldecoder("utf-8")("surrogateescape")
+    buf = ""
+    base = start
+    eof = False
+    while True:
+        pos = 0
+        n = len(buf)
+        # `mark`/`mark_bytes`: a char index into `buf` and its absolute byte
+        # offset, advanced per event so each character is encoded once.
+        mark = 0
+        mark_bytes = base
+        while pos < n:
+            ch = buf[pos]
+            if ch in _SKIP:
+                pos += 1
+                continue
+            if ch != "{":
+                # Banner text ("Filtering the log data using ...") or junk: skip the line.
+                nl = buf.find("\n", pos)
+                if nl < 0:
+                    break
+                pos = nl + 1
+                continue
+            try:
+                obj, end = _DECODER.raw_decode(buf, pos)
+            except json.JSONDecodeError as err:
+                if _needs_more_data(buf, err):
+                    break  # element continues in the next chunk (or is truncated at EOF)
+                offset = mark_bytes + _consumed_bytes(buf[mark : err.pos])
+                raise ValueError(f"malformed log event at byte {offset}: {err.msg}") from err
+            mark_bytes += _consumed_bytes(buf[mark:end])
+            mark = end
+            if isinstance(obj, dict):
+                yield obj, mark_bytes
+            pos = end
+        base = mark_bytes + _consumed_bytes(buf[mark:pos])
+        buf = buf[pos:]
+        if eof:
+            return
+        chunk = fh.read(chunk_size)
+        if not chunk:
+            eof = True
+            buf += decoder.decode(b"", final=True)
+            if not buf.strip(_SKIP):
+                return
+            continue
+        buf += decoder.decode(chunk)
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    for fmt in ("%Y-%m-%d %H:%M:%S.%f%z", "%Y-%m-%d %H:%M:%S%z"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def _after(stamp: Optional[str], bound: Optional[str]) -> bool:
+    if bound is None:
+        return True
+    if stamp is None:
+        return False
+    left, right = _parse_time(stamp), _parse_time(bound)
+    if left is not None and right is not None:
+        return left > right
+    return stamp > bound
+
+
+def _not_after(stamp: Optional[str], bound: Optional[str]) -> bool:
+    if bound is None:
+        return True
+    if stamp is None:
+        return False
+    return not _after(stamp, bound)
+
+
+def parse_sandbox_event(event: Dict[str, Any]) -> SandboxEvent:
+    message = str(event.get("eventMessage") or "")
+    m = _SANDBOX_RE.search(message)
+    if m:
+        return SandboxEvent(
+            timestamp=event.get("timestamp"),
+            pid=int(m.group("pid")),
+            process=m.group("process").strip(),
+            action=m.group("action"),
+            operation=m.group("operation"),
+            target=m.group("target") or None,
+            message=message,
+        )
+    pid = event.get("processID")
+    image = event.get("processImagePath")
+    return SandboxEvent(
+        timestamp=event.get("timestamp"),
+        pid=int(pid) if isinstance(pid, int) else None,
+        process=os.path.basename(image) if isinstance(image, str) and image else None,
+        action=None,
+        operation=None,
+        target=None,
+        message=message,
+    )
+
+
+class Checkpoint:
+    """Consumed position in a capture, persisted as JSON at `path`."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.source: Optional[str] = None
+        self.offset = 0
+        self.last_timestamp: Optional[str] = None
+        try:
+            doc = json.loads(path.read_text())
+        except (OSError, ValueError):
+            doc = None
+        if isinstance(doc, dict) and doc.get("schema_version") == CHECKPOINT_SCHEMA_VERSION:
+            self.source = doc.get("source")
+            self.offset = int(doc.get("offset") or 0)
+            self.last_timestamp = doc.get("last_timestamp")
+
+    def start_for(self, log_path: Path) -> Tuple[int, Optional[str]]:
+        """(byte offset to resume at, exclusive lower time bound) for `log_path`."""
+        try:
+            size = log_path.stat().st_size
+        except OSError:
+            size = 0
+        if self.source == str(log_path.resolve()) and self.offset <= size:
+            return self.offset, None
+        return 0, self.last_timestamp
+
+    def advance(self, log_path: Path, offset: int, timestamp: Optional[str]) -> None:
+        self.source = str(log_path.resolve())
+        self.offset = offset
+        if timestamp is not None and _after(timestamp, self.last_timestamp):
+            self.last_timestamp = timestamp
+
+    def save(self) -> None:
+        doc = {
+            "schema_version": CHECKPOINT_SCHEMA_VERSION,
+            "source": self.source,
+            "offset": self.offset,
+            "last_timestamp": self.last_timestamp,
+        }
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(doc, indent=2, sort_keys=True))
+        os.replace(tmp, self.path)
+
+
+def iter_sandbox_events(
+    log_path: Path,
+    *,
+    pid: Optional[int] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    checkpoint: Optional[Checkpoint] = None,
+) -> Iterator[SandboxEvent]:
+    """
+    Yield SandboxEvents from `log_path`.
+
+    `pid` keeps events whose message names that pid (falling back to the
+    `(pid)` substring when the message does not parse). `since` is exclusive
+    and `until` inclusive. With a `checkpoint`, reading resumes where the last
+    call stopped and the checkpoint is advanced (not saved) as events are
+    consumed.
+    """
+    start = 0
+    if checkpoint is not None:
+        start, resume_since = checkpoint.start_for(log_path)
+        if resume_since is not None and (since is None or _after(resume_since, since)):
+            since = resume_since
+    pid_needle = f"({pid})" if pid is not None else None
+    newest: Optional[str] = None
+    offset = start
+    with log_path.open("rb") as fh:
+        for event, offset in iter_events(fh, start):
+            stamp = event.get("timestamp")
+            if stamp is not None and (newest is None or _after(stamp, newest)):
+                newest = stamp
+            if since is not None and not _after(stamp, since):
+                continue
+            if until is not None and not _not_after(stamp, until):
+                continue
+            if pid_needle is not None and pid_needle not in str(event.get("eventMessage") or ""):
+                continue
+            record = parse_sandbox_event(event)
+            if pid is not None and record.pid is not None and record.pid != pid:
+                continue
+            yield record
+    if checkpoint is not None:
+        checkpoint.advance(log_path, offset, newest)
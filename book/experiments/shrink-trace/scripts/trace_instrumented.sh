@@ -20,6 +20,7 @@ LOG_PREDICATE='((processID == 0) AND (senderImagePath CONTAINS "/Sandbox")) OR (
 WORK_DIR="${WORK_DIR:-$(pwd)}"
 TRACE_DIR="${TRACE_DIR:-${WORK_DIR}/phases/trace}"
 TRACE_LOG_DIR="${TRACE_DIR}/logs"
+LOG_SHOW_CHECKPOINT="${TRACE_LOG_DIR}/log_show_checkpoint.json"
 TRACE_VALIDATION_DIR="${TRACE_DIR}/validation"
 TRACE_ISSUES_DIR="${TRACE_DIR}/issues"
 TRACE_METRICS="${TRACE_DIR}/metrics.jsonl"
@@ -127,6 +128,7 @@ SANDBOX_PROFILE_REL="$(repo_rel "${SANDBOX_PROFILE}")"
 mkdir -p "${TRACE_LOG_DIR}" "${TRACE_VALIDATION_DIR}" "${TRACE_ISSUES_DIR}"
 : > "${TRACE_BAD_RULES}"
 : > "${TRACE_LAST_RULE}"
+rm -f "${LOG_SHOW_CHECKPOINT}"
 
 # Initialize profile if missing (same shape as upstream, with optional dyld seed). :contentReference[oaicite:13]{index=13}
 if [[ ! -f "${SANDBOX_PROFILE}" ]]; then
@@ -308,7 +310,8 @@ while true; do
     iter_log_show="${TRACE_LOG_DIR}/iter_${iter}_log_show.json"
     sleep 1
     /usr/bin/log show --last "${LOG_SHOW_WINDOW}" --style json --predicate "${LOG_PREDICATE}" > "${iter_log_show}" 2>/dev/null || true
-    python3 "${DENY_EXTRACTOR}" "${iter_log_show}" "${deny_arg}" > "${deny_lines_tmp}"
+    # The checkpoint skips events already consumed by earlier log-show fallbacks.
+    python3 "${DENY_EXTRACTOR}" "${iter_log_show}" "${deny_arg}" --checkpoint "${LOG_SHOW_CHECKPOINT}" > "${deny_lines_tmp}"
     denies_seen="$(wc -l < "${deny_lines_tmp}" | tr -d ' ')"
   fi
 
@@ -3,8 +3,8 @@
 Harvest the Filter Vocabulary from the extracted libsandbox.dylib.
 
 Approach:
-- Use `nm` to locate `_filter_info` (array of filter descriptors).
-- Map vmaddrs to file offsets via `otool -l` segment data.
+- Look up `_filter_info` (array of filter descriptors) in the symbol table.
+- Map vmaddrs to file offsets via LC_SEGMENT_64 data (`book.api.macho`).
 - Treat each 0x20-byte entry as a descriptor; the first pointer is the filter
   name (pointer-auth masked). Skip zero/empty entries and stop at the first
   all-zero record.
@@ -17,59 +17,26 @@ Outputs:
 from __future__ import annotations
 
 import json
+import sys
 import struct
-import subprocess
-from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List
 
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from book.api.macho import Segment, open_macho
+
 
 LIB_PATH = Path("book/experiments/vocab-from-cache/extracted/usr/lib/libsandbox.1.dylib")
 OUT_PATH = Path("book/experiments/vocab-from-cache/out/filter_names.json")
 ENTRY_SIZE = 0x20  # bytes per filter_info entry
 
 
-@dataclass
-class Segment:
-    name: str
-    vmaddr: int
-    vmsize: int
-    fileoff: int
-    filesize: int
-
-
 def parse_segments(path: Path) -> List[Segment]:
-    out = subprocess.check_output(["otool", "-l", str(path)], text=True)
-    segs: List[Segment] = []
-    current: Dict[str, str] = {}
-    for line in out.splitlines():
-        line = line.strip()
-        if line.startswith("cmd LC_SEGMENT_64"):
-            current = {}
-        elif line.startswith("segname"):
-            current["name"] = line.split()[1]
-        elif line.startswith("vmaddr"):
-            current["vmaddr"] = line.split()[1]
-        elif line.startswith("vmsize"):
-            current["vmsize"] = line.split()[1]
-        elif line.startswith("fileoff"):
-            current["fileoff"] = line.split()[1]
-        elif line.startswith("filesize"):
-            current["filesize"] = line.split()[1]
-        elif line.startswith("flags") and current:
-            required = {"name", "vmaddr", "vmsize", "fileoff", "filesize"}
-            if required.issubset(current):
-                segs.append(
-                    Segment(
-                        name=current["name"],
-                        vmaddr=int(current["vmaddr"], 16),
-                        vmsize=int(current["vmsize"], 16),
-                        fileoff=int(current["fileoff"]),
-                        filesize=int(current["filesize"]),
-                    )
-                )
-            current = {}
-    return segs
+    """LC_SEGMENT_64 vmaddr/fileoff mapping, read directly from the Mach-O."""
+    return list(open_macho(path).segments)
 
 
 def vm_to_file(vm: int, segments: List[Segment]) -> int:
@@ -80,11 +47,10 @@ def vm_to_file(vm: int, segments: List[Segment]) -> int:
 
 
 def symbol_vmaddr(path: Path, symbol: str) -> int:
-    out = subprocess.check_output(["nm", "-nm", str(path)], text=True)
-    for line in out.splitlines():
-        if symbol in line.split()[-1]:
-            return int(line.split()[0], 16)
-    raise ValueError(f"symbol {symbol} not found in {path}")
+    addr = open_macho(path).symbol_address(symbol)
+    if addr is None:
+        raise ValueError(f"symbol {symbol} not found in {path}")
+    return addr
 
 
 def harvest_filter_names(path: Path) -> Dict[str, object]:
@@ -6,7 +6,7 @@ Steps:
 - Locate `_operation_names` and `_operation_info` to recover the pointer array
   and count (the span between them, 8 bytes per entry).
 - Decode each pointer (lower 48 bits plus shared-cache base) to a vmaddr.
-- Convert vmaddrs into file offsets using segment metadata from `otool -l`.
+- Convert vmaddrs into file offsets using LC_SEGMENT_64 metadata (`book.api.macho`).
 - Read null-terminated strings from `__TEXT.__cstring` and emit the ordered list.
 
 Outputs:
@@ -16,58 +16,24 @@ Outputs:
 from __future__ import annotations
 
 import json
-import subprocess
-from dataclasses import dataclass
+import sys
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
 
-LIB_PATH = Path("book/experiments/vocab-from-cache/extracted/usr/lib/libsandbox.1.dylib")
-OUT_PATH = Path("book/experiments/vocab-from-cache/out/operation_names.json")
+from book.api.macho import Segment, open_macho
 
 
-@dataclass
-class Segment:
-    name: str
-    vmaddr: int
-    vmsize: int
-    fileoff: int
-    filesize: int
+LIB_PATH = Path("book/experiments/vocab-from-cache/extracted/usr/lib/libsandbox.1.dylib")
+OUT_PATH = Path("book/experiments/vocab-from-cache/out/operation_names.json")
 
 
 def parse_segments(path: Path) -> List[Segment]:
-    """Parse `otool -l` output to recover segment vmaddr/fileoff mapping."""
-    out = subprocess.check_output(["otool", "-l", str(path)], text=True)
-    segs: List[Segment] = []
-    current: Dict[str, str] = {}
-    for line in out.splitlines():
-        line = line.strip()
-        if line.startswith("cmd LC_SEGMENT_64"):
-            current = {}
-        elif line.startswith("segname"):
-            current["name"] = line.split()[1]
-        elif line.startswith("vmaddr"):
-            current["vmaddr"] = line.split()[1]
-        elif line.startswith("vmsize"):
-            current["vmsize"] = line.split()[1]
-        elif line.startswith("fileoff"):
-            current["fileoff"] = line.split()[1]
-        elif line.startswith("filesize"):
-            current["filesize"] = line.split()[1]
-        elif line.startswith("flags") and current:
-            required = {"name", "vmaddr", "vmsize", "fileoff", "filesize"}
-            if required.issubset(current):
-                segs.append(
-                    Segment(
-                        name=current["name"],
-                        vmaddr=int(current["vmaddr"], 16),
-                        vmsize=int(current["vmsize"], 16),
-                        fileoff=int(current["fileoff"]),
-                        filesize=int(current["filesize"]),
-                    )
-                )
-            current = {}
-    return segs
+    """LC_SEGMENT_64 vmaddr/fileoff mapping, read directly from the Mach-O."""
+    return list(open_macho(path).segments)
 
 
 def vm_to_file(vm: int, segments: List[Segment]) -> int:
@@ -78,11 +44,10 @@ def vm_to_file(vm: int, segments: List[Segment]) -> int:
 
 
 def symbol_vmaddr(path: Path, symbol: str) -> int:
-    out = subprocess.check_output(["nm", "-nm", str(path)], text=True)
-    for line in out.splitlines():
-        if symbol in line.split()[-1]:
-            return int(line.split()[0], 16)
-    raise ValueError(f"symbol {symbol} not found in {path}")
+    addr = open_macho(path).symbol_address(symbol)
+    if addr is None:
+        raise ValueError(f"symbol {symbol} not found in {path}")
+    return addr
 
 
 def read_null_terminated(buf: bytes, offset: int) -> Tuple[str, int]:
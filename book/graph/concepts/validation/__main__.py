@@ -5,6 +5,8 @@ Usage examples:
 - python -m book.graph.concepts.validation --all
 - python -m book.graph.concepts.validation --tag vocab
 - python -m book.graph.concepts.validation --experiment field2
+- python -m book.graph.concepts.validation --all --jobs 4
+- python -m book.graph.concepts.validation --all --force
 """
 
 from __future__ import annotations
@@ -22,7 +24,7 @@ ROOT = find_repo_root(Path(__file__))
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from book.graph.concepts.validation import registry
+from book.graph.concepts.validation import registry, scheduler
 
 METADATA_PATH = ROOT / "book" / "graph" / "concepts" / "validation" / "out" / "metadata.json"
 STATUS_PATH = ROOT / "book" / "graph" / "concepts" / "validation" / "out" / "validation_status.json"
@@ -75,11 +77,8 @@ def compute_hashes(paths: List[str]) -> Dict[str, str]:
         path = ensure_absolute(p, ROOT)
         if not path.exists():
             continue
-        h = hashlib.sha256()
         with path.open("rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                h.update(chunk)
-        hashes[to_repo_relative(path, ROOT)] = h.hexdigest()
+            hashes[to_repo_relative(path, ROOT)] = hashlib.file_digest(f, "sha256").hexdigest()
     return hashes
 
 
@@ -107,7 +106,13 @@ def select_jobs(
     return selected
 
 
-def normalize_record(job: registry.ValidationJob, result: Dict, host_meta: Dict, prev_record: Dict | None) -> Dict:
+def normalize_record(
+    job: registry.ValidationJob,
+    result: Dict,
+    host_meta: Dict,
+    prev_record: Dict | None,
+    wall_time_s: float | None = None,
+) -> Dict:
     status = result.get("status", "ok")
     raw_outputs = result.get("outputs", job.outputs)
     raw_inputs = result.get("inputs", job.inputs)
@@ -137,8 +142,11 @@ def normalize_record(job: registry.ValidationJob, result: Dict, host_meta: Dict,
     }
     if "notes" in result:
         record["notes"] = result["notes"]
-    if "metrics" in result:
-        record["metrics"] = result["metrics"]
+    if "metrics" in result or wall_time_s is not None:
+        metrics = dict(result.get("metrics") or {})
+        if wall_time_s is not None:
+            metrics["wall_time_s"] = round(wall_time_s, 3)
+        record["metrics"] = metrics
     if "error" in result:
         record["error"] = result["error"]
     if change in {"unchanged", "changed"}:
@@ -154,11 +162,118 @@ def run_job(job: registry.ValidationJob, skip_missing_inputs: bool, host_meta: D
             host_meta,
             prev_record,
         )
-    try:
-        result = job.runner() or {}
-        return normalize_record(job, result, host_meta, prev_record)
-    except Exception as exc:  # pragma: no cover
-        return normalize_record(job, {"status": "blocked", "error": f"{exc}"}, host_meta, prev_record)
+    result, wall_time_s = scheduler.execute_job(job)
+    return normalize_record(job, result, host_meta, prev_record, wall_time_s)
+
+
+def reuse_record(job: registry.ValidationJob, prev_record: Dict | None, fingerprint: str) -> Dict | None:
+    """
+    Return the prior record for `job` if it can stand in for a rerun: the prior
+    run was ok, its input/code fingerprint matches, and every output it hashed
+    is still on disk with the recorded hash.
+    """
+    if not prev_record or prev_record.get("fingerprint") != fingerprint:
+        return None
+    if not str(prev_record.get("status", "")).startswith("ok"):
+        return None
+    recorded = prev_record.get("hashes") or {}
+    current = compute_hashes(list(recorded))
+    if any(current.get(path) != digest for path, digest in recorded.items()):
+        return None
+    record = dict(prev_record)
+    record["status"] = "ok-unchanged"
+    record["change"] = "unchanged"
+    record["incremental"] = "reused"
+    return record
+
+
+def run_jobs(
+    jobs: List[registry.ValidationJob],
+    skip_missing_inputs: bool,
+    host_meta: Dict,
+    prev_status: Dict[str, Dict],
+    max_workers: int = 1,
+    incremental: bool = True,
+) -> List[Dict]:
+    """
+    Run jobs in dependency order (concurrently when max_workers > 1) and return
+    normalized records in the order the jobs were selected.
+
+    With `incremental`, a job whose fingerprint (taken once its producers have
+    finished) matches its previous ok record is not run; the prior record is
+    reused.
+    """
+    fingerprints: Dict[str, str] = {}
+    reused: Dict[str, Dict] = {}
+
+    def skip(job: registry.ValidationJob) -> bool:
+        fingerprints[job.id] = job.fingerprint()
+        if not incremental:
+            return False
+        record = reuse_record(job, prev_status.get(job.id), fingerprints[job.id])
+        if record is None:
+            return False
+        reused[job.id] = record
+        return True
+
+    runnable = [job for job in jobs if not (skip_missing_inputs and not job.has_inputs())]
+    raw = scheduler.run_jobs(runnable, max_workers=max_workers, skip=skip)
+    records: List[Dict] = []
+    for job in jobs:
+        prev_record = prev_status.get(job.id)
+        if job.id not in raw:
+            records.append(run_job(job, skip_missing_inputs, host_meta, prev_record))
+            continue
+        if job.id in reused:
+            records.append(reused[job.id])
+            continue
+        result, wall_time_s = raw[job.id]
+        record = normalize_record(job, result, host_meta, prev_record, wall_time_s)
+        record["fingerprint"] = fingerprints[job.id]
+        records.append(record)
+    return records
+
+
+def run_and_record(
+    selected: List[registry.ValidationJob],
+    prev_status: Dict[str, Dict] | None = None,
+    *,
+    skip_missing_inputs: bool = False,
+    max_workers: int = 1,
+    incremental: bool = True,
+) -> List[Dict]:
+    """Run `selected` jobs and write validation_status.json; returns the records (also used in-process by promotion)."""
+    prev_status = load_prev_status() if prev_status is None else prev_status
+    host_meta = load_host_meta()
+    world_id = load_world_id()
+    results = run_jobs(
+        selected,
+        skip_missing_inputs,
+        host_meta,
+        prev_status,
+        max_workers=max_workers,
+        incremental=incremental,
+    )
+    STATUS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "schema": {
+            "job_id": "string",
+            "status": "ok|partial|brittle|blocked|skipped",
+            "host": "object",
+            "inputs": "list[str]",
+            "outputs": "list[str]",
+            "tags": "list[str]",
+            "notes": "string?",
+            "metrics": "object?",
+            "error": "string?",
+            "fingerprint": "string?",
+            "incremental": "reused?",
+        },
+        "world_id": world_id,
+        "jobs": results,
+    }
+    STATUS_PATH.write_text(json.dumps(payload, indent=2))
+    return results
 
 
 def main() -> None:
@@ -170,6 +285,17 @@ def main() -> None:
     ap.add_argument("--skip-missing-inputs", action="store_true", help="skip jobs whose inputs are absent")
     ap.add_argument("--list", action="store_true", help="list available jobs and exit")
     ap.add_argument("--describe", help="show details for a specific job id and exit")
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="run independent jobs concurrently in N worker processes (default 1: serial)",
+    )
+    ap.add_argument(
+        "--force",
+        action="store_true",
+        help="rerun every selected job even if its inputs and code are unchanged since the last ok run",
+    )
     args = ap.parse_args()
 
     jobs = registry.load_all_jobs()
@@ -201,30 +327,18 @@ def main() -> None:
         print("No jobs selected; use --all or --list to see options.")
         sys.exit(1)
 
-    host_meta = load_host_meta()
-    world_id = load_world_id()
-    results = [run_job(job, args.skip_missing_inputs, host_meta, prev_status.get(job.id)) for job in selected]
-    STATUS_PATH.parent.mkdir(parents=True, exist_ok=True)
-    payload = {
-        "schema": {
-            "job_id": "string",
-            "status": "ok|partial|brittle|blocked|skipped",
-            "host": "object",
-            "inputs": "list[str]",
-            "outputs": "list[str]",
-            "tags": "list[str]",
-            "notes": "string?",
-            "metrics": "object?",
-            "error": "string?",
-        },
-        "world_id": world_id,
-        "jobs": results,
-    }
-    STATUS_PATH.write_text(json.dumps(payload, indent=2))
+    results = run_and_record(
+        selected,
+        prev_status,
+        skip_missing_inputs=args.skip_missing_inputs,
+        max_workers=args.jobs,
+        incremental=not args.force,
+    )
 
     # Human-friendly summary
     for res in results:
-        print(f"{res['job_id']}: {res['status']}")
+        suffix = " (reused)" if res.get("incremental") == "reused" else ""
+        print(f"{res['job_id']}: {res['status']}{suffix}")
 
 
 if __name__ == "__main__":
@@ -16,7 +16,7 @@ ROOT = find_repo_root(Path(__file__))
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from book.api.profile_tools import decoder
+from book.api.profile_tools import decode_cache
 from book.graph.concepts.validation import registry
 from book.graph.concepts.validation.registry import ValidationJob
 
@@ -90,7 +90,7 @@ def run_fixtures_job():
             status = "partial"
         else:
             try:
-                decoded = decoder.decode_profile_dict(path.read_bytes())
+                decoded = decode_cache.decode_profile_dict(path.read_bytes())
                 rec["node_count"] = decoded.get("node_count")
                 rec["op_count"] = decoded.get("op_count")
                 rec["format_variant"] = decoded.get("format_variant")
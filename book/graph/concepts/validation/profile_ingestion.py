@@ -11,41 +11,9 @@ placeholder counts while still letting callers inspect byte ranges.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional, List, Dict, Any
-import struct
-import string
-
-PRINTABLE = set(bytes(string.printable, "ascii"))
-
-# Minimal Mach-O segment parser for slicing fallbacks
-def _parse_macho_segments(data: bytes) -> List[Dict[str, Any]]:
-    # Expect 64-bit Mach-O magic 0xfeedfacf
-    if len(data) < 32 or data[0:4] not in (b"\xcf\xfa\xed\xfe", b"\xfe\xed\xfa\xcf"):
-        return []
-    # mach_header_64: uint32 magic, cpu_type, cpu_subtype, filetype, ncmds, sizeofcmds, flags, reserved
-    _, _, _, _, ncmds, _, _, _ = struct.unpack_from("<IIIIIIII", data, 0)
-    offset = 32
-    segments = []
-    for _ in range(ncmds):
-        if offset + 8 > len(data):
-            break
-        cmd, cmdsize = struct.unpack_from("<II", data, offset)
-        if cmd == 0x19:  # LC_SEGMENT_64
-            if offset + 72 > len(data):
-                break
-            segname = data[offset + 8 : offset + 24].split(b"\x00", 1)[0].decode()
-            vmaddr, vmsize, fileoff, filesize = struct.unpack_from("<QQQQ", data, offset + 24)
-            segments.append(
-                {
-                    "name": segname,
-                    "vmaddr": vmaddr,
-                    "vmsize": vmsize,
-                    "fileoff": fileoff,
-                    "filesize": filesize,
-                }
-            )
-        offset += cmdsize
-    return segments
+from typing import Optional
+
+from book.api.profile_tools.ingestion import find_literal_start
 
 
 @dataclass
@@ -179,33 +147,6 @@ def slice_sections_with_offsets(blob: ProfileBlob, header: Header) -> tuple[Sect
         if lower_bound > len(data):
             lower_bound = len(data)
 
-    def find_literal_start(buf: bytes, start: int) -> int:
-        segments = _parse_macho_segments(buf)
-        for seg in segments:
-            if seg["name"] == "__TEXT":
-                cstring = seg["fileoff"] + seg["filesize"]  # crude upper bound
-                if cstring >= start:
-                    return cstring
-        # Prefer a short run of non-NUL printable characters starting at the lower bound.
-        min_run = 4
-        for i in range(start, len(buf) - min_run):
-            j = i
-            while j < len(buf) and buf[j] != 0x00 and buf[j] in PRINTABLE:
-                j += 1
-            if j - i >= min_run:
-                return i
-        # Fallback: ratio-based scan, still starting at the lower bound.
-        window = 64
-        threshold = 0.7
-        for i in range(start, len(buf)):
-            chunk = buf[i : min(len(buf), i + window)]
-            if not chunk:
-                continue
-            printable = sum(1 for b in chunk if b == 0x00 or b in PRINTABLE)
-            if printable / len(chunk) >= threshold:
-                return i
-        return len(buf)
-
     literal_start = find_literal_start(data, lower_bound)
     literal_end = len(data)
     nodes_end = literal_start
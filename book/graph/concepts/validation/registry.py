@@ -7,10 +7,13 @@ those modules for side-effect registration and then selects/runs jobs by id/tag.
 
 from __future__ import annotations
 
+import hashlib
 import importlib
+import sys
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Callable, Dict, List, Any
+from types import ModuleType
+from typing import Callable, Dict, List, Any, Optional
 
 # Repository root (book/..)
 ROOT = Path(__file__).resolve().parents[4]
@@ -47,6 +50,77 @@ class ValidationJob:
             return True
         return any(p.exists() for p in self.expanded_inputs())
 
+    def code_paths(self) -> List[Path]:
+        """
+        Source files of the runner's module plus every `book.*` module it
+        reaches through its globals (imported modules, functions, classes),
+        so edits to shared helpers such as the decoder count as code changes.
+        """
+        start = sys.modules.get(getattr(self.runner, "__module__", ""), None)
+        if start is None:
+            return []
+        seen = {start.__name__}
+        queue = [start]
+        paths: List[Path] = []
+        while queue:
+            module = queue.pop()
+            path = getattr(module, "__file__", None)
+            if path:
+                paths.append(Path(path))
+            for value in list(vars(module).values()):
+                name = value.__name__ if isinstance(value, ModuleType) else getattr(value, "__module__", None)
+                if not isinstance(name, str) or not name.startswith("book.") or name in seen:
+                    continue
+                dep = sys.modules.get(name)
+                if dep is not None:
+                    seen.add(name)
+                    queue.append(dep)
+        return sorted(paths)
+
+    def fingerprint(self) -> str:
+        """
+        Content hash over the expanded inputs (directories recursively), the
+        declared input/output lists, and the job's code (`code_paths`).
+
+        Used by the driver to reuse a prior record when nothing a job reads has
+        changed.
+        """
+        entries: List[str] = [f"inputs={self.inputs!r}", f"outputs={self.outputs!r}"]
+        files: List[Path] = []
+        for path in self.expanded_inputs():
+            if path.is_dir():
+                files.extend(p for p in path.rglob("*") if p.is_file())
+            else:
+                files.append(path)
+        files.extend(self.code_paths())
+        for path in sorted(set(files)):
+            try:
+                rel = path.relative_to(ROOT).as_posix()
+            except ValueError:
+                rel = str(path)
+            digest = _file_sha256(path)
+            entries.append(f"{rel}:{digest or 'missing'}")
+        return hashlib.sha256("\n".join(entries).encode("utf-8")).hexdigest()
+
+
+_HASH_CACHE: Dict[Path, tuple] = {}
+
+
+def _file_sha256(path: Path) -> Optional[str]:
+    """sha256 of a file, memoized per (mtime_ns, size) within this process."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _HASH_CACHE.get(path)
+    if cached and cached[0] == key:
+        return cached[1]
+    with path.open("rb") as fh:
+        digest = hashlib.file_digest(fh, "sha256").hexdigest()
+    _HASH_CACHE[path] = (key, digest)
+    return digest
+
 
 JOBS: List[ValidationJob] = []
 
@@ -0,0 +1,162 @@
+"""
+Dependency-aware scheduling for validation jobs.
+
+Jobs declare `inputs`/`outputs`; a job depends on every other selected job
+whose outputs it reads (exact path, directory prefix, or glob match). Jobs that
+write the same output are serialized in registry order. Independent jobs run
+concurrently in a process pool; each worker imports the registry once and runs
+jobs by id, so runners never need to be picklable.
+
+The driver (`__main__`) still owns normalization and writes one status file in
+selection order, so the result is independent of completion order.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from book.graph.concepts.validation import registry
+
+JobResult = Tuple[Dict[str, Any], float]
+SkipCheck = Callable[[registry.ValidationJob], bool]
+
+
+def _rel(pattern: str) -> str:
+    path = Path(pattern)
+    if path.is_absolute():
+        try:
+            path = path.relative_to(registry.ROOT)
+        except ValueError:
+            pass
+    return path.as_posix().rstrip("/")
+
+
+def _reads(input_pattern: str, output: str) -> bool:
+    if input_pattern == output:
+        return True
+    if output.startswith(input_pattern + "/"):
+        return True
+    if any(ch in input_pattern for ch in "*?["):
+        return fnmatch.fnmatchcase(output, input_pattern)
+    return False
+
+
+def job_dependencies(jobs: Sequence[registry.ValidationJob]) -> Dict[str, Set[str]]:
+    """Map job id -> ids of jobs (within `jobs`) that must finish first."""
+    inputs = {job.id: [_rel(p) for p in job.inputs] for job in jobs}
+    outputs = {job.id: [_rel(p) for p in job.outputs] for job in jobs}
+    deps: Dict[str, Set[str]] = {job.id: set() for job in jobs}
+    for i, consumer in enumerate(jobs):
+        for j, producer in enumerate(jobs):
+            if i == j:
+                continue
+            produced = outputs[producer.id]
+            if any(_reads(inp, out) for inp in inputs[consumer.id] for out in produced):
+                deps[consumer.id].add(producer.id)
+            elif j < i and set(produced) & set(outputs[consumer.id]):
+                deps[consumer.id].add(producer.id)
+    return deps
+
+
+def _next_ready(
+    order: Sequence[registry.ValidationJob], pending: Set[str], done: Set[str], deps: Dict[str, Set[str]]
+) -> List[registry.ValidationJob]:
+    return [job for job in order if job.id in pending and deps[job.id] <= done]
+
+
+def topological_order(
+    jobs: Sequence[registry.ValidationJob], deps: Optional[Dict[str, Set[str]]] = None
+) -> List[registry.ValidationJob]:
+    """
+    Order jobs so producers precede consumers, keeping registry order otherwise.
+
+    A dependency cycle is broken by taking the earliest pending job in
+    registry order.
+    """
+    deps = deps if deps is not None else job_dependencies(jobs)
+    pending = {job.id for job in jobs}
+    done: Set[str] = set()
+    ordered: List[registry.ValidationJob] = []
+    while pending:
+        ready = _next_ready(jobs, pending, done, deps)
+        job = ready[0] if ready else next(j for j in jobs if j.id in pending)
+        ordered.append(job)
+        pending.discard(job.id)
+        done.add(job.id)
+    return ordered
+
+
+def execute_job(job: registry.ValidationJob) -> JobResult:
+    """Run one job in-process; return (raw result, wall time in seconds)."""
+    start = time.perf_counter()
+    try:
+        result = job.runner() or {}
+    except Exception as exc:  # pragma: no cover
+        result = {"status": "blocked", "error": f"{exc}"}
+    return result, time.perf_counter() - start
+
+
+_WORKER_JOBS: Dict[str, registry.ValidationJob] = {}
+
+
+def _init_worker() -> None:
+    _WORKER_JOBS.update({job.id: job for job in registry.load_all_jobs()})
+
+
+def _execute_by_id(job_id: str) -> JobResult:
+    return execute_job(_WORKER_JOBS[job_id])
+
+
+def run_jobs(
+    jobs: Sequence[registry.ValidationJob],
+    max_workers: int = 1,
+    skip: Optional[SkipCheck] = None,
+) -> Dict[str, Optional[JobResult]]:
+    """
+    Run `jobs` and return job id -> (raw result, wall time).
+
+    With `max_workers <= 1` jobs run serially in-process, in dependency order.
+    Otherwise ready jobs are dispatched to a process pool as soon as all of
+    their producers have finished.
+
+    `skip` is consulted (in this process) once a job's producers are done;
+    when it returns True the job is not run and maps to None.
+    """
+    deps = job_dependencies(jobs)
+    results: Dict[str, Optional[JobResult]] = {}
+    if max_workers <= 1:
+        for job in topological_order(jobs, deps):
+            results[job.id] = None if skip and skip(job) else execute_job(job)
+        return results
+
+    pending = {job.id for job in jobs}
+    done: Set[str] = set()
+    running: Dict[Future, str] = {}
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as pool:
+        while pending or running:
+            ready = _next_ready(jobs, pending, done, deps)
+            if not ready and not running:
+                # Cycle: release the earliest pending job in registry order.
+                ready = [next(j for j in jobs if j.id in pending)]
+            for job in ready:
+                pending.discard(job.id)
+                if skip and skip(job):
+                    results[job.id] = None
+                    done.add(job.id)
+                    continue
+                running[pool.submit(_execute_by_id, job.id)] = job.id
+            if not running:
+                continue
+            finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for fut in finished:
+                job_id = running.pop(fut)
+                try:
+                    results[job_id] = fut.result()
+                except Exception as exc:  # pragma: no cover - worker crash
+                    results[job_id] = ({"status": "blocked", "error": f"{exc}"}, 0.0)
+                done.add(job_id)
+    return results
@@ -111,7 +111,7 @@ def run_schema_job():
 registry.register(
     ValidationJob(
         id="validation:schema-check",
-        inputs=[rel(STATUS_PATH)],
+        inputs=[rel(STATUS_PATH), rel(EXPERIMENT_STATUS_DIR)],
         outputs=[],
         tags=["meta", "schema"],
         description="Sanity-check validation status files for schema compliance.",
@@ -6,11 +6,10 @@ the canonical vocab mappings.
 from __future__ import annotations
 
 import json
-import subprocess
-from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List
 
+from book.api.macho import Segment, open_macho
 from book.api.path_utils import find_repo_root, to_repo_relative
 
 ROOT = find_repo_root(Path(__file__))
@@ -24,47 +23,9 @@ from book.graph.concepts.validation import registry
 from book.graph.concepts.validation.registry import ValidationJob
 
 
-@dataclass
-class Segment:
-    name: str
-    vmaddr: int
-    vmsize: int
-    fileoff: int
-    filesize: int
-
-
 def parse_segments(path: Path) -> List[Segment]:
-    out = subprocess.check_output(["otool", "-l", str(path)], text=True)
-    segs: List[Segment] = []
-    current: Dict[str, str] = {}
-    for line in out.splitlines():
-        line = line.strip()
-        if line.startswith("cmd LC_SEGMENT_64"):
-            current = {}
-        elif line.startswith("segname"):
-            current["name"] = line.split()[1]
-        elif line.startswith("vmaddr"):
-            current["vmaddr"] = line.split()[1]
-        elif line.startswith("vmsize"):
-            current["vmsize"] = line.split()[1]
-        elif line.startswith("fileoff"):
-            current["fileoff"] = line.split()[1]
-        elif line.startswith("filesize"):
-            current["filesize"] = line.split()[1]
-        elif line.startswith("flags") and current:
-            required = {"name", "vmaddr", "vmsize", "fileoff", "filesize"}
-            if required.issubset(current):
-                segs.append(
-                    Segment(
-                        name=current["name"],
-                        vmaddr=int(current["vmaddr"], 16),
-                        vmsize=int(current["vmsize"], 16),
-                        fileoff=int(current["fileoff"]),
-                        filesize=int(current["filesize"]),
-                    )
-                )
-            current = {}
-    return segs
+    """LC_SEGMENT_64 vmaddr/fileoff mapping, read directly from the Mach-O."""
+    return list(open_macho(path).segments)
 
 
 def vm_to_file(vm: int, segments: List[Segment]) -> int:
@@ -75,12 +36,10 @@ def vm_to_file(vm: int, segments: List[Segment]) -> int:
 
 
 def symbol_vmaddr(path: Path, symbol: str) -> int:
-    out = subprocess.check_output(["nm", "-nm", str(path)], text=True)
-    for line in out.splitlines():
-        parts = line.split()
-        if parts and parts[-1] == symbol:
-            return int(parts[0], 16)
-    raise ValueError(f"symbol {symbol} not found in {path}")
+    addr = open_macho(path).symbol_address(symbol)
+    if addr is None:
+        raise ValueError(f"symbol {symbol} not found in {path}")
+    return addr
 
 
 def read_cstring(buf: bytes, offset: int) -> str:
@@ -0,0 +1,86 @@
+"""
+Shared, memoized artifact access for mapping generators.
+
+Generators read the same vocab/digest/coverage/baseline JSON over and over;
+when they run in one process (see `build_graph.py`) `load_json` parses each
+file once and hands every caller the same object. Entries are keyed by
+(mtime_ns, size) and dropped explicitly with `invalidate` once a generator
+rewrites its outputs.
+
+Loaded objects are shared: treat them as read-only and copy before mutating.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+_LOCK = threading.Lock()
+_JSON: Dict[Path, Tuple[int, int, Any]] = {}
+_SHA256: Dict[Path, Tuple[int, int, str]] = {}
+_STATS = {"json_parses": 0, "json_hits": 0, "sha256_reads": 0, "sha256_hits": 0}
+
+
+def _stamp(path: Path) -> Tuple[int, int]:
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+def load_json(path: Path) -> Any:
+    """Parsed JSON for `path`, parsed at most once per file version in this process."""
+    path = Path(path).resolve()
+    stamp = _stamp(path)
+    with _LOCK:
+        cached = _JSON.get(path)
+        if cached is not None and cached[:2] == stamp:
+            _STATS["json_hits"] += 1
+            return cached[2]
+    data = json.loads(path.read_text())
+    with _LOCK:
+        _JSON[path] = (*stamp, data)
+        _STATS["json_parses"] += 1
+    return data
+
+
+def file_sha256(path: Path) -> Optional[str]:
+    """sha256 of a file (None when missing), memoized per (mtime_ns, size)."""
+    path = Path(path).resolve()
+    try:
+        stamp = _stamp(path)
+    except FileNotFoundError:
+        return None
+    with _LOCK:
+        cached = _SHA256.get(path)
+        if cached is not None and cached[:2] == stamp:
+            _STATS["sha256_hits"] += 1
+            return cached[2]
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    digest = h.hexdigest()
+    with _LOCK:
+        _SHA256[path] = (*stamp, digest)
+        _STATS["sha256_reads"] += 1
+    return digest
+
+
+def invalidate(paths: Optional[Iterable[Path]] = None) -> None:
+    """Forget cached parses/hashes for `paths` (everything when None)."""
+    with _LOCK:
+        if paths is None:
+            _JSON.clear()
+            _SHA256.clear()
+            return
+        for path in paths:
+            resolved = Path(path).resolve()
+            _JSON.pop(resolved, None)
+            _SHA256.pop(resolved, None)
+
+
+def stats() -> Dict[str, int]:
+    with _LOCK:
+        return dict(_STATS)
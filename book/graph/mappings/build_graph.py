@@ -0,0 +1,480 @@
+"""
+In-process, dependency-tracked build graph for mapping generators.
+
+Each `MappingGenerator` declares the mapping files it reads (`inputs`), the
+files it writes (`outputs`), and the code it runs (`code`). A generator
+depends on every other selected generator whose outputs it reads, so
+producers always finish before consumers; independent generators run
+concurrently on a thread pool in this process, sharing parsed JSON through
+`artifacts.load_json`.
+
+A generator is rebuilt only when something it depends on changed since its
+last successful build: the content hash of an input or code file, or an
+output that is missing or no longer matches what it wrote. Hashes are taken
+once its producers have finished, so a producer that rewrites identical bytes
+does not force its consumers to rebuild. Build records (per-file sha256 plus
+the reasons a generator ran) live in `book/out/mapping-build/status.json`.
+
+`run_promotion.py` is the CLI; it runs the validation jobs the selected
+generators need once, in-process, before building.
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from book.graph.mappings import artifacts
+
+ROOT = Path(__file__).resolve().parents[3]
+STATUS_PATH = ROOT / "book" / "out" / "mapping-build" / "status.json"
+STATUS_SCHEMA = "mappings.build_status.v0.1"
+
+BASELINE = "book/world/sonoma-14.4.1-23E224-arm64/world-baseline.json"
+
+
+@dataclass(frozen=True)
+class MappingGenerator:
+    id: str
+    run: Callable[[], Any]
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+    code: Tuple[str, ...] = ()
+    groups: Tuple[str, ...] = ()
+    validation_tags: Tuple[str, ...] = ()
+    validation_experiments: Tuple[str, ...] = ()
+    required_jobs: Tuple[str, ...] = ()
+    extra_inputs: Optional[Callable[[], Iterable[str]]] = None
+    description: str = ""
+
+    def input_paths(self) -> List[str]:
+        paths = list(self.inputs)
+        if self.extra_inputs is not None:
+            paths.extend(self.extra_inputs())
+        own = set(self.outputs)
+        # A generator that re-reads its own output (to keep a published contract)
+        # is covered by the output check; hashing it as an input would make every
+        # build look stale on the next run.
+        return sorted({p for p in paths if p not in own})
+
+
+def _script(module: str, entry: str = "main", **kwargs: Any) -> Callable[[], Any]:
+    def run() -> Any:
+        return getattr(importlib.import_module(module), entry)(**kwargs)
+
+    return run
+
+
+def _module_path(module: str) -> str:
+    return module.replace(".", "/") + ".py"
+
+
+def _packet_inputs() -> List[str]:
+    """Promotion packets plus every file they point at."""
+    from book.graph.mappings.runtime import promotion_packets
+
+    paths: List[str] = []
+    for packet_path in promotion_packets.DEFAULT_PACKET_PATHS:
+        paths.append(packet_path.relative_to(ROOT).as_posix())
+        if not packet_path.exists():
+            continue
+        packet = artifacts.load_json(packet_path)
+        for value in packet.values() if isinstance(packet, dict) else ():
+            if isinstance(value, str) and value.startswith("book/"):
+                paths.append(value)
+    return paths
+
+
+def _generator(
+    id: str,
+    module: str,
+    *,
+    entry: str = "main",
+    kwargs: Optional[Mapping[str, Any]] = None,
+    inputs: Sequence[str],
+    outputs: Sequence[str],
+    code: Sequence[str] = (),
+    **extra: Any,
+) -> MappingGenerator:
+    return MappingGenerator(
+        id=id,
+        run=_script(module, entry, **dict(kwargs or {})),
+        inputs=tuple(inputs),
+        outputs=tuple(outputs),
+        code=(_module_path(module), "book/graph/mappings/artifacts.py", *code),
+        **extra,
+    )
+
+
+GENERATORS: List[MappingGenerator] = [
+    _generator(
+        "runtime-signatures",
+        "book.graph.mappings.runtime.generate_runtime_signatures",
+        entry="generate",
+        kwargs={"validate": False},
+        inputs=[
+            "book/graph/mappings/runtime_cuts/runtime_story.json",
+            "book/graph/mappings/runtime/runtime_coverage.json",
+            "book/graph/concepts/validation/out/experiments/field2/field2_ir.json",
+            BASELINE,
+        ],
+        extra_inputs=_packet_inputs,
+        outputs=["book/graph/mappings/runtime/runtime_signatures.json"],
+        code=["book/graph/mappings/runtime/promotion_packets.py", "book/api/runtime_tools/core/normalize.py"],
+        groups=("runtime",),
+        validation_experiments=("field2",),
+        required_jobs=("experiment:field2",),
+    ),
+    _generator(
+        "system-profiles-static-checks",
+        "book.graph.mappings.system_profiles.generate_static_checks",
+        inputs=[
+            "book/graph/mappings/tag_layouts/tag_layouts.json",
+            "book/graph/concepts/validation/fixtures/blobs",
+            BASELINE,
+        ],
+        outputs=["book/graph/mappings/system_profiles/static_checks.json"],
+        code=["book/api/profile_tools"],
+        groups=("system-profiles",),
+        validation_tags=("system-profiles",),
+    ),
+    _generator(
+        "system-profiles-digests",
+        "book.graph.mappings.system_profiles.generate_digests_from_ir",
+        kwargs={"validate": False},
+        inputs=[
+            "book/graph/concepts/validation/out/experiments/system-profile-digest/digests_ir.json",
+            "book/graph/mappings/system_profiles/static_checks.json",
+            BASELINE,
+        ],
+        outputs=["book/graph/mappings/system_profiles/digests.json"],
+        groups=("system-profiles",),
+        validation_tags=("system-profiles",),
+        required_jobs=("experiment:system-profile-digest",),
+    ),
+    _generator(
+        "carton-coverage",
+        "book.graph.mappings.carton.generate_coverage_from_carton",
+        kwargs={"validate": False},
+        inputs=[
+            "book/graph/mappings/vocab/ops.json",
+            "book/graph/mappings/system_profiles/digests.json",
+            BASELINE,
+        ],
+        outputs=["book/graph/mappings/carton/operation_coverage.json"],
+        groups=("carton-coverage",),
+        validation_tags=("smoke", "system-profiles"),
+        required_jobs=("vocab:sonoma-14.4.1", "experiment:system-profile-digest"),
+    ),
+    _generator(
+        "carton-operation-index",
+        "book.graph.mappings.carton.generate_operation_index",
+        inputs=[
+            "book/graph/mappings/vocab/ops.json",
+            "book/graph/mappings/system_profiles/digests.json",
+            "book/graph/mappings/carton/operation_coverage.json",
+            BASELINE,
+        ],
+        outputs=["book/graph/mappings/carton/operation_index.json"],
+        groups=("carton-indices",),
+        validation_tags=("system-profiles",),
+    ),
+    _generator(
+        "carton-profile-layer-index",
+        "book.graph.mappings.carton.generate_profile_layer_index",
+        inputs=[
+            "book/graph/mappings/vocab/ops.json",
+            "book/graph/mappings/system_profiles/digests.json",
+            "book/graph/mappings/carton/operation_coverage.json",
+            BASELINE,
+        ],
+        outputs=["book/graph/mappings/carton/profile_layer_index.json"],
+        groups=("carton-indices",),
+        validation_tags=("system-profiles",),
+    ),
+    _generator(
+        "carton-filter-index",
+        "book.graph.mappings.carton.generate_filter_index",
+        inputs=[
+            "book/graph/mappings/vocab/filters.json",
+            "book/graph/mappings/system_profiles/digests.json",
+            BASELINE,
+        ],
+        outputs=["book/graph/mappings/carton/filter_index.json"],
+        groups=("carton-indices",),
+        validation_tags=("system-profiles",),
+    ),
+]
+
+
+def select_generators(
+    names: Iterable[str], generators: Sequence[MappingGenerator] = GENERATORS
+) -> List[MappingGenerator]:
+    """Generators matching ids or group names, in registry order."""
+    wanted = [n for n in names if n]
+    known = {g.id for g in generators} | {grp for g in generators for grp in g.groups}
+    unknown = [n for n in wanted if n not in known]
+    if unknown:
+        raise ValueError(f"unknown generator: {', '.join(unknown)}")
+    return [g for g in generators if g.id in wanted or any(grp in wanted for grp in g.groups)]
+
+
+def _reads(input_path: str, output: str) -> bool:
+    return input_path == output or output.startswith(input_path.rstrip("/") + "/")
+
+
+def generator_dependencies(generators: Sequence[MappingGenerator]) -> Dict[str, Set[str]]:
+    """Map generator id -> ids (within `generators`) whose outputs it reads."""
+    inputs = {g.id: list(g.inputs) for g in generators}
+    deps: Dict[str, Set[str]] = {g.id: set() for g in generators}
+    for consumer in generators:
+        for producer in generators:
+            if producer.id == consumer.id:
+                continue
+            if any(_reads(inp, out) for inp in inputs[consumer.id] for out in producer.outputs):
+                deps[consumer.id].add(producer.id)
+    return deps
+
+
+def _hash_paths(paths: Iterable[str], root: Path, *, code: bool = False) -> Dict[str, Optional[str]]:
+    """sha256 per file; directories expand recursively (`.py` files only for code)."""
+    out: Dict[str, Optional[str]] = {}
+    for rel in paths:
+        path = root / rel
+        if path.is_dir():
+            pattern = "*.py" if code else "*"
+            for child in sorted(path.rglob(pattern)):
+                if child.is_file() and "__pycache__" not in child.parts:
+                    out[child.relative_to(root).as_posix()] = artifacts.file_sha256(child)
+        else:
+            out[rel] = artifacts.file_sha256(path)
+    return out
+
+
+def _changed(prev: Mapping[str, Optional[str]], now: Mapping[str, Optional[str]]) -> List[str]:
+    return sorted(k for k in set(prev) | set(now) if prev.get(k) != now.get(k))
+
+
+def load_status(path: Path = STATUS_PATH) -> Dict[str, Dict[str, Any]]:
+    try:
+        data = json.loads(path.read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+    if data.get("schema") != STATUS_SCHEMA:
+        return {}
+    return {rec["generator_id"]: rec for rec in data.get("generators", []) if isinstance(rec, dict)}
+
+
+def write_status(records: Mapping[str, Dict[str, Any]], path: Path = STATUS_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"schema": STATUS_SCHEMA, "generators": [records[k] for k in sorted(records)]}
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n")
+
+
+def plan(
+    gen: MappingGenerator,
+    prev: Optional[Mapping[str, Any]],
+    root: Path,
+    *,
+    force: bool = False,
+    rebuilt_producers: Mapping[str, str] | None = None,
+) -> Tuple[List[str], Dict[str, Any]]:
+    """
+    Reasons `gen` must run (empty when up to date) and the input/code hash
+    snapshot the decision was made on.
+    """
+    snapshot = {
+        "inputs": _hash_paths(gen.input_paths(), root),
+        "code": _hash_paths(gen.code, root, code=True),
+    }
+    reasons: List[str] = []
+    if force:
+        reasons.append("forced")
+    if not prev:
+        reasons.append("no previous build record")
+        return reasons, snapshot
+    produced_by = rebuilt_producers or {}
+    changed_inputs = _changed(prev.get("inputs") or {}, snapshot["inputs"])
+    if changed_inputs:
+        labels = [f"{p} (rebuilt by {produced_by[p]})" if p in produced_by else p for p in changed_inputs]
+        reasons.append("inputs changed: " + ", ".join(labels))
+    changed_code = _changed(prev.get("code") or {}, snapshot["code"])
+    if changed_code:
+        reasons.append("code changed: " + ", ".join(changed_code))
+    recorded_outputs = prev.get("outputs") or {}
+    current_outputs = _hash_paths(gen.outputs, root)
+    stale = [p for p in gen.outputs if current_outputs.get(p) is None or current_outputs.get(p) != recorded_outputs.get(p)]
+    if stale:
+        reasons.append("outputs missing or modified: " + ", ".join(stale))
+    return reasons, snapshot
+
+
+@dataclass
+class BuildResult:
+    records: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    ran: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    blocked: List[str] = field(default_factory=list)
+    explain: Dict[str, List[str]] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed and not self.blocked
+
+
+def build(
+    generators: Sequence[MappingGenerator],
+    *,
+    root: Path = ROOT,
+    status_path: Path = STATUS_PATH,
+    jobs: int = 1,
+    force: bool = False,
+    dry_run: bool = False,
+    on_decision: Optional[Callable[[str, List[str]], None]] = None,
+) -> BuildResult:
+    """
+    Build `generators` in dependency order, `jobs` at a time.
+
+    Each generator is planned once all of its producers are done. Up-to-date
+    generators are skipped; a failure blocks everything downstream of it.
+    With `dry_run`, nothing runs: a generator whose producer would rebuild is
+    reported as pending on that producer.
+    """
+    deps = generator_dependencies(generators)
+    prev_status = load_status(status_path)
+    result = BuildResult()
+    records: Dict[str, Dict[str, Any]] = dict(prev_status)
+    rebuilt_outputs: Dict[str, str] = {}
+    by_id = {g.id: g for g in generators}
+    pending: List[str] = [g.id for g in generators]
+    done: Set[str] = set()
+    dead: Set[str] = set()
+    running: Dict[Future, Tuple[str, Dict[str, Any], List[str], float]] = {}
+
+    def decide(gen: MappingGenerator) -> Optional[Tuple[Dict[str, Any], List[str]]]:
+        upstream = sorted(deps[gen.id] & dead)
+        if upstream:
+            reasons = [f"blocked: upstream {', '.join(upstream)} failed"]
+            result.blocked.append(gen.id)
+            dead.add(gen.id)
+        else:
+            reasons, snapshot = plan(
+                gen, prev_status.get(gen.id), root, force=force, rebuilt_producers=rebuilt_outputs
+            )
+            if dry_run:
+                would = sorted(d for d in deps[gen.id] if d in result.ran)
+                if would and not reasons:
+                    reasons = [f"pending: upstream {', '.join(would)} would rebuild"]
+        result.explain[gen.id] = reasons or ["up to date"]
+        if on_decision is not None:
+            on_decision(gen.id, result.explain[gen.id])
+        if gen.id in dead:
+            return None
+        if not reasons:
+            result.skipped.append(gen.id)
+            return None
+        result.ran.append(gen.id)
+        return (None if dry_run else snapshot), reasons
+
+    def finish(gen_id: str, snapshot: Dict[str, Any], reasons: List[str], wall: float) -> None:
+        gen = by_id[gen_id]
+        artifacts.invalidate(root / p for p in gen.outputs)
+        outputs = _hash_paths(gen.outputs, root)
+        for rel in gen.outputs:
+            rebuilt_outputs[rel] = gen_id
+        records[gen_id] = {
+            "generator_id": gen_id,
+            "inputs": snapshot["inputs"],
+            "code": snapshot["code"],
+            "outputs": outputs,
+            "reasons": reasons,
+            "wall_time_s": round(wall, 3),
+        }
+
+    def timed(gen: MappingGenerator) -> float:
+        start = time.perf_counter()
+        gen.run()
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        while pending or running:
+            ready = [gid for gid in pending if deps[gid] <= done]
+            for gen_id in ready:
+                pending.remove(gen_id)
+                decision = decide(by_id[gen_id])
+                if decision is None or dry_run:
+                    done.add(gen_id)
+                    continue
+                snapshot, reasons = decision
+                running[pool.submit(timed, by_id[gen_id])] = (gen_id, snapshot, reasons, 0.0)
+            if not running:
+                if pending and not ready:
+                    raise RuntimeError(f"dependency cycle among generators: {', '.join(pending)}")
+                continue
+            finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for fut in finished:
+                gen_id, snapshot, reasons, _ = running.pop(fut)
+                try:
+                    wall = fut.result()
+                except BaseException as exc:  # noqa: BLE001 - recorded, surfaced by the caller
+                    result.failed[gen_id] = f"{type(exc).__name__}: {exc}"
+                    dead.add(gen_id)
+                    records.pop(gen_id, None)
+                else:
+                    finish(gen_id, snapshot, reasons, wall)
+                done.add(gen_id)
+
+    result.records = records
+    if not dry_run:
+        write_status(records, status_path)
+    return result
+
+
+def validation_selection(generators: Sequence[MappingGenerator]) -> Tuple[List[str], List[str]]:
+    """(tags, experiments) of validation jobs the generators require, plus `smoke`."""
+    tags = {"smoke"}
+    experiments: Set[str] = set()
+    for gen in generators:
+        tags.update(gen.validation_tags)
+        experiments.update(gen.validation_experiments)
+    return sorted(tags), sorted(experiments)
+
+
+def run_validation(tags: Sequence[str], experiments: Sequence[str]) -> List[Dict[str, Any]]:
+    """Run the validation jobs for `tags` or `experiments` once, in this process."""
+    from book.graph.concepts.validation import __main__ as driver
+    from book.graph.concepts.validation import registry
+
+    jobs = registry.load_all_jobs()
+    wanted: Set[str] = set()
+    if tags:
+        wanted.update(j.id for j in driver.select_jobs(jobs, [], list(tags), [], False))
+    if experiments:
+        wanted.update(j.id for j in driver.select_jobs(jobs, [], [], list(experiments), False))
+    selected = [j for j in jobs if j.id in wanted]
+    return driver.run_and_record(selected)
+
+
+def job_gate_failures(
+    generators: Sequence[MappingGenerator], records: Iterable[Mapping[str, Any]]
+) -> List[str]:
+    """
+    Required validation jobs that are missing or not `ok*` in `records`.
+
+    Generators re-check job status themselves only when they rebuild; this
+    gate applies it on every promotion, including when all are up to date.
+    """
+    status = {rec.get("job_id") or rec.get("id"): rec.get("status") for rec in records}
+    failures: List[str] = []
+    for job_id in sorted({job for gen in generators for job in gen.required_jobs}):
+        if job_id not in status:
+            failures.append(f"job {job_id} missing from validation results")
+        elif not str(status[job_id] or "").startswith("ok"):
+            failures.append(f"job {job_id} not ok: {status[job_id]}")
+    return failures
@@ -24,6 +24,11 @@ from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
 ROOT = Path(__file__).resolve().parents[4]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from book.graph.mappings import artifacts
+
 OPS_PATH = ROOT / "book/graph/mappings/vocab/ops.json"
 DIGESTS_PATH = ROOT / "book/graph/mappings/system_profiles/digests.json"
 CARTON_PATH = ROOT / "book/api/carton/CARTON.json"
@@ -61,13 +66,13 @@ def require_jobs(status: Dict[str, Dict]) -> None:
 def load_json(path: Path) -> Dict:
     if not path.exists():
         raise FileNotFoundError(f"missing input: {path}")
-    return json.loads(path.read_text())
+    return artifacts.load_json(path)
 
 
 def load_baseline_world() -> str:
     if not BASELINE_PATH.exists():
         raise FileNotFoundError(f"missing baseline: {BASELINE_PATH}")
-    data = json.loads(BASELINE_PATH.read_text())
+    data = artifacts.load_json(BASELINE_PATH)
     world_id = data.get("world_id")
     if not world_id:
         raise RuntimeError("world_id missing from baseline")
@@ -130,8 +135,10 @@ def summarize(coverage: Dict[str, Dict]) -> Dict[str, object]:
     }
 
 
-def main() -> None:
-    run_validation()
+def main(*, validate: bool = True) -> None:
+    """`validate=False` skips the validation run (the caller already ran it); job status is still required."""
+    if validate:
+        run_validation()
     status = load_status()
     require_jobs(status)
 
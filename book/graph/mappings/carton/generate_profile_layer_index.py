@@ -12,10 +12,16 @@ Inputs (all from CARTON):
 from __future__ import annotations
 
 import json
+import sys
 from pathlib import Path
 from typing import Dict, List
 
 ROOT = Path(__file__).resolve().parents[4]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from book.graph.mappings import artifacts
+
 DIGESTS = ROOT / "book/graph/mappings/system_profiles/digests.json"
 VOCAB = ROOT / "book/graph/mappings/vocab/ops.json"
 COVERAGE = ROOT / "book/graph/mappings/carton/operation_coverage.json"
@@ -25,13 +31,13 @@ OUT = ROOT / "book/graph/mappings/carton/profile_layer_index.json"
 
 
 def load_json(path: Path) -> dict:
-    return json.loads(path.read_text())
+    return artifacts.load_json(path)
 
 
 def baseline_ref() -> dict:
     if not BASELINE.exists():
         raise FileNotFoundError(f"missing baseline: {BASELINE}")
-    data = json.loads(BASELINE.read_text())
+    data = artifacts.load_json(BASELINE)
     world_id = data.get("world_id")
     if not world_id:
         raise RuntimeError("world_id missing from baseline")
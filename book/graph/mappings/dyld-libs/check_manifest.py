@@ -3,13 +3,16 @@ from __future__ import annotations
 
 import hashlib
 import json
-import re
-import subprocess
 import sys
 from pathlib import Path
 from typing import Dict
 
 REPO_ROOT = Path(__file__).resolve().parents[4]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from book.api.macho import open_macho
+
 MANIFEST = Path(__file__).resolve().with_name("manifest.json")
 
 
@@ -27,16 +30,9 @@ def sha256_hex(path: Path) -> str:
     return h.hexdigest()
 
 
-def nm_symbols(path: Path) -> Dict[str, str]:
-    out = subprocess.check_output(["nm", str(path)], text=True)
-    symmap: Dict[str, str] = {}
-    for line in out.splitlines():
-        m = re.match(r"([0-9a-fA-F]+)\s+[A-Za-z]\s+(\S+)", line)
-        if not m:
-            continue
-        addr, name = m.groups()
-        symmap[name] = "0x" + addr.lower()
-    return symmap
+def defined_symbols(path: Path) -> Dict[str, str]:
+    """Defined symbols as nm-style zero-padded hex addresses."""
+    return {name: f"0x{addr:016x}" for name, addr in open_macho(path).defined_symbols().items()}
 
 
 def check_entry(entry: Dict) -> None:
@@ -47,7 +43,7 @@ def check_entry(entry: Dict) -> None:
     assert size == entry["size"], f"size mismatch for {path}: {size} != {entry['size']}"
     assert digest == entry["sha256"], f"sha mismatch for {path}: {digest} != {entry['sha256']}"
     expected_syms: Dict[str, str] = entry.get("symbols") or {}
-    actual_syms = nm_symbols(path)
+    actual_syms = defined_symbols(path)
     for name, addr in expected_syms.items():
         actual = actual_syms.get(name)
         assert actual, f"symbol {name} missing in {path}"
@@ -1,78 +1,90 @@
 """
-Thin promotion helper: run validation for selected tags/ids then call mapping generators.
+Promotion helper: run validation for the selected generators, then rebuild the
+mappings that are out of date (see `build_graph.py`).
 
 Usage example (runtime + system profiles + CARTON coverage + indices):
     python -m book.graph.mappings.run_promotion --generators runtime,system-profiles,carton-coverage,carton-indices
+
+Why did something rebuild (or not)?
+    python -m book.graph.mappings.run_promotion --explain --dry-run
 """
 
 from __future__ import annotations
 
 import argparse
-import subprocess
 import sys
 from pathlib import Path
 
-ROOT = Path(__file__).resolve().parents[2]
-
-GENERATOR_CMDS = {
-    "runtime": [
-        [sys.executable, str(ROOT / "graph" / "mappings" / "runtime" / "generate_runtime_signatures.py")],
-    ],
-    "system-profiles": [
-        [sys.executable, str(ROOT / "graph" / "mappings" / "system_profiles" / "generate_digests_from_ir.py")],
-    ],
-    "carton-coverage": [
-        [sys.executable, str(ROOT / "graph" / "mappings" / "carton" / "generate_coverage_from_carton.py")],
-    ],
-    "carton-indices": [
-        [sys.executable, str(ROOT / "graph" / "mappings" / "carton" / "generate_operation_index.py")],
-        [sys.executable, str(ROOT / "graph" / "mappings" / "carton" / "generate_profile_layer_index.py")],
-        [sys.executable, str(ROOT / "graph" / "mappings" / "carton" / "generate_filter_index.py")],
-    ],
-}
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
 
+from book.graph.mappings import artifacts, build_graph
 
-def run_validation(tags):
-    """
-    Run the validation harness with the requested tags before promotion.
-    This keeps promotion tied to the same evidence tiers used to vet the
-    mappings (smoke/system-profiles/etc.).
-    """
-    cmd = [sys.executable, "-m", "book.graph.concepts.validation"]
-    for tag in tags:
-        cmd.extend(["--tag", tag])
-    subprocess.check_call(cmd, cwd=ROOT.parent)
+DEFAULT_GENERATORS = "runtime,system-profiles,carton-coverage,carton-indices"
 
 
-def main():
+def main(argv: list[str] | None = None) -> int:
     """
-    Dispatch generator scripts after a minimal validation pass. The default set
-    refreshes runtime signatures, system profile digests, and CARTON coverage +
-    indices in a single run.
+    Validate once, in-process, with the tags/experiments the selected
+    generators declare (plus `smoke`); refuse to promote if any job a
+    selected generator requires is not `ok`. Then build the generators in
+    dependency order, skipping those whose inputs, code, and outputs are
+    unchanged since their last build.
     """
     ap = argparse.ArgumentParser()
     ap.add_argument(
         "--generators",
-        default="runtime,system-profiles,carton-coverage,carton-indices",
-        help="comma-separated generators to run (runtime,system-profiles,carton-coverage,carton-indices)",
+        default=DEFAULT_GENERATORS,
+        help=f"comma-separated generator ids or groups ({DEFAULT_GENERATORS})",
     )
-    args = ap.parse_args()
-    gens = [g.strip() for g in args.generators.split(",") if g.strip()]
-    tags = {"smoke"}
-    if "system-profiles" in gens:
-        tags.add("system-profiles")
-    if "carton-coverage" in gens or "carton-indices" in gens:
-        tags.add("system-profiles")
+    ap.add_argument("--jobs", type=int, default=4, help="generators to run concurrently (default: 4)")
+    ap.add_argument("--force", action="store_true", help="rebuild every selected generator")
+    ap.add_argument("--explain", action="store_true", help="print why each generator is rebuilt or skipped")
+    ap.add_argument("--dry-run", action="store_true", help="plan only; skip validation and generators")
+    args = ap.parse_args(argv)
 
-    run_validation(sorted(tags))
+    names = [g.strip() for g in args.generators.split(",") if g.strip()]
+    try:
+        generators = build_graph.select_generators(names)
+    except ValueError as exc:
+        raise SystemExit(str(exc))
 
-    for gen in gens:
-        cmds = GENERATOR_CMDS.get(gen)
-        if not cmds:
-            raise SystemExit(f"unknown generator: {gen}")
-        for cmd in cmds:
-            subprocess.check_call(cmd, cwd=ROOT.parent)
+    if not args.dry_run:
+        tags, experiments = build_graph.validation_selection(generators)
+        records = build_graph.run_validation(tags, experiments)
+        gate = build_graph.job_gate_failures(generators, records)
+        if gate:
+            for failure in gate:
+                print(f"[!] {failure}", file=sys.stderr)
+            return 1
+
+    def report(gen_id: str, reasons: list[str]) -> None:
+        if args.explain:
+            print(f"[{gen_id}]")
+            for reason in reasons:
+                print(f"  - {reason}")
+
+    result = build_graph.build(
+        generators,
+        jobs=args.jobs,
+        force=args.force,
+        dry_run=args.dry_run,
+        on_decision=report,
+    )
+    verb = "would rebuild" if args.dry_run else "rebuilt"
+    print(f"[+] {verb} {len(result.ran)}, up to date {len(result.skipped)}")
+    stats = artifacts.stats()
+    print(
+        f"[+] artifact cache: {stats['json_parses']} parses, {stats['json_hits']} hits; "
+        f"{stats['sha256_reads']} hashes, {stats['sha256_hits']} hits"
+    )
+    for gen_id, err in result.failed.items():
+        print(f"[!] {gen_id} failed: {err}", file=sys.stderr)
+    for gen_id in result.blocked:
+        print(f"[!] {gen_id} not built: upstream failure", file=sys.stderr)
+    return 0 if result.ok else 1
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
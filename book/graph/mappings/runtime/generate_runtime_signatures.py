@@ -18,6 +18,7 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from book.api import path_utils
+from book.graph.mappings import artifacts
 from book.api.runtime_tools.core import normalize as runtime_normalize
 
 SCRIPT_ROOT = Path(__file__).resolve().parent
@@ -56,13 +57,13 @@ def load_status(job_id: str) -> Dict[str, Any]:
 def load_json(path: Path) -> Dict[str, Any]:
     if not path.exists():
         raise FileNotFoundError(f"missing input: {path}")
-    return json.loads(path.read_text())
+    return artifacts.load_json(path)
 
 
 def load_baseline_world() -> str:
     if not BASELINE_PATH.exists():
         raise FileNotFoundError(f"missing baseline: {BASELINE_PATH}")
-    data = json.loads(BASELINE_PATH.read_text())
+    data = artifacts.load_json(BASELINE_PATH)
     world_id = data.get("world_id")
     if not world_id:
         raise RuntimeError("world_id missing from baseline")
@@ -279,8 +280,9 @@ def extract_runtime_profile_from_command(cmd: Any) -> str | None:
     return None
 
 
-def generate(packet_paths: list[Path] | None = None) -> Path:
-    run_field2_validation()
+def generate(packet_paths: list[Path] | None = None, *, validate: bool = True) -> Path:
+    if validate:
+        run_field2_validation()
     for job_id in EXPECTED_JOBS:
         load_status(job_id)
 
@@ -34,7 +34,7 @@ REPO_ROOT = Path(__file__).resolve().parents[4]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
-from book.api.profile_tools import decoder
+from book.api.profile_tools import decode_cache
 from book.api.profile_tools.op_table import op_entries
 from book.graph.concepts.validation import profile_ingestion as pi
 
@@ -186,7 +186,7 @@ def make_attestation(
     op_entries_list: List[int] = []
     if header.operation_count:
         op_entries_list = op_entries(blob, header.operation_count)
-    decoded = decoder.decode_profile_dict(blob)
+    decoded = decode_cache.decode_profile_dict(blob)
     tags = decoded.get("tag_counts") or {}
     literals = ascii_strings(sections.regex_literals or b"")
     anchor_list = anchor_hits(literals, anchor_map)
@@ -21,6 +21,11 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 ROOT = Path(__file__).resolve().parents[4]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from book.graph.mappings import artifacts
+
 IR_PATH = ROOT / "book" / "graph" / "concepts" / "validation" / "out" / "experiments" / "system-profile-digest" / "digests_ir.json"
 STATUS_PATH = ROOT / "book" / "graph" / "concepts" / "validation" / "out" / "validation_status.json"
 OUT_PATH = ROOT / "book" / "graph" / "mappings" / "system_profiles" / "digests.json"
@@ -82,7 +87,7 @@ def load_status(job_id: str) -> Dict[str, Any]:
 def load_ir(path: Path) -> Dict[str, Any]:
     if not path.exists():
         raise FileNotFoundError(f"missing IR: {path}")
-    return json.loads(path.read_text())
+    return artifacts.load_json(path)
 
 
 def load_existing_mapping() -> Dict[str, Any]:
@@ -94,7 +99,7 @@ def load_existing_mapping() -> Dict[str, Any]:
 def load_baseline_world() -> str:
     if not BASELINE_PATH.exists():
         raise FileNotFoundError(f"missing baseline: {BASELINE_PATH}")
-    data = json.loads(BASELINE_PATH.read_text())
+    data = artifacts.load_json(BASELINE_PATH)
     world_id = data.get("world_id")
     if not world_id:
         raise RuntimeError("world_id missing from baseline")
@@ -112,7 +117,7 @@ def sha256_path(path: Path) -> str:
 def load_static_checks() -> Tuple[Dict[str, Any], str]:
     if not STATIC_CHECKS_PATH.exists():
         raise FileNotFoundError(f"missing static checks: {STATIC_CHECKS_PATH}")
-    data = json.loads(STATIC_CHECKS_PATH.read_text())
+    data = artifacts.load_json(STATIC_CHECKS_PATH)
     entries = data.get("entries") or []
     by_path = {entry.get("path"): entry for entry in entries if isinstance(entry, dict)}
     tag_layout_hash = (data.get("metadata") or {}).get("tag_layout_hash") or data.get("tag_layout_hash")
@@ -178,9 +183,14 @@ def downgrade_status(current: str, drift: List[Dict[str, Any]], existing_reason:
     return downgrade_target, reason
 
 
-def main() -> None:
-    run_validation()
-    run_static_checks()
+def main(*, validate: bool = True) -> None:
+    """
+    `validate=False` skips the validation run and static-checks regeneration
+    (the caller already ran both); job status is still required.
+    """
+    if validate:
+        run_validation()
+        run_static_checks()
     job = load_status(EXPECTED_JOB)
     ir = load_ir(IR_PATH)
     world_id = load_baseline_world()
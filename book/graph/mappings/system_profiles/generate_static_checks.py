@@ -24,7 +24,7 @@ REPO_ROOT = Path(__file__).resolve().parents[4]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
-from book.api.profile_tools import decoder
+from book.api.profile_tools import decode_cache
 from book.api.profile_tools import digests as digests_mod
 from book.graph.concepts.validation import profile_ingestion as pi
 OUT_PATH = REPO_ROOT / "book/graph/mappings/system_profiles/static_checks.json"
@@ -73,7 +73,7 @@ def summarize(path: Path, tag_layout_hash: str) -> Dict[str, Any]:
     blob = path.read_bytes()
     header = pi.parse_header(pi.ProfileBlob(bytes=blob, source=path.name))
     sections = pi.slice_sections(pi.ProfileBlob(bytes=blob, source=path.name), header)
-    dec = decoder.decode_profile_dict(blob)
+    dec = decode_cache.decode_profile_dict(blob)
     op_table_hash = hashlib.sha256(dec.get("op_table", b"") if isinstance(dec.get("op_table"), (bytes, bytearray)) else json.dumps(dec.get("op_table", [])).encode()).hexdigest()
     return {
         "path": str(path.relative_to(REPO_ROOT)),
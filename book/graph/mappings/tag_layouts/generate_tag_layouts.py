@@ -24,7 +24,7 @@ REPO_ROOT = Path(__file__).resolve().parents[4]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
-from book.api.profile_tools import decoder  # type: ignore
+from book.api.profile_tools import decode_cache  # type: ignore
 from book.graph.mappings.tag_layouts import annotate_metadata  # type: ignore
 
 
@@ -58,7 +58,7 @@ def collect_tags_and_stride(paths: Iterable[Tuple[str, Path]]) -> Tuple[Set[int]
     for pid, path in paths:
         if not path.exists():
             raise FileNotFoundError(f"missing canonical blob for {pid}: {path}")
-        prof = decoder.decode_profile_dict(path.read_bytes())
+        prof = decode_cache.decode_profile_dict(path.read_bytes())
         tag_counts = prof.get("tag_counts") or {}
         for k in tag_counts.keys():
             try:
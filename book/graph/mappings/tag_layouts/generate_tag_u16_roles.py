@@ -23,7 +23,7 @@ REPO_ROOT = Path(__file__).resolve().parents[4]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
-from book.api.profile_tools import decoder  # type: ignore
+from book.api.profile_tools import decode_cache  # type: ignore
 
 
 BASELINE_PATH = REPO_ROOT / "book/world/sonoma-14.4.1-23E224-arm64/world-baseline.json"
@@ -96,7 +96,7 @@ def main() -> None:
     for _pid, path in sources:
         if not path.exists():
             raise FileNotFoundError(f"missing canonical blob: {path}")
-        prof = decoder.decode_profile_dict(path.read_bytes())
+        prof = decode_cache.decode_profile_dict(path.read_bytes())
         for node in prof.get("nodes") or []:
             try:
                 node_tag = int(node.get("tag"))
@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+Test-impact selection for the `run_all.py` harness.
+
+Each test module runs in its own fresh worker process with an audit hook
+(`sys.addaudithook`) that records what the module actually touched: every
+repo file opened for reading (source, bytecode mapped back to source, JSON
+fixtures, mappings, blobs), every repo directory listed, and every repo
+module left in `sys.modules`. Each file is hashed (and each directory
+listing digested) by the worker when the module first touches it, so a
+record holds the content the module actually saw even if another module
+rewrites the file later in the same run. The dependency set and those
+digests are stored per module in `book/out/test-impact/impact.json`.
+
+Lookups of repo paths that do not exist (`os.stat`/`os.lstat`, which back
+`Path.exists()` and `os.path.isfile()`, and failed opens) are recorded as
+"missing" dependencies, so a module that skipped for want of a fixture
+reruns once the fixture appears.
+
+On the next run a module is selected only when one of its recorded files
+changed content, a listed directory gained or lost entries, a missing path
+appeared, it failed last
+time, it has no record yet, or the harness itself changed. A checkout that
+only touches mtimes rehashes those files and selects nothing. Modules that
+launch subprocesses cannot be traced past the process boundary, so they
+always run. Selected modules run in parallel (`--jobs`).
+
+Usage:
+    python -m book.tests.impact                 # run impacted modules
+    python -m book.tests.impact --all           # full run, refreshes every record
+    python -m book.tests.impact --dry-run --explain
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import itertools
+import os
+import stat
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+ROOT = Path(__file__).resolve().parents[2]
+STATE_PATH = ROOT / "book" / "out" / "test-impact" / "impact.json"
+STATE_SCHEMA = "tests.impact.v0.2"
+
+# A change to any of these can change how every module runs.
+HARNESS_FILES = (
+    "book/tests/run_all.py",
+    "book/tests/impact.py",
+    "book/tests/conftest.py",
+    "pytest.ini",
+)
+# Writable scratch areas; reads there are not inputs.
+_EXCLUDED_PREFIXES = ("book/out/", ".git/")
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _listing_digest(path: Path) -> Optional[str]:
+    try:
+        names = sorted(os.listdir(path))
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return hashlib.sha256("\n".join(names).encode()).hexdigest()
+
+
+def _repo_rel(path: Any) -> Optional[str]:
+    if isinstance(path, os.PathLike):
+        path = os.fspath(path)
+    if isinstance(path, bytes):
+        path = os.fsdecode(path)
+    if not isinstance(path, str):
+        return None
+    full = os.path.abspath(path)
+    root = str(ROOT)
+    if not full.startswith(root + os.sep):
+        return None
+    if f"{os.sep}__pycache__{os.sep}" in full:
+        if not full.endswith(".pyc"):
+            return None
+        import importlib.util
+
+        try:
+            full = importlib.util.source_from_cache(full)
+        except ValueError:
+            return None
+    rel = os.path.relpath(full, root).replace(os.sep, "/")
+    if rel.startswith(_EXCLUDED_PREFIXES):
+        return None
+    return rel
+
+
+class _Tracer:
+    def __init__(self) -> None:
+        self.files: Dict[str, str] = {}
+        self.entries: Dict[str, List[Any]] = {}
+        self.writes: Set[str] = set()
+        self.dirs: Dict[str, str] = {}
+        self.missing: Set[str] = set()
+        self.spawned: List[str] = []
+        self._busy = False
+
+    def lookup_failed(self, path: Any) -> None:
+        if self._busy:
+            return
+        rel = _repo_rel(path)
+        if rel is not None:
+            self.missing.add(rel)
+
+    def watch_lookups(self) -> None:
+        """Wrap `os.stat`/`os.lstat` (no audit events) to see negative lookups."""
+        for name in ("stat", "lstat"):
+            real = getattr(os, name)
+
+            def lookup(path: Any, *args: Any, _real: Any = real, **kwargs: Any) -> os.stat_result:
+                try:
+                    return _real(path, *args, **kwargs)
+                except (FileNotFoundError, NotADirectoryError):
+                    self.lookup_failed(path)
+                    raise
+
+            setattr(os, name, lookup)
+
+    def read(self, rel: str) -> None:
+        """Hash `rel` the first time it is read (a no-op for non-files)."""
+        if rel in self.files:
+            return
+        busy, self._busy = self._busy, True  # our own open/stat are not the module's
+        try:
+            st = os.stat(ROOT / rel)
+            if stat.S_ISREG(st.st_mode):
+                digest = _sha256(ROOT / rel)
+                self.files[rel] = digest
+                self.entries[rel] = [st.st_mtime_ns, st.st_size, digest]
+        except (FileNotFoundError, NotADirectoryError):
+            self.missing.add(rel)
+        except OSError:
+            pass
+        finally:
+            self._busy = busy
+
+    def listed(self, rel: str) -> None:
+        if rel in self.dirs:
+            return
+        busy, self._busy = self._busy, True
+        try:
+            digest = _listing_digest(ROOT / rel)
+        finally:
+            self._busy = busy
+        if digest is None:
+            self.missing.add(rel)
+        else:
+            self.dirs[rel] = digest
+
+    def __call__(self, event: str, args: Tuple[Any, ...]) -> None:
+        if self._busy:
+            return
+        if event == "open":
+            path, mode, flags = args
+            if mode is None:
+                reading = not (flags & (os.O_WRONLY | os.O_RDWR))
+            else:
+                reading = not any(c in mode for c in "wax+")
+            rel = _repo_rel(path)
+            if rel is not None and reading:
+                self.read(rel)
+            elif rel is not None:
+                self.writes.add(rel)
+        elif event in ("os.listdir", "os.scandir"):
+            rel = _repo_rel(args[0] if args[0] is not None else ".")
+            if rel is not None:
+                self.listed(rel)
+        elif event in ("subprocess.Popen", "os.system", "os.posix_spawn", "os.exec"):
+            self.spawned.append(str(args[0] if args else event))
+
+
+def trace_module(mod_name: str) -> Dict[str, Any]:
+    """Run one test module under the tracer (worker entry point; one module per process)."""
+    # Workers inherit the pool's start method; tests expect the platform default.
+    multiprocessing.set_start_method(None, force=True)
+    tracer = _Tracer()
+    tracer.watch_lookups()
+    sys.addaudithook(tracer)
+    start = time.perf_counter()
+    from book.tests import run_all
+
+    ran, failures = run_all.run_module(mod_name)
+    for mod in list(sys.modules.values()):
+        rel = _repo_rel(getattr(mod, "__file__", None))
+        if rel is not None:
+            tracer.read(rel)
+    # Files the module created and removed again were scratch, not inputs.
+    tracer._busy = True
+    files = {rel: digest for rel, digest in tracer.files.items() if (ROOT / rel).is_file()}
+    return {
+        "module": mod_name,
+        "ran": ran,
+        "failures": [(res.name, res.error) for res in failures],
+        "files": files,
+        "entries": tracer.entries,
+        "writes": sorted(tracer.writes),
+        "dirs": tracer.dirs,
+        "missing": sorted(tracer.missing - tracer.files.keys() - tracer.dirs.keys()),
+        "spawned": sorted(set(tracer.spawned)),
+        "wall_time_s": round(time.perf_counter() - start, 3),
+    }
+
+
+class HashCache:
+    """sha256 per repo file, reused while (mtime_ns, size) is unchanged."""
+
+    def __init__(self, entries: Optional[Dict[str, List[Any]]] = None, root: Optional[Path] = None) -> None:
+        self.root = root or ROOT
+        self.entries: Dict[str, List[Any]] = dict(entries or {})
+        self._seen: Dict[str, Optional[str]] = {}
+
+    def file(self, rel: str) -> Optional[str]:
+        if rel in self._seen:
+            return self._seen[rel]
+        try:
+            st = (self.root / rel).stat()
+        except FileNotFoundError:
+            self.entries.pop(rel, None)
+            self._seen[rel] = None
+            return None
+        cached = self.entries.get(rel)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            digest = cached[2]
+        else:
+            digest = _sha256(self.root / rel)
+            self.entries[rel] = [st.st_mtime_ns, st.st_size, digest]
+        self._seen[rel] = digest
+        return digest
+
+    def listing(self, rel: str) -> Optional[str]:
+        key = rel + "/"
+        if key not in self._seen:
+            self._seen[key] = _listing_digest(self.root / rel)
+        return self._seen[key]
+
+    def forget(self, rels: Iterable[str]) -> None:
+        for rel in rels:
+            self._seen.pop(rel, None)
+
+
+def load_state(path: Path = STATE_PATH) -> Dict[str, Any]:
+    try:
+        data = json.loads(path.read_text())
+    except (FileNotFoundError, ValueError):
+        data = {}
+    if data.get("schema") != STATE_SCHEMA:
+        data = {}
+    data.setdefault("schema", STATE_SCHEMA)
+    data.setdefault("harness", {})
+    data.setdefault("modules", {})
+    data.setdefault("hashes", {})
+    return data
+
+
+def write_state(state: Dict[str, Any], path: Path = STATE_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(state, indent=1, sort_keys=True) + "\n")
+    os.replace(tmp, path)
+
+
+def _changed(recorded: Dict[str, Optional[str]], current) -> List[str]:
+    return sorted(k for k, digest in recorded.items() if current(k) != digest)
+
+
+def select(
+    modules: Iterable[str], state: Dict[str, Any], hashes: HashCache, *, run_all: bool = False
+) -> Tuple[Dict[str, List[str]], List[str]]:
+    """Split `modules` into {selected: reasons} and the list of unaffected ones."""
+    selected: Dict[str, List[str]] = {}
+    skipped: List[str] = []
+    harness_changed = _changed(state["harness"], hashes.file) if state["harness"] else ["no previous run"]
+    writers: Dict[str, List[str]] = {}
+    for name, rec in sorted(state["modules"].items()):
+        for rel in rec.get("writes", ()):
+            writers.setdefault(rel, []).append(name)
+    for mod in modules:
+        record = state["modules"].get(mod)
+        reasons: List[str] = []
+        if run_all:
+            reasons.append("full run requested")
+        elif harness_changed:
+            reasons.append("harness changed: " + ", ".join(harness_changed))
+        elif record is None:
+            reasons.append("no impact record")
+        else:
+            if record.get("failures"):
+                reasons.append("failed last run")
+            if record.get("spawned"):
+                reasons.append("spawns subprocesses (untraced): " + ", ".join(record["spawned"]))
+            changed = [
+                rel + "".join(f" (written by {w})" for w in writers.get(rel, ()) if w != mod)
+                for rel in _changed(record.get("files", {}), hashes.file)
+            ]
+            if changed:
+                reasons.append("files changed: " + ", ".join(changed))
+            listed = _changed(record.get("dirs", {}), hashes.listing)
+            if listed:
+                reasons.append("directory entries changed: " + ", ".join(listed))
+            appeared = [rel for rel in record.get("missing", ()) if os.path.lexists(hashes.root / rel)]
+            if appeared:
+                reasons.append("missing paths now exist: " + ", ".join(appeared))
+        if reasons:
+            selected[mod] = reasons
+        else:
+            skipped.append(mod)
+    return selected, skipped
+
+
+def _runs_exclusive(record: Optional[Dict[str, Any]]) -> bool:
+    return record is None or bool(record.get("writes") or record.get("spawned"))
+
+
+def _execute(modules: List[str], jobs: int) -> Iterable[Tuple[str, Dict[str, Any]]]:
+    """Run `modules` under the tracer, `jobs` at a time, yielding results as they finish."""
+    if not modules:
+        return
+    # One module per fresh process: the tracer must see every import the
+    # module makes, not only those an earlier module left uncached. Workers
+    # fork from a server that has already imported the harness (and pytest).
+    ctx = multiprocessing.get_context("forkserver")
+    ctx.set_forkserver_preload(["book.tests.run_all"])
+    with ProcessPoolExecutor(max_workers=max(1, jobs), mp_context=ctx, max_tasks_per_child=1) as pool:
+        futures = {pool.submit(trace_module, mod): mod for mod in modules}
+        for fut in as_completed(futures):
+            mod = futures[fut]
+            try:
+                yield mod, fut.result()
+            except BaseException as exc:  # noqa: BLE001 - a crashed worker is a failure
+                yield mod, {"module": mod, "ran": 0, "failures": [(mod, f"worker crashed: {exc!r}")]}
+
+
+def run(
+    modules: Iterable[str],
+    *,
+    jobs: int = 4,
+    run_all: bool = False,
+    dry_run: bool = False,
+    explain: bool = False,
+    state_path: Path = STATE_PATH,
+) -> int:
+    from book.tests import run_all as harness
+
+    modules = list(modules)
+    state = load_state(state_path)
+    hashes = HashCache(state["hashes"])
+    selected, skipped = select(modules, state, hashes, run_all=run_all)
+    if explain:
+        for mod in modules:
+            print(f"[{mod}]")
+            for reason in selected.get(mod, ["unaffected"]):
+                print(f"  - {reason}")
+    print(f"[impact] {len(selected)} of {len(modules)} test modules selected", flush=True)
+    if dry_run:
+        return 0
+
+    # Modules that write repo files (or shell out, which may) run alone so
+    # they cannot race a concurrent reader; so do modules not yet traced.
+    exclusive = [m for m in selected if _runs_exclusive(state["modules"].get(m))]
+    shared = [m for m in selected if m not in exclusive]
+    total_ran = 0
+    failures: List[Any] = []
+    # Records keep the digests the worker took when the module read each file;
+    # rehashing here would credit a reader with content a later (exclusive)
+    # module wrote, and the reader would never see that content run.
+    for mod, result in itertools.chain(_execute(shared, jobs), _execute(exclusive, 1)):
+        total_ran += result["ran"]
+        failures.extend(harness.Result(name, False, err) for name, err in result["failures"])
+        if "files" not in result:
+            state["modules"].pop(mod, None)
+            continue
+        hashes.entries.update(result["entries"])
+        hashes.forget(result["files"])
+        state["modules"][mod] = {
+            "files": result["files"],
+            "dirs": result["dirs"],
+            "missing": result["missing"],
+            "writes": result["writes"],
+            "spawned": result["spawned"],
+            "failures": [name for name, _ in result["failures"]],
+            "wall_time_s": result["wall_time_s"],
+        }
+
+    hashes.forget(HARNESS_FILES)
+    state["harness"] = {rel: hashes.file(rel) for rel in HARNESS_FILES}
+    known = set(modules)
+    state["modules"] = {m: rec for m, rec in state["modules"].items() if m in known}
+    live = {f for rec in state["modules"].values() for f in rec["files"]} | set(HARNESS_FILES)
+    state["hashes"] = {rel: entry for rel, entry in hashes.entries.items() if rel in live}
+    write_state(state, state_path)
+    print(f"[impact] {len(skipped)} unaffected module(s) not run")
+    return harness.report(total_ran, failures)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--all", action="store_true", help="run every test module and refresh all records")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 4, help="parallel worker processes")
+    ap.add_argument("--dry-run", action="store_true", help="report the selection without running tests")
+    ap.add_argument("--explain", action="store_true", help="print why each module is selected or not")
+    args = ap.parse_args(argv)
+
+    os.chdir(ROOT)
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    from book.tests import run_all as harness
+
+    return run(
+        harness._discover_modules(),
+        jobs=args.jobs,
+        run_all=args.all,
+        dry_run=args.dry_run,
+        explain=args.explain,
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -97,6 +97,9 @@ except ImportError:  # pragma: no cover - fallback stub
     pytest = stub  # type: ignore
 
 
+# pytest.skip() raises a BaseException subclass; treat it as a pass.
+_SKIP_EXC = getattr(getattr(pytest, "skip", None), "Exception", ())
+
 ROOT = Path(__file__).resolve().parents[2]
 TEST_DIR = Path(__file__).parent
 
@@ -155,6 +158,8 @@ def _run_callable(fn: Callable) -> Result:
     try:
         fn(**kwargs)
         return Result(fn.__name__, True)
+    except _SKIP_EXC:
+        return Result(fn.__name__, True)
     except Exception:
         tb = traceback.format_exc()
         return Result(fn.__name__, False, tb)
@@ -184,30 +189,26 @@ def _run_unittest_classes(mod) -> Tuple[int, List[Result]]:
     return result.testsRun, failures
 
 
-def run_all() -> int:
-    modules = _discover_modules()
-    failures: List[Result] = []
-    total_ran = 0
-
-    for mod_name in modules:
-        try:
-            mod = importlib.import_module(mod_name)
-        except Exception:
-            tb = traceback.format_exc()
-            failures.append(Result(mod_name, False, tb))
-            continue
+def run_module(mod_name: str) -> Tuple[int, List[Result]]:
+    """Import one test module and run its tests; returns (tests run, failures)."""
+    try:
+        mod = importlib.import_module(mod_name)
+    except _SKIP_EXC:
+        return 0, []
+    except Exception:
+        return 0, [Result(mod_name, False, traceback.format_exc())]
 
-        ran, unit_failures = _run_unittest_classes(mod)
-        total_ran += ran
-        failures.extend(unit_failures)
+    total_ran, failures = _run_unittest_classes(mod)
+    for name, obj in list(vars(mod).items()):
+        if inspect.isfunction(obj) and name.startswith("test_"):
+            res = _run_callable(obj)
+            total_ran += 1
+            if not res.ok:
+                failures.append(res)
+    return total_ran, failures
 
-        for name, obj in list(vars(mod).items()):
-            if inspect.isfunction(obj) and name.startswith("test_"):
-                res = _run_callable(obj)
-                total_ran += 1
-                if not res.ok:
-                    failures.append(res)
 
+def report(total_ran: int, failures: List[Result]) -> int:
     if failures:
         print("Test failures:")
         for res in failures:
@@ -219,5 +220,17 @@ def run_all() -> int:
     return 0
 
 
+def run_all() -> int:
+    failures: List[Result] = []
+    total_ran = 0
+
+    for mod_name in _discover_modules():
+        ran, mod_failures = run_module(mod_name)
+        total_ran += ran
+        failures.extend(mod_failures)
+
+    return report(total_ran, failures)
+
+
 if __name__ == "__main__":
     sys.exit(run_all())
@@ -0,0 +1,112 @@
+import hashlib
+import io
+import json
+import socket
+import threading
+
+import pytest
+
+from book.api.carton import carton_query
+from book.api.carton import server
+
+
+def test_batch_matches_single_queries():
+    names = carton_query.list_operations()
+    stories = carton_query.operation_stories(names)
+    assert list(stories) == names
+    for name in ("file-read*", names[0], names[-1]):
+        assert stories[name] == carton_query.operation_story(name)
+    profiles = carton_query.profiles_with_operations(["file-read*", "network-outbound"])
+    assert profiles["file-read*"] == carton_query.profiles_with_operation("file-read*")
+    assert profiles["network-outbound"] == carton_query.profiles_with_operation("network-outbound")
+
+
+def test_batch_reports_every_unknown_operation():
+    with pytest.raises(carton_query.UnknownOperationError) as excinfo:
+        carton_query.operation_stories(["file-read*", "nope-1", "nope-2"])
+    assert "nope-1" in str(excinfo.value) and "nope-2" in str(excinfo.value)
+
+
+def test_stdio_server_answers_and_reports_errors():
+    requests = [
+        {"id": 1, "method": "operation_stories", "params": {"op_names": ["file-read*"]}},
+        {"id": 2, "method": "filter_story", "args": ["path"]},
+        {"id": 3, "method": "operation_story", "args": ["not-a-real-op"]},
+        {"id": 4, "method": "clear_cache"},
+        {"id": 5, "method": "filter_story", "args": ["path", "extra"]},
+    ]
+    reader = io.StringIO("\n".join(json.dumps(r) for r in requests) + "\nnot json\n")
+    writer = io.StringIO()
+    server.serve_stream(reader, writer)
+    responses = [json.loads(line) for line in writer.getvalue().splitlines()]
+    assert [r["id"] for r in responses] == [1, 2, 3, 4, 5, None]
+    assert responses[0]["result"]["file-read*"] == carton_query.operation_story("file-read*")
+    assert responses[1]["result"]["filter_name"] == "path"
+    assert responses[2]["error"]["type"] == "UnknownOperationError"
+    assert all(r["error"]["type"] == "BadRequest" for r in responses[3:])
+
+
+def test_stdio_server_survives_badly_typed_arguments():
+    requests = [
+        {"id": 1, "method": "ops_with_low_coverage", "args": ["x"]},
+        {"id": 2, "method": "filter_story", "args": ["path"]},
+    ]
+    reader = io.StringIO("\n".join(json.dumps(r) for r in requests) + "\n")
+    writer = io.StringIO()
+    server.serve_stream(reader, writer)
+    responses = [json.loads(line) for line in writer.getvalue().splitlines()]
+    assert [r["id"] for r in responses] == [1, 2]
+    assert responses[0]["error"]["type"] == "InternalError"
+    assert "ops_with_low_coverage" in responses[0]["error"]["message"]
+    assert responses[1]["result"]["filter_name"] == "path"
+
+
+def test_unix_socket_server_reloads_when_manifest_changes(monkeypatch, tmp_path):
+    coverage_rel = carton_query.LOGICAL_PATHS["carton.coverage"]
+    original = carton_query.ROOT / coverage_rel
+    coverage = tmp_path / "coverage.json"
+    coverage.write_bytes(original.read_bytes())
+    base_manifest = json.loads(carton_query.CARTON_MANIFEST.read_text())
+    manifest_path = tmp_path / "CARTON.json"
+    logical_paths = dict(carton_query.LOGICAL_PATHS)
+    logical_paths["carton.coverage"] = str(coverage)
+
+    def write_manifest():
+        manifest = json.loads(json.dumps(base_manifest))
+        for entry in manifest["files"]:
+            if entry["path"] == coverage_rel:
+                entry["path"] = str(coverage)
+                entry["sha256"] = hashlib.sha256(coverage.read_bytes()).hexdigest()
+        manifest_path.write_text(json.dumps(manifest, indent=1))
+
+    write_manifest()
+    monkeypatch.setattr(carton_query, "CARTON_MANIFEST", manifest_path)
+    monkeypatch.setattr(carton_query, "LOGICAL_PATHS", logical_paths)
+    carton_query.clear_cache()
+
+    sock_path = tmp_path / "carton.sock"
+    srv = server.CartonUnixServer(str(sock_path), server._LineHandler)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(str(sock_path))
+            stream = client.makefile("rw")
+
+            def ask(req):
+                stream.write(json.dumps(req) + "\n")
+                stream.flush()
+                return json.loads(stream.readline())
+
+            req = {"id": "a", "method": "profiles_with_operations", "params": {"op_names": ["file-read*"]}}
+            before = ask(req)["result"]["file-read*"]
+            doc = json.loads(coverage.read_text())
+            doc["coverage"]["file-read*"]["system_profiles"] = ["sys:only"]
+            coverage.write_text(json.dumps(doc))
+            assert ask(req)["error"]["type"] == "CartonDataError"  # mapping changed, manifest did not
+            write_manifest()
+            assert ask(req)["result"]["file-read*"] == ["sys:only"] != before
+    finally:
+        srv.shutdown()
+        srv.server_close()
+        carton_query.clear_cache()
@@ -0,0 +1,86 @@
+import hashlib
+import json
+from pathlib import Path
+
+import pytest
+
+from book.api.carton import carton_query
+from book.api.carton import snapshot
+
+
+@pytest.fixture
+def temp_coverage(monkeypatch, tmp_path):
+    """Point carton.coverage at a writable copy listed (with its hash) in a temp manifest."""
+    original = carton_query.ROOT / carton_query.LOGICAL_PATHS["carton.coverage"]
+    coverage = tmp_path / "coverage.json"
+    coverage.write_bytes(original.read_bytes())
+    manifest = json.loads(carton_query.CARTON_MANIFEST.read_text())
+    for entry in manifest["files"]:
+        if entry["path"] == carton_query.LOGICAL_PATHS["carton.coverage"]:
+            entry["path"] = str(coverage)
+            entry["sha256"] = hashlib.sha256(coverage.read_bytes()).hexdigest()
+    manifest_path = tmp_path / "CARTON.json"
+    manifest_path.write_text(json.dumps(manifest))
+    logical_paths = dict(carton_query.LOGICAL_PATHS)
+    logical_paths["carton.coverage"] = str(coverage)
+    monkeypatch.setattr(carton_query, "CARTON_MANIFEST", manifest_path)
+    monkeypatch.setattr(carton_query, "LOGICAL_PATHS", logical_paths)
+    carton_query.clear_cache()
+    yield coverage
+    carton_query.clear_cache()
+
+
+def test_verified_load_is_memoized_until_the_file_changes(temp_coverage, monkeypatch):
+    carton_query.operation_story("file-read*")
+    reads = []
+    real_read = Path.read_bytes
+    monkeypatch.setattr(Path, "read_bytes", lambda self: reads.append(self) or real_read(self))
+    carton_query.operation_story("file-read*")
+    carton_query.profiles_with_operation("file-read*")
+    assert reads == []
+
+    temp_coverage.write_text(temp_coverage.read_text() + "\n")
+    with pytest.raises(carton_query.CartonDataError):
+        carton_query.operation_story("file-read*")
+
+
+def test_cached_answers_are_copies():
+    profiles = carton_query.profiles_with_operation("file-read*")
+    profiles.append("sys:not-real")
+    story = carton_query.operation_story("file-read*")
+    story["system_profile_status"].clear()
+    assert "sys:not-real" not in carton_query.profiles_with_operation("file-read*")
+    assert carton_query.operation_story("file-read*")["system_profile_status"]
+
+
+def test_snapshot_round_trip_and_staleness(temp_coverage, tmp_path):
+    path = tmp_path / "carton.snapshot"
+    assert snapshot.write_snapshot(path) == len(carton_query.LOGICAL_PATHS)
+    expected = carton_query.operation_story("file-read*")
+
+    carton_query.clear_cache()
+    assert snapshot.load_snapshot(path) == len(carton_query.LOGICAL_PATHS)
+    assert carton_query.operation_story("file-read*") == expected
+
+    temp_coverage.write_text(temp_coverage.read_text() + "\n")
+    carton_query.clear_cache()
+    assert snapshot.load_snapshot(path) == len(carton_query.LOGICAL_PATHS) - 1
+    with pytest.raises(carton_query.CartonDataError):
+        carton_query.operation_story("file-read*")
+    assert snapshot.load_snapshot(tmp_path / "missing.snapshot") == 0
+
+
+def test_snapshot_pickled_against_moved_code_is_ignored(temp_coverage, tmp_path):
+    path = tmp_path / "carton.snapshot"
+    for stale in (b"cbook.api.carton.no_such_module\nStamp\n.", b"cbook.api.carton.snapshot\nNoSuchClass\n."):
+        path.write_bytes(stale)
+        carton_query.clear_cache()
+        assert snapshot.load_snapshot(path) == 0
+    assert carton_query.operation_story("file-read*")["system_profile_status"]
+
+
+def test_latency_reports_cold_and_warm_per_query():
+    results = snapshot.measure_latency(repeat=2)
+    assert set(results) == set(snapshot.QUERY_CALLS)
+    for row in results.values():
+        assert row["cold_ms"] >= 0 and row["warm_ms"] >= 0
@@ -0,0 +1,65 @@
+import json
+from pathlib import Path
+
+from book.api.profile_tools import decoder
+from book.api.profile_tools import digests as digests_mod
+
+
+ROOT = Path(__file__).resolve().parents[2]
+GOLDEN_MANIFEST = ROOT / "book" / "graph" / "concepts" / "validation" / "golden_corpus" / "corpus_manifest.json"
+
+
+def _blobs():
+    paths = list(digests_mod.canonical_system_profile_blobs(ROOT).values())
+    for entry in json.loads(GOLDEN_MANIFEST.read_text()).get("entries", []):
+        path = ROOT / entry["compiled_path"]
+        if path.exists():
+            paths.append(path)
+    return paths
+
+
+def _scan_literal_refs(dec: decoder.DecodedProfile, nodes_bytes: bytes):
+    """Original nodes x literals x patterns scan, kept as the parity reference."""
+    literal_start = dec.sections["literal_start"]
+    candidates = []
+    for idx, (off, val) in enumerate(dec.literal_strings_with_offsets):
+        abs_off = literal_start + off
+        pats = [
+            off.to_bytes(2, "little"),
+            abs_off.to_bytes(2, "little"),
+            off.to_bytes(4, "little"),
+            abs_off.to_bytes(4, "little"),
+            idx.to_bytes(2, "little"),
+            idx.to_bytes(4, "little"),
+        ]
+        candidates.append((off, abs_off, val, pats))
+    out = []
+    for node in dec.nodes:
+        matches = set()
+        for off, abs_off, val, pats in candidates:
+            if any(f == off or f == abs_off for f in node["fields"]):
+                matches.add(val)
+        chunk = nodes_bytes[node["offset"] : node["offset"] + node["record_size"]]
+        for _off, _abs, val, pats in candidates:
+            if any(p in chunk for p in pats):
+                matches.add(val)
+        out.append(sorted(matches))
+    return out
+
+
+def test_literal_ref_index_matches_pattern_scan():
+    checked = 0
+    for path in _blobs():
+        data = path.read_bytes()
+        for stride in (None, 8, 12):
+            dec = decoder.decode_profile(data, node_stride_bytes=stride)
+            start = dec.sections["nodes_start"]
+            nodes_bytes = data[start : start + dec.sections["nodes"]]
+            expected = _scan_literal_refs(dec, nodes_bytes)
+            assert [n["literal_refs"] for n in dec.nodes] == expected, (path.name, stride)
+            assert all(
+                n["literal_refs_provenance"] == ("heuristic" if n["literal_refs"] else "none")
+                for n in dec.nodes
+            )
+            checked += sum(1 for refs in expected if refs)
+    assert checked > 0
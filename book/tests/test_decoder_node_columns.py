@@ -0,0 +1,58 @@
+from pathlib import Path
+
+from book.api.profile_tools import decoder
+from book.api.profile_tools import digests as digests_mod
+
+
+ROOT = Path(__file__).resolve().parents[2]
+_CANONICAL = digests_mod.canonical_system_profile_blobs(ROOT)
+ALLOW_ALL = ROOT / "book" / "experiments" / "sbpl-graph-runtime" / "out" / "allow_all.sb.bin"
+BLOBS = [*_CANONICAL.values(), ALLOW_ALL]
+
+
+def _records(data: bytes, stride: int):
+    """Record-at-a-time reference: (tag, [u16...]) per full record."""
+    out = []
+    for off in range(0, len(data) - stride + 1, stride):
+        fields = [int.from_bytes(data[off + i : off + i + 2], "little") for i in range(2, stride, 2)]
+        out.append((data[off], fields))
+    return out
+
+
+def test_node_columns_match_record_parse():
+    for path in BLOBS:
+        data = path.read_bytes()
+        for stride in (8, 12):
+            columns = decoder._node_columns_fixed_stride(data, stride)
+            ref = _records(data, stride)
+            assert columns.count == len(ref)
+            assert columns.remainder == len(data) - len(ref) * stride
+            assert list(columns.tags) == [tag for tag, _ in ref]
+            for slot, col in enumerate(columns.fields):
+                assert list(col) == [fields[slot] for _, fields in ref]
+
+
+def test_decode_without_nodes_matches_full_decode():
+    for path in BLOBS:
+        data = path.read_bytes()
+        for stride in (None, 8):
+            full = decoder.decode_profile_dict(data, node_stride_bytes=stride)
+            lean = decoder.decode_profile_dict(data, node_stride_bytes=stride, include_nodes=False)
+            assert lean.pop("nodes") == []
+            full.pop("nodes")
+            assert lean == full
+
+
+def test_columnar_validation_matches_node_dicts():
+    for path in BLOBS:
+        dec = decoder.decode_profile(path.read_bytes(), node_stride_bytes=8)
+        nodes = dec.nodes
+        assert dec.node_columns is not None
+        assert dec.node_count == len(nodes)
+        in_bounds = sum(1 for n in nodes for e in n["fields"][:2] if e < len(nodes))
+        assert dec.validation["edge_fields_in_bounds"] == in_bounds
+        assert dec.validation["edge_fields_total"] == sum(len(n["fields"][:2]) for n in nodes)
+        tag_counts = {}
+        for n in nodes:
+            tag_counts[str(n["tag"])] = tag_counts.get(str(n["tag"]), 0) + 1
+        assert dec.tag_counts == tag_counts
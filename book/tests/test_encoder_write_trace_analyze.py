@@ -0,0 +1,46 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+EXPERIMENT = ROOT / "book" / "experiments" / "encoder-write-trace"
+
+
+def load_analyze_trace():
+    spec = importlib.util.spec_from_file_location("encoder_write_trace_analyze", EXPERIMENT / "analyze_trace.py")
+    mod = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    sys.modules[spec.name] = mod
+    spec.loader.exec_module(mod)  # type: ignore
+    return mod
+
+
+def test_blob_index_matches_find_all():
+    mod = load_analyze_trace()
+    blob = b"\x00\x01\x00\x01\x00AAAAB\x00\x01"
+    index = mod.BlobIndex(blob)
+    for needle in (b"\x00", b"\x00\x01", b"AA", b"AAAAB", b"\x01\x00\x01\x00A", b"Z", b""):
+        assert index.find_all(needle) == list(mod._find_all(blob, needle))
+
+
+def test_reconstruct_counts_overlaps_and_conflicts():
+    mod = load_analyze_trace()
+    writes = [(0x100, b"abcd"), (0x102, b"cdef"), (0x104, b"Xf"), (0x106, b"gh")]
+    rec = mod._reconstruct(writes, cursor_mode="cursor_as_ptr")
+    assert rec["reconstructed_len"] == 8
+    assert rec["coverage"] == 8
+    assert rec["overlaps"] == 4
+    assert rec["conflicts"] == 1
+    assert rec["reconstructed_bytes"] == b"abcdXfgh"
+
+    gapped = mod._reconstruct([(0, b"ab"), (4, b"ef"), (5, b"Z")], cursor_mode="cursor_as_offset")
+    assert gapped["coverage"] == 4
+    assert gapped["overlaps"] == 1 and gapped["conflicts"] == 1
+    assert gapped["match"] == {"kind": "gapped"}
+
+
+def test_analysis_reproduces_committed_output(tmp_path):
+    mod = load_analyze_trace()
+    out = tmp_path / "trace_analysis.json"
+    assert mod.main(["--out", str(out)]) == 0
+    assert out.read_text() == (EXPERIMENT / "out" / "trace_analysis.json").read_text()
@@ -0,0 +1,166 @@
+import asyncio
+import stat
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from book.api.entitlementjail import async_session
+from book.api.entitlementjail.async_session import AsyncXpcSession
+from book.api.entitlementjail.session import open_session
+
+
+# Speaks the `xpc session` JSONL protocol. Probes run on their own threads, so
+# a probe with `--sleep-ms` answers after later ones (out of order).
+STUB = r'''
+import json, os, sys, threading, time
+
+lock = threading.Lock()
+
+def emit(obj):
+    with lock:
+        sys.stdout.write(json.dumps(obj) + "\n")
+        sys.stdout.flush()
+
+def event(name, **data):
+    emit({"kind": "xpc_session_event", "data": {"event": name, **data}})
+
+if os.environ.get("STUB_EXIT"):
+    sys.stderr.write("stub refused\n")
+    sys.exit(int(os.environ["STUB_EXIT"]))
+
+event("session_ready", pid=os.getpid(), service_name="stub.service")
+
+def run(cmd):
+    argv = cmd.get("argv") or []
+    if "--sleep-ms" in argv:
+        time.sleep(int(argv[argv.index("--sleep-ms") + 1]) / 1000.0)
+    # Echo argv the way the service reports it: home-relative paths expanded.
+    data = {"probe_id": cmd["probe_id"], "argv": [a.replace("~", "/Users/stub") for a in argv], "rc": 0}
+    if "correlation_id" in cmd:
+        data["correlation_id"] = cmd["correlation_id"]
+    event("probe_done", probe_id=cmd["probe_id"])
+    emit({"kind": "probe_response", "data": data})
+
+threads = []
+for line in sys.stdin:
+    cmd = json.loads(line)
+    if cmd.get("command") == "close_session":
+        break
+    if cmd.get("command") == "run_probe":
+        event("probe_starting", probe_id=cmd["probe_id"])
+        t = threading.Thread(target=run, args=(cmd,))
+        t.start()
+        threads.append(t)
+for t in threads:
+    t.join()
+event("session_closed")
+'''
+
+
+@pytest.fixture
+def stub_ej(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    stub = tmp_path / "ej-stub"
+    stub.write_text(f"#!{sys.executable}\n" + STUB)
+    stub.chmod(stub.stat().st_mode | stat.S_IXUSR)
+    monkeypatch.setattr(async_session, "EJ", stub)
+    return stub
+
+
+def _session(tmp_path: Path) -> AsyncXpcSession:
+    return AsyncXpcSession(profile_id="minimal", plan_id="test:ej:async", cwd=tmp_path)
+
+
+def test_async_session_pipelines_and_matches_out_of_order_responses(stub_ej: Path, tmp_path: Path):
+    async def scenario():
+        async with _session(tmp_path) as session:
+            assert session.pid() is not None
+            assert session.service_name() == "stub.service"
+            t0 = time.monotonic()
+            responses = await session.run_probes(
+                [
+                    ("slow", ["--sleep-ms", "400"]),
+                    ("slow", ["--sleep-ms", "400"]),
+                    ("fast", []),
+                ],
+                timeout_s=5.0,
+            )
+            elapsed = time.monotonic() - t0
+            assert [r["data"]["probe_id"] for r in responses] == ["slow", "slow", "fast"]
+            # Both slow probes were in flight together.
+            assert elapsed < 0.75
+
+            tagged = await asyncio.gather(
+                session.run_probe(probe_id="same", argv=["--sleep-ms", "300"], request_id="a"),
+                session.run_probe(probe_id="same", argv=[], request_id="b"),
+            )
+            assert [r["data"]["correlation_id"] for r in tagged] == ["a", "b"]
+
+            # Claimed responses are hidden; events before them are consumed.
+            assert await session.next_event(kind="probe_response", timeout_s=0.2) is None
+
+            await session.send_command({"command": "run_probe", "probe_id": "raw", "argv": []})
+            started = await session.wait_for_event(event="probe_starting", timeout_s=2.0)
+            assert started["data"]["probe_id"] == "raw"
+            raw = await session.next_event(kind="probe_response", timeout_s=2.0)
+            assert raw["data"]["probe_id"] == "raw"
+        return session
+
+    session = asyncio.run(scenario())
+    assert session.exit_code == 0
+    assert session.proc is None
+    assert any(o.get("data", {}).get("event") == "session_closed" for o in session.stdout_jsonl)
+
+
+def test_async_session_accepts_responses_with_normalized_argv(stub_ej: Path, tmp_path: Path):
+    async def scenario():
+        async with _session(tmp_path) as session:
+            responses = await session.run_probes(
+                [("fs_op", ["--path", "~/a", "--sleep-ms", "200"]), ("other", ["~"])],
+                timeout_s=5.0,
+            )
+            return session, responses
+
+    session, responses = asyncio.run(scenario())
+    assert [r["data"]["probe_id"] for r in responses] == ["fs_op", "other"]
+    assert responses[0]["data"]["argv"][:2] == ["--path", "/Users/stub/a"]
+    assert [(m["probe_id"], m["matched_argv"]) for m in session.probe_mismatches] == [
+        ("other", ["~"]),
+        ("fs_op", ["--path", "~/a", "--sleep-ms", "200"]),
+    ]
+
+
+def test_sync_session_wraps_async_client(stub_ej: Path, tmp_path: Path):
+    session = open_session(profile_id="minimal", plan_id="test:ej:sync", cwd=tmp_path)
+    try:
+        assert session.session_ready is not None
+        assert session.proc is not None and session.proc.poll() is None
+        response = session.run_probe(probe_id="capabilities_snapshot")
+        assert response["data"]["probe_id"] == "capabilities_snapshot"
+        batch = session.run_probes([("a", ["--sleep-ms", "200"]), ("b", [])], timeout_s=5.0)
+        assert [r["data"]["probe_id"] for r in batch] == ["a", "b"]
+        session.send_command({"command": "run_probe", "probe_id": "probe_catalog", "argv": []})
+        seen = []
+        while True:
+            obj = session.read_jsonl(timeout_s=2.0)
+            assert obj is not None
+            seen.append(obj)
+            if obj.get("kind") == "probe_response":
+                break
+        assert seen[-1]["data"]["probe_id"] == "probe_catalog"
+    finally:
+        session.close()
+    assert session.exit_code == 0
+    assert session.proc is None
+    assert session.stdout_lines
+
+
+def test_session_not_ready_reports_exit(stub_ej: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("STUB_EXIT", "3")
+    with pytest.raises(RuntimeError) as excinfo:
+        open_session(profile_id="minimal", plan_id="test:ej:fail", cwd=tmp_path, ready_timeout_s=5.0)
+    code, error = excinfo.value.args
+    assert code == "xpc_session_not_ready"
+    assert error["state"] == "exit:3"
+    assert "stub refused" in error["stderr"]
@@ -0,0 +1,94 @@
+import time
+
+import pytest
+
+from book.api.entitlementjail.pool import SessionPool
+
+
+class FakeSession:
+    started = 0
+
+    def __init__(self, *, profile_id, plan_id, wait_spec=None, **kwargs):
+        self.profile_id = profile_id
+        self.plan_id = plan_id
+        self.wait_spec = wait_spec
+        self.running = False
+        self.closed = False
+        self.probes = []
+
+    def start(self, *, ready_timeout_s):
+        time.sleep(0.05)
+        FakeSession.started += 1
+        self.running = True
+
+    def is_running(self):
+        return self.running
+
+    def run_probe(self, *, probe_id, argv=(), timeout_s=25.0):
+        if probe_id == "boom":
+            raise RuntimeError("probe_response_missing", {})
+        self.probes.append(probe_id)
+        return {"kind": "probe_response", "data": {"probe_id": probe_id, "session": id(self)}}
+
+    def run_probe_with_observer(self, *, probe_id, argv=(), **kwargs):
+        return {"probe_id": probe_id, "probe_error": "boom" if probe_id == "boom" else None}
+
+    def close(self):
+        self.running = False
+        self.closed = True
+
+
+@pytest.fixture
+def pool():
+    FakeSession.started = 0
+    with SessionPool(plan_id="test:pool", max_probes_per_session=3, session_factory=FakeSession) as pool:
+        yield pool
+
+
+def test_pool_warms_concurrently_and_reuses_sessions(pool: SessionPool):
+    t0 = time.monotonic()
+    assert pool.warm("minimal", count=4) == 4
+    assert time.monotonic() - t0 < 0.15
+    sessions = {pool.run_probe("minimal", probe_id="p")["data"]["session"] for _ in range(3)}
+    assert len(sessions) == 1
+    # Third probe hit the per-session limit, so the next one uses another warm session.
+    assert pool.run_probe("minimal", probe_id="p")["data"]["session"] not in sessions
+
+    stats = pool.stats()
+    key = stats["keys"][0]
+    assert key["profile_id"] == "minimal"
+    assert (key["hits"], key["misses"], key["recycled"], key["probes"]) == (4, 0, 1, 4)
+    assert key["hit_rate"] == 1.0
+    assert key["starts"] == 4
+    assert key["start_latency_s"]["min"] >= 0.05
+
+
+def test_pool_recycles_on_error_and_unhealthy(pool: SessionPool):
+    with pool.session("minimal") as session:
+        first = session
+    with pytest.raises(RuntimeError):
+        pool.run_probe("minimal", probe_id="boom")
+    assert first.closed
+
+    with pool.session("minimal") as session:
+        second = session
+    second.running = False
+    record = pool.run_probe_with_observer("minimal", probe_id="ok")
+    assert record["probe_error"] is None
+    assert second.closed
+
+    stats = pool.stats()["total"]
+    assert stats["unhealthy"] == 1
+    assert stats["recycled"] == 1
+    assert (stats["hits"], stats["misses"]) == (1, 3)
+
+
+def test_pool_wait_sessions_are_single_use(pool: SessionPool):
+    pool.warm("minimal", wait_spec="fifo:auto", count=1)
+    with pool.session("minimal", wait_spec="fifo:auto") as session:
+        assert session.wait_spec == "fifo:auto"
+    assert session.closed
+    assert pool.stats()["keys"][0]["idle"] == 0
+    pool.close()
+    with pytest.raises(RuntimeError, match="session_pool_closed"):
+        pool.run_probe("minimal", probe_id="p")
@@ -1,4 +1,5 @@
 import importlib.util
+import json
 from pathlib import Path
 import sys
 
@@ -44,3 +45,193 @@ def test_ddmin_reduces_to_minimal_failing_subset():
     start = ["A", "B", "C", "D", "E"]
     out = mod.ddmin(start, pred)
     assert out == ["C"]
+
+
+def _oracle(mod, required, linked_pairs=()):
+    """
+    Pure-Python stand-in for the wrapper: GATE iff all required items survive;
+    INVALID when both items of a linked pair are gone (an arity-style failure).
+    """
+
+    def pred(xs):
+        present = set(xs)
+        if any(a not in present and b not in present for a, b in linked_pairs):
+            return mod.CandidateClass.INVALID
+        return mod.CandidateClass.GATE if required <= present else mod.CandidateClass.NOT_GATE
+
+    return pred
+
+
+def test_parallel_ddmin_matches_serial_result_and_trace():
+    import random
+
+    mod = _load_tool_module()
+    rng = random.Random(11)
+    for _ in range(40):
+        items = list(range(rng.randint(2, 40)))
+        required = set(rng.sample(items, rng.randint(1, min(4, len(items)))))
+        others = [x for x in items if x not in required]
+        pairs = [tuple(rng.sample(others, 2))] if len(others) >= 2 and rng.random() < 0.5 else []
+        pred = _oracle(mod, required, pairs)
+        serial_trace, parallel_trace = [], []
+        serial = mod.ddmin(list(items), pred, trace=serial_trace.append)
+        parallel = mod.ddmin(list(items), pred, trace=parallel_trace.append, jobs=4)
+        assert parallel == serial
+        assert parallel_trace == serial_trace
+
+
+def test_parallel_ddmin_cancels_candidates_after_first_gate():
+    import threading
+    import time
+
+    mod = _load_tool_module()
+    base = _oracle(mod, {"C"})
+    started = []
+    cancels = []
+    lock = threading.Lock()
+
+    def slow_pred(xs):
+        with lock:
+            started.append(tuple(xs))
+        time.sleep(0.05)
+        return base(xs)
+
+    items = list("ABCDEFGHIJKLMNOP")
+    t0 = time.monotonic()
+    out = mod.ddmin(items, slow_pred, jobs=8, cancel=lambda: cancels.append(1))
+    parallel_s = time.monotonic() - t0
+    assert out == ["C"]
+    assert cancels
+
+    started.clear()
+    t0 = time.monotonic()
+    assert mod.ddmin(items, slow_pred) == ["C"]
+    serial_s = time.monotonic() - t0
+    assert parallel_s < serial_s
+
+
+def test_parallel_ddmin_max_tests_counts_only_consumed_candidates(tmp_path: Path):
+    import pytest
+
+    mod = _load_tool_module()
+    wrapper = tmp_path / "wrapper"
+    wrapper.write_text(f"#!{sys.executable}\n")
+    wrapper.chmod(0o755)
+    base = _oracle(mod, {"B", "G"})
+    items = list("ABCDEFGH")
+
+    def minimize(max_tests, jobs):
+        probe = mod.ApplyProbe(wrapper_path=wrapper, command=["/usr/bin/true"], timeout_sec=10, max_tests=max_tests)
+
+        def pred(xs):
+            probe.run(f"(version 1) ; {''.join(xs)}")
+            return base(xs)
+
+        return mod.ddmin(list(items), pred, jobs=jobs, cancel=probe.cancel_running), probe
+
+    serial, probe = minimize(None, 1)
+    budget = probe.tests_run
+    parallel, probe = minimize(budget, 4)
+    assert parallel == serial == ["B", "G"]
+    assert probe.tests_run >= budget
+    for jobs in (1, 4):
+        with pytest.raises(RuntimeError, match="max_tests exceeded"):
+            minimize(budget - 1, jobs)
+
+
+def test_apply_probe_cancel_running_kills_inflight_wrapper(tmp_path: Path):
+    import threading
+    import time
+
+    mod = _load_tool_module()
+    wrapper = tmp_path / "wrapper"
+    wrapper.write_text(f"#!{sys.executable}\nimport time\ntime.sleep(10)\n")
+    wrapper.chmod(0o755)
+    probe = mod.ApplyProbe(wrapper_path=wrapper, command=["/usr/bin/true"], timeout_sec=30)
+
+    errors = []
+
+    def run():
+        try:
+            probe.run("(version 1)")
+        except Exception as exc:  # noqa: BLE001
+            errors.append(exc)
+
+    t = threading.Thread(target=run)
+    t0 = time.monotonic()
+    t.start()
+    time.sleep(0.3)
+    probe.cancel_running()
+    t.join(timeout=5)
+    assert not t.is_alive()
+    assert time.monotonic() - t0 < 5
+    assert len(errors) == 1 and isinstance(errors[0], mod.ProbeCancelled)
+    assert probe.tests_run == 1
+
+
+def test_outcome_store_ttl_eviction_and_reload(tmp_path: Path):
+    from book.tools.preflight import outcome_store
+
+    now = [1000.0]
+    path = tmp_path / "store.jsonl"
+    store = outcome_store.OutcomeStore(path, ttl_sec=100.0, max_entries=2, clock=lambda: now[0])
+    keys = [outcome_store.outcome_key(f"sha{i}", ["/usr/bin/true"], "world", "wrap") for i in range(3)]
+    assert keys[0] != outcome_store.outcome_key("sha0", ["/usr/bin/true"], "world", "other-wrapper")
+    for i, key in enumerate(keys):
+        now[0] += 10
+        store.put(key, {"n": i}, sbpl_sha256=f"sha{i}", command=["/usr/bin/true"], world_id="world", wrapper_sha256="wrap")
+    store.put(keys[2], {"n": 22}, sbpl_sha256="sha2", command=["/usr/bin/true"], world_id="world", wrapper_sha256="wrap")
+    assert store.get(keys[2]) == {"n": 22}
+    assert store.get("missing") is None
+    store.close()  # superseded line + over max_entries -> compacted to the newest two
+    assert len(path.read_text().splitlines()) == 2
+
+    reopened = outcome_store.OutcomeStore(path, ttl_sec=100.0, clock=lambda: now[0])
+    assert reopened.get(keys[0]) is None
+    assert reopened.get(keys[1]) == {"n": 1}
+    now[0] += 95
+    assert reopened.get(keys[1]) is None  # expired
+    assert reopened.get(keys[2]) == {"n": 22}
+    stats = reopened.stats()
+    assert (stats["hits"], stats["misses"], stats["expired"]) == (2, 2, 1)
+
+
+def test_apply_probe_reuses_persisted_outcomes_across_runs(tmp_path: Path):
+    mod = _load_tool_module()
+    from book.tools.preflight import outcome_store
+
+    calls = tmp_path / "calls.txt"
+    wrapper = tmp_path / "wrapper"
+    wrapper.write_text(f"#!{sys.executable}\nwith open({str(calls)!r}, 'a') as fh:\n    fh.write('x')\n")
+    wrapper.chmod(0o755)
+    store_path = tmp_path / "outcomes.jsonl"
+    trace_path = tmp_path / "trace.jsonl"
+
+    def fresh_probe():
+        store = outcome_store.OutcomeStore(store_path)
+        return store, mod.ApplyProbe(
+            wrapper_path=wrapper, command=["/usr/bin/true"], timeout_sec=10, trace_path=trace_path, store=store
+        )
+
+    store, probe = fresh_probe()
+    first = probe.run("(version 1)")
+    probe.run("(version 1)")
+    assert calls.read_text() == "x"
+    assert probe.run("(version 1)", cache=False).wrapper_rc == first.wrapper_rc
+    assert calls.read_text() == "xx"
+    assert store.stats()["writes"] == 1
+
+    store, probe = fresh_probe()
+    again = probe.run("(version 1)")
+    assert again == first
+    assert calls.read_text() == "xx"
+    assert probe.tests_run == 0
+    assert store.stats()["hits"] == 1
+
+    # A different wrapper binary is a different key.
+    wrapper.write_text(wrapper.read_text() + "# changed\n")
+    store, probe = fresh_probe()
+    probe.run("(version 1)")
+    assert calls.read_text() == "xxx"
+    traced = [json.loads(line) for line in trace_path.read_text().splitlines()]
+    assert [r.get("outcome_store") for r in traced] == ["miss", None, "hit", "miss"]
@@ -0,0 +1,83 @@
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+EXPERIMENT = ROOT / "book" / "experiments" / "mac-policy-registration"
+if str(EXPERIMENT) not in sys.path:
+    sys.path.insert(0, str(EXPERIMENT))
+
+import kc_address_index as kai  # noqa: E402
+
+FILESET_INDEX = EXPERIMENT / "out" / "kc_fileset_index.json"
+
+
+def _brute(intervals, addr):
+    hits = [iv for iv in intervals if iv["start"] <= addr < iv["end"]]
+    best = min(hits, key=lambda iv: iv["end"] - iv["start"]) if hits else None
+    return best, len(hits)
+
+
+def test_overlapping_intervals_resolve_smallest_and_count_all():
+    rnd = random.Random(7)
+    intervals = []
+    for n in range(200):
+        start = rnd.randrange(0, 5000)
+        intervals.append({"start": start, "end": start + rnd.randrange(1, 600), "entry_id": f"e{n}", "segment_name": "s"})
+    index = kai.KcAddressIndex(intervals)
+    addrs = list(range(0, 5700, 3))
+    indices, counts = index.lookup_many(addrs)
+    for addr, idx, count in zip(addrs, indices, counts):
+        best, expected = _brute(intervals, addr)
+        assert count == expected
+        if best is None:
+            assert idx == -1
+        else:
+            hit = index.interval(idx)
+            assert hit["end"] - hit["start"] == best["end"] - best["start"]
+            assert hit["start"] <= addr < hit["end"]
+
+
+def test_nested_segments_and_signed_addresses():
+    base = 0xFFFFFE0007004000
+    index = kai.KcAddressIndex(
+        [
+            {"start": base, "end": base + 0x10000, "entry_id": "kernel", "segment_name": "__TEXT", "is_exec": True},
+            {"start": base + 0x4000, "end": base + 0x8000, "entry_id": "kext", "segment_name": "__DATA", "is_exec": False},
+        ]
+    )
+    hit, count = index.lookup(base + 0x5000)
+    assert (hit["entry_id"], hit["segment_name"], hit["is_exec"], count) == ("kext", "__DATA", False, 2)
+    signed = (base + 0x9000) - (1 << 64)
+    hit, count = index.lookup(signed)
+    assert (hit["entry_id"], count) == ("kernel", 1)
+    assert index.lookup(base + 0x10000) == (None, 0)
+
+
+def test_entry_span_fallback_without_interval_map():
+    data = {"entries": [{"entry_id": "only", "vmaddr_span": {"start": 0x1000, "end": 0x2000}}]}
+    index = kai.KcAddressIndex.from_fileset_index(data)
+    assert index.lookup(0x1800)[0]["entry_id"] == "only"
+
+
+def test_persisted_index_round_trips_and_rebuilds_on_change(tmp_path):
+    fileset = tmp_path / "kc_fileset_index.json"
+    fileset.write_text(json.dumps({"segment_intervals": [{"start": 16, "end": 32, "entry_id": "a", "segment_name": "s"}]}))
+    first = kai.load_address_index(fileset)
+    persisted = tmp_path / kai.INDEX_NAME
+    assert persisted.exists()
+    assert kai.load_address_index(fileset).lookup(20) == first.lookup(20)
+
+    fileset.write_text(json.dumps({"segment_intervals": [{"start": 16, "end": 32, "entry_id": "b", "segment_name": "s"}]}))
+    assert kai.load_address_index(fileset).lookup(20)[0]["entry_id"] == "b"
+
+
+@pytest.mark.skipif(not FILESET_INDEX.exists(), reason="kc_fileset_index.json not present")
+def test_committed_index_matches_fileset_index():
+    doc = json.loads((EXPERIMENT / "out" / kai.INDEX_NAME).read_text())
+    rebuilt = kai.KcAddressIndex.from_fileset_index(json.loads(FILESET_INDEX.read_text()))
+    assert doc == rebuilt.to_json(doc["source"])
+    assert doc["source"]["sha256"] == kai._sha256_bytes(FILESET_INDEX.read_bytes())
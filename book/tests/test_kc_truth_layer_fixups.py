@@ -0,0 +1,150 @@
+import importlib.util
+import json
+import struct
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+BASE = 0xFFFFFE0007004000
+PAGE = 0x4000
+TEXT_OFF, DATA_OFF, LINKEDIT_OFF = 0x0, 0x4000, 0xC000
+
+
+EXPERIMENT = ROOT / "book" / "experiments" / "mac-policy-registration"
+
+
+def load_kc_truth_layer():
+    if str(EXPERIMENT) not in sys.path:
+        sys.path.insert(0, str(EXPERIMENT))  # sibling import of kc_address_index
+    path = EXPERIMENT / "kc_truth_layer.py"
+    spec = importlib.util.spec_from_file_location("kc_truth_layer", path)
+    mod = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    sys.modules[spec.name] = mod  # dataclasses resolve annotations via sys.modules
+    spec.loader.exec_module(mod)  # type: ignore
+    return mod
+
+
+def _ptr(target, next_delta, cache_level=0, is_auth=False, diversity=0):
+    return target | (cache_level << 30) | (diversity << 32) | (next_delta << 51) | (int(is_auth) << 63)
+
+
+def _segment(name, vmaddr, vmsize, fileoff, filesize):
+    return struct.pack("<II16sQQQQIIII", 0x19, 72, name.encode(), vmaddr, vmsize, fileoff, filesize, 7, 7, 0, 0)
+
+
+def _fixups_blob(page_starts):
+    # dyld_chained_fixups_header + starts_in_image (3 segments, only __DATA_CONST has starts).
+    seg_info = struct.pack("<IHHQIH", 22 + 2 * len(page_starts), PAGE, 8, DATA_OFF, 0, 2)
+    seg_info += struct.pack(f"<{len(page_starts)}H", *page_starts)
+    image = struct.pack("<IIII", 3, 0, 16, 0)
+    header = struct.pack("<IIIIIII", 0, 32, 0, 0, 0, 1, 0) + b"\0" * 4
+    return header + image + seg_info
+
+
+def build_fileset(path: Path, *, multi: bool = True) -> None:
+    """
+    Minimal MH_FILESET KC: one entry at fileoff 0 with __TEXT, a two-page
+    __DATA_CONST carrying pointer_format 8 chains, and __LINKEDIT holding the
+    chained-fixups payload. Page 1 uses DYLD_CHAINED_PTR_START_MULTI (two
+    chains) unless `multi` is False.
+    """
+    page_starts = [0x10, 0x8000 | 2, 0x0000, 0x8000 | 0x100] if multi else [0x10, 0x0000]
+    fixups = _fixups_blob(page_starts)
+    name = b"com.example.kext\0"
+    entry_cmd = struct.pack("<IIQQII", 0x80000035, 32 + 24, BASE, 0, 32, 0) + name.ljust(24, b"\0")
+    cmds = b"".join(
+        [
+            _segment("__TEXT", BASE, PAGE, TEXT_OFF, PAGE),
+            _segment("__DATA_CONST", BASE + PAGE, 2 * PAGE, DATA_OFF, 2 * PAGE),
+            _segment("__LINKEDIT", BASE + 3 * PAGE, PAGE, LINKEDIT_OFF, len(fixups)),
+            struct.pack("<IIII", 0x80000034, 16, LINKEDIT_OFF, len(fixups)),
+            entry_cmd,
+        ]
+    )
+    header = struct.pack("<IiiIIIII", 0xFEEDFACF, 0x0100000C, 0, 0xC, 5, len(cmds), 0, 0)
+    image = bytearray(LINKEDIT_OFF + len(fixups))
+    image[: len(header) + len(cmds)] = header + cmds
+    image[LINKEDIT_OFF:] = fixups
+
+    def put(fileoff, value):
+        struct.pack_into("<Q", image, fileoff, value)
+
+    # Page 0: 0x10 -> 0x18 -> 0x28 (next is in 4-byte units).
+    put(DATA_OFF + 0x10, _ptr(0x100, 2))
+    put(DATA_OFF + 0x18, _ptr(0x200, 4, is_auth=True, diversity=0x1234))
+    put(DATA_OFF + 0x28, _ptr(0x5000, 0))  # lands in __DATA_CONST (not exec)
+    # Page 1: chain at 0x0 (single pointer) and, for MULTI, a chain at 0x100 -> 0x108.
+    put(DATA_OFF + PAGE + 0x0, _ptr(0x300, 0))
+    put(DATA_OFF + PAGE + 0x100, _ptr(0x400, 2))
+    put(DATA_OFF + PAGE + 0x108, _ptr(0x500, 0))
+    path.write_bytes(bytes(image))
+
+
+def _run(mod, tmp_path, mode, multi=True):
+    kc = tmp_path / "fileset.kc"
+    build_fileset(kc, multi=multi)
+    out_dir = tmp_path / f"out-{mode}"
+    assert mod.main(["--kc", str(kc), "--out-dir", str(out_dir), "--fixups-mode", mode]) == 0
+    assert (out_dir / "kc_address_index.json").exists()
+    summary = json.loads((out_dir / "kc_fixups_summary.json").read_text())
+    records = [json.loads(line) for line in (out_dir / "kc_fixups.jsonl").read_text().splitlines()]
+    return summary, records
+
+
+def test_multi_start_pages_are_walked(tmp_path):
+    mod = load_kc_truth_layer()
+    summary, records = _run(mod, tmp_path, "full")
+    counts = summary["fixup_counts"]
+    assert counts["total_fixups"] == 6
+    assert counts["page_start_mode_counts"] == {"single": 1, "multi": 1}
+    assert counts["multi_start_pages"][0]["chain_starts"] == [0x0, 0x100]
+    assert counts["page_coverage"]["__DATA_CONST"]["pages_with_fixups"] == 2
+    assert counts["max_chain_len"] == 3
+    assert counts["resolved_counts"]["resolved_in_entry"] == 6
+    assert counts["resolved_counts"]["resolved_in_exec"] == 5
+
+    assert [r["vmaddr"] - BASE for r in records] == [
+        PAGE + 0x10,
+        PAGE + 0x18,
+        PAGE + 0x28,
+        2 * PAGE + 0x0,
+        2 * PAGE + 0x100,
+        2 * PAGE + 0x108,
+    ]
+    second = records[1]
+    assert second["decoded"]["is_auth"] is True
+    assert second["decoded"]["diversity"] == 0x1234
+    assert second["next_offset"] == 16
+    assert second["resolved_unsigned"] == BASE + 0x200
+    assert second["owner_entry"] == "com.example.kext"
+    assert second["owner_segment"] == "__DATA_CONST"
+    assert records[4]["page_chain_start"] == 0x100
+
+
+def test_compact_and_lite_modes_match_full(tmp_path):
+    mod = load_kc_truth_layer()
+    _, full = _run(mod, tmp_path, "full")
+    _, compact = _run(mod, tmp_path, "compact")
+    _, lite = _run(mod, tmp_path, "lite")
+    assert compact == [{"v": r["vmaddr"], "r": r["resolved_unsigned"]} for r in full]
+    assert [r["decoded"] for r in lite] == [
+        {k: r["decoded"][k] for k in ("target", "cache_level", "is_auth")} for r in full
+    ]
+
+
+def test_fixup_columns_rebuild_records(tmp_path):
+    mod = load_kc_truth_layer()
+    kc = tmp_path / "fileset.kc"
+    build_fileset(kc, multi=False)
+    header, cmds = mod._load_cmd_bytes(kc, 0)
+    segments = mod._parse_segments(cmds, header.ncmds)
+    fixups_data = kc.read_bytes()[LINKEDIT_OFF:]
+    collected = mod._collect_fixups(kc, segments, fixups_data)
+    columns = collected["fixups"]
+    assert len(columns) == collected["total_fixups"] == 4
+    first = columns.record(0)
+    assert first["segment_name"] == "__DATA_CONST"
+    assert first["fileoff"] == DATA_OFF + 0x10
+    assert first["decoded"] == mod._decode_kernel_cache_ptr(first["raw"])
+    assert list(columns)[3]["page_index"] == 1
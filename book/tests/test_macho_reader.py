@@ -0,0 +1,150 @@
+import json
+import struct
+from pathlib import Path
+
+import pytest
+
+from book.api.macho import reader
+from book.api.macho import MachOError, load_macho, open_macho
+
+ROOT = Path(__file__).resolve().parents[2]
+DYLD_LIBS = ROOT / "book" / "graph" / "mappings" / "dyld-libs"
+
+BASE_VM = 0x100000000
+
+
+def _segment(name: str, vmaddr: int, fileoff: int) -> bytes:
+    return struct.pack("<2I16s4Q4I", reader.LC_SEGMENT_64, 72, name.encode(), vmaddr, 0x1000, fileoff, 0x1000, 3, 3, 0, 0)
+
+
+def _image(file_base: int) -> bytes:
+    """Thin arm64 image whose segment/linkedit offsets are absolute at `file_base`."""
+    linkedit = file_base + 0x2000
+    strtab = b"\x00_local\x00_import\x00"
+    fixups = bytearray(struct.pack("<7I", 0, 32, 72, 76, 1, reader.DYLD_CHAINED_IMPORT, 0).ljust(32, b"\x00"))
+    fixups += struct.pack("<4I", 3, 0, 16, 0)
+    fixups += struct.pack("<IHHQIHH", 24, 0x1000, reader.DYLD_CHAINED_PTR_64_OFFSET, 0x1000, 0, 1, 0)
+    fixups += struct.pack("<I", 1) + b"_import\x00"
+    cmds = (
+        _segment("__TEXT", BASE_VM, file_base)
+        + _segment("__DATA", BASE_VM + 0x1000, file_base + 0x1000)
+        + _segment("__LINKEDIT", BASE_VM + 0x2000, linkedit)
+        + struct.pack("<6I", reader.LC_SYMTAB, 24, linkedit, 2, linkedit + 0x100, len(strtab))
+        + struct.pack("<4I", reader.LC_DYLD_CHAINED_FIXUPS, 16, linkedit + 0x200, len(fixups))
+    )
+    header = struct.pack("<8I", reader.MH_MAGIC_64, reader.CPU_TYPE_ARM64, 0, 6, 5, len(cmds), 0, 0)
+    text = bytearray((header + cmds).ljust(0x1000, b"\x00"))
+    text[0x800:0x805] = b"hello"
+    data = struct.pack("<QQ", 0x10 | (2 << 51), 1 << 63).ljust(0x1000, b"\x00")
+    nlist = struct.pack("<IBBHQ", 1, reader.N_SECT, 1, 0, BASE_VM + 0x10) + struct.pack(
+        "<IBBHQ", 8, reader.N_UNDF | reader.N_EXT, 0, 0, 0
+    )
+    le = bytearray(0x1000)
+    le[0 : len(nlist)] = nlist
+    le[0x100 : 0x100 + len(strtab)] = strtab
+    le[0x200 : 0x200 + len(fixups)] = fixups
+    return bytes(text) + data + bytes(le)
+
+
+def test_manifest_symbols_and_segments_on_dyld_slices():
+    manifest = json.loads((DYLD_LIBS / "manifest.json").read_text())
+    for entry in manifest["libs"]:
+        image = open_macho(ROOT / entry["path"])
+        assert open_macho(ROOT / entry["path"]) is image
+        for name, addr in entry["symbols"].items():
+            assert image.symbol_address(name) == int(addr, 16)
+        text = image.segment("__TEXT")
+        assert text is not None and text.fileoff == 0
+        assert image.vm_to_file(text.vmaddr + 0x40) == 0x40
+        assert image.file_to_vm(0x40) == text.vmaddr + 0x40
+        assert image.section("__TEXT", "__text") is not None
+
+    lib = open_macho(DYLD_LIBS / "usr" / "lib" / "libsandbox.1.dylib")
+    write = lib.symbol("_sb_mutable_buffer_write")
+    assert write is not None and write.is_defined and not write.is_external
+    stubs = {e.section for e in lib.indirect_symbols() if e.name == "__Block_copy"}
+    assert stubs == {"__TEXT,__auth_stubs"}
+
+
+def test_fileset_entry_symbols_and_chained_fixups(tmp_path: Path):
+    entry_id = b"com.example.kext\x00".ljust(24, b"\x00")
+    entry = struct.pack("<2IQQ2I", reader.LC_FILESET_ENTRY, 32 + len(entry_id), BASE_VM, 0x1000, 32, 0) + entry_id
+    container = struct.pack("<8I", reader.MH_MAGIC_64, reader.CPU_TYPE_ARM64, 0, reader.MH_FILESET, 1, len(entry), 0, 0)
+    path = tmp_path / "collection"
+    path.write_bytes((container + entry).ljust(0x1000, b"\x00") + _image(0x1000))
+
+    collection = load_macho(path)
+    assert [(e.entry_id, e.fileoff) for e in collection.fileset_entries] == [("com.example.kext", 0x1000)]
+    image = collection.fileset_entry("com.example.kext")
+    assert [s.name for s in image.segments] == ["__TEXT", "__DATA", "__LINKEDIT"]
+    assert image.symbol_address("_local") == BASE_VM + 0x10
+    assert image.symbol_address("_import") is None
+    assert image.symbol("_import").is_undefined
+    assert image.read_cstring(BASE_VM + 0x800) == "hello"
+    with pytest.raises(MachOError):
+        image.vm_to_file(BASE_VM + 0x5000)
+
+    imports = image.chained_imports()
+    assert [(i.lib_ordinal, i.name) for i in imports] == [(1, "_import")]
+    fixups = list(image.iter_chained_fixups())
+    assert [(f.vmaddr, f.fileoff, f.is_bind, f.target, f.ordinal) for f in fixups] == [
+        (BASE_VM + 0x1000, 0x2000, False, BASE_VM + 0x10, None),
+        (BASE_VM + 0x1008, 0x2008, True, None, 0),
+    ]
+
+
+def _kc_entry(file_base: int) -> bytes:
+    """Fileset entry whose __DATA page starts two DYLD_CHAINED_PTR_64_KERNEL_CACHE chains."""
+    linkedit = file_base + 0x2000
+    page_starts = (reader.DYLD_CHAINED_PTR_START_MULTI | 1, 0x0, reader.DYLD_CHAINED_PTR_START_LAST | 0x100)
+    fixups = bytearray(struct.pack("<7I", 0, 32, 0, 0, 0, reader.DYLD_CHAINED_IMPORT, 0))
+    fixups += b"\x00" * 4 + struct.pack("<4I", 3, 0, 16, 0)
+    fixups += struct.pack("<IHHQIH", 22 + 2 * len(page_starts), 0x1000, reader.DYLD_CHAINED_PTR_64_KERNEL_CACHE, 0x1000, 0, 1)
+    fixups += struct.pack(f"<{len(page_starts)}H", *page_starts)
+    cmds = (
+        _segment("__TEXT", BASE_VM, file_base)
+        + _segment("__DATA", BASE_VM + 0x1000, file_base + 0x1000)
+        + _segment("__LINKEDIT", BASE_VM + 0x2000, linkedit)
+        + struct.pack("<4I", reader.LC_DYLD_CHAINED_FIXUPS, 16, linkedit, len(fixups))
+    )
+    header = struct.pack("<8I", reader.MH_MAGIC_64, reader.CPU_TYPE_ARM64, 0, 11, 4, len(cmds), 0, 0)
+    data = bytearray(0x1000)
+    struct.pack_into("<Q", data, 0x0, 0x10 | (2 << 51))
+    auth = 0x20 | (1 << 30) | (0x1234 << 32) | (1 << 48) | (2 << 49) | (1 << 63)
+    struct.pack_into("<Q", data, 0x8, auth)
+    struct.pack_into("<Q", data, 0x100, 0x30)
+    return (header + cmds).ljust(0x1000, b"\x00") + bytes(data) + bytes(fixups).ljust(0x1000, b"\x00")
+
+
+def test_kernel_collection_entry_walks_multi_start_kernel_cache_chains(tmp_path: Path):
+    kc_base = BASE_VM - 0x1000
+    entry_id = b"com.apple.kec.test\x00".ljust(24, b"\x00")
+    cmds = _segment("__TEXT", kc_base, 0) + struct.pack(
+        "<2IQQ2I", reader.LC_FILESET_ENTRY, 32 + len(entry_id), BASE_VM, 0x1000, 32, 0
+    ) + entry_id
+    container = struct.pack("<8I", reader.MH_MAGIC_64, reader.CPU_TYPE_ARM64, 0, reader.MH_FILESET, 2, len(cmds), 0, 0)
+    path = tmp_path / "kc"
+    path.write_bytes((container + cmds).ljust(0x1000, b"\x00") + _kc_entry(0x1000))
+
+    image = load_macho(path).fileset_entry("com.apple.kec.test")
+    assert image.collection_base == kc_base
+    fixups = list(image.iter_chained_fixups())
+    assert [(f.vmaddr, f.fileoff, f.target, f.cache_level, f.is_auth) for f in fixups] == [
+        (BASE_VM + 0x1000, 0x2000, kc_base + 0x10, 0, False),
+        (BASE_VM + 0x1008, 0x2008, 0x20, 1, True),
+        (BASE_VM + 0x1100, 0x2100, kc_base + 0x30, 0, False),
+    ]
+    assert (fixups[1].diversity, fixups[1].addr_div, fixups[1].key) == (0x1234, True, 2)
+    assert {f.pointer_format for f in fixups} == {reader.DYLD_CHAINED_PTR_64_KERNEL_CACHE}
+
+
+def test_fat_file_selects_arm64_slice(tmp_path: Path):
+    thin = _image(0)
+    fat = struct.pack(">2I", reader.FAT_MAGIC, 1) + struct.pack(">5I", reader.CPU_TYPE_ARM64, 0, 0x4000, len(thin), 14)
+    path = tmp_path / "fat"
+    path.write_bytes(fat.ljust(0x4000, b"\x00") + thin)
+    image = load_macho(path)
+    assert image.symbol_address("_local") == BASE_VM + 0x10
+    assert image.read_cstring(BASE_VM + 0x800) == "hello"
+    with pytest.raises(MachOError):
+        load_macho(path, arch=reader.CPU_TYPE_X86_64)
@@ -0,0 +1,129 @@
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from book.graph.mappings import artifacts, build_graph
+from book.graph.mappings.build_graph import MappingGenerator
+
+
+def _copy(root: Path, src: str, dst: str, calls: list):
+    def run():
+        calls.append(dst)
+        data = json.loads((root / src).read_text())
+        (root / dst).write_text(json.dumps({"from": src, "data": data}, sort_keys=True))
+
+    return run
+
+
+def _chain(root: Path, calls: list):
+    return [
+        MappingGenerator("b", _copy(root, "a.json", "b.json", calls), inputs=("a.json",), outputs=("b.json",)),
+        MappingGenerator("c", _copy(root, "b.json", "c.json", calls), inputs=("b.json",), outputs=("c.json",)),
+        MappingGenerator("d", _copy(root, "x.json", "d.json", calls), inputs=("x.json",), outputs=("d.json",)),
+    ]
+
+
+def test_rebuilds_only_what_changed(tmp_path: Path):
+    (tmp_path / "a.json").write_text('{"v": 1}')
+    (tmp_path / "x.json").write_text('{"v": 1}')
+    status = tmp_path / "status.json"
+    calls: list = []
+    gens = _chain(tmp_path, calls)
+    assert build_graph.generator_dependencies(gens) == {"b": set(), "c": {"b"}, "d": set()}
+
+    first = build_graph.build(gens, root=tmp_path, status_path=status, jobs=2)
+    assert first.ok and sorted(first.ran) == ["b", "c", "d"]
+    assert calls.index("b.json") < calls.index("c.json")
+
+    calls.clear()
+    second = build_graph.build(gens, root=tmp_path, status_path=status)
+    assert calls == [] and sorted(second.skipped) == ["b", "c", "d"]
+
+    (tmp_path / "a.json").write_text('{"v": 2}')
+    calls.clear()
+    third = build_graph.build(gens, root=tmp_path, status_path=status)
+    assert calls == ["b.json", "c.json"]
+    assert third.explain["b"] == ["inputs changed: a.json"]
+    assert third.explain["c"] == ["inputs changed: b.json (rebuilt by b)"]
+    assert third.explain["d"] == ["up to date"]
+
+    (tmp_path / "c.json").write_text("{}")
+    dry = build_graph.build(gens, root=tmp_path, status_path=status, dry_run=True)
+    assert dry.ran == ["c"] and dry.explain["c"] == ["outputs missing or modified: c.json"]
+    assert (tmp_path / "c.json").read_text() == "{}"
+
+
+def test_producer_rewriting_identical_bytes_does_not_cascade(tmp_path: Path):
+    (tmp_path / "a.json").write_text('{"v": 1}')
+    (tmp_path / "x.json").write_text('{"v": 1}')
+    status = tmp_path / "status.json"
+    calls: list = []
+    gens = _chain(tmp_path, calls)
+    build_graph.build(gens, root=tmp_path, status_path=status)
+
+    forced = build_graph.build(gens[:1], root=tmp_path, status_path=status, force=True)
+    assert forced.ran == ["b"] and forced.explain["b"] == ["forced"]
+    calls.clear()
+    after = build_graph.build(gens, root=tmp_path, status_path=status)
+    assert after.ran == [] and calls == []
+
+
+def test_independent_generators_overlap_and_failures_block_downstream(tmp_path: Path):
+    (tmp_path / "a.json").write_text("{}")
+    barrier = threading.Barrier(2, timeout=5)
+
+    def meet():
+        barrier.wait()
+
+    def boom():
+        raise RuntimeError("boom")
+
+    gens = [
+        MappingGenerator("p", meet, inputs=("a.json",), outputs=("p.json",)),
+        MappingGenerator("q", meet, inputs=("a.json",), outputs=("q.json",)),
+        MappingGenerator("bad", boom, inputs=("a.json",), outputs=("bad.json",)),
+        MappingGenerator("after", lambda: None, inputs=("bad.json",), outputs=("after.json",)),
+    ]
+    status = tmp_path / "status.json"
+    result = build_graph.build(gens, root=tmp_path, status_path=status, jobs=3)
+    assert not result.ok
+    assert result.failed == {"bad": "RuntimeError: boom"}
+    assert result.blocked == ["after"]
+    recorded = json.loads(status.read_text())["generators"]
+    assert sorted(r["generator_id"] for r in recorded) == ["p", "q"]
+
+
+def test_select_generators_by_group_and_validation_selection():
+    selected = build_graph.select_generators(["system-profiles", "carton-coverage"])
+    assert [g.id for g in selected] == ["system-profiles-static-checks", "system-profiles-digests", "carton-coverage"]
+    assert build_graph.validation_selection(selected) == (["smoke", "system-profiles"], [])
+    with pytest.raises(ValueError):
+        build_graph.select_generators(["nope"])
+    records = [
+        {"job_id": "vocab:sonoma-14.4.1", "status": "ok-unchanged"},
+        {"job_id": "experiment:system-profile-digest", "status": "blocked"},
+    ]
+    assert build_graph.job_gate_failures(selected, records) == ["job experiment:system-profile-digest not ok: blocked"]
+    records[1]["status"] = "ok"
+    assert build_graph.job_gate_failures(selected, records) == []
+    assert build_graph.job_gate_failures(selected, records[:1]) == [
+        "job experiment:system-profile-digest missing from validation results"
+    ]
+    deps = build_graph.generator_dependencies(build_graph.GENERATORS)
+    assert deps["carton-operation-index"] == {"carton-coverage", "system-profiles-digests"}
+    assert deps["system-profiles-digests"] == {"system-profiles-static-checks"}
+
+
+def test_artifacts_memoize_until_invalidated(tmp_path: Path):
+    path = tmp_path / "m.json"
+    path.write_text('{"k": 1}')
+    first = artifacts.load_json(path)
+    assert artifacts.load_json(path) is first
+    path.write_text('{"k": 22}')
+    assert artifacts.load_json(path) == {"k": 22}
+    digest = artifacts.file_sha256(path)
+    artifacts.invalidate([path])
+    assert artifacts.file_sha256(path) == digest
+    assert artifacts.file_sha256(tmp_path / "missing.json") is None
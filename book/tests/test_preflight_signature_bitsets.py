@@ -0,0 +1,113 @@
+import importlib.util
+import itertools
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+EXPERIMENT = ROOT / "book" / "experiments" / "preflight-blob-digests"
+
+
+def load(name: str, filename: str):
+    spec = importlib.util.spec_from_file_location(name, EXPERIMENT / filename)
+    mod = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    sys.modules[spec.name] = mod
+    spec.loader.exec_module(mod)  # type: ignore
+    return mod
+
+
+@pytest.fixture
+def experiment_path(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.syspath_prepend(str(EXPERIMENT))
+
+
+def _random_rows(rng: random.Random, n: int):
+    rows = []
+    for i in range(n):
+        if rng.random() < 0.05:
+            rows.append({"label": "control", "features": None})
+            continue
+        tags = sorted(rng.sample(range(12), rng.randint(0, 5)))
+        feats = {
+            "tags_present": tags,
+            "tags_present_count": len(tags),
+            "node_count": rng.randint(1, 4),
+            "op_count": rng.randint(1, 4),
+            "derived": {
+                "literal_pool_bytes_ratio": rng.random(),
+                "op_table_unique_ratio": rng.random(),
+            },
+        }
+        rows.append({"label": rng.choice(["apply_gated", "control", "unknown"]), "features": feats})
+    return rows
+
+
+def _brute(cand, row):
+    feats = row.get("features")
+    if not isinstance(feats, dict):
+        return False
+    present = set(feats["tags_present"])
+    kind = cand["kind"]
+    if kind == "tag_present":
+        return cand["tag"] in present
+    if kind == "tag_or":
+        return any(t in present for t in cand["tags"])
+    if kind == "tag_and":
+        return all(t in present for t in cand["tags"])
+    if kind == "tags_present_count_eq":
+        return feats["tags_present_count"] == cand["n"]
+    if kind == "node_count_eq_op_count":
+        return feats["node_count"] == feats["op_count"]
+    if kind == "literal_pool_bytes_ratio_ge":
+        return feats["derived"]["literal_pool_bytes_ratio"] >= cand["threshold"]
+    if kind == "op_table_unique_ratio_le":
+        return feats["derived"]["op_table_unique_ratio"] <= cand["threshold"]
+    raise AssertionError(kind)
+
+
+def test_feature_matrix_masks_match_row_predicates(experiment_path):
+    fb = load("preflight_feature_bitsets", "feature_bitsets.py")
+    rng = random.Random(7)
+    rows = _random_rows(rng, 300)
+    matrix = fb.FeatureMatrix(rows)
+    cands = [
+        {"kind": "node_count_eq_op_count"},
+        {"kind": "tags_present_count_eq", "n": 3},
+        {"kind": "literal_pool_bytes_ratio_ge", "threshold": 0.25},
+        {"kind": "op_table_unique_ratio_le", "threshold": 0.5},
+        {"kind": "tag_present", "tag": 4},
+        {"kind": "tag_or", "tags": [1, 5, 9]},
+        {"kind": "tag_and", "tags": [2, 3]},
+        {"kind": "tag_and", "tags": []},
+    ]
+    for cand in cands:
+        expected = [i for i, row in enumerate(rows) if _brute(cand, row)]
+        assert list(fb.iter_bits(matrix.mask_for(cand))) == expected, cand
+
+    tags = list(range(12))
+    for conjunctive, kind in ((False, "tag_or"), (True, "tag_and")):
+        seen = {}
+        for combo, mask in fb.iter_tag_combinations(matrix, tags, [2, 4], conjunctive=conjunctive):
+            seen[combo] = mask
+            assert mask == matrix.mask_for({"kind": kind, "tags": list(combo)})
+        expected = set(itertools.combinations(tags, 2)) | set(itertools.combinations(tags, 4))
+        assert set(seen) == expected
+
+
+def test_derive_regenerates_checked_in_candidates(experiment_path, tmp_path: Path):
+    derive = load("preflight_derive_signature_candidates", "derive_signature_candidates.py")
+    out = tmp_path / "candidates.json"
+    assert derive.main(["--out", str(out)]) == 0
+    assert out.read_text() == (EXPERIMENT / "out" / "structural_signature_candidates.json").read_text()
+
+    wide = tmp_path / "wide.json"
+    assert derive.main(["--out", str(wide), "--or-sizes", "2,3,4", "--and-sizes", "2,3", "--max-candidates", "5"]) == 0
+
+    doc = json.loads(wide.read_text())
+    assert doc["metrics"]["candidates_emitted"] == 5
+    assert len(doc["candidates"]) == 5
+    assert doc["metrics"]["candidates"] > 189
@@ -0,0 +1,91 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from book.api.profile_tools import bench as pb
+from book.api.profile_tools import cli
+from book.api.profile_tools import ingestion as pi
+
+ROOT = Path(__file__).resolve().parents[2]
+AIRLOCK = ROOT / "book" / "graph" / "concepts" / "validation" / "fixtures" / "blobs" / "airlock.sb.bin"
+
+
+@pytest.fixture
+def benchmark():
+    # Single-round stand-in with the pytest-benchmark calling shape.
+    return pb.Benchmark(min_time=0.0, min_rounds=1, warmup=0)
+
+
+@pytest.fixture(scope="module")
+def corpora(tmp_path_factory):
+    return pb.bench_corpora(ROOT, tmp_path_factory.mktemp("bench"), scales=(4,))
+
+
+def test_scale_blob_repeats_node_region():
+    data = AIRLOCK.read_bytes()
+    scaled = pb.scale_blob(data, 4)
+    base, view = pi.ProfileView(data), pi.ProfileView(scaled)
+    assert len(scaled) == len(data) + 3 * len(base.nodes)
+    assert bytes(view.op_table) == bytes(base.op_table)
+    assert bytes(view.nodes) == bytes(base.nodes) * 4
+    assert bytes(view.regex_literals) == bytes(base.regex_literals)
+
+
+def test_corpora_cover_canonical_golden_and_synthetic(corpora):
+    assert set(corpora["canonical"]) == {"airlock", "bsd", "sample"}
+    assert corpora["golden"]
+    assert set(corpora) == {"canonical", "golden", "synthetic-x4"}
+
+
+@pytest.mark.parametrize("target", pb.TARGETS)
+def test_every_target_runs_over_every_corpus(benchmark, corpora, target):
+    for case in pb.build_cases(corpora, root=ROOT, targets=[target]):
+        result = benchmark(case.func)
+        assert len(result) == case.blobs
+        stats = benchmark.stats
+        assert stats["rounds"] == 1
+        assert stats["ops_per_sec"] > 0
+        assert stats["alloc_peak_bytes"] > 0
+        assert stats["peak_rss_bytes"] > 0
+
+
+def test_isolated_case_reports_child_measurements(corpora):
+    case = pb.build_cases({"canonical": corpora["canonical"]}, root=ROOT, targets=["slice_sections_with_offsets"])[0]
+    row = pb.measure_isolated(case, pb.Benchmark(min_time=0.0, min_rounds=1, warmup=0))
+    assert row["target"] == "slice_sections_with_offsets"
+    assert row["corpus"] == "canonical"
+    assert row["rounds"] == 1
+
+
+def test_compare_flags_regressions_beyond_threshold():
+    baseline = {"cases": {"a": {"ops_per_sec": 100.0, "alloc_peak_bytes": 1000}, "gone": {"ops_per_sec": 1.0}}}
+    current = {"cases": {"a": {"ops_per_sec": 70.0, "alloc_peak_bytes": 500}, "added": {"ops_per_sec": 1.0}}}
+    report = pb.compare_results(baseline, current, threshold=0.25)
+    assert [(r["case"], r["metric"]) for r in report["regressions"]] == [("a", "ops_per_sec")]
+    assert [(r["case"], r["metric"]) for r in report["improvements"]] == [("a", "alloc_peak_bytes")]
+    assert report["missing"] == ["gone"]
+    assert report["new"] == ["added"]
+    assert not pb.compare_results(baseline, current, threshold=0.6)["regressions"]
+
+
+def test_cli_run_then_compare(tmp_path, capsys):
+    out = tmp_path / "baseline.json"
+    args = ["--quick", "--min-time", "0", "--no-golden", "--scale", "2", "--filter", "slice_sections", "--no-isolate"]
+    assert cli.main(["bench", "run", *args, "--out", str(out)]) == 0
+    doc = json.loads(out.read_text())
+    assert doc["schema_version"] == pb.SCHEMA_VERSION
+    assert set(doc["cases"]) == {
+        "slice_sections_with_offsets[canonical]",
+        "slice_sections_with_offsets[synthetic-x2]",
+    }
+
+    assert cli.main(["bench", "compare", str(out), "--current", str(out)]) == 0
+
+    slower = json.loads(out.read_text())
+    for row in slower["cases"].values():
+        row["ops_per_sec"] /= 2
+    slow_path = tmp_path / "slower.json"
+    slow_path.write_text(json.dumps(slower))
+    assert cli.main(["bench", "compare", str(out), "--current", str(slow_path)]) == 1
+    assert "[!] slice_sections_with_offsets[canonical] ops_per_sec" in capsys.readouterr().err
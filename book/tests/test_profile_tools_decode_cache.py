@@ -0,0 +1,82 @@
+import json
+import os
+from dataclasses import replace
+from pathlib import Path
+
+from book.api.profile_tools import cli
+from book.api.profile_tools import decode_cache
+from book.api.profile_tools import decoder
+from book.api.profile_tools import digests as digests_mod
+from book.api.profile_tools import mapping_context as mc
+
+
+ROOT = Path(__file__).resolve().parents[2]
+BLOBS = list(digests_mod.canonical_system_profile_blobs(ROOT).values())
+
+
+def test_cached_decode_matches_direct_decode(tmp_path):
+    cache = decode_cache.DecodeCache(root=tmp_path)
+    for path in BLOBS:
+        data = path.read_bytes()
+        direct = decoder.decode_profile_dict(data)
+        assert cache.decode_profile_dict(data) == direct
+        assert cache.decode_profile_dict(data) == direct
+    assert cache.misses == len(BLOBS)
+    assert cache.hits == len(BLOBS)
+    assert cache.stats()["entries"] == len(BLOBS)
+
+
+def test_cache_key_tracks_options_and_mappings(tmp_path):
+    cache = decode_cache.DecodeCache(root=tmp_path)
+    data = BLOBS[0].read_bytes()
+    ctx = mc.load_mapping_context(ROOT)
+    base = cache.key(data, mappings=ctx)
+    assert cache.key(data, mappings=ctx) == base
+    assert cache.key(data, node_stride_bytes=8, mappings=ctx) != base
+    assert cache.key(data, include_nodes=False, mappings=ctx) != base
+    edited = replace(ctx, sha256={**ctx.sha256, "filter_vocab": "0" * 64})
+    assert cache.key(data, mappings=edited) != base
+    assert cache.key(data + b"\x00", mappings=ctx) != base
+
+
+def test_cache_evicts_least_recently_used(tmp_path, monkeypatch):
+    cache = decode_cache.DecodeCache(root=tmp_path, max_bytes=1 << 30)
+    scans = []
+    entries = cache._entries
+    monkeypatch.setattr(cache, "_entries", lambda: scans.append(1) or entries())
+    keys = []
+    for path in BLOBS:
+        data = path.read_bytes()
+        cache.decode_profile_dict(data)
+        keys.append(cache.key(data))
+    assert len(scans) == 1  # seeded once; later writes track a running total
+    # Explicit, well-separated mtimes (oldest first) so ordering does not
+    # depend on filesystem timestamp granularity.
+    for i, key in enumerate(keys):
+        os.utime(cache._path(key), (1_000_000 + i, 1_000_000 + i))
+    # Touch the first entry so the second becomes the oldest.
+    assert cache.get(keys[0]) is not None
+    sizes = {p.stem: size for _mtime, size, p in entries()}
+    cache.max_bytes = sum(sizes.values()) - 1
+    assert cache.evict() == 1
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[-1]) is not None
+
+
+def test_cache_cli_stats_and_clear(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv(decode_cache.CACHE_ENV, str(tmp_path))
+    decode_cache.decode_profile_dict(BLOBS[0].read_bytes())
+    assert cli.main(["cache", "stats"]) == 0
+    stats = json.loads(capsys.readouterr().out)
+    assert stats["entries"] == 1
+    assert cli.main(["cache", "clear"]) == 0
+    assert "removed 1" in capsys.readouterr().out
+    assert decode_cache.default_decode_cache().stats()["entries"] == 0
+
+
+def test_cache_disabled_falls_back_to_direct_decode(monkeypatch):
+    monkeypatch.setenv(decode_cache.CACHE_ENV, "off")
+    assert decode_cache.default_decode_cache() is None
+    data = BLOBS[0].read_bytes()
+    assert decode_cache.decode_profile_dict(data) == decoder.decode_profile_dict(data)
@@ -0,0 +1,59 @@
+import json
+import os
+from pathlib import Path
+
+from book.api.profile_tools import decoder
+from book.api.profile_tools import digests as digests_mod
+from book.api.profile_tools import mapping_context as mc
+
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _write_mappings(root: Path, role: str) -> None:
+    layouts = root / mc.TAG_LAYOUT_CANDIDATES[0]
+    layouts.parent.mkdir(parents=True, exist_ok=True)
+    layouts.write_text(
+        json.dumps({"tags": [{"tag": 0, "record_size_bytes": 8, "edge_fields": [0, 1], "payload_fields": [2]}]})
+    )
+    (root / mc.TAG_U16_ROLES_PATH).write_text(json.dumps({"roles": [{"tag": 0, "u16_role": role}]}))
+    vocab = root / mc.FILTER_VOCAB_PATH
+    vocab.parent.mkdir(parents=True, exist_ok=True)
+    vocab.write_text(json.dumps({"filters": [{"id": 1, "name": "path"}]}))
+
+
+def test_load_mapping_context_reads_published_tables():
+    ctx = mc.load_mapping_context(ROOT)
+    assert ctx.tag_layouts and ctx.tag_u16_roles and ctx.filter_vocab
+    assert ctx.sources["tag_layouts"] == mc.TAG_LAYOUT_CANDIDATES[0]
+    assert all(ctx.sha256[name] for name in ("tag_layouts", "tag_u16_roles", "filter_vocab"))
+
+
+def test_default_context_is_shared_and_reloads_on_edit(tmp_path, monkeypatch):
+    _write_mappings(tmp_path, "filter_vocab_id")
+    monkeypatch.setattr(mc, "find_repo_root", lambda *_args, **_kw: tmp_path)
+    mc.clear_default_mapping_context()
+    try:
+        first = mc.default_mapping_context()
+        assert mc.default_mapping_context() is first
+        assert first.tag_u16_roles == {0: "filter_vocab_id"}
+
+        roles = tmp_path / mc.TAG_U16_ROLES_PATH
+        _write_mappings(tmp_path, "arg_u16")
+        st = roles.stat()
+        os.utime(roles, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        second = mc.default_mapping_context()
+        assert second is not first
+        assert second.tag_u16_roles == {0: "arg_u16"}
+        assert second.fingerprint() != first.fingerprint()
+    finally:
+        mc.clear_default_mapping_context()
+
+
+def test_explicit_context_matches_default_decode():
+    ctx = mc.load_mapping_context(ROOT)
+    for path in digests_mod.canonical_system_profile_blobs(ROOT).values():
+        data = path.read_bytes()
+        assert decoder.decode_profile_dict(data, mappings=ctx) == decoder.decode_profile_dict(data)
+    blobs = digests_mod.canonical_system_profile_blobs(ROOT)
+    assert digests_mod.digest_named_blobs(blobs, mappings=ctx) == digests_mod.digest_named_blobs(blobs)
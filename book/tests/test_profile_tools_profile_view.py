@@ -0,0 +1,72 @@
+from pathlib import Path
+
+import pytest
+
+from book.api.profile_tools import ingestion as pi
+
+ROOT = Path(__file__).resolve().parents[2]
+BLOBS = [
+    ROOT / "book" / "graph" / "concepts" / "validation" / "fixtures" / "blobs" / name
+    for name in ("airlock.sb.bin", "bsd.sb.bin", "sample.sb.bin")
+] + [ROOT / "book" / "experiments" / "sbpl-graph-runtime" / "out" / "allow_all.sb.bin"]
+
+
+def _reference_find_literal_start(buf: bytes, start: int) -> int:
+    # The original per-offset scan (quadratic window sums), minus the Mach-O probe.
+    for i in range(start, len(buf) - 4):
+        j = i
+        while j < len(buf) and buf[j] != 0x00 and buf[j] in pi.PRINTABLE:
+            j += 1
+        if j - i >= 4:
+            return i
+    for i in range(start, len(buf)):
+        chunk = buf[i : min(len(buf), i + 64)]
+        if chunk and sum(1 for b in chunk if b == 0x00 or b in pi.PRINTABLE) / len(chunk) >= 0.7:
+            return i
+    return len(buf)
+
+
+@pytest.mark.parametrize("path", BLOBS, ids=lambda p: p.name)
+def test_profile_view_matches_slice_sections(path):
+    data = path.read_bytes()
+    profile = pi.ProfileBlob(bytes=data, source=path.name)
+    header = pi.parse_header(profile)
+    sections, offsets = pi.slice_sections_with_offsets(profile, header)
+
+    view = pi.ProfileView(data, path.name)
+    assert view.header == header
+    assert view.offsets == offsets
+    assert bytes(view.op_table) == sections.op_table
+    assert bytes(view.nodes) == sections.nodes
+    assert bytes(view.regex_literals) == sections.regex_literals
+    assert view.literal_start == _reference_find_literal_start(data, view.literal_lower_bound)
+
+
+def test_op_table_access_skips_literal_scan(monkeypatch):
+    data = BLOBS[0].read_bytes()
+    monkeypatch.setattr(pi, "find_literal_start", lambda *_a, **_k: pytest.fail("literal scan ran"))
+    view = pi.ProfileView(data, "lazy")
+    assert view.header.operation_count
+    assert len(view.op_entries()) == view.header.operation_count
+    assert view.nodes_start == view.op_table_end
+
+
+def test_operation_count_override_applies_to_modern_blobs():
+    data = BLOBS[0].read_bytes()
+    view = pi.ProfileView(data, "override", operation_count=4)
+    assert view.header.operation_count == 4
+    assert len(view.op_table) == 8
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_literal_scan_matches_reference_on_low_printable_buffers(seed):
+    import random
+
+    rng = random.Random(seed)
+    for _ in range(200):
+        buf = bytearray(rng.choice(b"\x00\x00\xffA\n\x80") for _ in range(rng.randint(0, 200)))
+        for i in range(3, len(buf), 4):
+            buf[i] = 0xFF  # break printable runs so the ratio fallback is exercised
+        buf = bytes(buf)
+        start = rng.randint(0, len(buf) + 2)
+        assert pi.find_literal_start(buf, start) == _reference_find_literal_start(buf, start)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from book.api.runtime_tools.artifacts import digests
+from book.api.runtime_tools.artifacts.reader import load_bundle_index_strict, open_bundle_unverified
+from book.api.runtime_tools.artifacts.writer import write_artifact_index
+
+
+def _bundle(tmp_path: Path) -> Path:
+    out_dir = tmp_path / "bundle"
+    out_dir.mkdir()
+    (out_dir / "a.json").write_text(json.dumps({"schema_version": "a.v1"}))
+    (out_dir / "big.log").write_bytes(os.urandom(3 * 1024 * 1024))
+    (out_dir / "empty.txt").write_bytes(b"")
+    write_artifact_index(
+        out_dir,
+        run_id="run-1",
+        world_id="world",
+        schema_version="index.v1",
+        expected_artifacts=["a.json", "big.log", "empty.txt", "absent.json"],
+        repo_root=tmp_path,
+    )
+    return out_dir
+
+
+def test_sha256_paths_matches_hashlib(tmp_path):
+    paths = []
+    for i, size in enumerate([0, 1, 4096, 2 * 1024 * 1024 + 7]):
+        path = tmp_path / f"f{i}"
+        path.write_bytes(os.urandom(size))
+        paths.append(path)
+    result = digests.sha256_paths(paths)
+    assert result == {p: hashlib.sha256(p.read_bytes()).hexdigest() for p in paths}
+
+
+def test_strict_load_reports_first_failure_in_index_order(tmp_path):
+    out_dir = _bundle(tmp_path)
+    index = load_bundle_index_strict(out_dir, repo_root=tmp_path)
+    assert [e["path"] for e in index["artifacts"]] == ["bundle/a.json", "bundle/big.log", "bundle/empty.txt"]
+    assert index["missing"] == ["bundle/absent.json"]
+
+    (out_dir / "a.json").write_text("tampered")
+    (out_dir / "empty.txt").unlink()
+    with pytest.raises(ValueError, match="a.json"):
+        load_bundle_index_strict(out_dir, repo_root=tmp_path)
+
+    report = open_bundle_unverified(out_dir, repo_root=tmp_path)
+    assert report["digest_mismatches"] == ["bundle/a.json"]
+    assert report["missing"] == ["bundle/empty.txt"]
+
+
+def test_sidecar_skips_rehash_but_not_verification(tmp_path, monkeypatch):
+    sidecar_path = tmp_path / "sidecar.json"
+    monkeypatch.setenv(digests.SIDECAR_ENV, str(sidecar_path))
+    out_dir = _bundle(tmp_path)
+    assert sidecar_path.exists()
+
+    calls = []
+    real = digests.sha256_path
+    monkeypatch.setattr(digests, "sha256_path", lambda p: calls.append(p) or real(p))
+    load_bundle_index_strict(out_dir, repo_root=tmp_path)
+    assert calls == []
+
+    # A tampered index is still rejected from the cached digest.
+    index_path = out_dir / "artifact_index.json"
+    doc = json.loads(index_path.read_text())
+    doc["artifacts"][1]["sha256"] = "0" * 64
+    index_path.write_text(json.dumps(doc))
+    with pytest.raises(ValueError, match="big.log"):
+        load_bundle_index_strict(out_dir, repo_root=tmp_path)
+
+    # A rewritten artifact changes its stat key and is rehashed.
+    (out_dir / "a.json").write_text(json.dumps({"schema_version": "a.v2", "pad": True}))
+    with pytest.raises(ValueError, match="a.json"):
+        load_bundle_index_strict(out_dir, repo_root=tmp_path)
+    assert out_dir / "a.json" in calls
@@ -0,0 +1,106 @@
+"""
+Component tests for concurrent probe execution in the harness runner.
+
+Probes run through `harness/fake_sandbox_runner.py`, which mirrors the
+sandbox_runner CLI without applying any policy, so these run on any host.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from book.api.runtime_tools.harness import runner
+
+FAKE_RUNNER = Path(runner.__file__).with_name("fake_sandbox_runner.py")
+
+
+@pytest.fixture
+def fake_harness(tmp_path, monkeypatch):
+    missing = tmp_path / "missing-tool"
+    monkeypatch.setattr(runner, "RUNNER", FAKE_RUNNER)
+    for name in ("WRAPPER", "READER", "WRITER", "MACH_PROBE", "FILE_PROBE"):
+        monkeypatch.setattr(runner, name, missing)
+    monkeypatch.setenv("SANDBOX_LORE_PREFLIGHT", "0")
+    monkeypatch.setenv("SANDBOX_LORE_FAKE_RUNNER_DENY", "deny-me")
+    log = tmp_path / "fake_runner.log"
+    monkeypatch.setenv("SANDBOX_LORE_FAKE_RUNNER_LOG", str(log))
+    return log
+
+
+def _matrix(tmp_path: Path, **extra) -> Path:
+    profile = tmp_path / "allow.sb"
+    profile.write_text("(version 1)\n(allow default)\n")
+    data = tmp_path / "data"
+    data.mkdir(exist_ok=True)
+    (data / "ok.txt").write_text("ok\n")
+    (data / "deny-me.txt").write_text("no\n")
+    (data / "fx-a").write_text("a\n")
+    (data / "fx-b").write_text("b\n")
+    profiles = {}
+    for p in range(2):
+        probes = [
+            {"name": "read-ok", "operation": "file-read*", "target": str(data / "ok.txt"), "expected": "allow"},
+            {"name": "read-deny", "operation": "file-read*", "target": str(data / "deny-me.txt"), "expected": "deny"},
+            {"name": "lookup", "operation": "mach-lookup", "target": "com.apple.x", "expected": "allow"},
+            {"name": "fixture-a", "operation": "file-read*", "target": str(data / "fx-a"), "expected": "allow", "serial_group": "fx"},
+            {"name": "fixture-b", "operation": "file-read*", "target": str(data / "fx-b"), "expected": "allow", "serial_group": "fx"},
+        ]
+        profiles[f"fake:{p}"] = {"blob": str(profile), "mode": "sbpl", "probes": probes}
+    matrix_path = tmp_path / "expected_matrix.json"
+    matrix_path.write_text(json.dumps({"world_id": "test", "profiles": profiles, **extra}))
+    return matrix_path
+
+
+def _intervals(log: Path):
+    events = [json.loads(line) for line in log.read_text().splitlines()]
+    starts = {e["pid"]: e for e in events if e["event"] == "start"}
+    ends = {e["pid"]: e for e in events if e["event"] == "end"}
+    return [(starts[pid]["t"], ends[pid]["t"], starts[pid]["argv"]) for pid in starts]
+
+
+def _max_overlap(intervals) -> int:
+    points = sorted([(s, 1) for s, _e, _a in intervals] + [(e, -1) for _s, e, _a in intervals])
+    live = peak = 0
+    for _t, delta in points:
+        live += delta
+        peak = max(peak, live)
+    return peak
+
+
+def test_parallel_results_match_serial_order(tmp_path, fake_harness):
+    matrix_path = _matrix(tmp_path)
+    profiles = tmp_path / "runtime_profiles"
+    serial_path = runner.run_matrix(matrix_path, out_dir=tmp_path / "serial", runtime_profile_dir=profiles)
+    parallel_path = runner.run_matrix(
+        matrix_path, out_dir=tmp_path / "parallel", runtime_profile_dir=profiles, parallel=4
+    )
+    serial = json.loads(serial_path.read_text())
+    parallel = json.loads(parallel_path.read_text())
+
+    assert list(parallel) == ["fake:0", "fake:1"]
+    assert parallel == serial
+    probes = parallel["fake:0"]["probes"]
+    assert [p["name"] for p in probes] == ["read-ok", "read-deny", "lookup", "fixture-a", "fixture-b"]
+    assert [p["actual"] for p in probes] == ["allow", "deny", "allow", "allow", "allow"]
+    assert parallel["fake:0"]["status"] == "ok"
+
+
+def test_parallel_overlaps_probes_but_keeps_serial_groups_ordered(tmp_path, fake_harness, monkeypatch):
+    monkeypatch.setenv("SANDBOX_LORE_FAKE_RUNNER_DELAY", "0.2")
+    runner.run_matrix(_matrix(tmp_path), out_dir=tmp_path / "out", parallel=4)
+    intervals = _intervals(fake_harness)
+    assert len(intervals) == 10
+    assert _max_overlap(intervals) > 1
+
+    grouped = sorted((s, e, Path(a[-1]).name) for s, e, a in intervals if Path(a[-1]).name.startswith("fx-"))
+    assert [target for _s, _e, target in grouped] == ["fx-a", "fx-b", "fx-a", "fx-b"]
+    assert all(prev[1] <= nxt[0] for prev, nxt in zip(grouped, grouped[1:]))
+
+
+def test_matrix_can_force_serial_execution(tmp_path, fake_harness, monkeypatch):
+    monkeypatch.setenv("SANDBOX_LORE_FAKE_RUNNER_DELAY", "0.05")
+    runner.run_matrix(_matrix(tmp_path, serialize_probes=True), out_dir=tmp_path / "out", parallel=4)
+    assert _max_overlap(_intervals(fake_harness)) == 1
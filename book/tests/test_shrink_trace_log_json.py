@@ -0,0 +1,119 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+SCRIPTS = ROOT / "book" / "experiments" / "shrink-trace" / "scripts"
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+import log_json  # noqa: E402
+
+
+def _event(ts, message, pid=0):
+    return {"timestamp": ts, "eventMessage": message, "processID": pid, "processImagePath": "/kernel"}
+
+
+def _capture(events, *, banner=True):
+    body = ",".join(json.dumps(e, indent=2) for e in events)
+    head = 'Filtering the log data using "sender == \\"Sandbox\\""\n' if banner else ""
+    return head + "[" + body + "\n]\n"
+
+
+EVENTS = [
+    _event("2026-01-01 10:00:00.000000-0800", "Sandbox: cat(101) deny(1) file-read-data /etc/hosts"),
+    _event("2026-01-01 10:00:01.000000-0800", 'Sandbox: sh(202) deny(1) file-write-create /tmp/a "quoted"\nnext'),
+    _event("2026-01-01 10:00:02.000000-0800", "Sandbox: cat(101) allow(0) file-read-metadata /"),
+]
+
+
+def test_sandbox_events_are_typed(tmp_path):
+    path = tmp_path / "log.json"
+    path.write_text(_capture(EVENTS))
+    events = list(log_json.iter_sandbox_events(path))
+    assert [(e.pid, e.process, e.operation) for e in events] == [
+        (101, "cat", "file-read-data"),
+        (202, "sh", "file-write-create"),
+        (101, "cat", "file-read-metadata"),
+    ]
+    assert events[0].target == "/etc/hosts"
+    assert events[1].target == '/tmp/a "quoted"\nnext'
+    assert [e.is_deny for e in events] == [True, True, False]
+
+
+def test_pid_and_window_filters(tmp_path):
+    path = tmp_path / "log.json"
+    path.write_text(_capture(EVENTS))
+    assert [e.pid for e in log_json.iter_sandbox_events(path, pid=101)] == [101, 101]
+    window = log_json.iter_sandbox_events(
+        path, since="2026-01-01 10:00:00.000000-0800", until="2026-01-01 18:00:01.000000+0000"
+    )
+    assert [e.pid for e in window] == [202]
+
+
+def test_truncated_tail_and_small_chunks(tmp_path):
+    path = tmp_path / "log.json"
+    text = _capture(EVENTS, banner=False)
+    path.write_text(text[: text.rindex("{") + 20])
+    with path.open("rb") as fh:
+        seen = list(log_json.iter_events(fh, chunk_size=7))
+    assert [e["eventMessage"] for e, _ in seen] == [e["eventMessage"] for e in EVENTS[:2]]
+    assert path.read_bytes()[seen[-1][1] - 1 : seen[-1][1]] == b"}"
+
+
+def test_offsets_with_multibyte_text_and_malformed_element(tmp_path):
+    path = tmp_path / "log.json"
+    events = [_event("2026-01-01 10:00:00.000000-0800", "Sandbox: caf\u00e9(7) deny(1) file-read-data /t\u00e9st")] + EVENTS
+    path.write_text(_capture(events).replace("\\u00e9", "\u00e9"), encoding="utf-8")
+    data = path.read_bytes()
+    with path.open("rb") as fh:
+        seen = list(log_json.iter_events(fh, chunk_size=5))
+    assert len(seen) == 4
+    for event, end in seen:
+        assert data[:end].endswith(b"}")
+        with path.open("rb") as fh:
+            resumed = list(log_json.iter_events(fh, start=end))
+        assert len(resumed) == len(seen) - seen.index((event, end)) - 1
+
+    bad = _capture(EVENTS).replace('"processID": 0,', '"processID": 0 oops,', 1)
+    path.write_text(bad)
+    with path.open("rb") as fh:
+        with pytest.raises(ValueError, match="malformed log event at byte"):
+            list(log_json.iter_events(fh, chunk_size=7))
+
+
+def test_checkpoint_resumes_by_offset_then_timestamp(tmp_path):
+    path = tmp_path / "log.json"
+    ckpt_path = tmp_path / "ckpt.json"
+    text = _capture(EVENTS[:1])
+    path.write_text(text[: text.rindex("]")])  # live capture, array not closed yet
+    ckpt = log_json.Checkpoint(ckpt_path)
+    assert [e.pid for e in log_json.iter_sandbox_events(path, checkpoint=ckpt)] == [101]
+    ckpt.save()
+
+    with path.open("a") as fh:
+        fh.write("," + json.dumps(EVENTS[1]))
+    ckpt = log_json.Checkpoint(ckpt_path)
+    assert ckpt.offset > 0
+    assert [e.pid for e in log_json.iter_sandbox_events(path, checkpoint=ckpt)] == [202]
+    ckpt.save()
+
+    fresh = tmp_path / "log_show.json"
+    fresh.write_text(_capture(EVENTS))
+    ckpt = log_json.Checkpoint(ckpt_path)
+    assert [e.operation for e in log_json.iter_sandbox_events(fresh, checkpoint=ckpt)] == ["file-read-metadata"]
+
+
+def test_extract_denies_cli(tmp_path):
+    path = tmp_path / "log.json"
+    path.write_text(_capture(EVENTS))
+    ckpt = tmp_path / "ckpt.json"
+    cmd = [sys.executable, str(SCRIPTS / "extract_denies.py"), str(path), "202", "--checkpoint", str(ckpt)]
+    out = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+    assert out.splitlines() == ['Sandbox: sh(202) deny(1) file-write-create /tmp/a "quoted" next']
+    assert json.loads(ckpt.read_text())["last_timestamp"] == EVENTS[2]["timestamp"]
+    again = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+    assert again == ""
@@ -0,0 +1,129 @@
+import os
+import sys
+from pathlib import Path
+
+from book.tests import impact
+
+
+def _record(hashes, files=(), dirs=(), **extra):
+    record = {
+        "files": {f: hashes.file(f) for f in files},
+        "dirs": {d: hashes.listing(d) for d in dirs},
+        "writes": [],
+        "spawned": [],
+        "failures": [],
+    }
+    record.update(extra)
+    return record
+
+
+def _state(tmp_path: Path, **modules):
+    (tmp_path / "harness.py").write_text("h")
+    hashes = impact.HashCache(root=tmp_path)
+    return {
+        "schema": impact.STATE_SCHEMA,
+        "harness": {"harness.py": hashes.file("harness.py")},
+        "modules": {name: build(hashes) for name, build in modules.items()},
+        "hashes": hashes.entries,
+    }
+
+
+def _select(tmp_path: Path, state, **kwargs):
+    return impact.select(sorted(state["modules"]) + ["new"], state, impact.HashCache(state["hashes"], root=tmp_path), **kwargs)
+
+
+def test_selection_follows_content_not_mtime(tmp_path: Path):
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "a.json").write_text("{}")
+    (tmp_path / "mod.py").write_text("x = 1\n")
+    state = _state(
+        tmp_path,
+        reads_mod=lambda h: _record(h, files=["mod.py"]),
+        lists_data=lambda h: _record(h, dirs=["data"]),
+        failed=lambda h: _record(h, failures=["test_x"]),
+        shells_out=lambda h: _record(h, spawned=["python3"]),
+        needs_fixture=lambda h: _record(h, missing=["data/fixture.json"]),
+    )
+
+    selected, skipped = _select(tmp_path, state)
+    assert sorted(selected) == ["failed", "new", "shells_out"]
+    assert skipped == ["lists_data", "needs_fixture", "reads_mod"]
+
+    st = (tmp_path / "mod.py").stat()
+    os.utime(tmp_path / "mod.py", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    (tmp_path / "data" / "a.json").write_text('{"changed": true}')
+    selected, _ = _select(tmp_path, state)
+    assert "reads_mod" not in selected and "lists_data" not in selected
+
+    (tmp_path / "mod.py").write_text("x = 2\n")
+    (tmp_path / "data" / "b.json").write_text("{}")
+    selected, _ = _select(tmp_path, state)
+    assert selected["reads_mod"] == ["files changed: mod.py"]
+    assert selected["lists_data"] == ["directory entries changed: data"]
+    assert "needs_fixture" not in selected
+
+    (tmp_path / "data" / "fixture.json").write_text("{}")
+    selected, _ = _select(tmp_path, state)
+    assert selected["needs_fixture"] == ["missing paths now exist: data/fixture.json"]
+
+    (tmp_path / "harness.py").write_text("h2")
+    selected, skipped = _select(tmp_path, state)
+    assert skipped == [] and selected["reads_mod"] == ["harness changed: harness.py"]
+    assert _select(tmp_path, state, run_all=True)[1] == []
+
+
+def test_tracer_classifies_repo_reads_writes_and_listings():
+    tracer = impact._Tracer()
+    root = impact.ROOT
+    pyc = root / "book" / "tests" / "__pycache__" / f"run_all.{sys.implementation.cache_tag}.pyc"
+    tracer("open", (str(root / "book" / "tests" / "README.md"), "r", 0))
+    tracer("open", (str(pyc), "rb", 0))
+    tracer("open", (str(root / "book" / "api" / "x.json"), "w", 0))
+    tracer("open", (str(root / "book" / "out" / "scratch.json"), "r", 0))
+    tracer("open", ("/tmp/elsewhere.json", "r", 0))
+    tracer("open", (str(root / "book" / "api" / "y.bin"), None, os.O_RDONLY))
+    tracer("os.scandir", (str(root / "book" / "api"),))
+    tracer("subprocess.Popen", ("python3", ["python3", "-c", "pass"], None, None))
+    assert set(tracer.files) == {"book/tests/README.md", "book/tests/run_all.py"}
+    assert tracer.files["book/tests/README.md"] == impact.HashCache().file("book/tests/README.md")
+    assert tracer.missing == {"book/api/y.bin"}
+    assert tracer.writes == {"book/api/x.json"}
+    assert tracer.dirs == {"book/api": impact.HashCache().listing("book/api")}
+    assert tracer.spawned == ["python3"]
+    tracer.lookup_failed(root / "book" / "api" / "absent.json")
+    tracer.lookup_failed("/tmp/absent.json")
+    assert tracer.missing == {"book/api/y.bin", "book/api/absent.json"}
+    assert impact._runs_exclusive(None)
+    assert not impact._runs_exclusive({"writes": [], "spawned": []})
+
+
+def test_records_keep_read_time_digests_when_a_later_module_rewrites(tmp_path: Path, monkeypatch):
+    shared = tmp_path / "shared.json"
+    shared.write_text("{}")
+    seen = impact._sha256(shared)
+    state_path = tmp_path / "impact.json"
+
+    def result(files=None, writes=()):
+        return {"ran": 1, "failures": [], "files": files or {}, "entries": {}, "dirs": {}, "missing": [],
+                "writes": list(writes), "spawned": [], "wall_time_s": 0.0}
+
+    def execute(modules, jobs):
+        for mod in modules:
+            if mod == "writer":
+                shared.write_text('{"rewritten": true}')
+                yield mod, result(writes=["shared.json"])
+            else:
+                yield mod, result(files={"shared.json": seen})
+
+    monkeypatch.setattr(impact, "ROOT", tmp_path)
+    monkeypatch.setattr(impact, "_execute", execute)
+    state = impact.load_state(state_path)
+    state["modules"]["writer"] = {"files": {}, "dirs": {}, "writes": ["shared.json"], "spawned": [], "failures": []}
+    impact.write_state(state, state_path)
+    impact.run(["reader", "writer"], run_all=True, state_path=state_path)
+
+    state = impact.load_state(state_path)
+    assert state["modules"]["reader"]["files"] == {"shared.json": seen}
+    selected, skipped = impact.select(["reader", "writer"], state, impact.HashCache(state["hashes"]))
+    assert selected == {"reader": ["files changed: shared.json (written by writer)"]}
+    assert skipped == ["writer"]
@@ -0,0 +1,107 @@
+from pathlib import Path
+
+from book.graph.concepts.validation import registry
+from book.graph.concepts.validation import __main__ as driver
+
+
+def _job(job_id, inputs, outputs, calls, payload="ok"):
+    out = Path(outputs[0]) if outputs else None
+
+    def run():
+        calls.append(job_id)
+        if out is not None:
+            out.write_text(payload)
+        return {"status": "ok"}
+
+    return registry.ValidationJob(id=job_id, runner=run, inputs=list(inputs), outputs=list(outputs))
+
+
+def test_fingerprint_tracks_inputs_and_code(tmp_path):
+    src = tmp_path / "in"
+    src.mkdir()
+    (src / "nested").mkdir()
+    leaf = src / "nested" / "a.txt"
+    leaf.write_text("one")
+    job = _job("fp", [str(src)], [], [])
+
+    first = job.fingerprint()
+    assert job.fingerprint() == first
+    leaf.write_text("two-two")
+    assert job.fingerprint() != first
+
+    code = job.code_paths()
+    assert Path(__file__).resolve() in {p.resolve() for p in code}
+    assert Path(registry.__file__).resolve() in {p.resolve() for p in code}
+
+
+def _records(jobs, prev=None, incremental=True):
+    records = driver.run_jobs(jobs, False, {}, prev or {}, incremental=incremental)
+    return {r["job_id"]: r for r in records}
+
+
+def test_unchanged_jobs_reuse_previous_record(tmp_path):
+    inp = tmp_path / "input.txt"
+    inp.write_text("v1")
+    out = tmp_path / "output.txt"
+    calls = []
+    jobs = [_job("inc", [str(inp)], [str(out)], calls)]
+
+    first = _records(jobs)
+    assert calls == ["inc"]
+    assert first["inc"]["fingerprint"] == jobs[0].fingerprint()
+    assert "incremental" not in first["inc"]
+
+    second = _records(jobs, first)
+    assert calls == ["inc"]
+    assert second["inc"]["status"] == "ok-unchanged"
+    assert second["inc"]["incremental"] == "reused"
+    assert second["inc"]["hashes"] == first["inc"]["hashes"]
+
+    _records(jobs, second, incremental=False)
+    assert calls == ["inc", "inc"]
+
+
+def test_changed_inputs_or_outputs_force_a_rerun(tmp_path):
+    inp = tmp_path / "input.txt"
+    inp.write_text("v1")
+    out = tmp_path / "output.txt"
+    calls = []
+    jobs = [_job("inc", [str(inp)], [str(out)], calls)]
+
+    prev = _records(jobs)
+    inp.write_text("v2-longer")
+    prev = _records(jobs, prev)
+    assert calls == ["inc", "inc"]
+    assert "incremental" not in prev["inc"]
+
+    out.write_text("tampered")
+    _records(jobs, prev)
+    assert calls == ["inc", "inc", "inc"]
+
+    failed = {"inc": dict(prev["inc"], status="blocked")}
+    _records(jobs, failed)
+    assert len(calls) == 4
+
+
+def test_reuse_checks_the_outputs_the_result_reported(tmp_path):
+    inp = tmp_path / "input.txt"
+    inp.write_text("v1")
+    reported = tmp_path / "reported.txt"
+    calls = []
+
+    def run():
+        calls.append("override")
+        reported.write_text("payload")
+        return {"status": "ok", "outputs": [str(reported)]}
+
+    jobs = [registry.ValidationJob(id="override", runner=run, inputs=[str(inp)], outputs=[])]
+
+    prev = _records(jobs)
+    assert list(prev["override"]["hashes"]) == prev["override"]["outputs"]
+    prev = _records(jobs, prev)
+    assert calls == ["override"]
+    assert prev["override"]["incremental"] == "reused"
+
+    reported.write_text("tampered")
+    _records(jobs, prev)
+    assert calls == ["override", "override"]
@@ -0,0 +1,83 @@
+import multiprocessing
+
+import pytest
+
+from book.graph.concepts.validation import registry, scheduler
+
+
+def _job(job_id, inputs=(), outputs=(), runner=None):
+    return registry.ValidationJob(
+        id=job_id,
+        runner=runner or (lambda: {"status": "ok", "metrics": {"job": job_id}}),
+        inputs=list(inputs),
+        outputs=list(outputs),
+    )
+
+
+def test_dependencies_follow_output_to_input_overlap():
+    jobs = [
+        _job("consume-dir", inputs=["book/out/x"]),
+        _job("produce", outputs=["book/out/x/a.json"]),
+        _job("consume-glob", inputs=["book/out/x/*.json"]),
+        _job("consume-exact", inputs=["book/out/x/a.json"]),
+        _job("unrelated", inputs=["book/out/y.json"]),
+        _job("rewrite", outputs=["book/out/x/a.json"]),
+    ]
+    deps = scheduler.job_dependencies(jobs)
+    assert deps["consume-dir"] == {"produce", "rewrite"}
+    assert deps["consume-glob"] == {"produce", "rewrite"}
+    assert deps["consume-exact"] == {"produce", "rewrite"}
+    assert deps["unrelated"] == set()
+    # Shared outputs serialize in registry order.
+    assert deps["rewrite"] == {"produce"}
+    assert deps["produce"] == set()
+
+    order = [j.id for j in scheduler.topological_order(jobs, deps)]
+    assert order.index("produce") < order.index("rewrite") < order.index("consume-dir")
+
+
+def test_topological_order_breaks_cycles_in_registry_order():
+    jobs = [
+        _job("a", inputs=["out/b.json"], outputs=["out/a.json"]),
+        _job("b", inputs=["out/a.json"], outputs=["out/b.json"]),
+        _job("c"),
+    ]
+    assert [j.id for j in scheduler.topological_order(jobs)] == ["c", "a", "b"]
+
+
+def test_serial_run_records_results_and_wall_time():
+    calls = []
+
+    def runner(name):
+        def _run():
+            calls.append(name)
+            if name == "boom":
+                raise RuntimeError("failed")
+            return {"status": "ok"}
+
+        return _run
+
+    jobs = [
+        _job("late", inputs=["out/early.json"], runner=runner("late")),
+        _job("early", outputs=["out/early.json"], runner=runner("early")),
+        _job("boom", runner=runner("boom")),
+    ]
+    results = scheduler.run_jobs(jobs, max_workers=1)
+    assert calls.index("early") < calls.index("late")
+    assert results["late"][0] == {"status": "ok"}
+    assert results["boom"][0]["status"] == "blocked"
+    assert all(wall >= 0 for _result, wall in results.values())
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="synthetic jobs need fork workers")
+def test_parallel_run_matches_serial(monkeypatch):
+    jobs = [
+        _job("sched:a", outputs=["out/a.json"]),
+        _job("sched:b", inputs=["out/a.json"]),
+        _job("sched:c"),
+    ]
+    monkeypatch.setattr(registry, "JOBS", list(jobs))
+    monkeypatch.setattr(registry, "JOB_MODULES", [])
+    serial = scheduler.run_jobs(jobs, max_workers=1)
+    parallel = scheduler.run_jobs(jobs, max_workers=3)
+    assert {k: v[0] for k, v in parallel.items()} == {k: v[0] for k, v in serial.items()}
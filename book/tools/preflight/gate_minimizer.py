@@ -24,6 +24,7 @@ book.api.runtime_tools.core.contract, rather than inferring from stderr strings.
 from __future__ import annotations
 
 import argparse
+import contextvars
 import dataclasses
 import enum
 import hashlib
@@ -32,6 +33,8 @@ import os
 import subprocess
 import sys
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
@@ -43,6 +46,12 @@ if str(REPO_ROOT) not in sys.path:
 from book.api import path_utils  # type: ignore
 from book.api.runtime_tools.core import contract as rt_contract  # type: ignore
 from book.api.runtime_tools.core import models as runtime_models  # type: ignore
+from book.tools.preflight.outcome_store import (  # type: ignore
+    DEFAULT_MAX_ENTRIES,
+    DEFAULT_TTL_SEC,
+    OutcomeStore,
+    outcome_key,
+)
 
 
 EPERM = 1
@@ -276,7 +285,35 @@ def classify_outcome(outcome: ApplyProbeOutcome) -> CandidateClass:
     return CandidateClass.NOT_GATE
 
 
+class ProbeCancelled(RuntimeError):
+    """Raised by `ApplyProbe.run` when `cancel_running()` aborts an in-flight run."""
+
+
+# Set on ddmin's speculative worker threads. Probe runs made for a candidate
+# are recorded here instead of being charged against `max_tests`; ddmin
+# settles them (see `ApplyProbe.settle_speculative`) only for candidates whose
+# result it consumes, so the cap applies exactly as in a serial run.
+_SPECULATIVE_RUNS: contextvars.ContextVar[Optional[List[List[Any]]]] = contextvars.ContextVar(
+    "gate_minimizer_speculative_runs", default=None
+)
+
+
 class ApplyProbe:
+    """
+    Runs SBPL candidates through the wrapper and caches outcomes by SBPL hash.
+
+    `run` is safe to call from several threads (speculative ddmin);
+    `cancel_running()` kills the wrapper processes of runs already in flight,
+    which then raise `ProbeCancelled` and are neither cached nor traced as
+    outcomes. `max_tests` counts the runs a serial ddmin would make: runs for
+    speculative candidates that ddmin discards are executed (and reported in
+    `tests_run`) but never count toward the cap.
+
+    With an `OutcomeStore`, cached runs also consult and fill the on-disk
+    store (keyed with the wrapper's sha256 and `world_id`); timeouts and
+    missing-tool outcomes are never persisted.
+    """
+
     def __init__(
         self,
         wrapper_path: Path,
@@ -284,6 +321,8 @@ class ApplyProbe:
         timeout_sec: int,
         trace_path: Optional[Path] = None,
         max_tests: Optional[int] = None,
+        store: Optional[OutcomeStore] = None,
+        world_id: str = runtime_models.WORLD_ID,
     ):
         self.wrapper_path = wrapper_path
         self.command = list(command)
@@ -291,13 +330,32 @@ class ApplyProbe:
         self.trace_path = trace_path
         self.max_tests = max_tests
         self._tests_run = 0
+        self._charged = 0
         self._cache: Dict[str, ApplyProbeOutcome] = {}
         self._ddmin_calls = 0
+        self.store = store
+        self.world_id = world_id
+        self._wrapper_sha256: Optional[str] = None
+        self._lock = threading.Lock()
+        self._cancel_generation = 0
+        self._live: Dict[subprocess.Popen, int] = {}
 
     @property
     def tests_run(self) -> int:
         return self._tests_run
 
+    def _check_budget(self) -> None:
+        # Caller holds self._lock.
+        if self.max_tests is not None and self._charged >= self.max_tests:
+            raise RuntimeError(f"max_tests exceeded ({self.max_tests})")
+
+    def settle_speculative(self, executed: bool) -> None:
+        """Charge one consumed speculative run, as `run` would have serially."""
+        with self._lock:
+            self._check_budget()
+            if executed:
+                self._charged += 1
+
     def next_ddmin_call_id(self) -> int:
         self._ddmin_calls += 1
         return self._ddmin_calls
@@ -305,22 +363,80 @@ class ApplyProbe:
     def _write_trace(self, record: Dict[str, Any]) -> None:
         if not self.trace_path:
             return
-        self.trace_path.parent.mkdir(parents=True, exist_ok=True)
-        with self.trace_path.open("a", encoding="utf-8") as fh:
-            fh.write(json.dumps(record, sort_keys=True) + "\n")
+        line = json.dumps(record, sort_keys=True) + "\n"
+        with self._lock:
+            self.trace_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.trace_path.open("a", encoding="utf-8") as fh:
+                fh.write(line)
 
     def trace(self, record: Dict[str, Any]) -> None:
         self._write_trace(record)
 
+    def cancel_running(self) -> None:
+        """Kill every wrapper run started before this call."""
+        with self._lock:
+            self._cancel_generation += 1
+            live = list(self._live)
+        for proc in live:
+            try:
+                proc.kill()
+            except OSError:
+                pass
+
+    def _communicate(self, full_cmd: List[str], generation: int) -> Tuple[int, str]:
+        with self._lock:
+            if generation != self._cancel_generation:
+                raise ProbeCancelled("cancelled before launch")
+            proc = subprocess.Popen(
+                full_cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                env={k: v for k, v in os.environ.items() if not k.startswith("SANDBOX_LORE_SEATBELT_")},
+            )
+            self._live[proc] = generation
+        try:
+            try:
+                _, stderr = proc.communicate(timeout=self.timeout_sec)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.communicate()
+                raise
+        finally:
+            with self._lock:
+                self._live.pop(proc, None)
+                cancelled = generation != self._cancel_generation
+        if cancelled and proc.returncode is not None and proc.returncode < 0:
+            raise ProbeCancelled("cancelled while running")
+        return proc.returncode, stderr or ""
+
     def run(self, sbpl_text: str, *, cache: bool = True) -> ApplyProbeOutcome:
-        if self.max_tests is not None and self._tests_run >= self.max_tests:
-            raise RuntimeError(f"max_tests exceeded ({self.max_tests})")
+        ledger = _SPECULATIVE_RUNS.get()
+        entry: List[Any] = [self, False]
+        with self._lock:
+            generation = self._cancel_generation
+            if ledger is None:
+                self._check_budget()
+            else:
+                ledger.append(entry)
 
         sbpl_bytes = sbpl_text.encode("utf-8")
         sbpl_sha = hashlib.sha256(sbpl_bytes).hexdigest()
         cached = self._cache.get(sbpl_sha) if cache else None
         if cache and cached:
             return cached
+        store_key = self._store_key(sbpl_sha) if cache else None
+        if store_key is not None:
+            stored = self.store.get(store_key)  # type: ignore[union-attr]
+            if stored is not None:
+                try:
+                    outcome = ApplyProbeOutcome(**stored)
+                except TypeError:
+                    outcome = None
+                if outcome is not None:
+                    self._cache[sbpl_sha] = outcome
+                    self._write_trace({"sbpl_sha256": sbpl_sha, "outcome_store": "hit", "failure_stage": outcome.failure_stage})
+                    return outcome
 
         with tempfile.NamedTemporaryFile("w", suffix=".sb", delete=False) as tmp:
             tmp.write(sbpl_text)
@@ -336,14 +452,13 @@ class ApplyProbe:
             "--",
         ] + [str(x) for x in self.command]
         try:
-            self._tests_run += 1
-            proc = subprocess.run(
-                full_cmd,
-                capture_output=True,
-                text=True,
-                timeout=self.timeout_sec,
-                env={k: v for k, v in os.environ.items() if not k.startswith("SANDBOX_LORE_SEATBELT_")},
-            )
+            with self._lock:
+                self._tests_run += 1
+                if ledger is None:
+                    self._charged += 1
+                else:
+                    entry[1] = True
+            returncode, stderr_raw = self._communicate(full_cmd, generation)
         except subprocess.TimeoutExpired as exc:
             tmp_path.unlink(missing_ok=True)
             outcome = ApplyProbeOutcome(
@@ -377,7 +492,6 @@ class ApplyProbe:
         finally:
             tmp_path.unlink(missing_ok=True)
 
-        stderr_raw = proc.stderr or ""
         upgraded = rt_contract.upgrade_runtime_result({}, stderr_raw)
         failure_stage = upgraded.get("failure_stage")
         failure_kind = upgraded.get("failure_kind")
@@ -386,7 +500,7 @@ class ApplyProbe:
 
         outcome = ApplyProbeOutcome(
             sbpl_sha256=sbpl_sha,
-            wrapper_rc=proc.returncode,
+            wrapper_rc=returncode,
             failure_stage=failure_stage if isinstance(failure_stage, str) else None,
             failure_kind=failure_kind if isinstance(failure_kind, str) else None,
             apply_report=apply_report if isinstance(apply_report, dict) else None,
@@ -396,18 +510,37 @@ class ApplyProbe:
 
         if cache:
             self._cache[sbpl_sha] = outcome
-        self._write_trace(
-            {
-                "sbpl_sha256": sbpl_sha,
-                "cmd": recorded_cmd,
-                "wrapper_rc": proc.returncode,
-                "failure_stage": outcome.failure_stage,
-                "failure_kind": outcome.failure_kind,
-                "apply_report": outcome.apply_report,
-            }
-        )
+        record = {
+            "sbpl_sha256": sbpl_sha,
+            "cmd": recorded_cmd,
+            "wrapper_rc": returncode,
+            "failure_stage": outcome.failure_stage,
+            "failure_kind": outcome.failure_kind,
+            "apply_report": outcome.apply_report,
+        }
+        if store_key is not None:
+            self.store.put(  # type: ignore[union-attr]
+                store_key,
+                dataclasses.asdict(outcome),
+                sbpl_sha256=sbpl_sha,
+                command=self.command,
+                world_id=self.world_id,
+                wrapper_sha256=self._wrapper_sha256 or "",
+            )
+            record["outcome_store"] = "miss"
+        self._write_trace(record)
         return outcome
 
+    def _store_key(self, sbpl_sha: str) -> Optional[str]:
+        if self.store is None:
+            return None
+        if self._wrapper_sha256 is None:
+            try:
+                self._wrapper_sha256 = _sha256_path(self.wrapper_path)
+            except OSError:
+                return None
+        return outcome_key(sbpl_sha, self.command, self.world_id, self._wrapper_sha256)
+
 
 # --- Delta debugging -----------------------------------------------------------
 
@@ -432,64 +565,126 @@ def _split_chunks(items: Sequence[Any], n: int) -> List[Tuple[int, int]]:
     return chunks
 
 
+def _first_gate_serial(
+    candidates: Sequence[List[Any]],
+    test: Callable[[List[Any]], CandidateClass],
+) -> List[CandidateClass]:
+    outcomes: List[CandidateClass] = []
+    for candidate in candidates:
+        outcome = test(candidate)
+        outcomes.append(outcome)
+        if outcome == CandidateClass.GATE:
+            break
+    return outcomes
+
+
+def _speculative_test(
+    test: Callable[[List[Any]], CandidateClass], candidate: List[Any]
+) -> Tuple[CandidateClass, List[List[Any]]]:
+    runs: List[List[Any]] = []
+    token = _SPECULATIVE_RUNS.set(runs)
+    try:
+        return test(candidate), runs
+    finally:
+        _SPECULATIVE_RUNS.reset(token)
+
+
+def _first_gate_speculative(
+    candidates: Sequence[List[Any]],
+    test: Callable[[List[Any]], CandidateClass],
+    executor: ThreadPoolExecutor,
+    cancel: Optional[Callable[[], None]],
+) -> List[CandidateClass]:
+    """
+    Evaluate all candidates concurrently but consume results in order, so the
+    outcomes (and the chosen GATE) match `_first_gate_serial`. Candidates past
+    the first GATE are cancelled and their results discarded; probe runs are
+    charged against `max_tests` only for consumed candidates, in order.
+    """
+
+    futures = [executor.submit(_speculative_test, test, candidate) for candidate in candidates]
+    outcomes: List[CandidateClass] = []
+    try:
+        for future in futures:
+            outcome, runs = future.result()
+            for probe, executed in runs:
+                probe.settle_speculative(executed)
+            outcomes.append(outcome)
+            if outcome == CandidateClass.GATE:
+                break
+    finally:
+        rest = futures[len(outcomes) :]
+        if rest:
+            for future in rest:
+                future.cancel()
+            if cancel is not None:
+                cancel()
+            wait_futures(rest)
+    return outcomes
+
+
 def ddmin(
     items: List[Any],
     test: Callable[[List[Any]], CandidateClass],
     *,
     trace: Optional[Callable[[Dict[str, Any]], None]] = None,
     trace_context: Optional[Dict[str, Any]] = None,
+    jobs: int = 1,
+    cancel: Optional[Callable[[], None]] = None,
 ) -> List[Any]:
     """
     Zeller-style ddmin for ordered lists.
+
+    With `jobs > 1`, the complements of each iteration are tested
+    speculatively on up to `jobs` worker threads; the first GATE in chunk
+    order wins and `cancel` (if given) is called to abort the rest. Results
+    and trace records are the same as the serial run, and an `ApplyProbe`
+    `max_tests` cap trips at the same point; only the number of tests
+    executed can grow.
     """
 
     if test(list(items)) != CandidateClass.GATE:
         raise ValueError("ddmin called with a non-failing starting set")
 
+    executor = ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="ddmin") if jobs > 1 else None
     n = 2
     current = list(items)
     iteration = 0
-    while len(current) >= 2:
-        iteration += 1
-        reduced = False
-        gate_count = 0
-        not_gate_count = 0
-        invalid_count = 0
-        tested = 0
-        for start, end in _split_chunks(current, n):
-            candidate = current[:start] + current[end:]
-            tested += 1
-            outcome = test(candidate)
-            if outcome == CandidateClass.GATE:
-                gate_count += 1
-                current = candidate
+    try:
+        while len(current) >= 2:
+            iteration += 1
+            candidates = [current[:start] + current[end:] for start, end in _split_chunks(current, n)]
+            if executor is None:
+                outcomes = _first_gate_serial(candidates, test)
+            else:
+                outcomes = _first_gate_speculative(candidates, test, executor, cancel)
+            reduced = bool(outcomes) and outcomes[-1] == CandidateClass.GATE
+            if reduced:
+                current = candidates[len(outcomes) - 1]
                 n = max(2, n - 1)
-                reduced = True
+            if trace:
+                record = {
+                    "type": "ddmin_iteration",
+                    "iteration": iteration,
+                    "n": n,
+                    "current_len": len(current),
+                    "tested": len(outcomes),
+                    "gate": sum(1 for o in outcomes if o == CandidateClass.GATE),
+                    "not_gate": sum(1 for o in outcomes if o == CandidateClass.NOT_GATE),
+                    "invalid": sum(1 for o in outcomes if o == CandidateClass.INVALID),
+                    "reduced": reduced,
+                }
+                if trace_context:
+                    record.update(trace_context)
+                trace(record)
+            if reduced:
+                continue
+            if n >= len(current):
                 break
-            if outcome == CandidateClass.INVALID:
-                invalid_count += 1
-            else:
-                not_gate_count += 1
-        if trace:
-            record = {
-                "type": "ddmin_iteration",
-                "iteration": iteration,
-                "n": n,
-                "current_len": len(current),
-                "tested": tested,
-                "gate": gate_count,
-                "not_gate": not_gate_count,
-                "invalid": invalid_count,
-                "reduced": reduced,
-            }
-            if trace_context:
-                record.update(trace_context)
-            trace(record)
-        if reduced:
-            continue
-        if n >= len(current):
-            break
-        n = min(len(current), n * 2)
+            n = min(len(current), n * 2)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
     return current
 
 
@@ -576,7 +771,7 @@ def min_arity(expr: ListExpr) -> int:
     return 1
 
 
-def minimize_top_level_forms(forms: List[Expr], probe: ApplyProbe) -> List[Expr]:
+def minimize_top_level_forms(forms: List[Expr], probe: ApplyProbe, *, jobs: int = 1) -> List[Expr]:
     version_forms = [f for f in forms if _is_version_form(f)]
     others = [f for f in forms if not _is_version_form(f)]
 
@@ -594,11 +789,13 @@ def minimize_top_level_forms(forms: List[Expr], probe: ApplyProbe) -> List[Expr]
         test_candidate,
         trace=probe.trace,
         trace_context={"ddmin_context": "top_level_forms", "ddmin_call_id": ddmin_call_id},
+        jobs=jobs,
+        cancel=probe.cancel_running,
     )
     return version_forms + minimized
 
 
-def minimize_list_tail_at_path(forms: List[Expr], path: PathT, probe: ApplyProbe) -> List[Expr]:
+def minimize_list_tail_at_path(forms: List[Expr], path: PathT, probe: ApplyProbe, *, jobs: int = 1) -> List[Expr]:
     expr = get_at_path(forms, path)
     if not isinstance(expr, ListExpr):
         return forms
@@ -637,19 +834,23 @@ def minimize_list_tail_at_path(forms: List[Expr], path: PathT, probe: ApplyProbe
             "path": list(path),
             "operator": _list_operator(expr),
         },
+        jobs=jobs,
+        cancel=probe.cancel_running,
     )
     new_expr = ListExpr(tuple(prefix + minimized_tail))
     return replace_at_path(forms, path, new_expr)
 
 
-def minimize_profile(forms: List[Expr], probe: ApplyProbe) -> List[Expr]:
+def minimize_profile(forms: List[Expr], probe: ApplyProbe, *, jobs: int = 1) -> List[Expr]:
     """
     Coarse-to-fine minimization:
     1) ddmin top-level forms
     2) repeatedly minimize tails of all list expressions until fixpoint
+
+    `jobs` > 1 runs each ddmin iteration speculatively (see `ddmin`).
     """
 
-    reduced = minimize_top_level_forms(forms, probe)
+    reduced = minimize_top_level_forms(forms, probe, jobs=jobs)
 
     changed = True
     while changed:
@@ -657,7 +858,7 @@ def minimize_profile(forms: List[Expr], probe: ApplyProbe) -> List[Expr]:
         for path in list(iter_profile_list_paths(reduced)):
             before = reduced
             try:
-                reduced = minimize_list_tail_at_path(reduced, path, probe)
+                reduced = minimize_list_tail_at_path(reduced, path, probe, jobs=jobs)
             except Exception:
                 reduced = before
             if reduced != before:
@@ -796,6 +997,30 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     ap.add_argument("--command", nargs="+", default=["/usr/bin/true"], help="Command executed after apply (default: /usr/bin/true).")
     ap.add_argument("--timeout-sec", type=int, default=5, help="Per-run timeout in seconds.")
     ap.add_argument("--max-tests", type=int, default=None, help="Optional cap on apply tests to prevent runaway minimization.")
+    ap.add_argument(
+        "--outcome-store",
+        type=Path,
+        default=None,
+        help="JSONL store of apply outcomes reused across runs (keyed by SBPL sha256, command, world, wrapper sha256).",
+    )
+    ap.add_argument(
+        "--outcome-store-ttl-days",
+        type=float,
+        default=DEFAULT_TTL_SEC / 86400.0,
+        help="Ignore and evict stored outcomes older than this many days (default: 30).",
+    )
+    ap.add_argument(
+        "--outcome-store-max-entries",
+        type=int,
+        default=DEFAULT_MAX_ENTRIES,
+        help="Keep at most this many stored outcomes when compacting (newest win).",
+    )
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Test each ddmin iteration's complements on up to N concurrent wrapper runs (same result as serial).",
+    )
     ap.add_argument("--confirm", type=int, default=0, help="Rerun minimal failing + neighbor N times to confirm determinism (fresh processes).")
     args = ap.parse_args(argv)
     argv_effective = list(sys.argv[1:] if argv is None else argv)
@@ -808,12 +1033,20 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
 
     trace_path = out_dir / "trace.jsonl"
     trace_path.write_text("", encoding="utf-8")
+    store = None
+    if args.outcome_store is not None:
+        store = OutcomeStore(
+            path_utils.ensure_absolute(args.outcome_store, repo_root),
+            ttl_sec=args.outcome_store_ttl_days * 86400.0,
+            max_entries=args.outcome_store_max_entries,
+        )
     probe = ApplyProbe(
         wrapper_path=wrapper_path,
         command=args.command,
         timeout_sec=args.timeout_sec,
         trace_path=trace_path,
         max_tests=args.max_tests,
+        store=store,
     )
 
     original_text = _load_text(in_path)
@@ -838,7 +1071,7 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         )
         return 2
 
-    minimized_forms = minimize_profile(list(forms), probe)
+    minimized_forms = minimize_profile(list(forms), probe, jobs=max(1, args.jobs))
     minimal_failing = render_sbpl(minimized_forms)
     neighbor = find_passing_neighbor(minimized_forms, probe)
 
@@ -873,6 +1106,7 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         "command": args.command,
         "timeout_sec": args.timeout_sec,
         "max_tests": args.max_tests,
+        "jobs": args.jobs,
         "confirm_runs": args.confirm,
         "tests_run": probe.tests_run,
         "initial_outcome": dataclasses.asdict(initial_outcome),
@@ -885,6 +1119,12 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         },
         "confirm": confirm,
     }
+    if store is not None:
+        store_stats = store.stats()
+        store_stats["path"] = path_utils.to_repo_relative(store.path, repo_root)
+        probe.trace({"type": "outcome_store", **store_stats})
+        store.close()
+        run_doc["outcome_store"] = store_stats
     (out_dir / "run.json").write_text(json.dumps(run_doc, indent=2, sort_keys=True) + "\n", encoding="utf-8")
 
     print(f"[+] wrote {path_utils.to_repo_relative(out_dir / 'minimal_failing.sb', repo_root)}")
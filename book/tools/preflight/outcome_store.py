@@ -0,0 +1,165 @@
+"""
+Persistent apply-outcome store for `gate_minimizer.ApplyProbe`.
+
+Outcomes are keyed by (SBPL sha256, command, world_id, wrapper sha256), so a
+verdict is reused only when the same profile text would run through the same
+wrapper binary with the same post-apply command on the same world.
+
+Storage is an append-only JSONL file; the newest line for a key wins. The
+whole file is indexed in memory on open. Entries older than `ttl_sec` are
+ignored, and `close()` compacts the file (dropping expired entries and
+keeping the newest `max_entries`) when it has grown stale.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Sequence
+
+STORE_SCHEMA_VERSION = "preflight.apply_outcome_store.v0.1"
+DEFAULT_TTL_SEC = 30 * 24 * 3600.0
+DEFAULT_MAX_ENTRIES = 50_000
+
+
+def outcome_key(sbpl_sha256: str, command: Sequence[str], world_id: str, wrapper_sha256: str) -> str:
+    ident = json.dumps([sbpl_sha256, [str(c) for c in command], world_id, wrapper_sha256], separators=(",", ":"))
+    return hashlib.sha256(ident.encode("utf-8")).hexdigest()
+
+
+class OutcomeStore:
+    def __init__(
+        self,
+        path: Path,
+        *,
+        ttl_sec: Optional[float] = DEFAULT_TTL_SEC,
+        max_entries: Optional[int] = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._lines = 0
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.writes = 0
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            fh = self.path.open("r", encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with fh:
+            for line in fh:
+                self._lines += 1
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if not isinstance(record, dict) or record.get("schema_version") != STORE_SCHEMA_VERSION:
+                    continue
+                key = record.get("key")
+                if isinstance(key, str) and isinstance(record.get("outcome"), dict):
+                    self._index[key] = record
+
+    def _is_expired(self, record: Dict[str, Any], now: float) -> bool:
+        if self.ttl_sec is None:
+            return False
+        recorded = record.get("recorded_at_unix_s")
+        return not isinstance(recorded, (int, float)) or now - recorded > self.ttl_sec
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            record = self._index.get(key)
+            if record is not None and self._is_expired(record, self._clock()):
+                self.expired += 1
+                record = None
+            if record is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return dict(record["outcome"])
+
+    def put(
+        self,
+        key: str,
+        outcome: Dict[str, Any],
+        *,
+        sbpl_sha256: str,
+        command: Sequence[str],
+        world_id: str,
+        wrapper_sha256: str,
+    ) -> None:
+        record = {
+            "schema_version": STORE_SCHEMA_VERSION,
+            "key": key,
+            "sbpl_sha256": sbpl_sha256,
+            "command": [str(c) for c in command],
+            "world_id": world_id,
+            "wrapper_sha256": wrapper_sha256,
+            "recorded_at_unix_s": self._clock(),
+            "outcome": outcome,
+        }
+        line = json.dumps(record, sort_keys=True) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as fh:
+                fh.write(line)
+            self._index[key] = record
+            self._lines += 1
+            self.writes += 1
+
+    def _live_records(self) -> list:
+        now = self._clock()
+        live = [r for r in self._index.values() if not self._is_expired(r, now)]
+        live.sort(key=lambda r: r.get("recorded_at_unix_s") or 0.0)
+        if self.max_entries is not None and len(live) > self.max_entries:
+            live = live[len(live) - self.max_entries :]
+        return live
+
+    def compact(self) -> int:
+        """Rewrite the file with live entries only; returns the number kept."""
+        with self._lock:
+            live = self._live_records()
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with tmp.open("w", encoding="utf-8") as fh:
+                for record in live:
+                    fh.write(json.dumps(record, sort_keys=True) + "\n")
+            os.replace(tmp, self.path)
+            self._index = {r["key"]: r for r in live}
+            self._lines = len(live)
+            return len(live)
+
+    def close(self) -> None:
+        """Compact when the file carries superseded, expired, or over-limit lines."""
+        with self._lock:
+            if not self.path.exists():
+                return
+            needs = self._lines != len(self._live_records())
+        if needs:
+            self.compact()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "path": str(self.path),
+                "entries": len(self._index),
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "writes": self.writes,
+                "hit_rate": (self.hits / lookups) if lookups else None,
+                "ttl_sec": self.ttl_sec,
+                "max_entries": self.max_entries,
+            }